@@ -93,6 +93,28 @@ async def get_payments_list(limit: int = 100, admin_id: str = Depends(require_ad
     }
 
 
+@router.get("/rate_limits")
+async def get_rate_limits(admin_id: str = Depends(require_admin)):
+    """Rate limit 규칙별 허용/거절 카운터, 키 수, LRU 축출 수"""
+    from app.core.rate_limit import rate_limiter
+    return rate_limiter.stats()
+
+
+@router.get("/user_cache")
+async def get_user_cache_stats(admin_id: str = Depends(require_admin)):
+    """요청 경로 유저 캐시 — 프로필/토큰 적중률, DB 로드 수, single-flight 병합 수"""
+    from app.core.user_cache import user_cache
+    return user_cache.stats()
+
+
+@router.get("/startup_profile")
+async def get_startup_profile(top: int = 40, admin_id: str = Depends(require_admin)):
+    """콜드 스타트 프로파일 — 시작 단계별 시간, 모듈별 import 시간, 지연 라우터 로드 현황"""
+    from app.core.startup import profile
+    from app.main import lazy_routers
+    return {**profile.snapshot(top=min(max(top, 1), 500)), "lazy_routers": lazy_routers.stats()}
+
+
 # ─────────────────────────────────────────────
 # 비디오 마케팅 설정 (Video Config)
 # ─────────────────────────────────────────────
@@ -4,18 +4,21 @@ AI 승리예상 분석 API 엔드포인트
 - 개별 경기 상세 분석
 - 데이터 소스 수집 트리거
 """
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from datetime import datetime, timezone
 import logging
 import asyncio
+import json
 
 from app.core.ai_predictor import AIPredictor
 from app.core.ml_predictor import ml_predictor
 from app.services.football_stats_service import FootballStatsService
-from app.services.league_standings_service import LeagueStandingsService
+from app.services.league_standings_service import get_league_standings_service
 from app.services.basketball_stats_service import BasketballStatsService
 from app.services.live_score_api_service import LiveScoreApiService
+from app.services.live_score_hub import LiveScoreHub
 from app.services.pinnacle_api import pinnacle_service
 from app.schemas.predictions import MatchPrediction, PredictionResponse
 
@@ -35,7 +38,7 @@ def _ensure_services():
     global _services_initialized, football_stats, league_standings, basketball_stats, live_score_api, ai_predictor
     if not _services_initialized:
         football_stats = FootballStatsService()
-        league_standings = LeagueStandingsService()
+        league_standings = get_league_standings_service()
         basketball_stats = BasketballStatsService()
         live_score_api = LiveScoreApiService()
         ai_predictor = AIPredictor()
@@ -506,7 +509,6 @@ async def get_league_table(league_key: str):
     """리그 전체 순위표 + 최근 경기 결과"""
     _ensure_services()
     standings = []
-    recent_matches = []
 
     # 1. Standings from caches
     if league_key in ai_predictor._standings_cache:
@@ -517,20 +519,18 @@ async def get_league_table(league_key: str):
         if league_key in cached:
             standings = cached[league_key]
 
-    # 2. Recent matches from football-data.org (free, no quota impact)
-    if league_standings.api_key:
-        try:
-            recent_matches = await league_standings.fetch_recent_matches(league_key, limit=10)
-        except Exception as e:
-            logger.warning(f"Recent matches fetch error: {e}")
-
-    # 3. Top scorers
+    # 2. Recent matches + top scorers — 서비스 캐시에서 조립 (만료분만 조건부 요청)
+    recent_matches = []
     scorers = []
     if league_standings.api_key:
         try:
-            scorers = await league_standings.fetch_scorers(league_key, limit=5)
+            table = await league_standings.get_league_table(league_key)
+            recent_matches = table["recent_matches"]
+            scorers = table["top_scorers"]
+            if not standings:
+                standings = table["standings"]
         except Exception as e:
-            logger.warning(f"Scorers fetch error: {e}")
+            logger.warning(f"League table fetch error: {e}")
 
     return {
         "league_key": league_key,
@@ -540,68 +540,93 @@ async def get_league_table(league_key: str):
     }
 
 
-@router.get("/live-scores")
-async def get_live_scores(league: Optional[str] = None):
-    """실시간 진행 중인 경기 스코어 조회
-    - Live-Score-Api 우선 사용 (600 req/hr, 30초 캐시)
-    - API-Football은 fallback
-    - ?league=soccer_epl 로 특정 리그 필터 가능
+async def _fetch_live_snapshot() -> dict:
+    """업스트림 라이브 스코어 1회 조회 (LiveScoreHub 폴러 전용, 리그 필터 없음)
+    - Live-Score-Api 우선 사용 (600 req/hr)
+    - API-Football은 fallback (100 req/day)
     """
-    _ensure_services()
-    source = "none"
-
-    # 1차: Live-Score-Api (600 req/hr 무료)
     if live_score_api.is_available:
         try:
             matches = await live_score_api.fetch_live_scores()
             cache = live_score_api.get_live_cache()
-            source = "live-score-api"
-
-            # league 필터 (기존 호환: league_name 기반 부분 매칭)
-            if league and matches:
-                from app.services.football_stats_service import LEAGUE_MAP
-                league_id = LEAGUE_MAP.get(league)
-                # Live-Score-Api는 competition_id 사용, league_name으로도 필터
-                filtered = []
-                for m in matches:
-                    if league_id and m.get("league_id") == league_id:
-                        filtered.append(m)
-                    elif league and league.replace("soccer_", "").replace("_", " ").lower() in m.get("league_name", "").lower():
-                        filtered.append(m)
-                matches = filtered
-
             stats = live_score_api.get_stats()
             return {
                 "matches": matches,
-                "live_count": len(matches),
-                "total_live": len(cache.get("matches", [])),
                 "updated_at": cache.get("updated_at", ""),
-                "source": source,
+                "source": "live-score-api",
                 "api_used": stats.get("hourly_requests", 0),
                 "api_limit": stats.get("hourly_limit", 600),
             }
         except Exception as e:
             logger.warning(f"Live-Score-Api error, falling back: {e}")
 
-    # 2차: API-Football fallback (100 req/day)
     if football_stats.api_key:
         try:
-            matches = await football_stats.fetch_live_scores(league_key=league)
+            matches = await football_stats.fetch_live_scores()
             cache = football_stats.get_live_cache()
-            source = "api-football"
             return {
                 "matches": matches,
-                "live_count": len(matches),
-                "total_live": len(cache.get("matches", [])),
                 "updated_at": cache.get("updated_at", ""),
-                "source": source,
+                "source": "api-football",
                 "api_used": football_stats._daily_requests,
                 "api_limit": football_stats._daily_limit,
             }
         except Exception as e:
             logger.error(f"API-Football live scores error: {e}")
 
-    return {"matches": [], "message": "No live score API configured", "live_count": 0, "source": source}
+    return {"matches": [], "source": "none", "message": "No live score API configured"}
+
+
+# 인스턴스당 1개의 라이브 스코어 폴러 — REST/SSE 모두 이 스냅샷을 공유
+live_score_hub = LiveScoreHub(fetcher=_fetch_live_snapshot, interval=30.0)
+
+
+@router.get("/live-scores")
+async def get_live_scores(league: Optional[str] = None):
+    """실시간 진행 중인 경기 스코어 조회
+    - LiveScoreHub 스냅샷 사용 (30초 주기, 동시 요청은 업스트림 1회 조회 공유)
+    - ?league=soccer_epl 로 특정 리그 필터 가능
+    - 변경 이벤트 푸시는 /live-scores/stream (SSE)
+    """
+    _ensure_services()
+    await live_score_hub.refresh()
+    live_score_hub.ensure_started()
+    return live_score_hub.snapshot(league)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/live-scores/stream")
+async def stream_live_scores(request: Request, league: Optional[str] = None):
+    """실시간 스코어 SSE 스트림
+    - 접속 시 snapshot 이벤트 1회, 이후 goal / status / minute / match_start / match_end 이벤트
+    - ?league=soccer_epl 로 리그 구독
+    - 15초마다 keep-alive 코멘트
+    """
+    _ensure_services()
+    sub = live_score_hub.subscribe(league)
+
+    async def event_stream():
+        try:
+            await live_score_hub.refresh()
+            yield _sse("snapshot", live_score_hub.snapshot(league))
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event.get("type", "update"), event)
+        finally:
+            live_score_hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/live-scores/{match_id}/events")
@@ -722,6 +747,7 @@ async def get_data_sources_status():
             "description": "실시간 라이브 스코어, 이벤트, 라인업 (600 req/hr)",
             "hourly_limit": live_stats.get("hourly_limit", 600),
             "hourly_used": live_stats.get("hourly_requests", 0),
+            "hub": live_score_hub.stats(),
         },
         "api_football": {
             "status": "active" if football_stats.api_key else "no_key",
@@ -14,7 +14,7 @@ from app.services.team_mapper import TeamMapper
 from app.services.gemini_service import analyze_match
 from app.core.ai_predictor import AIPredictor
 from app.services.football_stats_service import FootballStatsService
-from app.services.league_standings_service import LeagueStandingsService
+from app.services.league_standings_service import get_league_standings_service
 import logging
 
 router = APIRouter()
@@ -32,7 +32,7 @@ def _ensure_services():
     global _services_initialized, football_stats, league_standings, ai_predictor
     if not _services_initialized:
         football_stats = FootballStatsService()
-        league_standings = LeagueStandingsService()
+        league_standings = get_league_standings_service()
         ai_predictor = AIPredictor()
         _services_initialized = True
 
@@ -2,10 +2,11 @@ from typing import Any
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 
-from app.models.user_db import get_user_by_email, create_user, get_user_by_id
+from app.models.user_db import get_user_by_email, create_user
 from app.core import security
+from app.core.user_cache import user_cache
 from pydantic import BaseModel, EmailStr
 import logging
 
@@ -45,14 +46,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
+        payload = user_cache.decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user = await get_user_by_id(user_id)
+    user = await user_cache.get_user(user_id, payload.get("tv", 0))
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     return user
@@ -91,7 +92,7 @@ async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
         raise HTTPException(status_code=400, detail="이메일 또는 비밀번호가 일치하지 않습니다.")
 
     return {
-        "access_token": security.create_access_token(user["id"]),
+        "access_token": security.create_access_token(user["id"], token_version=user.get("token_version", 0)),
         "token_type": "bearer",
     }
 
@@ -99,6 +100,8 @@ async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
 @router.get("/me", response_model=UserInfo)
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user info from JWT token."""
+    from app.core.rate_limit import rate_limiter
+    rate_limiter.remember_tier(current_user["id"], current_user.get("tier", "free"))
     return UserInfo(
         id=current_user["id"],
         email=current_user["email"],
@@ -162,7 +165,7 @@ async def google_login(req: GoogleAuthRequest):
         logger.info(f"New {user_data['auth_provider']} user created: {email}")
 
     return {
-        "access_token": security.create_access_token(user["id"]),
+        "access_token": security.create_access_token(user["id"], token_version=user.get("token_version", 0)),
         "token_type": "bearer",
     }
 
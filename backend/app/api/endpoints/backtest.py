@@ -26,6 +26,7 @@ async def get_backtest_insights(
             "status": "ok",
             "period_days": days,
             "insights": insights,
+            "cube": backtest_engine.cube_status(),
         }
     except Exception as e:
         logger.error(f"Backtest insights error: {e}")
@@ -36,6 +37,23 @@ async def get_backtest_insights(
         }
 
 
+@router.post("/cube/refresh")
+async def refresh_insight_cube():
+    """인사이트 큐브 재생성 (predictions_log 1회 스캔). 야간 파이프라인에서도 자동 실행."""
+    try:
+        result = await backtest_engine.refresh_cube()
+        return {"status": "ok", "cube": result}
+    except Exception as e:
+        logger.error(f"Backtest cube refresh error: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@router.get("/cube/status")
+async def get_insight_cube_status():
+    """인사이트 큐브 상태 (생성 시각, 만료, 셀 수)."""
+    return {"status": "ok", "cube": backtest_engine.cube_status()}
+
+
 @router.get("/accuracy/league")
 async def get_league_accuracy(
     days: int = Query(90, ge=7, le=365)
@@ -1,14 +1,26 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+import asyncio
 import logging
 from datetime import datetime, timezone
 import random
+import re
 
-from app.services.gemini_service import generate_blogger_content
+from app.services.gemini_service import generate_blogger_content, BLOGGER_SEO_PROMPT
 from app.services.blogger_service import blogger_service
+from app.services.publish_pipeline import publish_pipeline, PublishTarget
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+def to_slug(name: str) -> str:
+    if not name:
+        return "unknown"
+    name = re.sub(r'[^a-zA-Z0-9가-힣\s-]', '', name)
+    name = re.sub(r'[\s]+', '-', name)
+    return name.lower()
+
+
 @router.post("/post")
 async def trigger_daily_blogger_post():
     """
@@ -45,12 +57,9 @@ async def trigger_daily_blogger_post():
             valid = matches
 
         from firebase_admin import firestore
-        published_count = 0
-        skipped_count = 0
-        urls = []
+        run = publish_pipeline.start("blogger")
 
-        # Loop through ALL valid matches of today to post each one individually
-        for match in valid:
+        async def post_match(match):
             match_id = match.get("match_id")
             if not match_id:
                 t_home = match.get("team_home") or "home"
@@ -60,10 +69,9 @@ async def trigger_daily_blogger_post():
             # Firestore-based duplicate check to ensure 0 duplicates
             pub_doc_id = f"{today_str}_{match_id}"
             pub_doc_ref = db.collection("blogger_published").document(pub_doc_id)
-            if pub_doc_ref.get().exists:
+            if (await asyncio.to_thread(pub_doc_ref.get)).exists:
                 logger.info(f"Match {match_id} already published today on Blogger. Skipping to prevent duplicate.")
-                skipped_count += 1
-                continue
+                return "skipped", None
 
             match_time = match.get("match_time") or today_str
             if "T" in match_time:
@@ -73,25 +81,19 @@ async def trigger_daily_blogger_post():
             else:
                 date_param = match_time
 
-            import re
-            def to_slug(name: str) -> str:
-                if not name:
-                    return "unknown"
-                name = re.sub(r'[^a-zA-Z0-9가-힣\s-]', '', name)
-                name = re.sub(r'[\s]+', '-', name)
-                return name.lower()
-
             t_home_ko = match.get("team_home_ko") or match.get("team_home")
             t_away_ko = match.get("team_away_ko") or match.get("team_away")
             slug = f"{to_slug(t_home_ko)}-vs-{to_slug(t_away_ko)}"
             url_path = f"{date_param}/{slug}"
 
-            # Generate SEO HTML via Gemini
+            # Generate SEO HTML via Gemini (같은 경기 데이터면 저장된 글 재사용 — WordPress 와 공유)
             logger.info(f"Generating Blogger content for match: {slug}")
-            content_res = await generate_blogger_content(match, url_path)
+            content_res, content_fp = await run.content(
+                "blog_html", {"match": match, "url_path": url_path},
+                lambda: generate_blogger_content(match, url_path), BLOGGER_SEO_PROMPT)
             if not content_res:
                 logger.error(f"Failed to generate HTML content from Gemini for {slug}")
-                continue
+                return None, None
 
             # Format SEO title exactly as requested: [YYYY년 MM월 DD일] 홈팀 vs 원정팀 경기 분석 및 AI 승률 예측
             try:
@@ -101,38 +103,45 @@ async def trigger_daily_blogger_post():
                 formatted_date = date_param
             
             seo_title = f"[{formatted_date}] {t_home_ko} vs {t_away_ko} 경기 분석 및 AI 승률 예측"
-            
-            # Update Gemini response title to our standard format
-            content_res["title"] = seo_title
 
-            # Post to blogger
+            # Post to blogger (발행 원장: 같은 글이 이미 올라갔으면 건너뜀, Blogger 요청 제한)
             logger.info(f"Publishing {seo_title} to Blogger...")
-            res = await blogger_service.publish_post(
-                title=content_res["title"],
-                content=content_res["html"]
-            )
+            target = PublishTarget("blogger", blogger_service.blog_id,
+                                   lambda: blogger_service.publish_post(title=seo_title, content=content_res["html"]))
+            outcome = (await run.publish(content_fp, [target]))[0]
+            res = outcome.get("result")
 
-            if res:
+            if outcome["status"] in ("published", "skipped") and res:
                 published_url = res.get("url", "")
                 logger.info(f"Successfully posted to blogger. URL: {published_url}")
                 # Save to Firestore to prevent future duplicates
-                pub_doc_ref.set({
+                await asyncio.to_thread(pub_doc_ref.set, {
                     "match_id": match_id,
                     "published_at": firestore.SERVER_TIMESTAMP,
                     "url": published_url,
                     "title": seo_title
                 })
-                published_count += 1
-                urls.append(published_url)
-            else:
-                logger.error(f"Blogger API failed for {seo_title}")
+                return "published" if outcome["status"] == "published" else "skipped", published_url
+            if outcome["status"] == "in_doubt":
+                return "skipped", None
+            logger.error(f"Blogger API failed for {seo_title}")
+            return None, None
+
+        # Post ALL valid matches of today individually (경기별 동시 처리)
+        outcomes = await asyncio.gather(*(post_match(match) for match in valid))
+        published_count = sum(1 for status, _ in outcomes if status == "published")
+        skipped_count = sum(1 for status, _ in outcomes if status == "skipped")
+        urls = [url for status, url in outcomes if status == "published"]
+        summary = run.finish()
 
         return {
             "status": "success",
             "total_matches": len(valid),
             "published": published_count,
             "skipped": skipped_count,
-            "urls": urls
+            "urls": urls,
+            "timings_ms": summary["timings_ms"],
+            "content_cache": summary["content_cache"],
         }
 
     except Exception as e:
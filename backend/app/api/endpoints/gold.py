@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from app.core.deps import require_current_user
 from app.models.user_db import get_user_by_id, update_user
 from app.db.firestore import get_firestore_db
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -80,6 +81,7 @@ async def charge_gold(
     transaction = db.transaction()
     try:
         new_gold = update_balance_in_transaction(transaction, user_ref, req.amount)
+        user_cache.invalidate(user_id)
         
         # 거래 로그 생성
         tx_ref = db.collection("gold_transactions").document()
@@ -282,6 +284,8 @@ async def unlock_tipster_post(
     transaction = db.transaction()
     try:
         new_balance = execute_unlock(transaction, user_ref, author_ref, post_ref, price, tipster_earning, user_id)
+        user_cache.invalidate(user_id)
+        user_cache.invalidate(author_id)
         
         # 거래 내역 추가
         tx_ref = db.collection("gold_transactions").document()
@@ -361,6 +365,8 @@ async def gift_tipster(
     transaction = db.transaction()
     try:
         new_balance = execute_gift(transaction, user_ref, tipster_ref, req.amount, tipster_earning)
+        user_cache.invalidate(user_id)
+        user_cache.invalidate(req.tipster_id)
         
         # 거래 로그
         tx_ref_user = db.collection("gold_transactions").document()
@@ -6,45 +6,29 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/leaderboard")
-async def get_leaderboard(limit: int = 50, sort_by: str = "total_roi"):
+async def get_leaderboard(limit: int = 50, sort_by: str = "total_roi", offset: int = 0):
     """
     Get the top users based on their prediction stats.
     sort_by can be 'total_roi', 'hit_rate', 'won'
+    Served from the in-memory leaderboard index (app/services/leaderboard.py).
     """
     try:
-        from app.models.user_db import get_all_users
-        users = await get_all_users(limit=1000)  # get a batch and sort in memory if not indexed, or just 1000
-        
-        valid_users = []
-        for u in users:
-            stats = u.get("stats")
-            if stats and stats.get("prediction_count", 0) > 0:
-                # Calculate dynamically just in case
-                total_decided = stats.get("won", 0) + stats.get("lost", 0) + stats.get("partial", 0)
-                hit_rate = round(stats.get("won", 0) / total_decided * 100, 2) if total_decided > 0 else 0.0
-                
-                valid_users.append({
-                    "id": u.get("id"),
-                    "email": u.get("email"),
-                    "nickname": u.get("nickname") or u.get("email", "").split("@")[0],
-                    "role": u.get("role", "free"),
-                    "prediction_count": stats.get("prediction_count", 0),
-                    "won": stats.get("won", 0),
-                    "lost": stats.get("lost", 0),
-                    "total_roi": stats.get("total_roi", 0.0),
-                    "hit_rate": hit_rate
-                })
-        
-        # Sort
-        if sort_by == "hit_rate":
-            valid_users.sort(key=lambda x: x["hit_rate"], reverse=True)
-        elif sort_by == "won":
-            valid_users.sort(key=lambda x: x["won"], reverse=True)
-        else:
-            valid_users.sort(key=lambda x: x["total_roi"], reverse=True)
-            
-        return {"users": valid_users[:limit]}
-        
+        from app.services.leaderboard import leaderboard_service
+        return await leaderboard_service.page("slips", sort_by, max(offset, 0), min(max(limit, 1), 200))
     except Exception as e:
         logger.error(f"Failed to fetch leaderboard: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch leaderboard")
+
+
+@router.get("/leaderboard/rank/{user_id}")
+async def get_user_rank(user_id: str, sort_by: str = "total_roi"):
+    """A single user's rank on the leaderboard ("my rank")."""
+    try:
+        from app.services.leaderboard import leaderboard_service
+        entry = await leaderboard_service.rank_of("slips", user_id, sort_by)
+    except Exception as e:
+        logger.error(f"Failed to fetch leaderboard rank: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch leaderboard")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="User is not ranked yet")
+    return entry
@@ -7,16 +7,66 @@ Marketing API — SNS 콘텐츠 자동 생성 및 Buffer 발행
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
+import asyncio
 import logging
+from functools import partial
 from datetime import datetime, timezone
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# 발행 이력 (메모리 캐시 — 프로덕션에서는 Firestore 전환 권장)
+# 발행 이력 (메모리 캐시 — 채널별 발행 원장은 publish_pipeline)
 _publish_history: list = []
 
 
+def _post_fingerprint(text: str, image_url: Optional[str] = None, scheduled_at: Optional[str] = None) -> str:
+    """동일 게시물 판별용 지문 (문구 + 이미지 + 예약 시각)."""
+    from app.services.publish_pipeline import fingerprint
+    return fingerprint("buffer_post", {"text": text, "image_url": image_url, "scheduled_at": scheduled_at})
+
+
+def _buffer_targets(channels: List[dict], text: str, image_url: Optional[str] = None,
+                    scheduled_at: Optional[str] = None) -> list:
+    from app.services.buffer_service import buffer_service
+    from app.services.publish_pipeline import PublishTarget
+    return [
+        PublishTarget("buffer", c["id"], partial(buffer_service.create_post, c["id"], text,
+                                                 c.get("service", ""), scheduled_at, image_url))
+        for c in channels
+    ]
+
+
+def _buffer_summary(outcomes: List[dict]) -> dict:
+    """파이프라인 채널별 결과 → 기존 publish_post 응답 형식 (+ 건너뛴 채널 수)."""
+    from app.services.buffer_service import summarize_posts
+    attempted = [
+        o.get("result") or {"success": False, "channel_id": o["channel"], "error": o.get("error")}
+        for o in outcomes if o["status"] in ("published", "failed")
+    ]
+    result = summarize_posts(attempted) if attempted else {"success": True, "published": 0, "posts": []}
+    result["skipped"] = sum(1 for o in outcomes if o["status"] in ("skipped", "in_doubt"))
+    return result
+
+
+async def _cached_card(run, match_pred: dict) -> Optional[str]:
+    """분석 카드 이미지 URL (같은 예측이면 이전에 올린 카드 재사용)."""
+    from app.services.card_generator import generate_card_and_upload
+    from app.services.publish_pipeline import prediction_inputs
+
+    async def generate():
+        url = await generate_card_and_upload(match_pred)
+        return {"image_url": url} if url else None
+
+    try:
+        card, _ = await run.content("sns_card", prediction_inputs([match_pred]), generate)
+        if card:
+            logger.info(f"Card image: {card['image_url']}")
+        return (card or {}).get("image_url")
+    except Exception as e:
+        logger.warning(f"Card generation skipped: {e}")
+        return None
+
+
 class PublishRequest(BaseModel):
     post_index: Optional[int] = None  # 특정 게시물만 발행 (0-based). None이면 전체.
     scheduled_at: Optional[str] = None  # ISO 8601 예약 발행 시간
@@ -92,10 +142,11 @@ async def publish_sns_content(req: PublishRequest = PublishRequest()):
     """
     Gemini로 생성한 SNS 콘텐츠를 Buffer를 통해 발행.
     post_index 지정 시 해당 게시물만, 미지정 시 전체 발행.
+    같은 예측 세트면 저장된 문구/카드를 재사용하고, 이미 같은 게시물이 올라간 채널은 건너뜀.
     """
     from app.services.buffer_service import buffer_service
-    from app.services.gemini_service import generate_sns_content
-    from app.api.endpoints.ai_predictions import _predictions_cache
+    from app.services.gemini_service import generate_sns_content, SNS_MARKETING_PROMPT
+    from app.services.publish_pipeline import publish_pipeline, prediction_inputs
 
     if not buffer_service.is_configured:
         raise HTTPException(status_code=503, detail="BUFFER_ACCESS_TOKEN not configured")
@@ -114,8 +165,12 @@ async def publish_sns_content(req: PublishRequest = PublishRequest()):
             raise HTTPException(status_code=404, detail="No predictions available for publishing")
             
         pred_dicts = [p.dict() if hasattr(p, "dict") else p for p in predictions]
-        from app.services.gemini_service import generate_sns_content
-        posts = await generate_sns_content(pred_dicts)
+        run = publish_pipeline.start("sns_publish")
+        # generate_sns_content 는 신뢰도 상위 5경기로 작성 → 지문도 같은 5경기 기준
+        top_picks = sorted(pred_dicts, key=lambda x: x.get("confidence", 0), reverse=True)[:5]
+        posts, _ = await run.content("sns_posts", prediction_inputs(top_picks),
+                                     lambda: generate_sns_content(pred_dicts), SNS_MARKETING_PROMPT)
+        posts = posts or []
 
         # 발행 대상 선택
         if req.post_index is not None:
@@ -125,32 +180,25 @@ async def publish_sns_content(req: PublishRequest = PublishRequest()):
         else:
             targets = posts
 
-        # Buffer 발행
-        results = []
-        for i, post in enumerate(targets):
-            # 이미지 카드 생성
+        channels = await buffer_service.active_channels()
+        if not channels:
+            raise HTTPException(status_code=503, detail="No active Buffer channels found")
+        preds_by_id = {p.get("match_id", ""): p for p in pred_dicts}
+
+        async def publish_one(post):
+            # 이미지 카드 생성 (원본 예측 데이터에서 해당 경기 매칭, 같은 예측이면 기존 카드 재사용)
             image_url = None
-            if req.with_image:
-                try:
-                    from app.services.card_generator import generate_card_and_upload
-                    # 원본 예측 데이터에서 해당 경기 매칭
-                    match_pred = None
-                    for p in pred_dicts:
-                        pid = p.get("match_id", "")
-                        if pid == post.get("match_id"):
-                            match_pred = p
-                            break
-                    if match_pred:
-                        image_url = await generate_card_and_upload(match_pred)
-                        logger.info(f"Card image generated: {image_url}")
-                except Exception as e:
-                    logger.warning(f"Card generation skipped: {e}")
-
-            result = await buffer_service.publish_post(
-                text=post["text"],
-                scheduled_at=req.scheduled_at,
-                image_url=image_url,
-            )
+            match_pred = preds_by_id.get(post.get("match_id"))
+            if req.with_image and match_pred:
+                image_url = await _cached_card(run, match_pred)
+            post_fp = _post_fingerprint(post["text"], image_url, req.scheduled_at)
+            outcomes = await run.publish(post_fp, _buffer_targets(channels, post["text"], image_url, req.scheduled_at))
+            return _buffer_summary(outcomes)
+
+        buffer_results = await asyncio.gather(*(publish_one(post) for post in targets))
+
+        results = []
+        for post, result in zip(targets, buffer_results):
             results.append({
                 "match_id": post["match_id"],
                 "confidence": post["confidence"],
@@ -164,13 +212,17 @@ async def publish_sns_content(req: PublishRequest = PublishRequest()):
                 "published_at": datetime.now(timezone.utc).isoformat(),
                 "success": result.get("success", False),
                 "channels": result.get("published", 0),
+                "skipped": result.get("skipped", 0),
             })
 
+        summary = run.finish()
         success_count = sum(1 for r in results if r["buffer_result"].get("success"))
         return {
             "published": success_count,
             "total": len(targets),
             "results": results,
+            "timings_ms": summary["timings_ms"],
+            "content_cache": summary["content_cache"],
         }
 
     except HTTPException:
@@ -216,15 +268,11 @@ class RotationPublishRequest(BaseModel):
 async def publish_rotation_post(req: RotationPublishRequest = RotationPublishRequest()):
     """
     시간대별/지정 타입별 SNS 로테이션 발행 실행.
+    로테이션 슬롯(KST 2시간 단위) 안에서 재실행하면 같은 문구를 재사용하고 이미 발행된 채널은 건너뜀.
     """
     from app.services.buffer_service import buffer_service
-    from app.services.gemini_service import (
-        generate_sns_content,
-        generate_winning_proof_sns,
-        generate_educational_sns,
-        generate_top_picks_sns,
-        generate_generic_promo
-    )
+    from app.services import gemini_service
+    from app.services.publish_pipeline import publish_pipeline, prediction_inputs
     from app.api.endpoints import ai_predictions as ai_pred_module
     from app.models.prediction_db import get_recent_ai_predictions
 
@@ -237,6 +285,8 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
         KST = timezone(timedelta(hours=9))
         now_kst = datetime.now(KST)
         hour = now_kst.hour
+        # 스케줄러 주기(2시간)와 같은 슬롯 — 슬롯 내 재실행은 같은 선택/문구
+        slot = f"{now_kst:%Y-%m-%d}T{hour // 2 * 2:02d}"
 
         post_type = req.post_type
         if not post_type:
@@ -254,12 +304,10 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
                 post_type = "preview"
 
         logger.info(f"📱 SNS Rotation triggering: type={post_type} (KST Hour: {hour})")
+        run = publish_pipeline.start(f"sns_rotation:{post_type}")
 
-        # 2. 타입별 실행 및 데이터 매핑
-        text = None
-        image_url = None
-        match_id = "rotation"
-        confidence = 0
+        # 2. 타입별 실행 및 데이터 매핑 (콘텐츠는 입력 지문 기준 캐시)
+        payload = None
 
         # 캐시된 경기 예측 로드
         if not ai_pred_module._predictions_cache:
@@ -271,34 +319,54 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
             # 상위 3개 고신뢰도 리스트
             high_conf = [p for p in pred_dicts if p.get("confidence", 0) >= 55]
             if high_conf:
-                text = await generate_top_picks_sns(high_conf)
-                match_id = "top_picks"
+                top_3 = sorted(high_conf, key=lambda x: x.get("confidence", 0), reverse=True)[:3]
+
+                async def generate():
+                    text = await gemini_service.generate_top_picks_sns(high_conf)
+                    return {"text": text, "match_id": "top_picks"} if text else None
+
+                payload, _ = await run.content("sns_top_picks", prediction_inputs(top_3), generate,
+                                               gemini_service.SNS_TOP_PICKS_PROMPT)
             else:
                 post_type = "educational"  # 경기가 없으면 교육글로 대체
 
         if post_type == "educational":
-            # 정보성/브랜드 빌딩 칼럼
-            text = await generate_educational_sns()
-            match_id = "educational"
+            # 정보성/브랜드 빌딩 칼럼 (주제 무작위 → 슬롯 단위로 고정)
+            async def generate():
+                text = await gemini_service.generate_educational_sns()
+                return {"text": text, "match_id": "educational"} if text else None
+
+            payload, _ = await run.content("sns_educational", {"slot": slot}, generate,
+                                           gemini_service.SNS_EDUCATIONAL_PROMPT)
 
         elif post_type == "winning":
             # 적중 인증형
             try:
                 hits = await get_recent_ai_predictions(limit=5, status="HIT")
                 if hits:
-                    text = await generate_winning_proof_sns(hits)
-                    # 가장 최근 적중된 경기의 카드 생성 시도
-                    if req.with_image:
-                        from app.services.card_generator import generate_card_and_upload
-                        # hits[0]를 card_generator 형식으로 변환/전달
-                        best_hit = hits[0]
-                        # factors가 없으면 기본으로 넣어줌
-                        if "factors" not in best_hit:
-                            best_hit["factors"] = [{"name": "AI 예측 적중", "score": best_hit.get("confidence", 80)}]
-                        image_url = await generate_card_and_upload(best_hit)
-                    match_id = f"hit_{hits[0].get('match_id', '')}"
-                    confidence = hits[0].get("confidence", 0)
-                else:
+                    async def generate():
+                        text = await gemini_service.generate_winning_proof_sns(hits)
+                        if not text:
+                            return None
+                        image_url = None
+                        # 가장 최근 적중된 경기의 카드 생성 시도
+                        if req.with_image:
+                            from app.services.card_generator import generate_card_and_upload
+                            # hits[0]를 card_generator 형식으로 변환/전달
+                            best_hit = hits[0]
+                            # factors가 없으면 기본으로 넣어줌
+                            if "factors" not in best_hit:
+                                best_hit["factors"] = [{"name": "AI 예측 적중", "score": best_hit.get("confidence", 80)}]
+                            image_url = await generate_card_and_upload(best_hit)
+                        return {"text": text, "image_url": image_url,
+                                "match_id": f"hit_{hits[0].get('match_id', '')}",
+                                "confidence": hits[0].get("confidence", 0)}
+
+                    hit_inputs = [{k: h.get(k) for k in ("match_id", "recommendation", "home_score", "away_score",
+                                                          "confidence")} for h in hits]
+                    payload, _ = await run.content("sns_winning", {"hits": hit_inputs, "with_image": req.with_image},
+                                                   generate, gemini_service.SNS_WINNING_PROOF_PROMPT)
+                if not payload:
                     post_type = "preview"  # 적중 이력이 없으면 경기 프리뷰로 대체
             except Exception as e:
                 logger.error(f"Winning proof rotation error: {e}")
@@ -310,33 +378,50 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
             if high_conf:
                 import random
                 high_conf = sorted(high_conf, key=lambda x: x.get("confidence", 0), reverse=True)[:20]
-                selected_pred = random.choice(high_conf)
-                
-                posts = await generate_sns_content([selected_pred])
-                if posts:
-                    text = posts[0]["text"]
-                    match_id = posts[0]["match_id"]
-                    confidence = posts[0]["confidence"]
-                    
+                # 슬롯 시드 — 크래시 후 재실행해도 같은 경기 선택
+                selected_pred = random.Random(slot).choice(high_conf)
+
+                async def generate():
+                    posts = await gemini_service.generate_sns_content([selected_pred])
+                    if not posts:
+                        return None
+                    image_url = None
                     if req.with_image:
                         from app.services.card_generator import generate_card_and_upload
                         image_url = await generate_card_and_upload(selected_pred)
+                    return {"text": posts[0]["text"], "image_url": image_url,
+                            "match_id": posts[0]["match_id"], "confidence": posts[0]["confidence"]}
+
+                payload, _ = await run.content("sns_preview", {"match": prediction_inputs([selected_pred]),
+                                                               "with_image": req.with_image},
+                                               generate, gemini_service.SNS_MARKETING_PROMPT)
             else:
                 post_type = "generic"
 
-        if post_type == "generic" or not text:
+        if post_type == "generic" or not payload:
             # 최종 폴백: 일반 홍보글
-            text = await generate_generic_promo()
-            match_id = "generic_promo"
+            async def generate():
+                text = await gemini_service.generate_generic_promo()
+                return {"text": text, "match_id": "generic_promo"} if text else None
 
-        # 3. Buffer 실제 발행
-        if not text:
+            payload, _ = await run.content("sns_generic", {"slot": slot}, generate,
+                                           gemini_service.SNS_GENERIC_MARKETING_PROMPT)
+
+        # 3. Buffer 실제 발행 (채널 동시, 이미 같은 게시물이 있는 채널은 건너뜀)
+        if not payload or not payload.get("text"):
             raise HTTPException(status_code=500, detail="Failed to generate SNS content")
 
-        result = await buffer_service.publish_post(
-            text=text,
-            image_url=image_url,
-        )
+        text = payload["text"]
+        image_url = payload.get("image_url")
+        match_id = payload.get("match_id", "rotation")
+        channels = await buffer_service.active_channels()
+        if channels:
+            outcomes = await run.publish(_post_fingerprint(text, image_url),
+                                         _buffer_targets(channels, text, image_url))
+            result = _buffer_summary(outcomes)
+        else:
+            result = {"success": False, "error": "No active Buffer channels found"}
+        summary = run.finish()
 
         # 이력 저장
         _publish_history.append({
@@ -345,6 +430,7 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
             "published_at": datetime.now(timezone.utc).isoformat(),
             "success": result.get("success", False),
             "channels": result.get("published", 0),
+            "skipped": result.get("skipped", 0),
             "rotation_type": post_type,
         })
 
@@ -354,8 +440,12 @@ async def publish_rotation_post(req: RotationPublishRequest = RotationPublishReq
             "text": text,
             "image_url": image_url,
             "buffer_result": result,
+            "timings_ms": summary["timings_ms"],
+            "content_cache": summary["content_cache"],
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"SNS rotation publish error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -370,3 +460,13 @@ async def get_publish_history():
         "history": _publish_history[-20:][::-1],
         "total": len(_publish_history),
     }
+
+
+@router.get("/pipeline")
+async def get_publish_pipeline_status():
+    """발행 파이프라인 최근 실행(단계별 소요시간·캐시 적중·채널 결과 집계)과 발행 원장"""
+    from app.services.publish_pipeline import publish_pipeline
+    return {
+        "runs": list(publish_pipeline.recent_runs)[::-1],
+        "ledger": await publish_pipeline.recent_ledger(20),
+    }
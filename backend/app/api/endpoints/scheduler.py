@@ -157,6 +157,14 @@ async def get_scheduler_status():
     except Exception:
         pass
 
+    # LLM gateway (Gemini 호출 풀 / 응답 캐시)
+    llm_status = None
+    try:
+        from app.services.gemini_service import llm_gateway
+        llm_status = llm_gateway.stats()
+    except Exception:
+        pass
+
     return {
         "pinnacle": {
             "api_key_configured": bool(pinnacle_service.api_key),
@@ -172,9 +180,41 @@ async def get_scheduler_status():
             "scheduled_last_run": last_scheduled_run,
         },
         "ml_engine": ml_status,
+        "llm_gateway": llm_status,
     }
 
 
+# ─── 주기 작업 lease / 실행 원장 ───
+
+@router.get("/jobs")
+async def get_jobs_status():
+    """주기 작업별 lease 보유 인스턴스, 펜싱 토큰, 마지막 실행, 소요시간 통계(p50/p95, 회귀 여부)."""
+    from app.services.job_scheduler import job_scheduler
+    return await job_scheduler.status()
+
+
+@router.get("/jobs/{name}/runs")
+async def get_job_runs(name: str, limit: int = 50):
+    """작업 실행 원장 (최신순) — 시작/종료/소요시간/결과/fenced."""
+    from app.services.job_scheduler import job_scheduler
+    if name not in job_scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {name}")
+    runs = await job_scheduler.history(name, min(max(limit, 1), 500))
+    return {"job": name, "runs": runs, "durations": job_scheduler.duration_stats(runs)}
+
+
+@router.post("/jobs/{name}/run")
+async def run_job_now(name: str):
+    """작업 수동 실행 — 다른 인스턴스가 lease 보유 중이면 실행하지 않음 (슬롯 완료 여부는 무시)."""
+    from app.services.job_scheduler import job_scheduler
+    if name not in job_scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {name}")
+    record = await job_scheduler.run_if_due(name, force=True)
+    if record is None:
+        return {"job": name, "started": False, "reason": "lease held by another instance"}
+    return {"job": name, "started": True, "run": record}
+
+
 # ─── Phase 3: Nightly Self-Learning Pipeline ───
 
 _nightly_last_run: Optional[str] = None
@@ -214,6 +254,13 @@ async def trigger_nightly_retrain(background_tasks: BackgroundTasks):
                 except Exception as e:
                     logger.warning(f"Model reload after retrain failed: {e}")
 
+            # 확률 보정 맵 증분 재적합 (오늘 정산분 반영)
+            try:
+                from app.core.calibration import probability_calibrator
+                result["calibration"] = await probability_calibrator.refit()
+            except Exception as e:
+                logger.warning(f"Calibration refit after retrain failed: {e}")
+
             # Generate VIP error note report via Gemini
             error_note = result.get("error_note")
             if error_note and error_note.get("big_misses"):
@@ -237,6 +284,13 @@ async def trigger_nightly_retrain(background_tasks: BackgroundTasks):
                 except Exception as e:
                     logger.warning(f"Error note report generation failed: {e}")
 
+            # Rebuild backtest insight cube with freshly graded predictions
+            try:
+                from app.services.backtest_engine import backtest_engine
+                await backtest_engine.refresh_cube()
+            except Exception as e:
+                logger.warning(f"Backtest cube refresh failed: {e}")
+
             logger.info(f"✅ Nightly pipeline complete: {result}")
         except Exception as e:
             logger.error(f"Nightly pipeline failed: {e}")
@@ -256,13 +310,20 @@ async def trigger_nightly_retrain(background_tasks: BackgroundTasks):
 async def get_ml_status():
     """Get ML model status and recent prediction accuracy."""
     from app.core.ml_predictor import ml_predictor
+    from app.core.model_store import model_registry
     from app.services import bigquery_service as bq_svc
 
-    accuracy = await bq_svc.get_prediction_accuracy(days=30)
+    accuracy, shadow_30d = await asyncio.gather(
+        bq_svc.get_prediction_accuracy(days=30),
+        bq_svc.get_shadow_comparison(days=30),
+    )
 
     return {
         "engine": "lightgbm" if ml_predictor.is_ml_ready else "fallback",
         "model_loaded": ml_predictor.is_ml_ready,
+        "model": ml_predictor.model_info(),
+        "registry": model_registry.stats(),
+        "shadow": dict(ml_predictor.shadow_status(), comparison_30d=shadow_30d),
         "feature_importance": ml_predictor.get_feature_importance(),
         "accuracy_30d": accuracy,
         "nightly_pipeline": {
@@ -274,62 +335,132 @@ async def get_ml_status():
 
 
 @router.post("/reload_model")
-async def reload_ml_model():
-    """Force reload the ML model from GCS/local storage."""
-    from app.core.ml_predictor import ml_predictor
-    success = ml_predictor.reload_model()
+async def reload_ml_model(version: Optional[str] = None):
+    """
+    manifest 의 current 버전이 로드된 버전과 다를 때만 교체 (같으면 "unchanged").
+    version 지정 시 레지스트리의 해당 버전을 current 로 지정 후 교체 (롤백).
+    """
+    from app.core.ml_predictor import ml_predictor, MODEL_NAME
+    from app.core.model_store import model_registry
+
+    before = ml_predictor.model_info()
+    if version:
+        try:
+            await asyncio.to_thread(model_registry.activate, MODEL_NAME, version)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+    success = await asyncio.to_thread(ml_predictor.reload_model)
+    after = ml_predictor.model_info()
+
+    previous_version = before["version"] if before else None
+    current_version = after["version"] if after else None
+    if not success:
+        status = "fallback"
+    elif previous_version == current_version:
+        status = "unchanged"
+    else:
+        status = "reloaded"
     return {
-        "status": "reloaded" if success else "fallback",
+        "status": status,
         "ml_ready": success,
+        "previous_version": previous_version,
+        "version": current_version,
+        "model": after,
+    }
+
+
+@router.post("/candidate_model")
+async def set_candidate_model(version: Optional[str] = None, canary_pct: float = 0.0):
+    """
+    섀도 평가 후보 지정 — 후보는 라이브 트래픽을 백그라운드로 채점하고 canary_pct% 경기는 직접 응답.
+    version 생략 시 후보 해제. 승격은 /reload_model?version=.
+    """
+    from app.core.ml_predictor import ml_predictor, MODEL_NAME
+    from app.core.model_store import model_registry
+
+    try:
+        manifest = await asyncio.to_thread(model_registry.set_candidate, MODEL_NAME, version, canary_pct)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+    await asyncio.to_thread(model_registry.refresh, MODEL_NAME)
+    return {
+        "candidate": manifest.get("candidate"),
+        "current": manifest.get("current"),
+        "shadow": ml_predictor.shadow_status(),
     }
 
 
+@router.get("/calibration")
+async def calibration_report(source: Optional[str] = None, league: Optional[str] = None):
+    """
+    확률 보정 리포트 — 소스(ai / ml)·리그별 보정 방법, 표본 수,
+    holdout reliability diagram 과 ECE / log-loss (보정 전 → 후).
+    """
+    from app.core.calibration import probability_calibrator, SOURCES
+
+    if source and source not in SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {SOURCES}")
+    return await asyncio.to_thread(probability_calibrator.report, source, league)
+
+
+@router.post("/calibration/refit")
+async def refit_calibration(source: Optional[str] = None):
+    """보정 맵 증분 재적합 (야간 파이프라인과 동일, 새 정산분이 있는 리그만)."""
+    from app.core.calibration import probability_calibrator, SOURCES
+
+    if source and source not in SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {SOURCES}")
+    return await probability_calibrator.refit([source] if source else SOURCES)
+
+
 # ─── Historical Data Backfill ───
 
-_backfill_running: bool = False
 _backfill_result: Optional[dict] = None
 
 
 @router.post("/backfill_historical")
-async def trigger_backfill(background_tasks: BackgroundTasks):
+async def trigger_backfill(background_tasks: BackgroundTasks, reset: bool = False):
     """
     과거 시즌 경기 결과 + 배당률을 BigQuery에 소급 수집.
-    API-Football 무료 100건/일 → 리그 수에 따라 여러 회 실행.
+    API-Football 무료 100건/일 → 완료된 (league, season, kind) 단위는 체크포인트로 기록되어
+    재실행 시 남은 단위만 이어서 수집. reset=true 면 체크포인트를 무시하고 처음부터.
     """
-    global _backfill_running, _backfill_result
+    global _backfill_result
+    from app.services.backfill import backfill_engine
 
-    if _backfill_running:
-        return {"status": "Already running", "last_result": _backfill_result}
+    if backfill_engine.is_running:
+        return {"status": "Already running", "progress": await backfill_engine.get_status()}
 
     async def run_backfill():
-        global _backfill_running, _backfill_result
-        _backfill_running = True
+        global _backfill_result
         try:
-            from app.services.backfill import backfill_engine
             result = await backfill_engine.run_full_backfill(
                 seasons=[2022, 2023, 2024],  # API-Football free tier: 2022-2024
                 leagues=None,  # all leagues
+                reset=reset,
             )
             _backfill_result = result
-            logger.info(f"✅ Backfill complete: {result.get('total_matches_collected', 0)} matches")
+            logger.info(f"✅ Backfill run finished: {result.get('total_matches_collected', 0)} matches, "
+                        f"{len(result.get('remaining_units', []))} units remaining")
         except Exception as e:
             logger.error(f"Backfill failed: {e}")
             _backfill_result = {"status": "error", "error": str(e)}
-        finally:
-            _backfill_running = False
 
     background_tasks.add_task(run_backfill)
     return {
         "status": "Backfill started (2022-2024 seasons, all leagues)",
-        "note": "API-Football free tier: 100 req/day. May need multiple runs.",
+        "note": "API-Football free tier: 100 req/day. Resumes from checkpoint on each run.",
     }
 
 
 @router.get("/backfill_status")
 async def get_backfill_status():
-    """Get current backfill status."""
+    """Get current backfill progress (units, ETA, daily budget) and last result."""
+    from app.services.backfill import backfill_engine
+    progress = await backfill_engine.get_status()
     return {
-        "running": _backfill_running,
+        "running": progress["running"],
+        "progress": progress,
         "last_result": _backfill_result,
     }
 
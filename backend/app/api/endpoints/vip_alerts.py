@@ -158,6 +158,7 @@ async def create_rules(
             rules_ref.document(rule_id).set(rule_data)
             created.append({**rule_data, "id": rule_id})
         
+        _rules_changed()
         return {"success": True, "created": created, "count": len(created)}
         
     except HTTPException:
@@ -194,6 +195,7 @@ async def update_rule(
         
         if update_data:
             rule_ref.update(update_data)
+            _rules_changed()
         
         return {"success": True, "rule_id": rule_id, "updated": update_data}
         
@@ -221,6 +223,7 @@ async def delete_rule(
             raise HTTPException(404, "규칙을 찾을 수 없습니다.")
         
         rule_ref.delete()
+        _rules_changed()
         return {"success": True, "deleted": rule_id}
         
     except HTTPException:
@@ -232,44 +235,35 @@ async def delete_rule(
 
 # ─── Internal: 규칙 매칭 함수 (notifications.py에서 호출) ───
 
+def _rules_changed():
+    """규칙 변경 → 이 인스턴스 색인 즉시 무효화 + 다른 인스턴스용 버전 증가"""
+    from app.services.alert_rule_engine import alert_rule_engine
+    alert_rule_engine.invalidate()
+    try:
+        alert_rule_engine.store.bump_version()
+    except Exception as e:
+        logger.warning(f"Alert rule version bump failed: {e}")
+
+
 async def check_user_alert_rules(match_data: dict) -> List[dict]:
     """
     밸류벳 발견 시 VIP 사용자들의 커스텀 규칙과 매칭.
     
     Returns: List of {user_id, rule, match_data} for matched rules
     """
+    return await check_slate_alert_rules([match_data])
+
+
+async def check_slate_alert_rules(matches: List[dict]) -> List[dict]:
+    """
+    경기 슬레이트 전체를 규칙 색인(app/services/alert_rule_engine.py)으로 한 번에 매칭.
+    트리거 카운터는 주기/크기 조건에 따라 일괄 반영.
+    """
     try:
-        from app.db.firestore import get_firestore_db
-        db = get_firestore_db()
-        
-        # 모든 VIP 사용자의 규칙 조회
-        alert_rules_ref = db.collection("alert_rules")
-        users = alert_rules_ref.stream()
-        
-        matched = []
-        for user_doc in users:
-            user_id = user_doc.id
-            rules_ref = alert_rules_ref.document(user_id).collection("rules")
-            rules = rules_ref.where("enabled", "==", True).stream()
-            
-            for rule_doc in rules:
-                rule = rule_doc.to_dict()
-                if _matches_rule(rule, match_data):
-                    matched.append({
-                        "user_id": user_id,
-                        "rule_id": rule_doc.id,
-                        "rule": rule,
-                        "match_data": match_data,
-                    })
-                    
-                    # 트리거 카운트 업데이트
-                    rule_doc.reference.update({
-                        "triggered_count": (rule.get("triggered_count", 0) + 1),
-                        "last_triggered": datetime.utcnow().isoformat(),
-                    })
-        
+        from app.services.alert_rule_engine import alert_rule_engine
+        matched = await alert_rule_engine.evaluate(matches)
+        await alert_rule_engine.flush()
         return matched
-        
     except Exception as e:
         logger.error(f"Alert rule matching error: {e}")
         return []
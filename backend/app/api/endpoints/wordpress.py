@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 import logging
 from datetime import datetime, timezone
-import re
 
-from app.services.gemini_service import generate_blogger_content
+from app.api.endpoints.blogger import to_slug
+from app.services.gemini_service import generate_blogger_content, BLOGGER_SEO_PROMPT
 from app.services.wordpress_service import wordpress_service
+from app.services.publish_pipeline import publish_pipeline, PublishTarget
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -59,38 +60,40 @@ async def trigger_daily_wordpress_post():
         else:
             date_param = match_time
 
-        def to_slug(name: str) -> str:
-            if not name:
-                return "unknown"
-            name = re.sub(r'[^a-zA-Z0-9가-힣\s-]', '', name)
-            name = re.sub(r'[\s]+', '-', name)
-            return name.lower()
-
         t_home = top_match.get("team_home_ko") or top_match.get("team_home")
         t_away = top_match.get("team_away_ko") or top_match.get("team_away")
         slug = f"{to_slug(t_home)}-vs-{to_slug(t_away)}"
         
         url_path = f"{date_param}/{slug}"
         
-        # Generate SEO HTML via Gemini
+        # Generate SEO HTML via Gemini (Blogger 와 같은 경기면 저장된 글 재사용)
         logger.info(f"Generating WordPress content for match: {slug}")
-        content_res = await generate_blogger_content(top_match, url_path)
+        run = publish_pipeline.start("wordpress")
+        content_res, content_fp = await run.content(
+            "blog_html", {"match": top_match, "url_path": url_path},
+            lambda: generate_blogger_content(top_match, url_path), BLOGGER_SEO_PROMPT)
         
         if not content_res:
             logger.error("Failed to generate HTML content from Gemini")
             return {"status": "error", "message": "Failed to generate Gemini content"}
             
-        # Post to WordPress
+        # Post to WordPress (발행 원장: 같은 글이 이미 올라갔으면 건너뜀)
         logger.info("Publishing to WordPress...")
-        res = await wordpress_service.publish_post(
+        target = PublishTarget("wordpress", wordpress_service.wp_url, lambda: wordpress_service.publish_post(
             title=content_res["title"],
             content=content_res["html"],
             status="publish"  # Dynamically posts as a live published post
-        )
+        ))
+        outcome = (await run.publish(content_fp, [target]))[0]
+        summary = run.finish()
+        res = outcome.get("result")
         
-        if res:
+        if outcome["status"] == "published":
             logger.info(f"Successfully posted to WordPress. Link: {res.get('link')}")
-            return {"status": "success", "link": res.get("link")}
+            return {"status": "success", "link": res.get("link"), "timings_ms": summary["timings_ms"]}
+        elif outcome["status"] in ("skipped", "in_doubt"):
+            logger.info("WordPress post already published for this content. Skipping to prevent duplicate.")
+            return {"status": "skipped", "link": (res or {}).get("link"), "timings_ms": summary["timings_ms"]}
         else:
             logger.error("WordPress REST API posting failed.")
             return {"status": "error", "message": "WordPress API call failed"}
@@ -6,6 +6,7 @@ import logging
 from typing import List, Dict, Optional, Tuple
 from app.schemas.predictions import MatchPrediction, TeamStats
 from app.schemas.odds import OddsItem
+from app.core.calibration import probability_calibrator
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +69,9 @@ class AIPredictor:
         "soccer_egypt_premier_league": 1.22,
     }
 
-    def __init__(self):
+    def __init__(self, calibrate: bool = True):
+        # calibrate=False: 보정 맵 미적용 (워크포워드 재생 — 미래 정산분으로 적합된 맵 누수 방지)
+        self.calibrate = calibrate
         self._standings_cache: Dict[str, List[TeamStats]] = {}
         self._injuries_cache: Dict[str, List] = {}
         self._predictions_cache: List[Dict] = []
@@ -486,6 +489,13 @@ class AIPredictor:
         draw_prob = (draw_score / total) * 100
         away_prob = (away_score / total) * 100
 
+        # 리그별 확률 보정 (정산 이력으로 적합된 맵, 없으면 그대로)
+        raw_probs = [round(home_prob, 2), round(draw_prob, 2), round(away_prob, 2)]
+        if self.calibrate:
+            home_prob, draw_prob, away_prob = probability_calibrator.apply_one(
+                "ai", league, (home_prob, draw_prob, away_prob), percent=True
+            )
+
         # Determine recommendation
         if home_prob > away_prob and home_prob > draw_prob:
             recommendation = "HOME"
@@ -536,6 +546,7 @@ class AIPredictor:
             home_win_prob=round(home_prob, 1),
             draw_prob=round(draw_prob, 1),
             away_win_prob=round(away_prob, 1),
+            raw_probs=raw_probs,
             factors=factors,
             home_rank=f_rank.get("home_rank", 0),
             away_rank=f_rank.get("away_rank", 0),
@@ -0,0 +1,474 @@
+"""
+Probability Calibration — 리그별 확률 보정 (AIPredictor / MLInferenceService 휴리스틱 / MLPredictor 출력).
+
+두 가중합/softmax 엔진과 LightGBM 출력은 보정되지 않은 확률이고, 이 값이 value_picks / 조합기의
+Kelly 배분으로 바로 들어감 → 정산된 예측으로 리그별 보정 맵을 적합해 추론 시 적용.
+
+- 소스: "ai" = Firestore ai_prediction_history (AIPredictor·휴리스틱 엔진 출력),
+        "ml" = BigQuery predictions_log (MLPredictor 출력, 리그는 matches_raw 조인)
+  보정 전 확률(raw_probs)로 적합 — 이미 보정된 값으로 다시 적합하지 않도록
+- 리그별 맵: 표본이 ISOTONIC_MIN 이상이면 isotonic(클래스별 GRID 점 조회표) / temperature 후보,
+  TEMPERATURE_MIN 이상이면 temperature 후보만 → 시간순 뒤 HOLDOUT 구간 log-loss 가 가장 낮은 쪽
+  (보정 안 함 포함) 선택 후 전체 표본으로 재적합. 표본이 적은 리그는 소스 전체(__all__) 맵 사용
+- 맵은 model_store 레지스트리("prob_calibration")에 버전 저장 → 인스턴스 간 공유 / manifest 핫스왑
+- 적용: (n, 3) 확률 행렬을 리그별로 묶어 맵 1개당 벡터 연산 1회
+- 야간 재적합은 증분: 워터마크 이후 정산분만 가져와 표본(data/calibration, GCS 미러)에 추가,
+  새 표본이 생긴 리그 + __all__ 만 재적합
+- 리포트: 리그별 holdout reliability diagram(RELIABILITY_BINS 구간) + ECE (보정 전/후)
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.shadow_eval import OUTPUT_LABELS
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_NAME = "prob_calibration"
+SOURCES = ("ai", "ml")
+POOLED = "__all__"
+GRID = 51                      # isotonic 조회표 점 수 (0.00, 0.02, … 1.00)
+ISOTONIC_MIN = 300
+TEMPERATURE_MIN = 50
+MAX_ROWS_PER_LEAGUE = 3000     # 리그별 최근 표본만 유지 (모델/시즌 변화 추종)
+POOLED_MAX_ROWS = 20000
+HOLDOUT = 0.2
+RELIABILITY_BINS = 10
+FETCH_LIMIT = 20000
+EPS = 1e-6
+GCS_PREFIX = "calibration/"
+
+_DEFAULT_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "calibration"
+)
+_T_GRID = np.exp(np.linspace(np.log(0.25), np.log(4.0), 121))
+
+
+# ─── 맵 적합 / 적용 (순수 numpy) ───
+
+def _normalize(probs: np.ndarray) -> np.ndarray:
+    probs = np.clip(np.asarray(probs, dtype=np.float64), EPS, None)
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def log_loss(probs: np.ndarray, y: np.ndarray) -> float:
+    return float(-np.log(_normalize(probs)[np.arange(len(y)), y]).mean())
+
+
+def fit_temperature(probs: np.ndarray, y: np.ndarray) -> float:
+    """softmax(log p / T) 의 NLL 최소 T — 로그 간격 격자 전체를 한 번에 평가."""
+    logp = np.log(_normalize(probs))
+    scaled = logp[None, :, :] / _T_GRID[:, None, None]
+    scaled -= scaled.max(axis=2, keepdims=True)
+    nll = np.log(np.exp(scaled).sum(axis=2)) - scaled[:, np.arange(len(y)), y]
+    return float(_T_GRID[int(nll.mean(axis=1).argmin())])
+
+
+def fit_isotonic(probs: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """클래스별 one-vs-rest isotonic → (3, GRID) 조회표."""
+    from sklearn.isotonic import IsotonicRegression
+
+    grid = np.linspace(0.0, 1.0, GRID)
+    table = np.empty((len(OUTPUT_LABELS), GRID), dtype=np.float32)
+    for c in range(len(OUTPUT_LABELS)):
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        iso.fit(probs[:, c], (y == c).astype(np.float64))
+        table[c] = iso.predict(grid)
+    return table
+
+
+def apply_map(entry: Dict, probs: np.ndarray) -> np.ndarray:
+    """(n, 3) [HOME, DRAW, AWAY] 확률(합 1)에 맵 1개 적용."""
+    method = entry.get("method")
+    if method == "temperature":
+        scaled = np.log(_normalize(probs)) / entry["t"]
+        scaled -= scaled.max(axis=1, keepdims=True)
+        return _normalize(np.exp(scaled))
+    if method == "isotonic":
+        table = np.asarray(entry["table"], dtype=np.float64)
+        pos = np.clip(probs, 0.0, 1.0) * (GRID - 1)
+        lo = np.minimum(pos.astype(np.int64), GRID - 2)
+        frac = pos - lo
+        cols = np.arange(table.shape[0])[None, :]
+        return _normalize(table[cols, lo] * (1 - frac) + table[cols, lo + 1] * frac)
+    return probs
+
+
+def reliability(probs: np.ndarray, y: np.ndarray, bins: int = RELIABILITY_BINS) -> Tuple[float, List[Dict]]:
+    """최고 확률(top-label) 기준 reliability diagram + ECE."""
+    conf = probs.max(axis=1)
+    correct = (probs.argmax(axis=1) == y).astype(np.float64)
+    idx = np.minimum((conf * bins).astype(np.int64), bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    conf_sum = np.bincount(idx, weights=conf, minlength=bins)
+    acc_sum = np.bincount(idx, weights=correct, minlength=bins)
+    nonzero = counts > 0
+    gaps = np.abs(acc_sum[nonzero] - conf_sum[nonzero])
+    ece = float(gaps.sum() / max(1, len(y)))
+    diagram = [
+        {
+            "bin": [round(b / bins, 2), round((b + 1) / bins, 2)],
+            "count": int(counts[b]),
+            "confidence": round(float(conf_sum[b] / counts[b]), 4),
+            "accuracy": round(float(acc_sum[b] / counts[b]), 4),
+        }
+        for b in range(bins) if counts[b]
+    ]
+    return round(ece, 4), diagram
+
+
+def _fit(method: str, probs: np.ndarray, y: np.ndarray) -> Dict:
+    if method == "isotonic":
+        return {"method": "isotonic", "table": fit_isotonic(probs, y)}
+    if method == "temperature":
+        return {"method": "temperature", "t": round(fit_temperature(probs, y), 4)}
+    return {"method": "identity"}
+
+
+def fit_league(probs: np.ndarray, y: np.ndarray) -> Optional[Dict]:
+    """
+    시간순 표본 1개 리그 → 보정 맵 (표본 부족이면 None).
+    뒤 HOLDOUT 구간으로 방법 선택·지표 산출, 맵 자체는 전체 표본으로 적합.
+    """
+    n = len(y)
+    if n < TEMPERATURE_MIN:
+        return None
+    candidates = ["temperature"] + (["isotonic"] if n >= ISOTONIC_MIN else [])
+    split = int(n * (1 - HOLDOUT))
+    train_p, train_y, test_p, test_y = probs[:split], y[:split], probs[split:], y[split:]
+
+    scored = []
+    for method in ["identity"] + candidates:
+        calibrated = apply_map(_fit(method, train_p, train_y), test_p)
+        scored.append((log_loss(calibrated, test_y), method, calibrated))
+    best_loss, method, best_p = min(scored, key=lambda s: s[0])
+    raw_loss = scored[0][0]
+
+    ece_before, diagram_before = reliability(_normalize(test_p), test_y)
+    ece_after, diagram_after = reliability(best_p, test_y)
+    entry = _fit(method, probs, y)
+    entry.update({
+        "n": int(n),
+        "fitted_at": datetime.now(timezone.utc).isoformat(),
+        "holdout": {
+            "n": int(len(test_y)),
+            "log_loss_before": round(raw_loss, 4),
+            "log_loss_after": round(best_loss, 4),
+            "ece_before": ece_before,
+            "ece_after": ece_after,
+            "reliability_before": diagram_before,
+            "reliability_after": diagram_after,
+        },
+    })
+    return entry
+
+
+# ─── 정산 표본 수집 ───
+
+def _label_index(label: str) -> int:
+    return OUTPUT_LABELS.index(label) if label in OUTPUT_LABELS else -1
+
+
+async def fetch_ai_samples(since: Optional[str]) -> List[Dict]:
+    """ai_prediction_history 채점 완료분 (graded_at > since)."""
+    from app.db.firestore import get_firestore_db
+    from app.models.prediction_db import AI_HISTORY_COLLECTION
+
+    cutoff = datetime.fromisoformat(since) if since else datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+    def read():
+        docs = (
+            get_firestore_db().collection(AI_HISTORY_COLLECTION)
+            .where("graded_at", ">", cutoff)
+            .order_by("graded_at")
+            .limit(FETCH_LIMIT)
+            .stream()
+        )
+        rows = []
+        for doc in docs:
+            data = doc.to_dict()
+            raw = data.get("raw_probs") or [data.get("home_win_prob", 0), data.get("draw_prob", 0),
+                                            data.get("away_win_prob", 0)]
+            graded_at = data.get("graded_at")
+            if graded_at is not None and graded_at.tzinfo is None:
+                graded_at = graded_at.replace(tzinfo=timezone.utc)
+            rows.append({
+                "key": data.get("match_id") or doc.id,
+                "league": data.get("league") or "",
+                "probs": [float(p or 0) / 100 for p in raw],
+                "label": data.get("actual_result"),
+                "at": graded_at.isoformat() if graded_at else None,
+            })
+        return rows
+
+    return await asyncio.to_thread(read)
+
+
+async def fetch_ml_samples(since: Optional[str]) -> List[Dict]:
+    """predictions_log 정산분 (settled_at > since), 리그는 matches_raw 에서."""
+    from app.services import bigquery_service as bq
+
+    since_sql = since or "2000-01-01T00:00:00+00:00"
+    sql = f"""
+    SELECT p.match_id, m.league, p.pred_home, p.pred_draw, p.pred_away, p.actual_result,
+           FORMAT_TIMESTAMP('%Y-%m-%dT%H:%M:%E6S+00:00', p.settled_at) AS settled_at
+    FROM `{bq.PROJECT_ID}.{bq.DATASET_ID}.predictions_log` p
+    LEFT JOIN (
+      SELECT match_id, ANY_VALUE(league) AS league
+      FROM `{bq.PROJECT_ID}.{bq.DATASET_ID}.matches_raw`
+      GROUP BY match_id
+    ) m USING (match_id)
+    WHERE p.actual_result IS NOT NULL
+      AND p.settled_at > TIMESTAMP('{since_sql}')
+    ORDER BY p.settled_at
+    LIMIT {FETCH_LIMIT}
+    """
+    return [
+        {
+            "key": row["match_id"],
+            "league": row.get("league") or "",
+            "probs": [float(row.get("pred_home") or 0), float(row.get("pred_draw") or 0),
+                      float(row.get("pred_away") or 0)],
+            "label": row.get("actual_result"),
+            "at": row.get("settled_at"),
+        }
+        for row in await bq.query(sql)
+    ]
+
+
+FETCHERS = {"ai": fetch_ai_samples, "ml": fetch_ml_samples}
+
+
+# ─── 보정기 ───
+
+class ProbabilityCalibrator:
+    def __init__(self, root: str = _DEFAULT_ROOT, registry=None, mirror: bool = True, fetchers=None):
+        self.root = root
+        self.mirror = mirror
+        self.fetchers = fetchers or FETCHERS
+        self._registry = registry
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from app.core.model_store import model_registry
+            self._registry = model_registry
+        return self._registry
+
+    def maps(self, wait: bool = False) -> Dict:
+        """
+        현재 보정 맵 {"sources": {source: {league: entry}}} (없으면 빈 dict).
+        기본은 비차단 — 아직 로드 전이면 빈 dict(보정 없음)를 돌려주고 로드는 백그라운드에서.
+        wait=True 는 필요하면 동기 로드 (스레드에서 호출하는 보고서용).
+        """
+        try:
+            handle = self.registry.current(REGISTRY_NAME) if wait else self.registry.peek(REGISTRY_NAME)
+        except Exception as e:
+            logger.warning(f"Calibration maps unavailable: {e}")
+            return {}
+        return handle.model if handle else {}
+
+    async def load(self):
+        """시작 시 보정 맵 미리 로드 (manifest / blob 다운로드는 스레드에서)."""
+        await asyncio.to_thread(self.maps, True)
+
+    def apply(self, source: str, leagues: Sequence[str], probs: np.ndarray, percent: bool = False) -> np.ndarray:
+        """
+        (n, 3) [HOME, DRAW, AWAY] 확률 → 같은 스케일(percent 면 0~100)의 보정 확률.
+        맵이 없는 리그는 __all__ 맵, 그것도 없으면(또는 맵이 아직 로드 전이면) 그대로.
+        """
+        probs = np.asarray(probs, dtype=np.float64)
+        tables = self.maps().get("sources", {}).get(source)
+        if not tables or not len(probs):
+            return probs
+        scale = 100.0 if percent else 1.0
+        out = _normalize(probs / scale)
+        leagues = np.asarray(leagues, dtype=object)
+        for league in set(leagues.tolist()):
+            entry = tables.get(league) or tables.get(POOLED)
+            if entry:
+                mask = leagues == league
+                out[mask] = apply_map(entry, out[mask])
+        return out * scale
+
+    def apply_one(self, source: str, league: str, probs: Sequence[float], percent: bool = False) -> Tuple[float, ...]:
+        return tuple(float(p) for p in self.apply(source, [league], np.array([probs]), percent=percent)[0])
+
+    # ── 표본 저장소 ──
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _state(self) -> Dict:
+        path = self._path("state.json")
+        if not os.path.exists(path):
+            self._download("state.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: Dict):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self._path("state.json"))
+        self._upload("state.json")
+
+    def load_samples(self, source: str) -> Dict[str, np.ndarray]:
+        name = f"{source}.npz"
+        if not os.path.exists(self._path(name)):
+            self._download(name)
+        try:
+            with np.load(self._path(name), allow_pickle=False) as data:
+                return {k: data[k] for k in ("probs", "y", "leagues", "keys")}
+        except (OSError, ValueError, KeyError):
+            return {"probs": np.empty((0, 3), dtype=np.float32), "y": np.empty(0, dtype=np.int8),
+                    "leagues": np.empty(0, dtype=str), "keys": np.empty(0, dtype=str)}
+
+    def _save_samples(self, source: str, samples: Dict[str, np.ndarray]):
+        os.makedirs(self.root, exist_ok=True)
+        name = f"{source}.npz"
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".npz")
+        os.close(fd)
+        np.savez_compressed(tmp, **samples)
+        os.replace(tmp, self._path(name))
+        self._upload(name)
+
+    def _bucket(self):
+        if not self.mirror:
+            return None
+        try:
+            from app.core.model_store import _get_storage_client, _ensure_bucket
+            return _ensure_bucket() if _get_storage_client() else None
+        except Exception:
+            return None
+
+    def _upload(self, name: str):
+        bucket = self._bucket()
+        if bucket is None:
+            return
+        try:
+            bucket.blob(f"{GCS_PREFIX}{name}").upload_from_filename(self._path(name))
+        except Exception as e:
+            logger.warning(f"[Calibration] GCS upload failed ({name}): {e}")
+
+    def _download(self, name: str):
+        bucket = self._bucket()
+        if bucket is None:
+            return
+        try:
+            blob = bucket.blob(f"{GCS_PREFIX}{name}")
+            if blob.exists():
+                os.makedirs(self.root, exist_ok=True)
+                blob.download_to_filename(self._path(name))
+        except Exception as e:
+            logger.warning(f"[Calibration] GCS download failed ({name}): {e}")
+
+    # ── 야간 재적합 ──
+
+    @staticmethod
+    def _append(samples: Dict[str, np.ndarray], rows: List[Dict]) -> Tuple[Dict[str, np.ndarray], set]:
+        """새 정산 행 추가 (이미 있는 key / 라벨 없는 행 무시) → (표본, 새 행이 생긴 리그)."""
+        known = set(samples["keys"].tolist())
+        fresh = []
+        for row in rows:
+            label = _label_index(row.get("label"))
+            if label < 0 or row["key"] in known or sum(row["probs"]) <= 0:
+                continue
+            known.add(row["key"])
+            fresh.append((row, label))
+        if not fresh:
+            return samples, set()
+        merged = {
+            "probs": np.concatenate([samples["probs"], np.array([r["probs"] for r, _ in fresh], dtype=np.float32)]),
+            "y": np.concatenate([samples["y"], np.array([label for _, label in fresh], dtype=np.int8)]),
+            "leagues": np.concatenate([samples["leagues"].astype(object),
+                                       np.array([r["league"] for r, _ in fresh], dtype=object)]).astype(str),
+            "keys": np.concatenate([samples["keys"].astype(object),
+                                    np.array([str(r["key"]) for r, _ in fresh], dtype=object)]).astype(str),
+        }
+        # 리그별 최근 MAX_ROWS_PER_LEAGUE 행만 유지 (추가 순서 = 시간순)
+        keep = np.ones(len(merged["y"]), dtype=bool)
+        for league in np.unique(merged["leagues"]):
+            idx = np.flatnonzero(merged["leagues"] == league)
+            keep[idx[:-MAX_ROWS_PER_LEAGUE]] = False
+        merged = {k: v[keep] for k, v in merged.items()}
+        return merged, {r["league"] for r, _ in fresh}
+
+    async def refit(self, sources: Sequence[str] = SOURCES) -> Dict:
+        """증분 재적합 — 워터마크 이후 정산분만 수집, 새 표본이 생긴 리그 + __all__ 만 다시 적합."""
+        state = await asyncio.to_thread(self._state)
+        current = self.maps()
+        maps = {"sources": {s: dict(t) for s, t in current.get("sources", {}).items()}}
+        summary: Dict[str, Dict] = {}
+        changed = False
+
+        for source in sources:
+            since = state.get(source, {}).get("watermark")
+            try:
+                rows = await self.fetchers[source](since)
+            except Exception as e:
+                logger.warning(f"[Calibration] {source} sample fetch failed: {e}")
+                summary[source] = {"error": str(e)}
+                continue
+            samples = await asyncio.to_thread(self.load_samples, source)
+            samples, touched = self._append(samples, rows)
+            stamps = [r["at"] for r in rows if r.get("at")]
+            if stamps:
+                state[source] = {"watermark": max(stamps)}
+
+            tables = maps["sources"].setdefault(source, {})
+            refit = sorted(touched) + ([POOLED] if touched or POOLED not in tables else [])
+            probs = _normalize(samples["probs"])
+            for league in refit:
+                if league == POOLED:
+                    idx = np.arange(len(samples["y"]))[-POOLED_MAX_ROWS:]
+                else:
+                    idx = np.flatnonzero(samples["leagues"] == league)
+                entry = await asyncio.to_thread(fit_league, probs[idx], samples["y"][idx])
+                if entry:
+                    tables[league] = entry
+                else:
+                    tables.pop(league, None)
+            if touched:
+                await asyncio.to_thread(self._save_samples, source, samples)
+            changed = changed or any(league in tables for league in refit)
+            summary[source] = {
+                "fetched_rows": len(rows),
+                "total_rows": int(len(samples["y"])),
+                "refit_leagues": [league for league in refit if league in tables],
+            }
+
+        await asyncio.to_thread(self._write_state, state)
+        if changed:
+            maps["fitted_at"] = datetime.now(timezone.utc).isoformat()
+            await asyncio.to_thread(self.registry.publish, maps, REGISTRY_NAME, None, "current")
+            await asyncio.to_thread(self.registry.refresh, REGISTRY_NAME)
+        logger.info(f"📐 Calibration refit: {summary}")
+        return summary
+
+    def report(self, source: Optional[str] = None, league: Optional[str] = None) -> Dict:
+        """리그별 방법 / 표본 수 / holdout ECE·log-loss / reliability diagram."""
+        maps = self.maps(wait=True)
+        out = {}
+        for src, tables in maps.get("sources", {}).items():
+            if source and src != source:
+                continue
+            out[src] = {
+                lg: {k: v for k, v in entry.items() if k != "table"}
+                for lg, entry in sorted(tables.items())
+                if not league or lg == league
+            }
+        return {"fitted_at": maps.get("fitted_at"), "sources": out}
+
+
+probability_calibrator = ProbabilityCalibrator()
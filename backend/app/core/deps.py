@@ -1,7 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from app.core.security import SECRET_KEY, ALGORITHM
+from jose import JWTError
+from app.core.user_cache import user_cache, get_user_from_token
 from typing import Optional
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login/access-token", auto_error=False)
@@ -17,7 +17,7 @@ async def get_current_user(token: Optional[str] = Depends(oauth2_scheme)) -> Opt
         return None
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = user_cache.decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -44,7 +44,7 @@ async def require_current_user(token: str = Depends(oauth2_scheme)) -> str:
         )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = user_cache.decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -59,14 +59,13 @@ async def require_current_user(token: str = Depends(oauth2_scheme)) -> str:
         )
 
 
-async def require_admin(user_id: str = Depends(require_current_user)) -> str:
+async def require_admin(token: str = Depends(oauth2_scheme)) -> str:
     """
-    Admin Guard — JWT에서 user_id 추출 후 Firestore에서 role 확인.
+    Admin Guard — JWT에서 user_id 추출 후 Firestore에서 role 확인 (유저 캐시 경유).
     role이 'admin'이 아니면 403 Forbidden.
     """
-    from app.models.user_db import get_user_by_id
-
-    user = await get_user_by_id(user_id)
+    user_id = await require_current_user(token)
+    user = await get_user_from_token(token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
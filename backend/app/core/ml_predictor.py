@@ -2,20 +2,56 @@
 ML Predictor — LightGBM 기반 승률 예측 엔진.
 기존 ai_predictor.py의 6-Factor 수동 가중치 → ML 자동 학습 가중치로 교체.
 Fallback: ML 모델 미로드 시 기존 AIPredictor 사용.
+
+섀도 / 카나리 (model_store manifest 의 candidate 가 있을 때):
+  - 배치 특성 행렬 1개를 현재 모델이 요청 경로에서 채점, 후보는 shadow_eval 백그라운드 워커가 같은 행렬을 채점
+  - canary_pct% 경기(match_id 해시 고정)는 후보가 요청 경로에서 채점해 응답
+  - 버전별 지연 / log-loss / Brier 는 shadow_evaluator, 비교 로그는 BigQuery shadow_predictions
+
+응답 확률은 리그별 보정 맵("ml", app.core.calibration) 적용 후 값, predictions_log 에는 보정 전 모델 확률을 적재
+(보정 맵 재적합 / 모델 log-loss 가 보정에 오염되지 않도록).
 """
+import asyncio
 import logging
+import time
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from app.services.feature_store import extract_features_with_odds, get_feature_names
-from app.core.model_store import load_model, save_model
+from app.services.feature_matrix import LABELS
+from app.core.model_store import model_registry
+from app.core.calibration import probability_calibrator
+from app.core.shadow_eval import OUTPUT_LABELS, canary_bucket, shadow_evaluator
 from app.services import bigquery_service as bq
 
 logger = logging.getLogger(__name__)
 
-# Current model version
-MODEL_VERSION = "v1"
+# 모델 레지스트리 이름 — 버전은 manifest 의 current 를 따름
+MODEL_NAME = "lightgbm_predictor"
+FEATURIZE_CONCURRENCY = 8
+
+
+def class_probs(model, X: np.ndarray, **params) -> np.ndarray:
+    """
+    (n, 3) [HOME, DRAW, AWAY] 확률.
+    학습 라벨은 feature_matrix.LABELS 순서 (AWAY=0, DRAW=1, HOME=2) — Booster.predict 열 순서와 동일.
+    sklearn 래퍼(predict_proba / classes_)도 지원.
+    """
+    if hasattr(model, "predict_proba"):
+        raw = np.asarray(model.predict_proba(X))
+        classes = [LABELS[c] if isinstance(c, (int, np.integer)) else str(c) for c in model.classes_]
+    else:
+        raw = np.asarray(model.predict(X, **params))
+        classes = list(LABELS)
+    return raw[:, [classes.index(label) for label in OUTPUT_LABELS]]
+
+
+def feature_importances(model) -> np.ndarray:
+    try:
+        return np.asarray(model.feature_importance())
+    except AttributeError:
+        return np.asarray(model.feature_importances_)
 
 
 class MLPredictor:
@@ -25,18 +61,16 @@ class MLPredictor:
     """
 
     def __init__(self):
-        self._model = None
-        self._model_loaded = False
         self._fallback_predictor = None
+        self.shadow = shadow_evaluator
         self._load_model()
 
     def _load_model(self):
-        """Load the latest trained model."""
+        """Load the current model version (shared registry instance)."""
         try:
-            self._model = load_model("lightgbm_predictor")
-            if self._model is not None:
-                self._model_loaded = True
-                logger.info("✅ ML model loaded successfully")
+            handle = model_registry.current(MODEL_NAME)
+            if handle is not None:
+                logger.info(f"✅ ML model loaded successfully ({handle.version})")
             else:
                 logger.warning("No trained ML model found, will use fallback")
                 self._init_fallback()
@@ -44,6 +78,16 @@ class MLPredictor:
             logger.warning(f"ML model load failed: {e}, using fallback")
             self._init_fallback()
 
+    @property
+    def _handle(self):
+        """현재 버전 핸들 — 예측 1건은 시작 시 잡은 핸들로 끝까지 수행 (도중 교체 영향 없음)."""
+        return model_registry.current(MODEL_NAME)
+
+    @property
+    def _model(self):
+        handle = self._handle
+        return handle.model if handle else None
+
     def _init_fallback(self):
         """Initialize legacy AIPredictor as fallback."""
         try:
@@ -56,7 +100,21 @@ class MLPredictor:
     @property
     def is_ml_ready(self) -> bool:
         """Check if ML model is loaded and ready."""
-        return self._model_loaded and self._model is not None
+        return self._model is not None
+
+    def model_info(self) -> Optional[Dict]:
+        """로드된 버전 / 체크섬 / 로드 시간 / 메모리."""
+        handle = self._handle
+        return handle.info() if handle else None
+
+    def shadow_status(self) -> Dict:
+        """후보 모델 / 카나리 비율 + 버전별 온라인 지표 (ml_status 용)."""
+        candidate, canary_pct = model_registry.candidate(MODEL_NAME)
+        return {
+            "candidate": candidate.info() if candidate else None,
+            "canary_pct": canary_pct,
+            **self.shadow.stats(),
+        }
 
     async def predict(
         self,
@@ -74,113 +132,189 @@ class MLPredictor:
         Generate prediction for a single match.
         Returns probability distribution + top features.
         """
-        if not self.is_ml_ready:
-            return await self._predict_fallback(
-                home_team, away_team, league,
-                home_odds, draw_odds, away_odds
-            )
+        rows = await self._predict_rows([{
+            "home_team": home_team,
+            "away_team": away_team,
+            "league": league,
+            "home_odds": home_odds,
+            "draw_odds": draw_odds,
+            "away_odds": away_odds,
+            "missing_players_home": missing_players_home,
+            "missing_players_away": missing_players_away,
+            "match_date": match_date,
+        }])
+        return rows[0]
 
-        try:
-            # Extract features
-            features = await extract_features_with_odds(
-                home_team=home_team,
-                away_team=away_team,
-                league=league,
-                home_odds=home_odds,
-                draw_odds=draw_odds,
-                away_odds=away_odds,
-                missing_players_home=missing_players_home,
-                missing_players_away=missing_players_away,
-                match_date=match_date,
+    async def predict_batch(self, matches: List[Dict]) -> List[Dict]:
+        """Predict multiple matches at once (특성 행렬 1개로 일괄 채점)."""
+        return await self._predict_rows([
+            {
+                "home_team": match.get("team_home", ""),
+                "away_team": match.get("team_away", ""),
+                "league": match.get("league", ""),
+                "home_odds": float(match.get("home_odds", 0)),
+                "draw_odds": float(match.get("draw_odds", 0)),
+                "away_odds": float(match.get("away_odds", 0)),
+                "missing_players_home": int(match.get("missing_home", 0)),
+                "missing_players_away": int(match.get("missing_away", 0)),
+            }
+            for match in matches
+        ])
+
+    async def _fallback_rows(self, rows: List[Dict]) -> List[Dict]:
+        return [
+            await self._predict_fallback(
+                row["home_team"], row["away_team"], row["league"],
+                row["home_odds"], row["draw_odds"], row["away_odds"],
             )
+            for row in rows
+        ]
 
-            # Build feature vector in correct order
-            feature_names = get_feature_names()
-            X = np.array([[features.get(f, 0.0) for f in feature_names]])
-
-            # Predict probabilities
-            probs = self._model.predict_proba(X)[0]
-
-            # Map to home/draw/away (class order depends on training)
-            classes = list(self._model.classes_)
-            prob_map = {}
-            for i, cls in enumerate(classes):
-                prob_map[cls] = float(probs[i])
-
-            home_prob = prob_map.get("HOME", prob_map.get(0, 0.33))
-            draw_prob = prob_map.get("DRAW", prob_map.get(1, 0.33))
-            away_prob = prob_map.get("AWAY", prob_map.get(2, 0.33))
-
-            # Determine recommendation
-            max_prob = max(home_prob, draw_prob, away_prob)
-            if home_prob == max_prob:
-                recommendation = "HOME"
-            elif away_prob == max_prob:
-                recommendation = "AWAY"
-            else:
-                recommendation = "DRAW"
-
-            # Get top contributing features
-            top_features = self._get_top_features(features, feature_names)
-
-            result = {
-                "match_id": f"{home_team}_{away_team}",
-                "model_version": MODEL_VERSION,
-                "predictions": {
-                    "home_win": round(home_prob, 4),
-                    "draw": round(draw_prob, 4),
-                    "away_win": round(away_prob, 4),
-                },
-                "recommendation": recommendation,
-                "confidence": round(max_prob * 100, 1),
-                "top_features": top_features,
-                "engine": "lightgbm",
-            }
+    async def _featurize(self, rows: List[Dict]) -> List:
+        semaphore = asyncio.Semaphore(FEATURIZE_CONCURRENCY)
 
-            # Log prediction to BigQuery
-            await bq.log_prediction(
-                match_id=result["match_id"],
-                model_version=MODEL_VERSION,
-                pred_home=home_prob,
-                pred_draw=draw_prob,
-                pred_away=away_prob,
-                recommendation=recommendation,
-                confidence=max_prob * 100,
-            )
+        async def one(row):
+            async with semaphore:
+                return await extract_features_with_odds(**row)
 
-            return result
+        return await asyncio.gather(*(one(row) for row in rows), return_exceptions=True)
 
-        except Exception as e:
-            logger.error(f"ML prediction failed: {e}, using fallback")
-            return await self._predict_fallback(
-                home_team, away_team, league,
-                home_odds, draw_odds, away_odds
-            )
+    async def _predict_rows(self, rows: List[Dict]) -> List[Dict]:
+        if not rows:
+            return []
+        handle = self._handle
+        if handle is None:
+            return await self._fallback_rows(rows)
+
+        features = await self._featurize(rows)
+        ok = [i for i, f in enumerate(features) if not isinstance(f, BaseException)]
+        for i, f in enumerate(features):
+            if isinstance(f, BaseException):
+                logger.error(f"Feature extraction failed: {f}, using fallback")
+        results: List[Optional[Dict]] = [None] * len(rows)
+
+        if ok:
+            try:
+                feature_names = get_feature_names()
+                X = np.array([[features[i].get(name, 0.0) for name in feature_names] for i in ok], dtype=np.float64)
+                match_ids = [f"{rows[i]['home_team']}_{rows[i]['away_team']}" for i in ok]
+                raw, versions = self._score(handle, X, match_ids)
+                probs = probability_calibrator.apply("ml", [rows[i]["league"] for i in ok], raw)
+                importances = feature_importances(handle.model)
+                scored = [
+                    self._format_result(match_id, p, version, version != handle.version,
+                                        features[i], feature_names, importances, raw_probs=r)
+                    for i, match_id, p, r, version in zip(ok, match_ids, probs, raw, versions)
+                ]
+                for i, result in zip(ok, scored):
+                    results[i] = result
+                await self._log(scored)
+            except Exception as e:
+                logger.error(f"ML prediction failed: {e}, using fallback")
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            for i, result in zip(missing, await self._fallback_rows([rows[i] for i in missing])):
+                results[i] = result
+        return results
 
-    async def predict_batch(self, matches: List[Dict]) -> List[Dict]:
-        """Predict multiple matches at once."""
-        results = []
-        for match in matches:
-            result = await self.predict(
-                home_team=match.get("team_home", ""),
-                away_team=match.get("team_away", ""),
-                league=match.get("league", ""),
-                home_odds=float(match.get("home_odds", 0)),
-                draw_odds=float(match.get("draw_odds", 0)),
-                away_odds=float(match.get("away_odds", 0)),
-                missing_players_home=int(match.get("missing_home", 0)),
-                missing_players_away=int(match.get("missing_away", 0)),
+    def _score(self, handle, X: np.ndarray, match_ids: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        현재 모델로 채점 (요청 경로). 후보가 있으면 카나리 경기는 후보 확률로 응답하고,
+        나머지 경기는 같은 행렬을 섀도 워커에 넘김 (응답을 기다리게 하지 않음).
+        """
+        started = time.perf_counter()
+        live = class_probs(handle.model, X)
+        live_ms = (time.perf_counter() - started) * 1000
+        self.shadow.record(handle.version, match_ids, live, live_ms)
+        versions = [handle.version] * len(match_ids)
+
+        candidate, canary_pct = model_registry.candidate(MODEL_NAME)
+        if candidate is None:
+            return live, versions
+
+        canary = np.array([canary_bucket(match_id) < canary_pct for match_id in match_ids])
+        served = live
+        if canary.any():
+            canary_ids = [m for m, c in zip(match_ids, canary) if c]
+            started = time.perf_counter()
+            routed = class_probs(candidate.model, X[canary])
+            routed_ms = (time.perf_counter() - started) * 1000
+            self.shadow.record(candidate.version, canary_ids, routed, routed_ms)
+            self.shadow.log(canary_ids, handle.version, live[canary], live_ms,
+                            candidate.version, routed, routed_ms, canary=True)
+            served = live.copy()
+            served[canary] = routed
+            versions = [candidate.version if c else v for c, v in zip(canary, versions)]
+
+        rest = ~canary
+        if rest.any():
+            X_rest = X[rest]
+            self.shadow.submit(
+                candidate.version,
+                lambda: class_probs(candidate.model, X_rest, num_threads=1),
+                [m for m, r in zip(match_ids, rest) if r],
+                handle.version, live[rest], live_ms,
             )
-            results.append(result)
-        return results
+        return served, versions
 
-    def _get_top_features(self, features: Dict, feature_names: List[str], top_n: int = 5) -> List[Dict]:
-        """Get top N most influential features for this prediction."""
-        if not self.is_ml_ready:
-            return []
+    def _format_result(self, match_id: str, probs: np.ndarray, version: str, canary: bool,
+                       features: Dict, feature_names: List[str], importances: np.ndarray,
+                       raw_probs: Optional[np.ndarray] = None) -> Dict:
+        home_prob, draw_prob, away_prob = (float(p) for p in probs)
+
+        # Determine recommendation
+        max_prob = max(home_prob, draw_prob, away_prob)
+        if home_prob == max_prob:
+            recommendation = "HOME"
+        elif away_prob == max_prob:
+            recommendation = "AWAY"
+        else:
+            recommendation = "DRAW"
+
+        return {
+            "match_id": match_id,
+            "model_version": version,
+            "predictions": {
+                "home_win": round(home_prob, 4),
+                "draw": round(draw_prob, 4),
+                "away_win": round(away_prob, 4),
+            },
+            "raw_probs": [round(float(p), 4) for p in (probs if raw_probs is None else raw_probs)],
+            "recommendation": recommendation,
+            "confidence": round(max_prob * 100, 1),
+            "top_features": self._get_top_features(features, feature_names, importances=importances),
+            "engine": "lightgbm",
+            "canary": canary,
+        }
 
+    async def _log(self, results: List[Dict]):
+        """응답한 예측(보정 전 확률)은 predictions_log, 모인 섀도 비교 행은 shadow_predictions 에 일괄 적재."""
+        await bq.log_predictions([
+            {
+                "match_id": r["match_id"],
+                "model_version": r["model_version"],
+                "pred_home": r["raw_probs"][0],
+                "pred_draw": r["raw_probs"][1],
+                "pred_away": r["raw_probs"][2],
+                "recommendation": r["recommendation"],
+                "confidence": r["confidence"],
+            }
+            for r in results
+        ])
+        shadow_rows = self.shadow.take_log()
+        if shadow_rows:
+            await bq.insert_rows("shadow_predictions", shadow_rows)
+
+    def _get_top_features(self, features: Dict, feature_names: List[str], top_n: int = 5,
+                          importances: Optional[np.ndarray] = None) -> List[Dict]:
+        """Get top N most influential features for this prediction."""
         try:
-            importances = self._model.feature_importances_
+            if importances is None:
+                model = self._model
+                if model is None:
+                    return []
+                importances = feature_importances(model)
             feature_importance = sorted(
                 zip(feature_names, importances),
                 key=lambda x: x[1],
@@ -205,7 +339,7 @@ class MLPredictor:
 
         try:
             feature_names = get_feature_names()
-            importances = self._model.feature_importances_
+            importances = feature_importances(self._model)
             return {
                 name: float(imp)
                 for name, imp in zip(feature_names, importances)
@@ -250,6 +384,7 @@ class MLPredictor:
                 "draw": round(draw_prob, 4),
                 "away_win": round(away_prob, 4),
             },
+            "raw_probs": [round(home_prob, 4), round(draw_prob, 4), round(away_prob, 4)],
             "recommendation": recommendation,
             "confidence": round(max_prob * 100, 1),
             "top_features": [
@@ -259,10 +394,13 @@ class MLPredictor:
         }
 
     def reload_model(self):
-        """Force reload model from storage (called after retraining)."""
-        self._model = None
-        self._model_loaded = False
-        self._load_model()
+        """
+        manifest 의 current 버전이 바뀌었으면 새 버전으로 교체 (called after retraining).
+        같은 버전이면 다시 로드하지 않음. 교체 중에도 진행 중 예측은 이전 버전으로 계속.
+        """
+        handle = model_registry.refresh(MODEL_NAME)
+        if handle is None and self._fallback_predictor is None:
+            self._init_fallback()
         return self.is_ml_ready
 
 
@@ -1,11 +1,29 @@
 """
-GCS Model Store — Google Cloud Storage 기반 ML 모델 저장/로드.
-LightGBM .pkl 모델 파일을 GCS 버킷에 저장하고 Cloud Run에서 로드.
+GCS Model Store — 버전 관리되는 ML 모델 레지스트리 (로컬 캐시 + Google Cloud Storage).
+
+레이아웃 (로컬 ml_models/registry/ 와 GCS models/registry/ 동일):
+  {model}/manifest.json          → {"current": 버전, "previous": 버전, "versions": {버전: 체크섬/크기/형식}}
+  {model}/{version}/model.txt    → LightGBM 텍스트 모델 (unpickle 없이 Booster(model_file=) 로 직접 로드)
+  {model}/{version}/model.pkl    → LightGBM 이 아닌 모델만 joblib
+  {model}/{version}/meta.json
+
+- 버전 아티팩트는 불변: 같은 버전 이름에 다른 내용이 오면 새 이름(_2, _3 …)으로 저장
+- 로드 시 sha256 검증, manifest 는 아티팩트 업로드 후 마지막에 교체 (로컬은 tmp + os.replace)
+- ModelRegistry 가 프로세스당 모델 1벌을 공유 (MLPredictor / MLInferenceService / self_learning).
+  manifest 의 current 가 바뀌면 새 버전을 따로 로드한 뒤 참조만 교체 → 진행 중 예측은 이전 핸들로 끝남
+- manifest 의 "candidate" ({version, canary_pct}) 는 섀도/카나리 평가용 후보 — MLPredictor 가 함께 로드해 채점
+  (MODEL_ROLLOUT=shadow 면 save_model 이 current 대신 candidate 로 등록, 승격은 activate)
+- 레지스트리가 비어 있으면 이전 형식 ({model}_latest.pkl / {model}_lgb.txt) 을 읽음 (호환)
 """
+import json
 import logging
 import os
+import shutil
 import tempfile
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -15,6 +33,19 @@ _initialized = False
 
 BUCKET_NAME = os.getenv("GCS_MODEL_BUCKET", "scorenix-ml-models")
 MODEL_PREFIX = "models/"
+REGISTRY_PREFIX = f"{MODEL_PREFIX}registry/"
+LOCAL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "ml_models"))
+
+# manifest 재확인 주기 (초) — 다른 인스턴스의 재학습 결과를 이 주기로 따라감
+CHECK_SECONDS = float(os.getenv("MODEL_MANIFEST_CHECK_SECONDS", "60"))
+# 로컬 디스크(Cloud Run 은 메모리 파일시스템)에 남길 버전 수 — GCS 에는 전부 보존
+KEEP_LOCAL_VERSIONS = 3
+# 새 버전 배포 방식: direct = 바로 current / shadow = candidate 로 등록 (MODEL_CANARY_PCT % 응답을 후보가 담당)
+ROLLOUT = os.getenv("MODEL_ROLLOUT", "direct")
+CANARY_PCT = float(os.getenv("MODEL_CANARY_PCT", "0"))
+HISTORY_SIZE = 10
+
+FORMATS = {"lightgbm_text": "model.txt", "joblib": "model.pkl"}
 
 
 def _get_storage_client():
@@ -49,116 +80,480 @@ def _ensure_bucket():
         return None
 
 
-def save_model(model, model_name: str = "lightgbm_predictor", version: Optional[str] = None) -> str:
-    """
-    Save a model to GCS (or local fallback).
-    Returns the model path/URI.
-    """
-    import joblib
+def _sha256(path: str) -> str:
+    import hashlib
 
-    if version is None:
-        version = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    filename = f"{model_name}_v{version}.pkl"
-    gcs_path = f"{MODEL_PREFIX}{filename}"
 
-    # Always save locally first
-    local_dir = os.path.join(os.path.dirname(__file__), "..", "..", "ml_models")
-    os.makedirs(local_dir, exist_ok=True)
-    local_path = os.path.join(local_dir, filename)
-    joblib.dump(model, local_path)
-    logger.info(f"Model saved locally: {local_path}")
+def _rss_bytes() -> int:
+    """현재 프로세스 RSS (Linux /proc 기준, 그 외 0)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
 
-    # Also save as 'latest'
-    latest_path = os.path.join(local_dir, f"{model_name}_latest.pkl")
-    joblib.dump(model, latest_path)
 
-    # Try GCS upload
-    client = _get_storage_client()
-    if client:
-        try:
-            bucket = _ensure_bucket()
-            if bucket:
-                blob = bucket.blob(gcs_path)
-                blob.upload_from_filename(local_path)
-                logger.info(f"✅ Model uploaded to GCS: gs://{BUCKET_NAME}/{gcs_path}")
-
-                # Also upload as 'latest'
-                latest_blob = bucket.blob(f"{MODEL_PREFIX}{model_name}_latest.pkl")
-                latest_blob.upload_from_filename(local_path)
-                return f"gs://{BUCKET_NAME}/{gcs_path}"
-        except Exception as e:
-            logger.warning(f"GCS upload failed (local copy retained): {e}")
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
-    return local_path
 
+def _write_json_atomic(path: str, data: Dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
 
-def load_model(model_name: str = "lightgbm_predictor", version: Optional[str] = None):
-    """
-    Load model from GCS (or local fallback).
-    Tries: GCS latest → local latest → None.
-    """
+
+def _model_format(model) -> str:
+    return "lightgbm_text" if hasattr(model, "model_to_string") and hasattr(model, "save_model") else "joblib"
+
+
+def _write_artifact(model, fmt: str, path: str):
+    if fmt == "lightgbm_text":
+        model.save_model(path)
+    else:
+        import joblib
+        joblib.dump(model, path)
+
+
+def _clamp_pct(value) -> float:
+    return min(100.0, max(0.0, float(value or 0)))
+
+
+def _promote(manifest: Dict, version: str):
+    """current ← version (이전 current 는 previous, 같은 버전의 candidate 는 해제)."""
+    if manifest.get("current") != version:
+        manifest["previous"] = manifest.get("current")
+        manifest["current"] = version
+    if (manifest.get("candidate") or {}).get("version") == version:
+        manifest.pop("candidate")
+
+
+def _import_readers():
+    try:
+        import joblib  # noqa: F401
+        import lightgbm  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _read_artifact(path: str, fmt: str):
+    if fmt == "lightgbm_text":
+        import lightgbm as lgb
+        return lgb.Booster(model_file=path)
     import joblib
+    return joblib.load(path)
 
-    filename = f"{model_name}_latest.pkl" if version is None else f"{model_name}_v{version}.pkl"
 
-    # Try local first (faster)
-    local_dir = os.path.join(os.path.dirname(__file__), "..", "..", "ml_models")
-    local_path = os.path.join(local_dir, filename)
-    if os.path.exists(local_path):
-        try:
-            model = joblib.load(local_path)
-            logger.info(f"Model loaded from local: {local_path}")
-            return model
-        except Exception as e:
-            logger.warning(f"Local model load failed: {e}")
+@dataclass
+class LoadedModel:
+    """프로세스에 로드된 모델 1버전 — 교체돼도 이 핸들을 쥔 예측은 그대로 끝까지 수행."""
+    name: str
+    version: str
+    model: Any = field(repr=False)
+    sha256: str = ""
+    size_bytes: int = 0
+    load_ms: float = 0.0
+    rss_bytes: int = 0
+    loaded_at: str = ""
+    source: str = "registry"
 
-    # Try GCS
-    client = _get_storage_client()
-    if client:
+    def info(self) -> Dict:
+        # asdict 는 model 까지 deepcopy (Booster 재직렬화) → 스칼라 필드만 직접 읽음
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "model"}
+
+
+class ModelRegistry:
+    """불변 버전 아티팩트 + manifest("current") + 프로세스 공유 로더."""
+
+    def __init__(self, root: Optional[str] = None, remote: bool = True, check_seconds: float = CHECK_SECONDS):
+        self.root = root or os.path.join(LOCAL_DIR, "registry")
+        self.legacy_dir = os.path.dirname(self.root)
+        self.remote = remote
+        self.check_seconds = check_seconds
+        self.swaps = 0
+        self._models: Dict[str, LoadedModel] = {}
+        self._candidates: Dict[str, Tuple[LoadedModel, float]] = {}
+        self._checked: Dict[str, float] = {}
+        self._history: Dict[str, List[Dict]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    # ── 저장소 ──
+
+    def _bucket(self, create: bool = False):
+        if not self.remote:
+            return None
+        if create:
+            return _ensure_bucket()
+        client = _get_storage_client()
+        return client.bucket(BUCKET_NAME) if client else None
+
+    def _dir(self, name: str, version: Optional[str] = None) -> str:
+        return os.path.join(self.root, name, version) if version else os.path.join(self.root, name)
+
+    def _upload(self, bucket, local_path: str, key: str):
+        bucket.blob(f"{REGISTRY_PREFIX}{key}").upload_from_filename(local_path)
+
+    def manifest(self, name: str) -> Dict:
+        """현재 manifest — GCS 가 원본, 로컬 파일은 캐시 (GCS 불가 시 로컬만)."""
+        path = os.path.join(self._dir(name), "manifest.json")
+        local = _read_json(path) or {}
+        bucket = self._bucket()
+        if bucket is not None:
+            try:
+                blob = bucket.blob(f"{REGISTRY_PREFIX}{name}/manifest.json")
+                if blob.exists():
+                    remote = json.loads(blob.download_as_text())
+                    if remote != local:
+                        _write_json_atomic(path, remote)
+                    return remote
+            except Exception as e:
+                logger.warning(f"GCS manifest read failed ({name}), using local: {e}")
+        return local
+
+    def _write_manifest(self, name: str, manifest: Dict, bucket=None):
+        path = os.path.join(self._dir(name), "manifest.json")
+        _write_json_atomic(path, manifest)
+        if bucket is not None:
+            try:
+                self._upload(bucket, path, f"{name}/manifest.json")
+            except Exception as e:
+                logger.warning(f"GCS manifest upload failed ({name}, local copy retained): {e}")
+
+    def publish(self, model, name: str = "lightgbm_predictor", version: Optional[str] = None,
+                stage: str = "current", canary_pct: float = 0.0) -> str:
+        """
+        새 버전 아티팩트 저장 → manifest 의 current (stage="current") 또는 candidate 로 지정.
+        Returns: 아티팩트 URI (GCS 업로드 실패 시 로컬 경로)
+        """
+        version = version or datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        fmt = _model_format(model)
+        filename = FORMATS[fmt]
+        os.makedirs(self._dir(name), exist_ok=True)
+
+        fd, staged = tempfile.mkstemp(dir=self._dir(name), suffix=".part")
+        os.close(fd)
+        _write_artifact(model, fmt, staged)
+        digest = _sha256(staged)
+
+        manifest = self.manifest(name)
+        versions = manifest.setdefault("versions", {})
+        base, n = version, 1
+        while version in versions and versions[version]["sha256"] != digest:
+            n += 1
+            version = f"{base}_{n}"
+        if version != base:
+            logger.info(f"Model version {name}@{base} already exists with different content → {version}")
+
+        entry = versions.get(version) or {
+            "file": filename,
+            "format": fmt,
+            "sha256": digest,
+            "size_bytes": os.path.getsize(staged),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if hasattr(model, "num_trees"):
+            entry.setdefault("num_trees", model.num_trees())
+
+        version_dir = self._dir(name, version)
+        artifact = os.path.join(version_dir, filename)
+        os.makedirs(version_dir, exist_ok=True)
+        if os.path.exists(artifact):
+            os.remove(staged)  # 같은 내용이 이미 있음 (불변)
+        else:
+            os.replace(staged, artifact)
+        _write_json_atomic(os.path.join(version_dir, "meta.json"), dict(entry, name=name, version=version))
+        logger.info(f"Model saved locally: {artifact}")
+
+        uri = artifact
+        bucket = self._bucket(create=True)
+        if bucket is not None:
+            try:
+                self._upload(bucket, artifact, f"{name}/{version}/{filename}")
+                self._upload(bucket, os.path.join(version_dir, "meta.json"), f"{name}/{version}/meta.json")
+                uri = f"gs://{BUCKET_NAME}/{REGISTRY_PREFIX}{name}/{version}/{filename}"
+                logger.info(f"✅ Model uploaded to GCS: {uri}")
+            except Exception as e:
+                logger.warning(f"GCS upload failed (local copy retained): {e}")
+                bucket = None  # 아티팩트 없는 버전을 원격 manifest 가 가리키지 않도록
+
+        versions[version] = entry
+        if stage == "candidate" and manifest.get("current") not in (None, version):
+            manifest["candidate"] = {"version": version, "canary_pct": _clamp_pct(canary_pct)}
+        else:
+            _promote(manifest, version)
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._write_manifest(name, manifest, bucket)
+        self._prune_local(name, manifest)
+        return uri
+
+    def activate(self, name: str, version: str) -> Dict:
+        """기존 버전으로 current 고정 (후보 승격 / 롤백). 없는 버전이면 KeyError."""
+        manifest = self.manifest(name)
+        if version not in manifest.get("versions", {}):
+            raise KeyError(f"{name}@{version} not in registry")
+        if manifest.get("current") != version:
+            _promote(manifest, version)
+            manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._write_manifest(name, manifest, self._bucket())
+        return manifest
+
+    def set_candidate(self, name: str, version: Optional[str], canary_pct: float = 0.0) -> Dict:
+        """섀도 평가 후보 지정 (version=None 이면 해제). canary_pct: 후보가 응답할 비율 (0~100)."""
+        manifest = self.manifest(name)
+        if version is None:
+            manifest.pop("candidate", None)
+        elif version not in manifest.get("versions", {}):
+            raise KeyError(f"{name}@{version} not in registry")
+        else:
+            manifest["candidate"] = {"version": version, "canary_pct": _clamp_pct(canary_pct)}
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._write_manifest(name, manifest, self._bucket())
+        return manifest
+
+    def _prune_local(self, name: str, manifest: Dict):
+        keep = {manifest.get("current"), manifest.get("previous"), (manifest.get("candidate") or {}).get("version")}
+        loaded = self._models.get(name)
+        if loaded:
+            keep.add(loaded.version)
+        ordered = sorted(manifest.get("versions", {}).items(), key=lambda kv: kv[1].get("created_at", ""))
+        keep.update(v for v, _ in ordered[-KEEP_LOCAL_VERSIONS:])
+        for version, _ in ordered:
+            if version not in keep and os.path.isdir(self._dir(name, version)):
+                shutil.rmtree(self._dir(name, version), ignore_errors=True)
+
+    # ── 로드 ──
+
+    def _artifact_path(self, name: str, version: str, entry: Dict) -> str:
+        """로컬 아티팩트 경로 — 없으면 GCS 에서 받음."""
+        filename = entry.get("file", FORMATS["lightgbm_text"])
+        path = os.path.join(self._dir(name, version), filename)
+        if os.path.exists(path):
+            return path
+        bucket = self._bucket()
+        if bucket is None:
+            raise FileNotFoundError(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.part"
+        bucket.blob(f"{REGISTRY_PREFIX}{name}/{version}/{filename}").download_to_filename(tmp)
+        os.replace(tmp, path)
+        logger.info(f"Model artifact downloaded: {name}@{version}")
+        return path
+
+    def _measure(self, name: str, version: str, path: str, fmt: str, source: str,
+                 digest: Optional[str] = None) -> LoadedModel:
+        _import_readers()  # 첫 로드의 라이브러리 import 비용은 버전별 수치에서 제외
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        model = _read_artifact(path, fmt)
+        return LoadedModel(
+            name=name,
+            version=version,
+            model=model,
+            sha256=digest or _sha256(path),
+            size_bytes=os.path.getsize(path),
+            load_ms=round((time.perf_counter() - started) * 1000, 2),
+            rss_bytes=max(0, _rss_bytes() - rss_before),
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+            source=source,
+        )
+
+    def load(self, name: str, version: str, manifest: Optional[Dict] = None) -> LoadedModel:
+        """특정 버전 로드 (공유 인스턴스 교체 없음). 체크섬 불일치 시 ValueError."""
+        manifest = manifest if manifest is not None else self.manifest(name)
+        entry = manifest.get("versions", {}).get(version)
+        if entry is None:
+            raise KeyError(f"{name}@{version} not in registry")
+        path = self._artifact_path(name, version, entry)
+        digest = _sha256(path)
+        if digest != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for {name}@{version}: {digest[:12]} != {entry['sha256'][:12]}")
+        return self._measure(name, version, path, entry.get("format", "lightgbm_text"), "registry", digest)
+
+    def _load_legacy(self, name: str) -> Optional[LoadedModel]:
+        """레지스트리 도입 전 형식: {name}_latest.pkl (joblib) / {name}_lgb.txt, GCS models/{name}_latest.pkl."""
+        candidates = [(f"{name}_latest.pkl", "joblib"), (f"{name}_lgb.txt", "lightgbm_text")]
+        for filename, fmt in candidates:
+            path = os.path.join(self.legacy_dir, filename)
+            if os.path.exists(path):
+                return self._measure(name, "legacy", path, fmt, "legacy")
+
+        bucket = self._bucket()
+        if bucket is not None:
+            try:
+                blob = bucket.blob(f"{MODEL_PREFIX}{name}_latest.pkl")
+                if blob.exists():
+                    path = os.path.join(self.legacy_dir, f"{name}_latest.pkl")
+                    os.makedirs(self.legacy_dir, exist_ok=True)
+                    blob.download_to_filename(f"{path}.part")
+                    os.replace(f"{path}.part", path)
+                    return self._measure(name, "legacy", path, "joblib", "legacy")
+            except Exception as e:
+                logger.warning(f"GCS legacy model load failed: {e}")
+        return None
+
+    def _lock(self, name: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def refresh(self, name: str) -> Optional[LoadedModel]:
+        """
+        manifest 의 current 가 로드된 버전과 다를 때만 새로 로드해 교체 (같으면 그대로 반환).
+        로드 실패 시 이전 버전을 계속 사용.
+        """
+        with self._lock(name):
+            self._checked[name] = time.monotonic()
+            loaded = self._models.get(name)
+            try:
+                manifest = self.manifest(name)
+                self._sync_candidate(name, manifest)
+                version = manifest.get("current")
+                if version and loaded and loaded.version == version:
+                    return loaded
+                if version:
+                    handle = self.load(name, version, manifest)
+                elif loaded is None:
+                    handle = self._load_legacy(name)
+                else:
+                    return loaded
+            except Exception as e:
+                logger.warning(f"Model refresh failed for {name} (keeping {loaded.version if loaded else None}): {e}")
+                return loaded
+            if handle is None:
+                logger.warning(f"No model found for {name}")
+                return None
+            self._swap(handle)
+            return handle
+
+    def _sync_candidate(self, name: str, manifest: Dict):
+        """manifest 의 candidate 를 로드/교체/해제. 실패해도 current 교체에는 영향 없음."""
+        spec = manifest.get("candidate") or {}
+        version = spec.get("version")
+        if not version or version == manifest.get("current"):
+            self._candidates.pop(name, None)
+            return
+        pct = _clamp_pct(spec.get("canary_pct", 0))
+        loaded = self._candidates.get(name)
+        if loaded and loaded[0].version == version:
+            self._candidates[name] = (loaded[0], pct)
+            return
         try:
-            bucket = client.bucket(BUCKET_NAME)
-            gcs_path = f"{MODEL_PREFIX}{filename}"
-            blob = bucket.blob(gcs_path)
-            if blob.exists():
-                with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as tmp:
-                    blob.download_to_filename(tmp.name)
-                    model = joblib.load(tmp.name)
-                    # Cache locally
-                    os.makedirs(local_dir, exist_ok=True)
-                    joblib.dump(model, local_path)
-                    logger.info(f"Model loaded from GCS and cached: {gcs_path}")
-                    return model
+            handle = self.load(name, version, manifest)
         except Exception as e:
-            logger.warning(f"GCS model load failed: {e}")
+            logger.warning(f"Candidate load failed for {name}@{version}: {e}")
+            self._candidates.pop(name, None)
+            return
+        self._candidates[name] = (handle, pct)
+        logger.info(f"🧪 Candidate {name}@{version} loaded (canary {pct}%, load {handle.load_ms}ms)")
 
-    logger.warning(f"No model found for {model_name}")
-    return None
+    def candidate(self, name: str) -> Tuple[Optional[LoadedModel], float]:
+        """섀도 평가 후보와 카나리 비율 (없으면 (None, 0.0)). 갱신은 current() 의 manifest 확인이 함께 수행."""
+        return self._candidates.get(name, (None, 0.0))
 
+    def _swap(self, handle: LoadedModel):
+        previous = self._models.get(handle.name)
+        self._models[handle.name] = handle  # 참조 교체만 — 이전 핸들은 쥔 쪽이 놓으면 해제
+        self.swaps += 1
+        history = self._history.setdefault(handle.name, [])
+        history.append(handle.info())
+        del history[:-HISTORY_SIZE]
+        logger.info(
+            f"✅ Model {handle.name}@{handle.version} active "
+            f"(was {previous.version if previous else None}, load {handle.load_ms}ms, "
+            f"+{handle.rss_bytes / 1e6:.1f}MB rss)"
+        )
 
-def list_model_versions(model_name: str = "lightgbm_predictor") -> list:
-    """List all available model versions."""
-    versions = []
+    def current(self, name: str) -> Optional[LoadedModel]:
+        """
+        공유 인스턴스. 첫 호출만 동기 로드하고, 이후엔 check_seconds 마다
+        manifest 확인을 백그라운드 스레드에서 수행 (호출자는 기다리지 않음).
+        """
+        if name not in self._checked:
+            return self.refresh(name)
+        if time.monotonic() - self._checked[name] >= self.check_seconds:
+            self._refresh_in_background(name)
+        return self._models.get(name)
 
-    # Check local
-    local_dir = os.path.join(os.path.dirname(__file__), "..", "..", "ml_models")
-    if os.path.exists(local_dir):
-        for f in os.listdir(local_dir):
-            if f.startswith(model_name) and f.endswith(".pkl") and "latest" not in f:
-                version = f.replace(f"{model_name}_v", "").replace(".pkl", "")
-                versions.append({"version": version, "source": "local", "path": os.path.join(local_dir, f)})
+    def peek(self, name: str) -> Optional[LoadedModel]:
+        """
+        current() 의 비차단 버전 — 첫 로드도 백그라운드에서 수행하고, 로드 전에는 None.
+        요청 경로에서 GCS 다운로드를 기다리면 안 되는 보조 아티팩트(보정 맵 등)용.
+        """
+        if name not in self._checked or time.monotonic() - self._checked[name] >= self.check_seconds:
+            self._refresh_in_background(name)
+        return self._models.get(name)
 
-    # Check GCS
-    client = _get_storage_client()
-    if client:
-        try:
-            bucket = client.bucket(BUCKET_NAME)
-            blobs = bucket.list_blobs(prefix=f"{MODEL_PREFIX}{model_name}_v")
-            for blob in blobs:
-                version = blob.name.replace(f"{MODEL_PREFIX}{model_name}_v", "").replace(".pkl", "")
-                if version not in [v["version"] for v in versions]:
-                    versions.append({"version": version, "source": "gcs", "path": f"gs://{BUCKET_NAME}/{blob.name}"})
-        except Exception:
-            pass
-
-    return sorted(versions, key=lambda x: x["version"], reverse=True)
+    def _refresh_in_background(self, name: str):
+        if self._lock(name).locked():
+            return
+        self._checked[name] = time.monotonic()
+        threading.Thread(target=self.refresh, args=(name,), name=f"model-refresh-{name}", daemon=True).start()
+
+    def stats(self) -> Dict:
+        return {
+            "swaps": self.swaps,
+            "models": {
+                name: {
+                    "current": handle.info(),
+                    "candidate": (
+                        dict(self._candidates[name][0].info(), canary_pct=self._candidates[name][1])
+                        if name in self._candidates else None
+                    ),
+                    "loads": list(self._history.get(name, [])),
+                }
+                for name, handle in self._models.items()
+            },
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def save_model(model, model_name: str = "lightgbm_predictor", version: Optional[str] = None) -> str:
+    """
+    새 버전으로 저장하고 current 로 지정 (로컬 + GCS).
+    MODEL_ROLLOUT=shadow 면 candidate 로 등록 (current 가 없을 때는 바로 current).
+    Returns the model path/URI.
+    """
+    stage = "candidate" if ROLLOUT == "shadow" else "current"
+    return model_registry.publish(model, model_name, version, stage=stage, canary_pct=CANARY_PCT)
+
+
+def load_model(model_name: str = "lightgbm_predictor", version: Optional[str] = None):
+    """
+    current 버전의 공유 인스턴스 (version 지정 시 해당 버전을 별도 로드).
+    없으면 None.
+    """
+    handle = model_registry.current(model_name) if version is None else model_registry.load(model_name, version)
+    return handle.model if handle else None
+
+
+def list_model_versions(model_name: str = "lightgbm_predictor") -> list:
+    """List all available model versions."""
+    manifest = model_registry.manifest(model_name)
+    versions = [
+        {
+            "version": version,
+            "current": version == manifest.get("current"),
+            "source": "registry",
+            **entry,
+        }
+        for version, entry in manifest.get("versions", {}).items()
+    ]
+    legacy = os.path.join(model_registry.legacy_dir, f"{model_name}_latest.pkl")
+    if os.path.exists(legacy):
+        versions.append({"version": "legacy", "current": not manifest.get("current"),
+                         "source": "legacy", "path": legacy, "created_at": ""})
+    return sorted(versions, key=lambda x: x.get("created_at", ""), reverse=True)
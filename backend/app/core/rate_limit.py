@@ -0,0 +1,281 @@
+"""
+Rate Limiter — GCRA(Generic Cell Rate Algorithm) + 크기 제한 LRU.
+
+기존 RateLimitStore 는 IP마다 타임스탬프 리스트를 보관·재생성하고 키를 지우지 않아
+스크래핑/IP 스푸핑 트래픽에서 메모리가 무한히 증가했음.
+
+- 키당 float 1개(TAT: theoretical arrival time)만 저장 → 요청 수와 무관한 고정 메모리
+- LRU 최대 항목 수 제한, TAT 가 지난 항목은 "빈 버킷"과 동일하므로 축출해도 정확도 영향 없음
+- 경로 prefix 별 규칙 + 규칙 안에서 Tier 별 한도 (anonymous / free / basic / pro / vip)
+- 백엔드 교체 가능: LocalGCRABackend (기본) / FirestoreGCRABackend (인스턴스 간 공유, shared 규칙만)
+- 규칙별 허용/거절 카운터 → /api/admin/rate_limits
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITS_COLLECTION = "rate_limits"
+DEFAULT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "50000"))
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """period 초 동안 rate 건 (burst 건까지 연속 허용, 기본 = rate)."""
+    rate: int
+    period: float = 60.0
+    burst: Optional[int] = None
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.rate
+
+    @property
+    def tolerance(self) -> float:
+        return self.interval * (self.burst or self.rate)
+
+    @property
+    def label(self) -> str:
+        unit = {60.0: "min", 3600.0: "hour", 1.0: "sec"}.get(float(self.period), f"{self.period:g}s")
+        return f"{self.rate} req/{unit}"
+
+
+def gcra(tat: Optional[float], now: float, limit: RateLimit) -> Tuple[bool, float, float, int]:
+    """
+    GCRA 1회 판정. 반환: (허용 여부, 새 TAT, retry_after 초, 남은 허용 수).
+    거절 시 TAT 는 변하지 않음.
+    """
+    interval, tolerance = limit.interval, limit.tolerance
+    new_tat = max(tat or now, now) + interval
+    allow_at = new_tat - tolerance
+    if allow_at > now:
+        return False, tat or now, allow_at - now, 0
+    remaining = int((now - allow_at) / interval)
+    return True, new_tat, 0.0, remaining
+
+
+class LocalGCRABackend:
+    """프로세스 내 GCRA 상태 — 키 → TAT, 최대 max_keys 개 (LRU 축출)."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def check(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, float, int]:
+        with self._lock:
+            tat = self._tat.get(key)
+            allowed, new_tat, retry_after, remaining = gcra(tat, now, limit)
+            if allowed:
+                self._tat[key] = new_tat
+                self._tat.move_to_end(key)
+                while len(self._tat) > self.max_keys:
+                    self._tat.popitem(last=False)
+                    self.evictions += 1
+            return allowed, retry_after, remaining
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def stats(self) -> Dict:
+        return {"backend": "local", "keys": len(self._tat), "max_keys": self.max_keys, "evictions": self.evictions}
+
+
+class FirestoreGCRABackend:
+    """
+    인스턴스 간 공유 GCRA — rate_limits/{key} 문서에 TAT 저장 (트랜잭션 compare-and-set).
+    요청마다 Firestore 왕복이 있으므로 로그인/가입 같은 민감 경로(shared 규칙)에만 사용.
+    expires_at 필드에 Firestore TTL 정책을 걸면 만료 문서가 자동 삭제됨.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def check(self, key: str, limit: RateLimit, now: float) -> Tuple[bool, float, int]:
+        from google.cloud import firestore
+        from datetime import datetime, timezone
+        ref = self.db.collection(RATE_LIMITS_COLLECTION).document(key.replace("/", "_"))
+
+        @firestore.transactional
+        def fn(transaction):
+            snap = ref.get(transaction=transaction)
+            tat = (snap.to_dict() or {}).get("tat") if snap.exists else None
+            allowed, new_tat, retry_after, remaining = gcra(tat, now, limit)
+            if allowed:
+                transaction.set(ref, {"tat": new_tat,
+                                      "expires_at": datetime.fromtimestamp(new_tat, timezone.utc)})
+            return allowed, retry_after, remaining
+
+        return fn(self.db.transaction())
+
+    def stats(self) -> Dict:
+        return {"backend": "firestore", "collection": RATE_LIMITS_COLLECTION}
+
+
+@dataclass
+class RateLimitRule:
+    """경로 prefix 규칙. limits 에 없는 Tier 는 'default' 한도 사용."""
+    name: str
+    prefix: str
+    limits: Dict[str, RateLimit]
+    methods: Optional[Tuple[str, ...]] = None
+    shared: bool = False
+    allowed: int = 0
+    rejected: int = 0
+
+    def matches(self, path: str, method: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return path == self.prefix or path.startswith(self.prefix.rstrip("/") + "/") or self.prefix == "/"
+
+    def limit_for(self, tier: str) -> RateLimit:
+        return self.limits.get(tier) or self.limits["default"]
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    rule: str
+    limit: RateLimit
+    remaining: int
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"X-RateLimit-Limit": str(self.limit.rate), "X-RateLimit-Remaining": str(self.remaining)}
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, int(self.retry_after + 0.999)))
+        return headers
+
+
+def default_rules() -> List[RateLimitRule]:
+    """기본 규칙 — 앞쪽 규칙이 우선 (가장 구체적인 prefix 먼저)."""
+    per_min = lambda n: RateLimit(n, 60.0)
+    return [
+        RateLimitRule("auth_login", "/api/auth/login", {"default": RateLimit(10, 60.0, burst=5)},
+                      methods=("POST",), shared=True),
+        RateLimitRule("auth_register", "/api/auth/register", {"default": RateLimit(5, 3600.0, burst=3)},
+                      methods=("POST",), shared=True),
+        RateLimitRule("ai_stream", "/api/ai/live-scores/stream", {"default": RateLimit(10, 60.0)}),
+        RateLimitRule("video", "/api/video", {"default": per_min(10), "vip": per_min(30), "premium": per_min(30)}),
+        RateLimitRule("default", "/", {
+            "anonymous": per_min(60), "default": per_min(120),
+            "pro": per_min(300), "vip": per_min(600), "premium": per_min(600),
+        }),
+    ]
+
+
+class RateLimiter:
+    def __init__(self, rules: Optional[List[RateLimitRule]] = None, backend=None, shared_backend=None,
+                 clock=time.time, tier_cache_size: int = 10000):
+        self.rules = rules if rules is not None else default_rules()
+        self.backend = backend if backend is not None else LocalGCRABackend()
+        self._shared_backend = shared_backend
+        self.clock = clock
+        self._tiers: "OrderedDict[str, str]" = OrderedDict()
+        self._tier_cache_size = tier_cache_size
+        self.backend_errors = 0
+
+    # ── 키/티어 ──
+
+    def remember_tier(self, user_id: str, tier: str):
+        """인증된 유저의 Tier 기록 (/auth/me, tier_guard 조회 시 갱신) — 미들웨어에서 DB 조회 없이 사용."""
+        self._tiers[user_id] = tier
+        self._tiers.move_to_end(user_id)
+        while len(self._tiers) > self._tier_cache_size:
+            self._tiers.popitem(last=False)
+
+    def _user_from_token(self, request) -> Optional[str]:
+        auth = request.headers.get("authorization", "")
+        if not auth.lower().startswith("bearer "):
+            return None
+        from app.core.user_cache import user_cache
+        try:
+            return user_cache.decode_token(auth[7:].strip()).get("sub")
+        except Exception:
+            return None
+
+    def identify(self, request) -> Tuple[str, str]:
+        """(버킷 키, tier). 유효한 JWT → 유저 단위, 아니면 IP 단위 anonymous."""
+        user_id = self._user_from_token(request)
+        if user_id:
+            return f"user:{user_id}", self._tiers.get(user_id, "free")
+        ip = request.client.host if request.client else "unknown"
+        return f"ip:{ip}", "anonymous"
+
+    # ── 판정 ──
+
+    def _shared(self):
+        if self._shared_backend is None:
+            backend = None
+            if os.getenv("RATE_LIMIT_SHARED_BACKEND", "local").lower() == "firestore":
+                try:
+                    from app.db.firestore import get_firestore_db
+                    db = get_firestore_db()
+                    backend = FirestoreGCRABackend(db) if db else None
+                except Exception as e:
+                    logger.warning(f"[RateLimit] Firestore backend unavailable: {e}")
+            self._shared_backend = backend if backend is not None else self.backend
+        return self._shared_backend
+
+    def match(self, path: str, method: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(path, method):
+                return rule
+        return None
+
+    def check(self, key: str, tier: str, path: str, method: str = "GET") -> Optional[Decision]:
+        """동기 판정 (로컬 백엔드 전용 경로 / 테스트·벤치마크용)."""
+        rule = self.match(path, method)
+        if rule is None:
+            return None
+        return self._apply(rule, self.backend, key, tier)
+
+    def _apply(self, rule: RateLimitRule, backend, key: str, tier: str) -> Decision:
+        limit = rule.limit_for(tier)
+        try:
+            allowed, retry_after, remaining = backend.check(f"{rule.name}|{key}", limit, self.clock())
+        except Exception as e:
+            # 저장소 장애 시 fail-open (서비스 차단보다 과허용이 안전)
+            self.backend_errors += 1
+            logger.warning(f"[RateLimit] backend error ({rule.name}): {e}")
+            allowed, retry_after, remaining = True, 0.0, 0
+        if allowed:
+            rule.allowed += 1
+        else:
+            rule.rejected += 1
+        return Decision(allowed, rule.name, limit, remaining, retry_after)
+
+    async def check_request(self, request) -> Optional[Decision]:
+        rule = self.match(request.url.path, request.method)
+        if rule is None:
+            return None
+        key, tier = self.identify(request)
+        if rule.shared:
+            backend = self._shared()
+            if backend is not self.backend:
+                return await asyncio.to_thread(self._apply, rule, backend, key, tier)
+        return self._apply(rule, self.backend, key, tier)
+
+    def stats(self) -> Dict:
+        return {
+            "rules": [
+                {"name": r.name, "prefix": r.prefix, "methods": list(r.methods) if r.methods else None,
+                 "shared": r.shared, "limits": {t: l.label for t, l in r.limits.items()},
+                 "allowed": r.allowed, "rejected": r.rejected}
+                for r in self.rules
+            ],
+            "local": self.backend.stats(),
+            "shared": self._shared_backend.stats() if self._shared_backend is not None else None,
+            "known_tiers": len(self._tiers),
+            "backend_errors": self.backend_errors,
+        }
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,176 @@
+"""
+Shadow Evaluator — 후보 모델(manifest candidate) 섀도 / 카나리 평가.
+
+- 후보는 현재 모델과 같은 배치 특성 행렬을 채점하되 요청 경로 밖에서 수행
+  (단일 워커 executor, LightGBM num_threads=1)
+- 대기 중인 섀도 배치가 max_pending 을 넘으면 그 배치는 건너뜀 (dropped 집계) → 추가 CPU 상한
+- 카나리: match_id 해시 구간으로 canary_pct% 경기는 후보가 응답 (같은 경기는 항상 같은 쪽)
+- 버전별 온라인 지표: 채점 지연(ms) 평균 / p95, 결과 정산 시 log-loss / Brier / 적중률
+- 섀도 로그는 경기당 1행 (현재·후보 확률 소수 4자리)으로 모아 BigQuery shadow_predictions 에 일괄 적재
+"""
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_LABELS = ("HOME", "DRAW", "AWAY")   # 확률 행렬 열 순서
+MAX_PENDING = int(os.getenv("SHADOW_MAX_PENDING", "2"))
+PENDING_MATCHES = 5000                      # 결과 대기 중인 경기 (오래된 것부터 버림)
+LATENCY_WINDOW = 200
+FLUSH_ROWS = 50
+
+
+def canary_bucket(match_id: str) -> float:
+    """match_id → [0, 100) 고정 구간 (canary_pct 와 비교)."""
+    return (zlib.crc32(match_id.encode("utf-8")) % 10000) / 100
+
+
+class VersionMetrics:
+    def __init__(self):
+        self.batches = 0
+        self.scored = 0
+        self.settled = 0
+        self.correct = 0
+        self.log_loss = 0.0
+        self.brier = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def summary(self) -> Dict:
+        latencies = np.fromiter(self.latencies, dtype=np.float64)
+        return {
+            "batches": self.batches,
+            "scored": self.scored,
+            "settled": self.settled,
+            "log_loss": round(self.log_loss / self.settled, 4) if self.settled else None,
+            "brier": round(self.brier / self.settled, 4) if self.settled else None,
+            "accuracy_pct": round(self.correct / self.settled * 100, 1) if self.settled else None,
+            "latency_ms_avg": round(float(latencies.mean()), 2) if latencies.size else None,
+            "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2) if latencies.size else None,
+        }
+
+
+class ShadowEvaluator:
+    def __init__(self, max_pending: int = MAX_PENDING, executor: Optional[ThreadPoolExecutor] = None):
+        self.max_pending = max_pending
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-score")
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._metrics: Dict[str, VersionMetrics] = {}
+        self._pending: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()
+        self._log: List[Dict] = []
+        self.shadow_batches = 0
+        self.dropped = 0
+
+    def record(self, version: str, match_ids: Sequence[str], probs: np.ndarray, elapsed_ms: float):
+        """버전 1개의 배치 채점 결과 — 지연 기록 + 결과 대기 목록에 확률 보관."""
+        with self._lock:
+            metrics = self._metrics.setdefault(version, VersionMetrics())
+            metrics.batches += 1
+            metrics.scored += len(match_ids)
+            metrics.latencies.append(elapsed_ms)
+            for match_id, row in zip(match_ids, probs):
+                self._pending.setdefault(match_id, {})[version] = row
+                self._pending.move_to_end(match_id)
+            while len(self._pending) > PENDING_MATCHES:
+                self._pending.popitem(last=False)
+
+    def log(self, match_ids: Sequence[str], live_version: str, live: np.ndarray, live_ms: float,
+            shadow_version: str, shadow: np.ndarray, shadow_ms: float, canary: bool = False):
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "match_id": match_id,
+                "live_version": live_version,
+                "live_home": round(float(lp[0]), 4),
+                "live_draw": round(float(lp[1]), 4),
+                "live_away": round(float(lp[2]), 4),
+                "shadow_version": shadow_version,
+                "shadow_home": round(float(sp[0]), 4),
+                "shadow_draw": round(float(sp[1]), 4),
+                "shadow_away": round(float(sp[2]), 4),
+                "live_ms": round(live_ms, 2),
+                "shadow_ms": round(shadow_ms, 2),
+                "canary": canary,
+                "predicted_at": now,
+            }
+            for match_id, lp, sp in zip(match_ids, live, shadow)
+        ]
+        with self._lock:
+            self._log.extend(rows)
+
+    def submit(self, shadow_version: str, score: Callable[[], np.ndarray], match_ids: Sequence[str],
+               live_version: str, live: np.ndarray, live_ms: float) -> Optional[Future]:
+        """후보 채점을 백그라운드로 — 대기 배치가 가득 차 있으면 건너뜀 (None)."""
+        with self._lock:
+            if self._inflight >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._inflight += 1
+        return self._executor.submit(self._run, shadow_version, score, list(match_ids), live_version, live, live_ms)
+
+    def _run(self, shadow_version, score, match_ids, live_version, live, live_ms):
+        try:
+            started = time.perf_counter()
+            probs = score()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.record(shadow_version, match_ids, probs, elapsed_ms)
+            self.log(match_ids, live_version, live, live_ms, shadow_version, probs, elapsed_ms)
+            with self._lock:
+                self.shadow_batches += 1
+        except Exception as e:
+            logger.warning(f"Shadow scoring failed ({shadow_version}): {e}")
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    def record_outcomes(self, results: Dict[str, str]) -> int:
+        """정산 결과 {match_id: HOME/DRAW/AWAY} → 해당 경기를 채점한 모든 버전의 log-loss / Brier 누적."""
+        settled = 0
+        with self._lock:
+            for match_id, actual in results.items():
+                if actual not in OUTPUT_LABELS or match_id not in self._pending:
+                    continue
+                idx = OUTPUT_LABELS.index(actual)
+                onehot = np.zeros(len(OUTPUT_LABELS))
+                onehot[idx] = 1.0
+                for version, probs in self._pending.pop(match_id).items():
+                    metrics = self._metrics.setdefault(version, VersionMetrics())
+                    metrics.settled += 1
+                    metrics.correct += int(np.argmax(probs) == idx)
+                    metrics.log_loss += -math.log(max(float(probs[idx]), 1e-10))
+                    metrics.brier += float(np.sum((probs - onehot) ** 2))
+                settled += 1
+        return settled
+
+    def take_log(self, min_rows: int = FLUSH_ROWS) -> List[Dict]:
+        """적재할 섀도 로그 (min_rows 미만이면 빈 목록, 계속 모음)."""
+        with self._lock:
+            if len(self._log) < max(1, min_rows):
+                return []
+            rows, self._log = self._log, []
+            return rows
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "versions": {version: m.summary() for version, m in self._metrics.items()},
+                "shadow_batches": self.shadow_batches,
+                "dropped_batches": self.dropped,
+                "inflight": self._inflight,
+                "max_pending": self.max_pending,
+                "awaiting_results": len(self._pending),
+                "unflushed_log_rows": len(self._log),
+            }
+
+
+shadow_evaluator = ShadowEvaluator()
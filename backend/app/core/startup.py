@@ -0,0 +1,295 @@
+"""
+Startup — 콜드 스타트 단축용 지연 로딩 + 시작 프로파일.
+
+512 MiB Cloud Run 인스턴스에서 모든 라우터(→ lightgbm/pandas/firebase/Google 클라이언트)를 import 시점에
+올리고 Firestore 설정을 동기로 읽으면 첫 응답까지 수 초가 걸림.
+
+- 설정 로드: load_config_to_env 를 별도 스레드에서 시작 → 나머지 import 와 겹침, startup 에서 완료 대기
+- 지연 라우터: 경로 prefix 별 라우터 모듈을 첫 요청 시 import + include (이후 백그라운드 워밍)
+- 프로파일: 모듈별 import 시간(inclusive/self) + 시작 단계별 시간 → /api/admin/startup_profile
+
+LAZY_STARTUP=0 이면 기존처럼 모든 라우터를 import 시점에 등록.
+STARTUP_PROFILE=0 이면 import 타이머 비활성화.
+"""
+import asyncio
+import importlib
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LAZY_STARTUP = os.getenv("LAZY_STARTUP", "1") != "0"
+PROFILE_IMPORTS = os.getenv("STARTUP_PROFILE", "1") != "0"
+IMPORT_RECORD_MIN_SEC = 0.002
+IMPORT_RECORD_MAX = 2000
+
+
+# ─────────────────────────────────────────────
+# PROFILE
+# ─────────────────────────────────────────────
+
+class StartupProfile:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.started_wall = time.time()
+        self.phases: List[Dict] = []
+        self.imports: Dict[str, Dict] = {}
+        self.routers: List[Dict] = []
+        self.ready_sec: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append({"phase": name, "start_sec": round(start, 4),
+                                    "duration_sec": round(self.elapsed() - start, 4),
+                                    "thread": threading.current_thread().name})
+
+    def record_import(self, module: str, inclusive: float, self_time: float):
+        with self._lock:
+            if module in self.imports or len(self.imports) >= IMPORT_RECORD_MAX:
+                return
+            self.imports[module] = {"module": module, "inclusive_sec": round(inclusive, 4),
+                                    "self_sec": round(self_time, 4), "at_sec": round(self.elapsed(), 3)}
+
+    def record_router(self, module: str, prefix: str, seconds: float, trigger: str):
+        with self._lock:
+            self.routers.append({"module": module, "prefix": prefix, "import_sec": round(seconds, 4),
+                                 "at_sec": round(self.elapsed(), 3), "trigger": trigger})
+
+    def mark_ready(self):
+        if self.ready_sec is None:
+            self.ready_sec = round(self.elapsed(), 4)
+
+    def snapshot(self, top: int = 40) -> Dict:
+        with self._lock:
+            imports = sorted(self.imports.values(), key=lambda r: -r["inclusive_sec"])
+            by_self = sorted(self.imports.values(), key=lambda r: -r["self_sec"])
+            return {
+                "lazy_startup": LAZY_STARTUP,
+                "import_profiling": PROFILE_IMPORTS,
+                "process_started_at": self.started_wall,
+                "ready_sec": self.ready_sec,
+                "uptime_sec": round(self.elapsed(), 1),
+                "phases": list(self.phases),
+                "routers": list(self.routers),
+                "imports_recorded": len(imports),
+                "top_imports_inclusive": imports[:top],
+                "top_imports_self": by_self[:top],
+            }
+
+
+profile = StartupProfile()
+
+
+class _TimedLoader:
+    """원래 loader 의 exec_module 시간 측정 후 spec/모듈의 loader 를 원래 것으로 복원 (pkg_resources 등 호환)."""
+
+    def __init__(self, timer: "_ImportTimer", loader):
+        self._timer = timer
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        spec = getattr(module, "__spec__", None)
+        if spec is not None:
+            spec.loader = self._loader
+        try:
+            module.__loader__ = self._loader
+        except Exception:
+            pass
+        stack = self._timer.stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            inclusive = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += inclusive
+            if inclusive >= IMPORT_RECORD_MIN_SEC:
+                profile.record_import(module.__name__, inclusive, inclusive - children)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """sys.meta_path 선두에서 다른 finder 의 spec 을 받아 loader 만 감쌈."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def stack(self) -> List[float]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(self, spec.loader)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+
+_import_timer: Optional[_ImportTimer] = None
+
+
+def install_import_timer():
+    global _import_timer
+    if PROFILE_IMPORTS and _import_timer is None:
+        _import_timer = _ImportTimer()
+        sys.meta_path.insert(0, _import_timer)
+
+
+# ─────────────────────────────────────────────
+# ASYNC CONFIG LOAD
+# ─────────────────────────────────────────────
+
+_config_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-load")
+_config_future: Optional[Future] = None
+
+
+def _load_config() -> int:
+    with profile.phase("firestore_config_load"):
+        try:
+            from app.models.config_db import load_config_to_env
+            loaded = load_config_to_env()
+            if loaded:
+                print(f"Firestore load complete: {loaded} keys")
+            return loaded
+        except Exception as e:
+            print(f"Firestore config load skipped: {e}")
+            return 0
+
+
+def start_config_load() -> Future:
+    """Firestore 설정 로드를 백그라운드 스레드에서 시작 (1회)."""
+    global _config_future
+    if _config_future is None:
+        _config_future = _config_executor.submit(_load_config)
+    return _config_future
+
+
+async def wait_config() -> int:
+    """설정 로드 완료 대기 — 환경변수를 import 시점에 읽는 모듈을 올리기 전에 호출."""
+    return await asyncio.wrap_future(start_config_load())
+
+
+def wait_config_sync() -> int:
+    return start_config_load().result()
+
+
+# ─────────────────────────────────────────────
+# LAZY ROUTERS
+# ─────────────────────────────────────────────
+
+@dataclass
+class LazyRouter:
+    module: str
+    prefix: str
+    tags: List[str] = field(default_factory=list)
+    loaded: bool = False
+
+
+class LazyRouterRegistry:
+    """
+    prefix → 라우터 모듈 등록부. 요청 경로가 prefix 에 걸리면 그때 import + include_router.
+    /docs, /openapi.json 요청 시 전체 로드.
+    """
+    FULL_LOAD_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+    def __init__(self, app):
+        self.app = app
+        self.entries: List[LazyRouter] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._sync_lock = threading.Lock()
+
+    def add(self, module: str, prefix: str, tags: Optional[List[str]] = None):
+        self.entries.append(LazyRouter(module=module, prefix=prefix, tags=tags or []))
+
+    @property
+    def pending(self) -> List[LazyRouter]:
+        return [e for e in self.entries if not e.loaded]
+
+    def match(self, path: str) -> List[LazyRouter]:
+        if path.startswith(self.FULL_LOAD_PATHS):
+            return self.pending
+        return [e for e in self.pending if path == e.prefix or path.startswith(e.prefix + "/")]
+
+    def _include(self, entry: LazyRouter, module, seconds: float, trigger: str):
+        with self._sync_lock:
+            if entry.loaded:
+                return
+            self.app.include_router(module.router, prefix=entry.prefix, tags=entry.tags)
+            self.app.openapi_schema = None
+            entry.loaded = True
+        profile.record_router(entry.module, entry.prefix, seconds, trigger)
+
+    async def load(self, entry: LazyRouter, trigger: str = "request"):
+        if entry.loaded:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if entry.loaded:
+                return
+            await wait_config()
+            start = time.perf_counter()
+            module = await asyncio.to_thread(importlib.import_module, entry.module)
+            self._include(entry, module, time.perf_counter() - start, trigger)
+
+    async def ensure_for_path(self, path: str):
+        for entry in self.match(path):
+            await self.load(entry, trigger=path)
+
+    def load_all_sync(self, trigger: str = "eager"):
+        wait_config_sync()
+        for entry in self.pending:
+            start = time.perf_counter()
+            module = importlib.import_module(entry.module)
+            self._include(entry, module, time.perf_counter() - start, trigger)
+
+    async def warm(self, delay: float = 0.0):
+        """첫 응답 이후 나머지 라우터를 하나씩 미리 로드 (요청 경로의 지연 최소화)."""
+        await asyncio.sleep(delay)
+        with profile.phase("router_warmup"):
+            for entry in self.pending:
+                try:
+                    await self.load(entry, trigger="warmup")
+                except Exception as e:
+                    logger.warning(f"[Startup] router warmup failed for {entry.module}: {e}")
+                await asyncio.sleep(0)
+
+    def stats(self) -> Dict:
+        return {"registered": len(self.entries), "loaded": [e.prefix for e in self.entries if e.loaded],
+                "pending": [e.prefix for e in self.pending]}
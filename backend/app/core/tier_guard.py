@@ -6,7 +6,7 @@ Tier 강제 적용 미들웨어 (Backend)
 """
 from fastapi import Depends, HTTPException, status
 from app.core.deps import require_current_user
-from app.models.user_db import get_user_by_id
+from app.core.user_cache import user_cache
 from datetime import datetime
 
 TIER_ORDER = {"free": 0, "basic": 1, "pro": 2, "vip": 3, "premium": 3}
@@ -14,7 +14,15 @@ TIER_ORDER = {"free": 0, "basic": 1, "pro": 2, "vip": 3, "premium": 3}
 
 async def _get_user_tier(user_id: str) -> str:
     """유저의 현재 Tier 확인 (구독 만료도 체크)"""
-    user = await get_user_by_id(user_id)
+    tier = await _lookup_user_tier(user_id)
+    # 미들웨어 rate limit 이 DB 조회 없이 Tier 별 한도를 쓰도록 기록
+    from app.core.rate_limit import rate_limiter
+    rate_limiter.remember_tier(user_id, tier)
+    return tier
+
+
+async def _lookup_user_tier(user_id: str) -> str:
+    user = await user_cache.get_user(user_id)
     if not user:
         return "free"
 
@@ -0,0 +1,138 @@
+"""
+요청 경로 유저 캐시 — JWT 디코드 메모이즈 + 짧은 TTL 프로필 캐시 + single-flight.
+
+VIP 엔드포인트는 요청마다 jwt.decode + users/{id} 문서 읽기를 반복했음
+(한 화면에서 병렬 호출 5~6건 → 같은 문서 5~6회 읽기).
+
+- 토큰 디코드 결과는 토큰 문자열 단위로 exp 까지 캐시 (검증 성공분만)
+- 프로필은 (sub, tv) 키로 USER_CACHE_TTL 초 캐시. tv = 토큰 버전 클레임 (없으면 0)
+- 같은 유저의 동시 조회는 한 번의 DB 읽기로 합침 (single-flight)
+- update_user / 결제 / 골드 트랜잭션 후 invalidate() — 세대(generation) 번호로
+  무효화 이전에 시작된 조회 결과가 캐시에 다시 들어가는 것을 막음
+- 무효화는 인스턴스 로컬. 다른 인스턴스는 TTL 만큼 늦게 반영됨
+  → 잔액처럼 정확해야 하는 읽기·수정 경로는 user_db.get_user_by_id 를 직접 사용
+"""
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.cache import TTLCache
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "5000"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "20000"))
+
+_NOT_FOUND = object()
+
+
+class UserCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL, maxsize: int = USER_CACHE_SIZE,
+                 token_maxsize: int = TOKEN_CACHE_SIZE, loader=None, clock=time.time):
+        self.profiles = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.tokens = TTLCache(maxsize=token_maxsize, ttl=3600.0)
+        # 세대 번호는 진행 중 조회보다 오래 살아 있으면 충분 (TTL 의 몇 배)
+        self._generations = TTLCache(maxsize=maxsize * 2, ttl=max(ttl * 4, 60.0))
+        self._versions = TTLCache(maxsize=maxsize * 2, ttl=max(ttl * 4, 60.0))
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._loader = loader
+        self.clock = clock
+        self.loads = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    # ── JWT ──
+
+    def decode_token(self, token: str) -> dict:
+        """jwt.decode 메모이즈. 실패(JWTError)는 캐시하지 않고 그대로 전파."""
+        payload = self.tokens.get(token)
+        if payload is not None:
+            if payload.get("exp") is None or payload["exp"] > self.clock():
+                return payload
+            self.tokens.pop(token)
+
+        from jose import jwt
+        from app.core.security import SECRET_KEY, ALGORITHM
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = payload.get("exp")
+        ttl = min(3600.0, exp - self.clock()) if exp is not None else 3600.0
+        if ttl > 0:
+            self.tokens.set(token, payload, ttl=ttl)
+        return payload
+
+    # ── 프로필 ──
+
+    async def _load(self, user_id: str) -> Optional[dict]:
+        if self._loader is not None:
+            return await self._loader(user_id)
+        from app.models.user_db import get_user_by_id
+        return await get_user_by_id(user_id)
+
+    async def get_user(self, user_id: str, token_version: int = 0) -> Optional[dict]:
+        """캐시된 유저 문서 (복사본). 없는 유저도 TTL 동안 음성 캐시."""
+        key = (user_id, int(token_version or 0))
+        cached = self.profiles.get(key)
+        if cached is not None:
+            return None if cached is _NOT_FOUND else dict(cached)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            user = await asyncio.shield(future)
+            return dict(user) if user else None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generations.get(user_id, 0)
+        try:
+            self.loads += 1
+            user = await self._load(user_id)
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if self._generations.get(user_id, 0) == generation:
+            self.profiles.set(key, user if user else _NOT_FOUND)
+            self._versions.set(user_id, self._versions.get(user_id, frozenset()) | {key[1]})
+        future.set_result(user)
+        return dict(user) if user else None
+
+    def invalidate(self, user_id: str):
+        """해당 유저의 모든 토큰 버전 캐시 제거 + 진행 중 조회 결과 캐시 금지."""
+        if not user_id:
+            return
+        self.invalidations += 1
+        self._generations.set(user_id, self._generations.get(user_id, 0) + 1)
+        for version in self._versions.pop(user_id, frozenset()) | {0}:
+            self.profiles.pop((user_id, version))
+
+    def clear(self):
+        self.profiles.clear()
+        self.tokens.clear()
+        self._versions.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "profiles": self.profiles.stats(),
+            "tokens": self.tokens.stats(),
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "inflight": len(self._inflight),
+        }
+
+
+user_cache = UserCache()
+
+
+async def get_user_from_token(token: str) -> Optional[dict]:
+    """토큰 → 유저 문서 (캐시 경유). 잘못된 토큰은 JWTError, sub 없으면 None."""
+    payload = user_cache.decode_token(token)
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    return await user_cache.get_user(user_id, payload.get("tv", 0))
@@ -1,32 +1,27 @@
 from dotenv import load_dotenv
 import os
 import asyncio
+import json
+import sys
 import logging
-import time
-from collections import defaultdict
+from typing import Optional
 
 # Load .env BEFORE any app module imports so os.getenv() works everywhere
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 env_path = os.path.join(BASE_DIR, ".env")
 load_dotenv(env_path)
 
+from app.core.startup import profile, install_import_timer, start_config_load, wait_config, LazyRouterRegistry, LAZY_STARTUP
+install_import_timer()
+
 # ── Firestore에서 API 키 자동 로드 (배포 시 환경변수 소실 방지) ──
-try:
-    from app.models.config_db import load_config_to_env
-    loaded = load_config_to_env()
-    if loaded:
-        print(f"Firestore load complete: {loaded} keys")
-except Exception as _e:
-    print(f"Firestore config load skipped: {_e}")
-
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from app.api.endpoints import admin, odds, auth, payments, portfolio, market, scheduler, analysis, community, prediction, combinator, ai_predictions, notifications, league, blogger, wordpress, gold
-from app.api.endpoints import vip_combo, vip_alerts, vip_portfolio, vip_market
-from app.api.endpoints import backtest
-from app.api.endpoints import marketing
-from app.api.endpoints import video
-from fastapi.middleware.cors import CORSMiddleware
+# 백그라운드 스레드에서 시작 → 아래 import 와 병렬, 라우터 로드/startup 전에 완료 대기
+start_config_load()
+
+with profile.phase("import_framework"):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+    from fastapi.middleware.cors import CORSMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -59,68 +54,72 @@ app.add_middleware(
 )
 
 
-# ─── Rate Limiting 미들웨어 (60 req/min per IP) ───
-class RateLimitStore:
-    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
-        self.max_requests = max_requests
-        self.window = window_seconds
-        self.requests: dict = defaultdict(list)
-
-    def is_allowed(self, client_ip: str) -> bool:
-        now = time.time()
-        # 오래된 요청 제거
-        self.requests[client_ip] = [t for t in self.requests[client_ip] if now - t < self.window]
-        if len(self.requests[client_ip]) >= self.max_requests:
-            return False
-        self.requests[client_ip].append(now)
-        return True
-
-_rate_limiter = RateLimitStore(max_requests=60, window_seconds=60)
+# ─── Rate Limiting 미들웨어 (GCRA, 경로/Tier 별 한도 — app/core/rate_limit.py) ───
+from app.core.rate_limit import rate_limiter
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host if request.client else "unknown"
-    if not _rate_limiter.is_allowed(client_ip):
+    decision = await rate_limiter.check_request(request)
+    if decision is not None and not decision.allowed:
         return JSONResponse(
             status_code=429,
-            content={"detail": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요. (60 req/min)"},
+            content={"detail": f"요청이 너무 많습니다. 잠시 후 다시 시도해주세요. ({decision.limit.label})"},
+            headers=decision.headers(),
         )
     response = await call_next(request)
+    if decision is not None:
+        response.headers.update(decision.headers())
     return response
 
 # Include Routers
-app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+# odds 는 "/api" 전체 prefix 라 즉시 등록, 나머지는 첫 요청 시 import (LAZY_STARTUP=0 이면 즉시 전체 등록)
+with profile.phase("import_odds_router"):
+    from app.api.endpoints import odds
 app.include_router(odds.router, prefix="/api", tags=["odds"])
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-# app.include_router(payments.router, prefix="/api/payments", tags=["payments"])
-app.include_router(gold.router, prefix="/api/gold", tags=["gold"])
-app.include_router(portfolio.router, prefix="/api/portfolio", tags=["portfolio"])
-app.include_router(market.router, prefix="/api/market", tags=["market"])
-app.include_router(scheduler.router, prefix="/api/scheduler", tags=["scheduler"])
-app.include_router(analysis.router, prefix="/api/analysis", tags=["analysis"])
-app.include_router(community.router, prefix="/api/community", tags=["community"])
-app.include_router(prediction.router, prefix="/api/prediction", tags=["prediction"])
-app.include_router(combinator.router, prefix="/api/combinator", tags=["combinator"])
-app.include_router(ai_predictions.router, prefix="/api/ai", tags=["ai"])
-app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
-app.include_router(league.router, prefix="/api/league", tags=["league"])
+
+lazy_routers = LazyRouterRegistry(app)
+lazy_routers.add("app.api.endpoints.admin", "/api/admin", ["admin"])
+lazy_routers.add("app.api.endpoints.auth", "/api/auth", ["auth"])
+# lazy_routers.add("app.api.endpoints.payments", "/api/payments", ["payments"])
+lazy_routers.add("app.api.endpoints.gold", "/api/gold", ["gold"])
+lazy_routers.add("app.api.endpoints.portfolio", "/api/portfolio", ["portfolio"])
+lazy_routers.add("app.api.endpoints.market", "/api/market", ["market"])
+lazy_routers.add("app.api.endpoints.scheduler", "/api/scheduler", ["scheduler"])
+lazy_routers.add("app.api.endpoints.analysis", "/api/analysis", ["analysis"])
+lazy_routers.add("app.api.endpoints.community", "/api/community", ["community"])
+lazy_routers.add("app.api.endpoints.prediction", "/api/prediction", ["prediction"])
+lazy_routers.add("app.api.endpoints.combinator", "/api/combinator", ["combinator"])
+lazy_routers.add("app.api.endpoints.ai_predictions", "/api/ai", ["ai"])
+lazy_routers.add("app.api.endpoints.notifications", "/api/notifications", ["notifications"])
+lazy_routers.add("app.api.endpoints.league", "/api/league", ["league"])
 
 # VIP Endpoints
-app.include_router(vip_combo.router, prefix="/api/vip/combo", tags=["vip-combo"])
-app.include_router(vip_alerts.router, prefix="/api/vip/alerts", tags=["vip-alerts"])
-app.include_router(vip_portfolio.router, prefix="/api/vip/portfolio", tags=["vip-portfolio"])
-app.include_router(vip_market.router, prefix="/api/vip/market", tags=["vip-market"])
+lazy_routers.add("app.api.endpoints.vip_combo", "/api/vip/combo", ["vip-combo"])
+lazy_routers.add("app.api.endpoints.vip_alerts", "/api/vip/alerts", ["vip-alerts"])
+lazy_routers.add("app.api.endpoints.vip_portfolio", "/api/vip/portfolio", ["vip-portfolio"])
+lazy_routers.add("app.api.endpoints.vip_market", "/api/vip/market", ["vip-market"])
 
 # Backtest Insights
-app.include_router(backtest.router, prefix="/api/backtest", tags=["backtest"])
+lazy_routers.add("app.api.endpoints.backtest", "/api/backtest", ["backtest"])
 
 # Marketing (Buffer SNS, Blogger, WordPress)
-app.include_router(marketing.router, prefix="/api/marketing", tags=["marketing"])
-app.include_router(blogger.router, prefix="/api/blogger", tags=["blogger"])
-app.include_router(wordpress.router, prefix="/api/wordpress", tags=["wordpress"])
+lazy_routers.add("app.api.endpoints.marketing", "/api/marketing", ["marketing"])
+lazy_routers.add("app.api.endpoints.blogger", "/api/blogger", ["blogger"])
+lazy_routers.add("app.api.endpoints.wordpress", "/api/wordpress", ["wordpress"])
 
 # Video Auto-Generation
-app.include_router(video.router, prefix="/api/video", tags=["video"])
+lazy_routers.add("app.api.endpoints.video", "/api/video", ["video"])
+
+if not LAZY_STARTUP:
+    with profile.phase("import_all_routers"):
+        lazy_routers.load_all_sync()
+
+
+@app.middleware("http")
+async def lazy_router_middleware(request: Request, call_next):
+    if lazy_routers.pending:
+        await lazy_routers.ensure_for_path(request.url.path)
+    return await call_next(request)
 
 
 async def _auto_collect_stats():
@@ -129,15 +128,14 @@ async def _auto_collect_stats():
     logger.info("🔄 자동 데이터 수집 시작...")
     import time as _t
 
-    from app.models.bets_db import save_stats_cache, load_stats_cache
-
     # ── STEP 1: 배당 데이터 최우선 수집 ──
     t0 = _t.time()
     from app.services.pinnacle_api import pinnacle_service
     if pinnacle_service.api_key:
+        # 현재 슬롯을 다른 인스턴스가 이미 갱신했으면 건너뜀 (market_cache 공유)
         try:
-            odds = await pinnacle_service.refresh_odds()
-            logger.info(f"  ✅ API-Football Odds: {len(odds)} matches ({_t.time()-t0:.1f}s)")
+            record = await job_scheduler.run_if_due("odds_refresh")
+            logger.info(f"  ✅ API-Football Odds: {record['result'] if record else 'fresh in shared cache'} ({_t.time()-t0:.1f}s)")
         except Exception as e:
             logger.warning(f"  ⚠️ API-Football Odds error ({_t.time()-t0:.1f}s): {e}")
     else:
@@ -147,360 +145,281 @@ async def _auto_collect_stats():
 
     # ── STEP 2: AI 서비스 초기화 (별도 스레드 — event loop 차단 방지) ──
     t1 = _t.time()
+    from app.api.endpoints import ai_predictions
     try:
         await asyncio.to_thread(ai_predictions._ensure_services)
+        # 확률 보정 맵 — 요청 경로에서 GCS 를 기다리지 않도록 여기서 미리 로드
+        from app.core.calibration import probability_calibrator
+        await probability_calibrator.load()
         logger.info(f"  ✅ AI 서비스 초기화 완료 ({_t.time()-t1:.1f}s)")
     except Exception as e:
         logger.warning(f"  ⚠️ AI 서비스 초기화 실패 ({_t.time()-t1:.1f}s): {e}")
         return
 
-    from app.schemas.predictions import TeamStats
-    football_stats = ai_predictions.football_stats
-    league_standings = ai_predictions.league_standings
-    ai_predictor = ai_predictions.ai_predictor
-
     # ── STEP 3: Firestore 캐시 복원 ──
     t2 = _t.time()
     try:
-        cached = await load_stats_cache("ai_stats_snapshot")
-        if cached and ai_predictor:
-            standings_parsed = {}
-            for league, teams in cached.get("standings", {}).items():
-                standings_parsed[league] = [TeamStats(**t) for t in teams]
-            ai_predictor.update_data(
-                standings=standings_parsed or None,
-                injuries=cached.get("injuries", {}) or None,
-                api_predictions=cached.get("predictions", []) or None,
-                h2h=cached.get("h2h", {}) or None,
-            )
-            logger.info(f"  ✅ Firestore 캐시 복원 ({len(cached.get('standings', {}))} leagues, {_t.time()-t2:.1f}s)")
+        if await _sync_stats_snapshot():
+            logger.info(f"  ✅ Firestore 캐시 복원 ({_t.time()-t2:.1f}s)")
         else:
             logger.info(f"  📦 Firestore 캐시 없음 ({_t.time()-t2:.1f}s)")
     except Exception as e:
         logger.warning(f"  ⚠️ 캐시 복원 실패 ({_t.time()-t2:.1f}s): {e}")
 
-    # ── STEP 4: 외부 API 순위/통계 수집 ──
-    all_stats = {"standings": {}, "injuries": {}, "predictions": [], "h2h": {}}
-
-    # football-data.org
+    # ── STEP 4: 외부 API 순위/통계 수집 — 현재 슬롯을 다른 인스턴스가 이미 수집했으면 건너뜀 ──
     t3 = _t.time()
     try:
-        if league_standings:
-            standings_data = await league_standings.collect_all()
-            all_stats["standings"].update({
-                k: [t if isinstance(t, dict) else t.model_dump() for t in v]
-                for k, v in standings_data.items()
-            })
-            if ai_predictor:
-                for league, teams in standings_data.items():
-                    if league not in ai_predictor._standings_cache:
-                        team_list = [TeamStats(**t) if isinstance(t, dict) else t for t in teams]
-                        ai_predictor._standings_cache[league] = team_list
-            logger.info(f"  ✅ football-data.org: {len(standings_data)} leagues ({_t.time()-t3:.1f}s)")
+        record = await job_scheduler.run_if_due("stats_collection")
+        logger.info(f"  ✅ Stats: {record['result'] if record else 'fresh in shared cache'} ({_t.time()-t3:.1f}s)")
     except Exception as e:
-        logger.warning(f"  ⚠️ football-data.org error ({_t.time()-t3:.1f}s): {e}")
+        logger.warning(f"  ⚠️ Stats collection error ({_t.time()-t3:.1f}s): {e}")
 
-    # API-Football (일일 100건 제한)
-    t4 = _t.time()
-    try:
-        if football_stats:
-            fb_data = await football_stats.collect_all()
-            standings_parsed = {}
-            for league, teams in fb_data.get("standings", {}).items():
-                standings_parsed[league] = [TeamStats(**t) for t in teams]
-                all_stats["standings"][league] = teams
-            all_stats["injuries"] = fb_data.get("injuries", {})
-            all_stats["predictions"] = fb_data.get("predictions", [])
-            all_stats["h2h"] = fb_data.get("h2h", {})
-            if ai_predictor:
-                ai_predictor.update_data(
-                    standings=standings_parsed if standings_parsed else None,
-                    injuries=fb_data.get("injuries", {}) or None,
-                    api_predictions=fb_data.get("predictions", []) or None,
-                    h2h=fb_data.get("h2h", {}) or None,
-                )
-            logger.info(f"  ✅ API-Football: {football_stats._daily_requests} requests ({_t.time()-t4:.1f}s)")
-    except Exception as e:
-        logger.warning(f"  ⚠️ API-Football error ({_t.time()-t4:.1f}s): {e}")
+    logger.info(f"✅ 자동 데이터 수집 완료 (총 {_t.time()-t0:.1f}s) — AI 예측 준비됨")
 
-    # ── STEP 5: Firestore에 수집된 데이터 저장 ──
-    try:
-        if all_stats.get("standings") or all_stats.get("injuries") or all_stats.get("h2h"):
-            await save_stats_cache("ai_stats_snapshot", all_stats)
-            logger.info("  💾 Firestore 캐시 저장 완료")
-    except Exception as e:
-        logger.warning(f"  ⚠️ Firestore 캐시 저장 실패: {e}")
 
-    logger.info(f"✅ 자동 데이터 수집 완료 (총 {_t.time()-t0:.1f}s) — AI 예측 준비됨")
+STATS_SYNC_INTERVAL = float(os.getenv("STATS_SYNC_INTERVAL", str(30 * 60)))
+_stats_snapshot_applied: Optional[str] = None
 
 
-async def _periodic_odds_refresh():
-    """30분마다 API-Football에서 배당 데이터 자동 갱신"""
-    from app.services.pinnacle_api import pinnacle_service
-    await asyncio.sleep(60)  # 시작 후 1분 대기 (첫 수집과 겹치지 않도록)
+async def _sync_stats_snapshot() -> bool:
+    """공유 통계 스냅샷(ai_stats_snapshot)이 마지막 적용분과 다르면 AI 예측기에 반영. 적용 여부 반환."""
+    global _stats_snapshot_applied
+    import hashlib
+    from app.api.endpoints import ai_predictions
+    from app.models.bets_db import load_stats_cache
+    from app.schemas.predictions import TeamStats
 
+    ai_predictor = ai_predictions.ai_predictor
+    if not ai_predictor:
+        return False
+    cached = await load_stats_cache("ai_stats_snapshot")
+    if not cached:
+        return False
+    digest = hashlib.sha256(json.dumps(cached, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    if digest == _stats_snapshot_applied:
+        return False
+    standings_parsed = {league: [TeamStats(**t) for t in teams]
+                        for league, teams in cached.get("standings", {}).items()}
+    ai_predictor.update_data(
+        standings=standings_parsed or None,
+        injuries=cached.get("injuries", {}) or None,
+        api_predictions=cached.get("predictions", []) or None,
+        h2h=cached.get("h2h", {}) or None,
+    )
+    _stats_snapshot_applied = digest
+    logger.info(f"📦 [Stats-Sync] snapshot applied ({len(standings_parsed)} leagues)")
+    return True
+
+
+async def _stats_snapshot_loop():
+    """모든 인스턴스 — 통계 수집은 lease 보유 인스턴스만 하므로 나머지는 공유 스냅샷을 주기적으로 다시 읽음."""
     while True:
+        await asyncio.sleep(STATS_SYNC_INTERVAL)
         try:
-            await asyncio.sleep(4 * 3600)  # 4시간 간격 (무료 플랜 쿼타 보호)
-            if pinnacle_service.api_key:
-                odds = await pinnacle_service.refresh_odds()
-                logger.info(f"🔄 [Auto-Refresh] Pinnacle/The-Odds-Api: {len(odds)} matches updated")
-            else:
-                logger.debug("[Auto-Refresh] Skipping — no API key")
+            await _sync_stats_snapshot()
         except Exception as e:
-            logger.warning(f"[Auto-Refresh] Error: {e}")
+            logger.warning(f"[Stats-Sync] snapshot reload failed: {e}")
 
 
-async def _periodic_settlement():
-    """30분마다 투표 자동 정산 (경기 종료 감지 → 승/패 판정)"""
-    await asyncio.sleep(120)  # 시작 후 2분 대기 (데이터 수집 완료 후)
+async def _job_odds_refresh():
+    """API-Football 배당 데이터 갱신 (4시간 간격 — 무료 플랜 쿼타 보호)"""
+    from app.services.pinnacle_api import pinnacle_service
+    if not pinnacle_service.api_key:
+        logger.debug("[Auto-Refresh] Skipping — no API key")
+        return {"skipped": "no API key"}
+    odds = await pinnacle_service.refresh_odds()
+    logger.info(f"🔄 [Auto-Refresh] Pinnacle/The-Odds-Api: {len(odds)} matches updated")
+    return {"matches": len(odds)}
 
-    while True:
-        try:
-            from app.services.settlement import auto_settle_predictions
-            result = await auto_settle_predictions()
-            logger.info(f"📊 [Auto-Settlement] {result}")
-        except Exception as e:
-            logger.warning(f"[Auto-Settlement] Error: {e}")
 
-        await asyncio.sleep(30 * 60)  # 30분 간격
+async def _job_settlement():
+    """투표 자동 정산 (경기 종료 감지 → 승/패 판정)"""
+    from app.services.settlement import auto_settle_predictions
+    result = await auto_settle_predictions()
+    logger.info(f"📊 [Auto-Settlement] {result}")
+    return result
 
 
-async def _periodic_stats_collection():
-    """12시간마다 순위/부상/H2H 자동 수집 (09:00, 21:00 KST 동기화)"""
-    from datetime import timezone, timedelta
-    KST = timezone(timedelta(hours=9))
-    await asyncio.sleep(5 * 60)  # 첫 수집(_auto_collect_stats)과 겹치지 않도록 5분 대기
+async def _job_stats_collection():
+    """순위/부상/H2H 수집 (09:00, 21:00 KST)"""
+    logger.info("🔄 [Stats-Scheduler] Starting periodic stats collection...")
+    import time as _t
+    from app.api.endpoints import ai_predictions
+    t0 = _t.time()
 
-    while True:
-        try:
-            now_kst = __import__("datetime").datetime.now(KST)
-            # 다음 09:00 또는 21:00까지 대기 시간 계산
-            target_hours = [9, 21]
-            next_runs = []
-            for h in target_hours:
-                target = now_kst.replace(hour=h, minute=0, second=0, microsecond=0)
-                if target <= now_kst:
-                    target += timedelta(days=1)
-                next_runs.append(target)
-            next_run = min(next_runs)
-            wait_seconds = (next_run - now_kst).total_seconds()
-            logger.info(f"📅 [Stats-Scheduler] Next collection at {next_run.strftime('%H:%M KST')} (in {wait_seconds/3600:.1f}h)")
-            await asyncio.sleep(wait_seconds)
-
-            # 실행
-            logger.info("🔄 [Stats-Scheduler] Starting periodic stats collection...")
-            import time as _t
-            t0 = _t.time()
-
-            try:
-                await asyncio.to_thread(ai_predictions._ensure_services)
-            except Exception:
-                pass
-
-            football_stats = ai_predictions.football_stats
-            ai_predictor = ai_predictions.ai_predictor
-
-            if football_stats:
-                from app.schemas.predictions import TeamStats
-                from app.models.bets_db import save_stats_cache
-                fb_data = await football_stats.collect_all()
-                standings_parsed = {}
-                for league, teams in fb_data.get("standings", {}).items():
-                    standings_parsed[league] = [TeamStats(**t) for t in teams]
-                if ai_predictor:
-                    ai_predictor.update_data(
-                        standings=standings_parsed if standings_parsed else None,
-                        injuries=fb_data.get("injuries", {}) or None,
-                        api_predictions=fb_data.get("predictions", []) or None,
-                        h2h=fb_data.get("h2h", {}) or None,
-                    )
-                # Firestore 캐시 저장
-                try:
-                    all_stats = {
-                        "standings": {k: [t if isinstance(t, dict) else t.model_dump() for t in v]
-                                      for k, v in fb_data.get("standings", {}).items()},
-                        "injuries": fb_data.get("injuries", {}),
-                        "predictions": fb_data.get("predictions", []),
-                        "h2h": fb_data.get("h2h", {}),
-                    }
-                    await save_stats_cache("ai_stats_snapshot", all_stats)
-                except Exception as e:
-                    logger.warning(f"  ⚠️ Stats cache save failed: {e}")
-                logger.info(f"✅ [Stats-Scheduler] Collection done: {football_stats._daily_requests} API calls ({_t.time()-t0:.1f}s)")
-            else:
-                logger.warning("[Stats-Scheduler] football_stats not initialized")
-        except Exception as e:
-            logger.error(f"[Stats-Scheduler] Error: {e}")
-            await asyncio.sleep(60)  # 에러 시 1분 후 재시도
+    try:
+        await asyncio.to_thread(ai_predictions._ensure_services)
+    except Exception:
+        pass
 
+    football_stats = ai_predictions.football_stats
+    league_standings = ai_predictions.league_standings
+    ai_predictor = ai_predictions.ai_predictor
 
-async def _periodic_nightly_retrain():
-    """매일 03:00 KST에 ML 모델 재학습 + 예측 결과 정산"""
-    from datetime import timezone, timedelta
-    KST = timezone(timedelta(hours=9))
-    await asyncio.sleep(10 * 60)  # 시작 10분 대기
+    if not football_stats:
+        logger.warning("[Stats-Scheduler] football_stats not initialized")
+        return {"skipped": "football_stats not initialized"}
 
-    while True:
-        try:
-            now_kst = __import__("datetime").datetime.now(KST)
-            # 다음 03:00 KST까지 대기
-            target = now_kst.replace(hour=3, minute=0, second=0, microsecond=0)
-            if target <= now_kst:
-                target += timedelta(days=1)
-            wait_seconds = (target - now_kst).total_seconds()
-            logger.info(f"🌙 [Nightly] Next retrain at 03:00 KST (in {wait_seconds/3600:.1f}h)")
-            await asyncio.sleep(wait_seconds)
-
-            # 1. 자동 정산 (경기 결과 확인)
-            logger.info("🌙 [Nightly] Step 1: Auto-settlement...")
-            try:
-                from app.services.settlement import auto_settle_slips
-                settle_result = await auto_settle_slips()
-                logger.info(f"  ✅ Settlement: {settle_result}")
-            except Exception as e:
-                logger.warning(f"  ⚠️ Settlement error: {e}")
-
-            # 2. AI 예측 채점
-            logger.info("🌙 [Nightly] Step 2: Grading AI predictions...")
-            try:
-                from app.api.endpoints.ai_predictions import trigger_grade_predictions
-                grade_result = await trigger_grade_predictions()
-                logger.info(f"  ✅ Graded: {grade_result}")
-            except Exception as e:
-                logger.warning(f"  ⚠️ Grading error: {e}")
-
-            # 3. ML 재학습
-            logger.info("🌙 [Nightly] Step 3: ML retraining...")
-            try:
-                from app.services.self_learning import self_learning_pipeline
-                retrain_result = await self_learning_pipeline.run_nightly()
-                if retrain_result.get("model_updated"):
-                    from app.core.ml_predictor import ml_predictor
-                    ml_predictor.reload_model()
-                    logger.info("  ✅ ML model updated and reloaded")
-                else:
-                    logger.info(f"  ℹ️ Retrain result: {retrain_result}")
-            except Exception as e:
-                logger.warning(f"  ⚠️ Retrain error: {e}")
-
-            logger.info("✅ [Nightly] Pipeline complete")
-        except Exception as e:
-            logger.error(f"[Nightly] Error: {e}")
-            await asyncio.sleep(60)
+    from app.schemas.predictions import TeamStats
+    from app.models.bets_db import save_stats_cache
+
+    # football-data.org 순위 (API-Football 순위가 있는 리그는 덮어씀)
+    standings = {}
+    try:
+        if league_standings:
+            standings_data = await league_standings.collect_all()
+            standings.update({k: [t if isinstance(t, dict) else t.model_dump() for t in v]
+                              for k, v in standings_data.items()})
+    except Exception as e:
+        logger.warning(f"  ⚠️ football-data.org error: {e}")
+
+    fb_data = await football_stats.collect_all()
+    standings.update({k: [t if isinstance(t, dict) else t.model_dump() for t in v]
+                      for k, v in fb_data.get("standings", {}).items()})
+    standings_parsed = {}
+    for league, teams in standings.items():
+        standings_parsed[league] = [TeamStats(**t) for t in teams]
+    if ai_predictor:
+        ai_predictor.update_data(
+            standings=standings_parsed if standings_parsed else None,
+            injuries=fb_data.get("injuries", {}) or None,
+            api_predictions=fb_data.get("predictions", []) or None,
+            h2h=fb_data.get("h2h", {}) or None,
+        )
+    # Firestore 캐시 저장
+    try:
+        all_stats = {
+            "standings": standings,
+            "injuries": fb_data.get("injuries", {}),
+            "predictions": fb_data.get("predictions", []),
+            "h2h": fb_data.get("h2h", {}),
+        }
+        await save_stats_cache("ai_stats_snapshot", all_stats)
+    except Exception as e:
+        logger.warning(f"  ⚠️ Stats cache save failed: {e}")
+    logger.info(f"✅ [Stats-Scheduler] Collection done: {football_stats._daily_requests} API calls ({_t.time()-t0:.1f}s)")
+    return {"leagues": len(standings_parsed), "api_calls": football_stats._daily_requests}
 
 
-async def _periodic_sns_publish():
-    """2시간마다 자동 SNS 콘텐츠 발행 (Buffer 로테이션 시스템)"""
-    from datetime import timezone, timedelta
-    KST = timezone(timedelta(hours=9))
-    logger.info("📱 [SNS-Scheduler] Starting, will run every 2 hours...")
-    await asyncio.sleep(10 * 60)  # 초기 데이터 수집 대기
+async def _job_nightly_retrain():
+    """매일 03:00 KST ML 모델 재학습 + 예측 결과 정산"""
+    result = {}
 
-    while True:
-        try:
-            now_kst = __import__("datetime").datetime.now(KST)
-            logger.info(f"📱 [SNS-Scheduler] Waking up at {now_kst.strftime('%H:%M KST')}")
-
-            # Buffer 연동 확인
-            from app.services.buffer_service import buffer_service
-            if not buffer_service.is_configured:
-                logger.info("📱 [SNS-Scheduler] BUFFER_ACCESS_TOKEN not set, skipping")
-                await asyncio.sleep(7200)
-                continue
-
-            # 로테이션 기법으로 자동 발행 실행!
-            from app.api.endpoints.marketing import publish_rotation_post, RotationPublishRequest
-            req = RotationPublishRequest()
-            result = await publish_rotation_post(req)
-            
-            status = "✅" if result.get("success") else "❌"
-            logger.info(f"📱 [SNS-Scheduler] {status} Rotational publish done: type={result.get('rotation_type')} | Image: {bool(result.get('image_url'))}")
-
-            # 2시간(7200초) 대기
-            logger.info("📱 [SNS-Scheduler] Sleeping for 2 hours...")
-            await asyncio.sleep(7200)
+    # 1. 자동 정산 (경기 결과 확인)
+    logger.info("🌙 [Nightly] Step 1: Auto-settlement...")
+    try:
+        from app.services.settlement import auto_settle_slips
+        result["settlement"] = await auto_settle_slips()
+        logger.info(f"  ✅ Settlement: {result['settlement']}")
+    except Exception as e:
+        logger.warning(f"  ⚠️ Settlement error: {e}")
 
-        except Exception as e:
-            logger.error(f"[SNS-Scheduler] Error: {e}")
-            await asyncio.sleep(600)  # 에러 시 10분 후 재시도
+    # 2. AI 예측 채점
+    logger.info("🌙 [Nightly] Step 2: Grading AI predictions...")
+    try:
+        from app.api.endpoints.ai_predictions import trigger_grade_predictions
+        result["grading"] = await trigger_grade_predictions()
+        logger.info(f"  ✅ Graded: {result['grading']}")
+    except Exception as e:
+        logger.warning(f"  ⚠️ Grading error: {e}")
+
+    # 3. ML 재학습
+    logger.info("🌙 [Nightly] Step 3: ML retraining...")
+    try:
+        from app.services.self_learning import self_learning_pipeline
+        retrain_result = await self_learning_pipeline.run_nightly()
+        result["model_updated"] = bool(retrain_result.get("model_updated"))
+        if retrain_result.get("model_updated"):
+            from app.core.ml_predictor import ml_predictor
+            ml_predictor.reload_model()
+            logger.info("  ✅ ML model updated and reloaded")
+        else:
+            logger.info(f"  ℹ️ Retrain result: {retrain_result}")
+    except Exception as e:
+        logger.warning(f"  ⚠️ Retrain error: {e}")
+
+    # 4. 확률 보정 맵 증분 재적합 (2·3 단계 채점/정산분 반영)
+    logger.info("🌙 [Nightly] Step 4: Probability calibration refit...")
+    try:
+        from app.core.calibration import probability_calibrator
+        result["calibration"] = await probability_calibrator.refit()
+        logger.info(f"  ✅ Calibration: {result['calibration']}")
+    except Exception as e:
+        logger.warning(f"  ⚠️ Calibration refit error: {e}")
+
+    # 5. 백테스트 인사이트 큐브 재생성 (채점 결과 반영)
+    logger.info("🌙 [Nightly] Step 5: Backtest insight cube...")
+    try:
+        from app.services.backtest_engine import backtest_engine
+        result["cube"] = await backtest_engine.refresh_cube()
+        logger.info(f"  ✅ Cube: {result['cube']}")
+    except Exception as e:
+        logger.warning(f"  ⚠️ Cube refresh error: {e}")
+
+    logger.info("✅ [Nightly] Pipeline complete")
+    return result
+
+
+async def _job_sns_publish():
+    """2시간마다 자동 SNS 콘텐츠 발행 (Buffer 로테이션 시스템)"""
+    from app.services.buffer_service import buffer_service
+    if not buffer_service.is_configured:
+        logger.info("📱 [SNS-Scheduler] BUFFER_ACCESS_TOKEN not set, skipping")
+        return {"skipped": "buffer not configured"}
 
+    # 로테이션 기법으로 자동 발행 실행!
+    from app.api.endpoints.marketing import publish_rotation_post, RotationPublishRequest
+    result = await publish_rotation_post(RotationPublishRequest())
+    status = "✅" if result.get("success") else "❌"
+    logger.info(f"📱 [SNS-Scheduler] {status} Rotational publish done: type={result.get('rotation_type')} | Image: {bool(result.get('image_url'))}")
+    return {"success": result.get("success"), "rotation_type": result.get("rotation_type")}
 
-async def _periodic_blogger_publish():
+
+async def _job_blogger_publish():
     """매일 11:00 KST 구글 블로그(Blogger) 자동 포스팅"""
-    from datetime import timezone, timedelta
-    KST = timezone(timedelta(hours=9))
-    logger.info("✍️ [Blogger-Scheduler] Starting, will run daily at 11:00 KST...")
-    await asyncio.sleep(15 * 60)  # 서버 구동 후 초기 수집(30분 주기) 대기
+    from app.services.blogger_service import blogger_service
+    if not blogger_service.blog_id:
+        logger.info("✍️ [Blogger-Scheduler] Blogger ID not set, skipping")
+        return {"skipped": "blogger not configured"}
+
+    from app.api.endpoints.blogger import trigger_daily_blogger_post
+    result = await trigger_daily_blogger_post()
+    logger.info("✍️ [Blogger-Scheduler] Blogger posting triggered successfully.")
+    return result
 
-    while True:
-        try:
-            now_kst = __import__("datetime").datetime.now(KST)
-            target = now_kst.replace(hour=11, minute=0, second=0, microsecond=0)
-            if target <= now_kst:
-                target += timedelta(days=1)
-            wait_seconds = (target - now_kst).total_seconds()
-            
-            logger.info(f"✍️ [Blogger-Scheduler] Next post at 11:00 KST (in {wait_seconds/3600:.1f}h)")
-            await asyncio.sleep(wait_seconds)
-
-            logger.info("✍️ [Blogger-Scheduler] Waking up to post to Blogger...")
-            
-            # Blogger 연동 확인
-            from app.services.blogger_service import blogger_service
-            if not blogger_service.blog_id:
-                logger.info("✍️ [Blogger-Scheduler] Blogger ID not set, skipping")
-                await asyncio.sleep(600)
-                continue
-                
-            from app.api.endpoints.blogger import trigger_daily_blogger_post
-            # Call the endpoint handler function directly without arguments
-            await trigger_daily_blogger_post()
-                
-            logger.info("✍️ [Blogger-Scheduler] Blogger posting triggered successfully.")
-            
-        except Exception as e:
-            logger.error(f"[Blogger-Scheduler] Error: {e}")
-            await asyncio.sleep(600)  # 에러 시 10분 후 재시도
 
-async def _periodic_wordpress_publish():
+async def _job_wordpress_publish():
     """매일 11:30 KST 워드프레스(WordPress) 자동 포스팅"""
-    from datetime import timezone, timedelta
-    KST = timezone(timedelta(hours=9))
-    logger.info("✍️ [WordPress-Scheduler] Starting, will run daily at 11:30 KST...")
-    await asyncio.sleep(20 * 60)  # 서버 구동 후 초기 수집 대기
+    from app.services.wordpress_service import wordpress_service
+    if not wordpress_service.wp_url or not wordpress_service.wp_username or not wordpress_service.wp_app_password:
+        logger.info("✍️ [WordPress-Scheduler] WordPress credentials not fully configured, skipping")
+        return {"skipped": "wordpress not configured"}
+
+    from app.api.endpoints.wordpress import trigger_daily_wordpress_post
+    result = await trigger_daily_wordpress_post()
+    logger.info(f"✍️ [WordPress-Scheduler] WordPress post response: {result}")
+    return result
+
+
+# ─── 주기 작업 등록 (인스턴스 간 lease — 슬롯당 1개 인스턴스만 실행, 콜드 스타트 시 따라잡기) ───
+from app.services.job_scheduler import job_scheduler, JobSpec
+
+job_scheduler.register(JobSpec("odds_refresh", _job_odds_refresh, interval=4 * 3600, initial_delay=60, lease_ttl=10 * 60))
+job_scheduler.register(JobSpec("settlement", _job_settlement, interval=30 * 60, initial_delay=120, lease_ttl=10 * 60))
+job_scheduler.register(JobSpec("stats_collection", _job_stats_collection, daily_at=[(9, 0), (21, 0)],
+                               initial_delay=5 * 60, lease_ttl=30 * 60))
+job_scheduler.register(JobSpec("nightly_retrain", _job_nightly_retrain, daily_at=[(3, 0)],
+                               initial_delay=10 * 60, lease_ttl=60 * 60))
+job_scheduler.register(JobSpec("sns_publish", _job_sns_publish, interval=2 * 3600, initial_delay=10 * 60))
+job_scheduler.register(JobSpec("blogger_publish", _job_blogger_publish, daily_at=[(11, 0)], initial_delay=15 * 60))
+job_scheduler.register(JobSpec("wordpress_publish", _job_wordpress_publish, daily_at=[(11, 30)], initial_delay=20 * 60))
 
-    while True:
-        try:
-            now_kst = __import__("datetime").datetime.now(KST)
-            target = now_kst.replace(hour=11, minute=30, second=0, microsecond=0)
-            if target <= now_kst:
-                target += timedelta(days=1)
-            wait_seconds = (target - now_kst).total_seconds()
-            
-            logger.info(f"✍️ [WordPress-Scheduler] Next post at 11:30 KST (in {wait_seconds/3600:.1f}h)")
-            await asyncio.sleep(wait_seconds)
-
-            logger.info("✍️ [WordPress-Scheduler] Waking up to post to WordPress...")
-            
-            # WordPress 연동 확인
-            from app.services.wordpress_service import wordpress_service
-            if not wordpress_service.wp_url or not wordpress_service.wp_username or not wordpress_service.wp_app_password:
-                logger.info("✍️ [WordPress-Scheduler] WordPress credentials not fully configured, skipping")
-                await asyncio.sleep(600)
-                continue
-                
-            from app.api.endpoints.wordpress import trigger_daily_wordpress_post
-            # Call the daily posting logic directly
-            result = await trigger_daily_wordpress_post()
-            logger.info(f"✍️ [WordPress-Scheduler] WordPress post response: {result}")
-            
-        except Exception as e:
-            logger.error(f"[WordPress-Scheduler] Error: {e}")
-            await asyncio.sleep(600)  # 에러 시 10분 후 재시도
 
 @app.on_event("startup")
 async def startup_event():
+    with profile.phase("await_config"):
+        await wait_config()
+
     # Ensure API key is set on pinnacle_service
     from app.services.pinnacle_api import pinnacle_service
     api_key = os.getenv("API_FOOTBALL_KEY") or os.getenv("PINNACLE_API_KEY")
@@ -509,16 +428,26 @@ async def startup_event():
     print(f"Backend Startup: Firestore mode | API-Football Key: {'YES' if pinnacle_service.api_key else 'NO'}")
 
     # 백그라운드 스케줄러 시작
-    asyncio.create_task(_auto_collect_stats())         # 시작 시 1회 전체 수집
-    asyncio.create_task(_periodic_odds_refresh())       # 매 30분 배당 갱신
-    asyncio.create_task(_periodic_settlement())         # 매 30분 자동 정산
-    asyncio.create_task(_periodic_stats_collection())   # 12시간마다 순위/부상/H2H (09:00, 21:00 KST)
-    asyncio.create_task(_periodic_nightly_retrain())    # 매일 03:00 KST ML 재학습
-    asyncio.create_task(_periodic_sns_publish())        # 매일 10:00, 16:00 KST SNS 자동 발행
-    asyncio.create_task(_periodic_blogger_publish())    # 매일 11:00 KST Blogger 자동 발행
-    asyncio.create_task(_periodic_wordpress_publish())  # 매일 11:30 KST WordPress 자동 발행
+    asyncio.create_task(_auto_collect_stats())  # 시작 시 1회 — 인스턴스 메모리(AI 예측기) 워밍
+    asyncio.create_task(_stats_snapshot_loop())  # 리더가 저장한 통계 스냅샷 주기적 재적용
+    job_scheduler.start()                       # odds 4h / 정산 30m / 통계 09·21시 / 재학습 03시 / SNS 2h / Blogger 11시 / WP 11:30
     logger.info("🚀 All background schedulers started (including Blogger & WordPress auto-publish)")
 
+    # 첫 요청을 받은 뒤 나머지 라우터를 백그라운드에서 미리 로드
+    if lazy_routers.pending:
+        asyncio.create_task(lazy_routers.warm(delay=float(os.getenv("LAZY_WARM_DELAY", "5"))))
+    profile.mark_ready()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await job_scheduler.stop()
+    # 대기 중인 VIP 알림 트리거 카운터 반영 (엔진이 로드된 경우만)
+    engine_module = sys.modules.get("app.services.alert_rule_engine")
+    if engine_module is not None:
+        await engine_module.alert_rule_engine.flush(force=True)
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Scorenix API"}
@@ -96,9 +96,21 @@ async def upsert_prediction_user(user_id: str, stats: dict):
     stats["updated_at"] = datetime.datetime.utcnow()
     doc_ref.set(stats, merge=True)
 
+    # 리더보드 증분 반영
+    try:
+        from app.services.leaderboard import leaderboard_service
+        await leaderboard_service.record("league", {"user_id": user_id, **stats})
+    except Exception as e:
+        logger.warning(f"Leaderboard update failed ({user_id}): {e}")
+
 
 async def get_leaderboard(limit: int = 10) -> List[dict]:
-    """Get top users sorted by points descending."""
+    """Get top users sorted by points descending (served from the leaderboard service)."""
+    try:
+        from app.services.leaderboard import leaderboard_service
+        return (await leaderboard_service.page("league", "points", 0, limit))["users"]
+    except Exception as e:
+        logger.warning(f"Leaderboard service unavailable, querying Firestore: {e}")
     db = get_firestore_db()
     docs = (
         db.collection(PREDICTION_USERS_COLLECTION)
@@ -275,6 +287,7 @@ async def save_ai_predictions_batch(predictions: List[dict]):
             "home_win_prob": pred.get("home_win_prob", 0),
             "draw_prob": pred.get("draw_prob", 0),
             "away_win_prob": pred.get("away_win_prob", 0),
+            "raw_probs": pred.get("raw_probs"),  # 보정 전 확률 (calibration 재적합용)
             "prediction_date": today,
             "status": "PENDING",  # PENDING → HIT / MISS / PUSH
             "actual_result": None,  # HOME / DRAW / AWAY
@@ -2,6 +2,7 @@ from datetime import datetime
 import logging
 import os
 import json
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +16,30 @@ _DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path
 _USERS_FILE = os.path.join(_DATA_DIR, "users.json")
 
 
+_FIRESTORE_RETRY_SECONDS = 60.0
+_firestore_state = {"available": None, "checked_at": 0.0}
+
+
 def _is_firestore_available() -> bool:
+    """Firestore 사용 가능 여부 — 성공은 프로세스 수명 동안 기억, 실패는 60초마다 재확인."""
+    state = _firestore_state
+    if state["available"] or (
+        state["available"] is False and time.monotonic() - state["checked_at"] < _FIRESTORE_RETRY_SECONDS
+    ):
+        return state["available"]
     try:
         from app.db.firestore import get_firestore_db
         get_firestore_db()
-        return True
+        available = True
     except Exception:
-        return False
+        available = False
+    state["available"], state["checked_at"] = available, time.monotonic()
+    return available
+
+
+def _invalidate_user_cache(user_id: str):
+    from app.core.user_cache import user_cache
+    user_cache.invalidate(user_id)
 
 
 def _load_local_users() -> list:
@@ -113,6 +131,14 @@ async def create_user(user_data: dict):
 
 
 async def update_user(user_id: str, updates: dict):
+    try:
+        return await _update_user(user_id, updates)
+    finally:
+        # 쓰기 완료 후 무효화 — 쓰기 도중 시작된 캐시 조회도 세대 번호로 걸러짐
+        _invalidate_user_cache(user_id)
+
+
+async def _update_user(user_id: str, updates: dict):
     if _is_firestore_available():
         try:
             from app.db.firestore import get_firestore_db
@@ -156,7 +182,14 @@ async def update_user_prediction_stats(user_id: str, new_slip_status: str, total
     total_decided = stats["won"] + stats["lost"] + stats["partial"]
     stats["hit_rate"] = round(stats["won"] / total_decided * 100, 2) if total_decided > 0 else 0.0
     
-    await update_user(user_id, {"stats": stats})
+    updated = await update_user(user_id, {"stats": stats})
+
+    # 리더보드 증분 반영 (전체 재정렬 없이 이 유저만 재배치)
+    try:
+        from app.services.leaderboard import leaderboard_service
+        await leaderboard_service.record("slips", updated or {**User, "stats": stats})
+    except Exception as e:
+        logger.warning(f"Leaderboard update failed ({user_id}): {e}")
 
 # --- Payment Helpers ---
 async def create_payment(payment_data: dict):
@@ -66,6 +66,7 @@ class MatchPrediction(BaseModel):
     home_win_prob: float = 0.0
     draw_prob: float = 0.0
     away_win_prob: float = 0.0
+    raw_probs: Optional[List[float]] = None  # 보정 전 [HOME, DRAW, AWAY] % (보정 맵 재적합용)
 
     # Factor breakdown
     factors: List[Dict] = []
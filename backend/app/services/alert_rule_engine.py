@@ -0,0 +1,261 @@
+"""
+VIP 알림 규칙 엔진 — 필드별 역색인으로 경기 슬레이트를 한 번에 매칭.
+
+기존 check_user_alert_rules 는 경기 1건마다 alert_rules 전체 → 유저별 rules 서브컬렉션을
+다시 읽고 트리거마다 문서 update 를 날려 O(유저 × 규칙) 읽기·쓰기가 발생했음.
+
+- 활성 규칙을 collection_group("rules") 1회 스트림으로 메모리에 적재
+- 신선도: 규칙 CRUD 가 alert_rules_meta/version 을 증가 → REFRESH_POLL 초마다 버전 문서 1건만
+  읽어 바뀐 경우에만 재적재 (같은 인스턴스의 CRUD 는 invalidate() 로 즉시 반영)
+- 숫자 비교(>, >=, <, <=): 연산자별 정렬 임계값 배열 → bisect 로 매칭 구간 O(log n)
+- ==: 소문자 값 해시 버킷 O(1)
+- contains: 서로 다른 검색어 단위 버킷 — 비용이 규칙 수가 아니라 고유 검색어 수에 비례
+  (대부분 프리셋 검색어라 수십 개 이하)
+- 트리거 카운터는 메모리에 모았다가 Firestore batch + Increment 로 일괄 반영
+
+매칭 의미는 vip_alerts._matches_rule 과 동일 (float 변환 실패 시 불일치, 문자열 비교는 소문자).
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ALERT_RULES_COLLECTION = "alert_rules"
+ALERT_RULES_META = ("alert_rules_meta", "version")
+REFRESH_POLL = 30.0          # 버전 문서 확인 주기 (초)
+FLUSH_INTERVAL = 60.0        # 카운터 일괄 반영 주기 (초)
+FLUSH_SIZE = 400             # 대기 카운터가 이 이상이면 즉시 반영 (batch 한도 500)
+
+NUMERIC_OPS = (">", ">=", "<", "<=")
+
+RuleRef = Tuple[str, str, dict]   # (user_id, rule_id, rule)
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass
+class _FieldIndex:
+    # 연산자 → (정렬된 임계값, 같은 순서의 규칙 ref)
+    numeric: Dict[str, Tuple[List[float], List[RuleRef]]] = field(default_factory=dict)
+    equals: Dict[str, List[RuleRef]] = field(default_factory=dict)
+    contains: Dict[str, List[RuleRef]] = field(default_factory=dict)
+
+    def lookup(self, actual) -> Iterable[RuleRef]:
+        if self.numeric:
+            x = _to_float(actual)
+            if x is not None:
+                for op, (thresholds, refs) in self.numeric.items():
+                    if op == ">":       # threshold < x
+                        yield from refs[:bisect_left(thresholds, x)]
+                    elif op == ">=":    # threshold <= x
+                        yield from refs[:bisect_right(thresholds, x)]
+                    elif op == "<":     # threshold > x
+                        yield from refs[bisect_right(thresholds, x):]
+                    else:               # "<=": threshold >= x
+                        yield from refs[bisect_left(thresholds, x):]
+        if self.equals or self.contains:
+            text = str(actual).lower()
+            yield from self.equals.get(text, ())
+            for needle, refs in self.contains.items():
+                if needle in text:
+                    yield from refs
+
+
+class RuleIndex:
+    """활성 규칙 목록 → 필드별 역색인 (불변, 재적재 시 통째로 교체)."""
+
+    def __init__(self, rules: Iterable[RuleRef]):
+        numeric = defaultdict(lambda: defaultdict(list))
+        self.fields: Dict[str, _FieldIndex] = {}
+        self.size = 0
+        self.skipped = 0
+        for user_id, rule_id, rule in rules:
+            # 기존 쿼리(where enabled == True)와 동일 — enabled 필드가 없는 레거시 규칙은 비활성
+            if rule.get("enabled") is not True:
+                continue
+            name, op, value = rule.get("field", ""), rule.get("operator", ""), rule.get("value", "")
+            ref = (user_id, rule_id, rule)
+            idx = self.fields.setdefault(name, _FieldIndex())
+            if op in NUMERIC_OPS:
+                threshold = _to_float(value)
+                if threshold is None:
+                    self.skipped += 1      # 숫자가 아닌 임계값은 어떤 경기와도 불일치
+                    continue
+                numeric[name][op].append((threshold, ref))
+            elif op == "==":
+                idx.equals.setdefault(str(value).lower(), []).append(ref)
+            elif op == "contains":
+                idx.contains.setdefault(str(value).lower(), []).append(ref)
+            else:
+                self.skipped += 1
+                continue
+            self.size += 1
+        for name, by_op in numeric.items():
+            for op, pairs in by_op.items():
+                pairs.sort(key=lambda p: p[0])
+                self.fields[name].numeric[op] = ([t for t, _ in pairs], [r for _, r in pairs])
+
+    def match(self, match_data: dict) -> List[RuleRef]:
+        hits = []
+        for name, idx in self.fields.items():
+            actual = match_data.get(name)
+            if actual is not None:
+                hits.extend(idx.lookup(actual))
+        return hits
+
+
+class FirestoreAlertRuleStore:
+    """alert_rules/{user_id}/rules/{rule_id} 저장소 어댑터."""
+
+    def _db(self):
+        from app.db.firestore import get_firestore_db
+        return get_firestore_db()
+
+    def load_rules(self) -> List[RuleRef]:
+        rules = []
+        for doc in self._db().collection_group("rules").stream():
+            parent = doc.reference.parent.parent
+            if parent is None or parent.parent.id != ALERT_RULES_COLLECTION:
+                continue
+            data = doc.to_dict() or {}
+            if data.get("enabled") is True:
+                rules.append((parent.id, doc.id, data))
+        return rules
+
+    def version(self):
+        snap = self._db().collection(ALERT_RULES_META[0]).document(ALERT_RULES_META[1]).get()
+        return (snap.to_dict() or {}).get("version", 0) if snap.exists else 0
+
+    def bump_version(self):
+        from google.cloud import firestore
+        self._db().collection(ALERT_RULES_META[0]).document(ALERT_RULES_META[1]).set(
+            {"version": firestore.Increment(1), "updated_at": datetime.utcnow().isoformat()}, merge=True)
+
+    def flush_counters(self, counters: Dict[Tuple[str, str], Tuple[int, str]]):
+        from google.cloud import firestore
+        db = self._db()
+        items = list(counters.items())
+        for start in range(0, len(items), 450):
+            batch = db.batch()
+            for (user_id, rule_id), (count, last) in items[start:start + 450]:
+                ref = db.collection(ALERT_RULES_COLLECTION).document(user_id).collection("rules").document(rule_id)
+                # 그 사이 삭제된 규칙에 update 하면 batch 전체가 실패하므로 merge set 사용
+                batch.set(ref, {"triggered_count": firestore.Increment(count), "last_triggered": last}, merge=True)
+            batch.commit()
+
+
+class AlertRuleEngine:
+    def __init__(self, store=None, clock: Callable[[], float] = time.monotonic,
+                 refresh_poll: float = REFRESH_POLL, flush_interval: float = FLUSH_INTERVAL,
+                 flush_size: int = FLUSH_SIZE):
+        self.store = store if store is not None else FirestoreAlertRuleStore()
+        self.clock = clock
+        self.refresh_poll = refresh_poll
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.index: Optional[RuleIndex] = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at: Optional[str] = None
+        self._dirty = True
+        self._lock = asyncio.Lock()
+        self._pending: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._flushed_at = clock()
+        self.stats_counters = {"reloads": 0, "version_checks": 0, "matches_evaluated": 0,
+                               "triggers": 0, "flushes": 0, "flush_errors": 0}
+
+    # ── 규칙 적재 ──
+
+    def invalidate(self):
+        """같은 인스턴스의 규칙 CRUD 직후 호출 — 다음 평가에서 재적재."""
+        self._dirty = True
+
+    async def _ensure_fresh(self):
+        now = self.clock()
+        if not self._dirty and self.index is not None and now - self._checked_at < self.refresh_poll:
+            return
+        async with self._lock:
+            if not self._dirty and self.index is not None and self.clock() - self._checked_at < self.refresh_poll:
+                return
+            # 적재 전에 플래그를 내림 → 적재 도중 invalidate() 된 변경은 다음 평가에서 다시 적재
+            dirty, self._dirty = self._dirty, False
+            try:
+                self.stats_counters["version_checks"] += 1
+                version = await asyncio.to_thread(self.store.version)
+                if dirty or self.index is None or version != self._version:
+                    rules = await asyncio.to_thread(self.store.load_rules)
+                    self.index = RuleIndex(rules)
+                    self._version = version
+                    self._loaded_at = datetime.utcnow().isoformat()
+                    self.stats_counters["reloads"] += 1
+                    logger.info(f"[AlertRules] index loaded: {self.index.size} rules (v{version})")
+            except Exception:
+                self._dirty = self._dirty or dirty
+                raise
+            self._checked_at = self.clock()
+
+    # ── 평가 ──
+
+    async def evaluate(self, matches: List[dict]) -> List[dict]:
+        """슬레이트 전체를 한 번에 평가. 반환: [{user_id, rule_id, rule, match_data}, ...]"""
+        await self._ensure_fresh()
+        index = self.index
+        now_iso = datetime.utcnow().isoformat()
+        matched = []
+        for match_data in matches:
+            for user_id, rule_id, rule in index.match(match_data):
+                matched.append({"user_id": user_id, "rule_id": rule_id, "rule": rule, "match_data": match_data})
+                count, _ = self._pending.get((user_id, rule_id), (0, None))
+                self._pending[(user_id, rule_id)] = (count + 1, now_iso)
+        self.stats_counters["matches_evaluated"] += len(matches)
+        self.stats_counters["triggers"] += len(matched)
+        return matched
+
+    # ── 트리거 카운터 ──
+
+    async def flush(self, force: bool = False) -> int:
+        """대기 중인 트리거 카운터를 일괄 반영. force 가 아니면 주기/크기 조건 충족 시에만."""
+        if not self._pending:
+            return 0
+        if not force and len(self._pending) < self.flush_size \
+                and self.clock() - self._flushed_at < self.flush_interval:
+            return 0
+        pending, self._pending = self._pending, {}
+        self._flushed_at = self.clock()
+        try:
+            await asyncio.to_thread(self.store.flush_counters, pending)
+            self.stats_counters["flushes"] += 1
+            return len(pending)
+        except Exception as e:
+            # 실패분은 다음 flush 에 합산
+            self.stats_counters["flush_errors"] += 1
+            for key, (count, last) in pending.items():
+                prev, _ = self._pending.get(key, (0, None))
+                self._pending[key] = (prev + count, last)
+            logger.warning(f"[AlertRules] counter flush failed: {e}")
+            return 0
+
+    def stats(self) -> Dict:
+        return {
+            **self.stats_counters,
+            "rules": self.index.size if self.index else 0,
+            "fields": sorted(self.index.fields) if self.index else [],
+            "skipped_rules": self.index.skipped if self.index else 0,
+            "version": self._version,
+            "loaded_at": self._loaded_at,
+            "pending_counters": len(self._pending),
+        }
+
+
+alert_rule_engine = AlertRuleEngine()
@@ -3,12 +3,21 @@ Historical Data Backfill — 과거 시즌 데이터 소급 수집.
 API-Football에서 완료된 경기 결과를 가져와 BigQuery에 적재.
 이 데이터가 LightGBM ML 모델의 학습 데이터가 됨.
 
+작업 단위: (league, season, kind) — kind = matches | odds
+- 완료된 단위마다 체크포인트를 Firestore(MARKET_CACHE)에 저장 → 재실행 시 완료 단위 건너뜀
+- 단위들은 공유 rate limiter 아래에서 동시 실행 (429 시 적응형 백오프)
+- 일일 요청 예산(무료 100건/일)은 체크포인트에 함께 기록되어 재시작에도 유지
+- 진행률/ETA: GET /api/scheduler/backfill_status
+
 사용법:
   POST /api/scheduler/backfill_historical
   body: { "seasons": [2024, 2025], "leagues": ["soccer_epl", ...] }
 """
 import asyncio
 import logging
+import math
+import os
+import time
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
@@ -30,48 +39,128 @@ LEAGUE_MAP = {
 # All target leagues for backfill
 ALL_LEAGUES = list(LEAGUE_MAP.keys())
 
+UNIT_KINDS = ("matches", "odds")
+CHECKPOINT_KEY = "backfill_checkpoint"
+DAILY_REQUEST_BUDGET = 90      # 무료 100건/일 — 다른 서비스 몫 10건 남김
+REQUESTS_PER_UNIT_MAX = 2      # odds 는 bookmaker 필터 실패 시 1회 재조회
+MAX_UNIT_ATTEMPTS = 3
+MAX_429_RETRIES = 3
+
+
+class BudgetExhausted(Exception):
+    """일일 요청 예산 소진 — 요청을 보내지 않음. 단위는 실패로 치지 않고 다음 실행으로 넘김."""
+
+
+def unit_id(league: str, season: int, kind: str) -> str:
+    return f"{league}:{season}:{kind}"
+
+
+class AdaptiveRateLimiter:
+    """
+    공유 요청 간격 제한기.
+    - 기본 간격 = 60 / max_per_minute
+    - 429 수신 시 간격 2배 + Retry-After 동안 전체 정지, 성공 시 점진적으로 복귀
+    """
+
+    def __init__(self, max_per_minute: float = 10.0, max_backoff: float = 16.0):
+        self.base_interval = 60.0 / max_per_minute
+        self.max_backoff = max_backoff
+        self.backoff = 1.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.base_interval * self.backoff
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        self.backoff = max(1.0, self.backoff * 0.8)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        self.backoff = min(self.max_backoff, self.backoff * 2)
+        pause = retry_after if retry_after is not None else self.base_interval * self.backoff
+        self._next_slot = max(self._next_slot, time.monotonic() + pause)
+
 
 class HistoricalBackfill:
     """API-Football → BigQuery 과거 데이터 소급 수집 엔진."""
 
-    def __init__(self):
-        import os
+    def __init__(self, limiter: Optional[AdaptiveRateLimiter] = None,
+                 daily_budget: int = DAILY_REQUEST_BUDGET):
         self.api_key = os.getenv("API_FOOTBALL_KEY", "")
         self.base_url = "https://v3.football.api-sports.io"
+        self.limiter = limiter or AdaptiveRateLimiter(float(os.getenv("API_FOOTBALL_RATE_PER_MIN", "10")))
+        self.daily_budget = daily_budget
+        self._client: Optional[httpx.AsyncClient] = None
         self._request_count = 0
         self._total_matches = 0
         self._total_inserted = 0
 
+        # 오케스트레이터 상태
+        self._running = False
+        self._checkpoint: Dict = {}
+        self._ckpt_lock: Optional[asyncio.Lock] = None
+        self._progress: Optional[Dict] = None
+        self.last_result: Optional[Dict] = None
+
     def _headers(self):
         return {"x-apisports-key": self.api_key}
 
     async def _get(self, endpoint: str, params: dict) -> Optional[dict]:
-        """API-Football 요청 (rate limit 고려)."""
+        """
+        API-Football 요청 (공유 rate limiter + 429 적응형 백오프).
+        요청마다(429 재시도 포함) 보내기 전에 예산 1건을 예약 — 예산이 없으면 BudgetExhausted.
+        """
         url = f"{self.base_url}/{endpoint}"
+        client = self._client or httpx.AsyncClient(timeout=20.0)
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
+            for attempt in range(MAX_429_RETRIES + 1):
+                self._reserve_request()
+                await self.limiter.acquire()
                 resp = await client.get(url, headers=self._headers(), params=params)
-                self._request_count += 1
 
                 if resp.status_code == 429:
-                    logger.warning("Rate limited, waiting 60s...")
-                    await asyncio.sleep(60)
-                    resp = await client.get(url, headers=self._headers(), params=params)
-                    self._request_count += 1
+                    retry_after = resp.headers.get("Retry-After")
+                    self.limiter.on_throttled(float(retry_after) if retry_after else None)
+                    logger.warning(f"Rate limited on {endpoint} (attempt {attempt + 1}), "
+                                   f"backoff x{self.limiter.backoff:.1f}")
+                    continue
 
                 if resp.status_code != 200:
                     logger.warning(f"API-Football {endpoint}: HTTP {resp.status_code}")
                     return None
 
+                self.limiter.on_success()
                 data = resp.json()
                 if data.get("errors"):
                     logger.warning(f"API-Football errors: {data['errors']}")
                     return None
 
                 return data
+            return None
+        except BudgetExhausted:
+            raise
         except Exception as e:
             logger.error(f"API-Football request error: {e}")
             return None
+        finally:
+            if client is not self._client:
+                await client.aclose()
+
+    def _reserve_request(self):
+        """예산 확인과 차감 사이에 await 가 없으므로 동시 워커 사이에서도 원자적 (초과 발행 없음)."""
+        if self._budget_left() <= 0:
+            raise BudgetExhausted()
+        self._request_count += 1
+        self._checkpoint["requests_today"] = self._checkpoint.get("requests_today", 0) + 1
+
+    async def _insert_rows(self, table: str, rows: List[Dict]):
+        from app.services import bigquery_service as bq
+        return await bq.insert_rows(table, rows)
 
     async def backfill_season(
         self,
@@ -95,8 +184,10 @@ class HistoricalBackfill:
             "status": "FT",  # Full Time (completed)
         })
 
-        if not data or not data.get("response"):
-            return {"league": league_key, "season": season, "matches": 0, "error": "No data"}
+        if data is None:
+            return {"league": league_key, "season": season, "matches": 0, "error": "Request failed"}
+        if not data.get("response"):
+            return {"league": league_key, "season": season, "matches": 0}
 
         fixtures = data["response"]
         logger.info(f"  Found {len(fixtures)} completed fixtures")
@@ -147,8 +238,7 @@ class HistoricalBackfill:
         # Insert into BigQuery
         if rows:
             try:
-                from app.services import bigquery_service as bq
-                inserted = await bq.insert_rows("matches_raw", rows)
+                await self._insert_rows("matches_raw", rows)
                 self._total_inserted += len(rows)
                 logger.info(f"  ✅ Inserted {len(rows)} matches into BigQuery")
             except Exception as e:
@@ -188,7 +278,9 @@ class HistoricalBackfill:
                 "season": season,
             })
 
-        if not data or not data.get("response"):
+        if data is None:
+            return {"league": league_key, "season": season, "odds_count": 0, "error": "Request failed"}
+        if not data.get("response"):
             return {"league": league_key, "season": season, "odds_count": 0}
 
         odds_rows = []
@@ -227,59 +319,198 @@ class HistoricalBackfill:
 
         if odds_rows:
             try:
-                from app.services import bigquery_service as bq
-                await bq.insert_rows("odds_history", odds_rows)
+                await self._insert_rows("odds_history", odds_rows)
                 logger.info(f"  ✅ Inserted {len(odds_rows)} odds records")
             except Exception as e:
                 logger.error(f"  Odds insert error: {e}")
 
         return {"league": league_key, "season": season, "odds_count": len(odds_rows)}
 
+    # ─── Checkpoint ───
+
+    async def _load_checkpoint(self) -> Dict:
+        from app.models.bets_db import load_stats_cache
+        return await load_stats_cache(CHECKPOINT_KEY)
+
+    async def _save_checkpoint(self):
+        from app.models.bets_db import save_stats_cache
+        self._checkpoint["updated_at"] = datetime.now(timezone.utc).isoformat()
+        async with self._ckpt_lock:
+            await save_stats_cache(CHECKPOINT_KEY, self._checkpoint)
+
+    def _roll_budget_day(self):
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self._checkpoint.get("budget_day") != today:
+            self._checkpoint["budget_day"] = today
+            self._checkpoint["requests_today"] = 0
+
+    def _budget_left(self) -> int:
+        return self.daily_budget - self._checkpoint.get("requests_today", 0)
+
+    # ─── Orchestrator ───
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
     async def run_full_backfill(
         self,
         seasons: List[int] = None,
         leagues: List[str] = None,
+        concurrency: int = 3,
+        reset: bool = False,
     ) -> Dict:
         """
-        전체 과거 데이터 소급 수집 실행.
-        하루 100건 제한 → 리그 수에 따라 여러 번 나눠서 실행 필요.
+        전체 과거 데이터 소급 수집 실행 (재개 가능).
+        완료된 (league, season, kind) 단위는 건너뛰고, 일일 예산 소진 시 중단 → 다음 실행에서 이어서 수집.
         """
         if seasons is None:
             seasons = [2024, 2025]
         if leagues is None:
             leagues = ALL_LEAGUES
+        if self._running:
+            return {"status": "already_running"}
 
+        self._running = True
         self._request_count = 0
         self._total_matches = 0
         self._total_inserted = 0
+        self._ckpt_lock = asyncio.Lock()
+        try:
+            self._checkpoint = {} if reset else (await self._load_checkpoint() or {})
+            self._checkpoint.setdefault("units", {})
+            self._roll_budget_day()
+
+            plan = [(league, season, kind) for season in seasons for league in leagues for kind in UNIT_KINDS]
+            units = self._checkpoint["units"]
+            pending = [u for u in plan if units.get(unit_id(*u), {}).get("status") not in ("done", "skipped")]
+
+            self._progress = {
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "started_mono": time.monotonic(),
+                "plan": [unit_id(*u) for u in plan],
+                "completed_this_run": 0,
+                "in_progress": set(),
+                "stopped_reason": None,
+            }
+            logger.info(f"📥 Backfill: {len(plan)} units, {len(pending)} pending, "
+                        f"budget left {self._budget_left()}")
+
+            queue: asyncio.Queue = asyncio.Queue()
+            for u in pending:
+                queue.put_nowait(u)
+
+            results: List[Dict] = []
+            async with httpx.AsyncClient(timeout=20.0) as client:
+                self._client = client
+                workers = [asyncio.create_task(self._worker(queue, results))
+                           for _ in range(max(1, min(concurrency, len(pending))))]
+                await asyncio.gather(*workers)
+            self._client = None
+            await self._save_checkpoint()
+
+            remaining = [uid for uid in self._progress["plan"]
+                         if units.get(uid, {}).get("status") not in ("done", "skipped")]
+            summary = self._summary(results)
+            summary["remaining_units"] = remaining
+            if remaining and self._progress["stopped_reason"] == "daily_budget":
+                summary["status"] = "rate_limit_reached"
+            self.last_result = summary
+            return summary
+        finally:
+            self._client = None
+            self._running = False
+
+    async def _worker(self, queue: asyncio.Queue, results: List[Dict]):
+        units = self._checkpoint["units"]
+        while True:
+            if self._budget_left() < REQUESTS_PER_UNIT_MAX:
+                self._progress["stopped_reason"] = "daily_budget"
+                return
+            try:
+                league, season, kind = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            uid = unit_id(league, season, kind)
+            self._progress["in_progress"].add(uid)
+            started = time.monotonic()
+            requests_before = self._request_count
+            try:
+                if kind == "matches":
+                    result = await self.backfill_season(league, season)
+                else:
+                    result = await self.backfill_odds(league, season)
+            except BudgetExhausted:
+                # 시도 횟수를 늘리지 않고 pending 으로 남김 → 다음 실행에서 이어서 수집
+                self._progress["stopped_reason"] = "daily_budget"
+                return
+            except Exception as e:
+                result = {"league": league, "season": season, "error": str(e)}
+            finally:
+                self._progress["in_progress"].discard(uid)
+
+            state = units.get(uid, {})
+            attempts = state.get("attempts", 0) + 1
+            if result.get("error"):
+                status = "skipped" if attempts >= MAX_UNIT_ATTEMPTS else "failed"
+            else:
+                status = "done"
+                self._progress["completed_this_run"] += 1
+            units[uid] = {
+                "status": status,
+                "attempts": attempts,
+                "count": result.get("matches", result.get("odds_count", 0)),
+                "requests": self._request_count - requests_before,
+                "duration_sec": round(time.monotonic() - started, 2),
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if result.get("error"):
+                units[uid]["error"] = result["error"]
+            results.append(result)
+            await self._save_checkpoint()
+
+    async def get_status(self) -> Dict:
+        """진행률 + ETA. 실행 이력이 없는 인스턴스는 체크포인트에서 복원."""
+        if not self._checkpoint:
+            self._checkpoint = await self._load_checkpoint() or {}
+        units = self._checkpoint.get("units", {})
+        plan = self._progress["plan"] if self._progress else list(units.keys())
+
+        counts = {"done": 0, "failed": 0, "skipped": 0}
+        for uid in plan:
+            st = units.get(uid, {}).get("status")
+            if st in counts:
+                counts[st] += 1
+        remaining = len(plan) - counts["done"] - counts["skipped"]
+
+        eta_seconds = None
+        if self._running and self._progress and self._progress["completed_this_run"]:
+            elapsed = time.monotonic() - self._progress["started_mono"]
+            eta_seconds = round(elapsed / self._progress["completed_this_run"] * remaining)
+
+        done_units = [u for u in units.values() if u.get("status") == "done"]
+        avg_requests = (sum(u.get("requests", 0) for u in done_units) / len(done_units)) if done_units else 1.5
+        budget_days = math.ceil(remaining * avg_requests / self.daily_budget) if remaining else 0
 
-        results = []
-        for season in seasons:
-            for league in leagues:
-                # Check rate limit (free tier: 100/day)
-                if self._request_count >= 90:
-                    logger.warning(f"⚠️ Approaching rate limit ({self._request_count} requests). Stopping.")
-                    results.append({
-                        "status": "rate_limit_reached",
-                        "remaining_leagues": leagues[leagues.index(league):],
-                        "remaining_seasons": seasons[seasons.index(season):],
-                    })
-                    return self._summary(results)
-
-                # Fetch match results
-                match_result = await self.backfill_season(league, season)
-                results.append(match_result)
-
-                # Throttle to avoid rate limiting
-                await asyncio.sleep(2)
-
-                # Fetch odds (if we have requests remaining)
-                if self._request_count < 85:
-                    odds_result = await self.backfill_odds(league, season)
-                    results.append(odds_result)
-                    await asyncio.sleep(2)
-
-        return self._summary(results)
+        return {
+            "running": self._running,
+            "total_units": len(plan),
+            "completed": counts["done"],
+            "failed": counts["failed"],
+            "skipped": counts["skipped"],
+            "remaining": remaining,
+            "percent": round(100.0 * (len(plan) - remaining) / len(plan), 1) if plan else 0.0,
+            "in_progress": sorted(self._progress["in_progress"]) if self._progress else [],
+            "eta_seconds": eta_seconds,
+            "estimated_days_at_budget": budget_days,
+            "requests_today": self._checkpoint.get("requests_today", 0),
+            "daily_budget": self.daily_budget,
+            "rate_backoff": round(self.limiter.backoff, 2),
+            "started_at": self._progress["started_at"] if self._progress else None,
+            "checkpoint_updated_at": self._checkpoint.get("updated_at"),
+            "stopped_reason": self._progress["stopped_reason"] if self._progress else None,
+        }
 
     def _summary(self, results: List[Dict]) -> Dict:
         total_matches = sum(r.get("matches", 0) for r in results)
@@ -0,0 +1,284 @@
+"""
+Backtest Insight Cube — predictions_log 1회 스캔으로 만든 다차원 집계 큐브.
+
+차원: league × odds_bucket × conf_bucket × recommendation × actual_result × day
+측정값: n(건수), c(적중), sc(신뢰도 합), scc(적중 시 신뢰도 합), sl(log_loss 합), nl(log_loss 건수)
+
+/api/backtest/* 의 모든 집계는 이 큐브를 메모리에서 잘라서(slice) 계산.
+행 단위가 필요한 목록(고신뢰도 적중/오답)과 연속 적중 스트릭은 별도 detail 로 함께 보관.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+CUBE_MAX_DAYS = 365
+
+# 배당 구간 (상한, 라벨) — 순서 = 표시 순서
+ODDS_BUCKETS = [
+    (1.3, "1.0-1.3 (압도적 우세)"),
+    (1.6, "1.3-1.6 (강한 우세)"),
+    (2.0, "1.6-2.0 (약간 우세)"),
+    (2.5, "2.0-2.5 (균형)"),
+    (3.5, "2.5-3.5 (열세)"),
+    (float("inf"), "3.5+ (약팀)"),
+]
+
+# 신뢰도 구간 (하한, 라벨) — 높은 구간부터
+CONF_BUCKETS = [
+    (0.75, "🔥 75%+ (매우 높음)"),
+    (0.60, "✅ 60-75% (높음)"),
+    (0.45, "⚡ 45-60% (중간)"),
+    (0.0, "⚠️ 45% 미만 (낮음)"),
+]
+
+# 셀 배열 인덱스 (Firestore 1MB 제한 → dict 대신 배열로 저장)
+L, OB, CB, REC, ACT, DAY, N, C, SC, SCC, SL, NL = range(12)
+
+
+def _sql_case(expr: str, buckets, op: str) -> str:
+    whens = " ".join(f"WHEN {expr} {op} {bound} THEN {i}" for i, (bound, _) in enumerate(buckets[:-1]))
+    return f"CASE {whens} ELSE {len(buckets) - 1} END"
+
+
+def cube_sql(project: str, dataset: str, days: int = CUBE_MAX_DAYS) -> str:
+    """큐브 집계 SQL — predictions_log 1회 스캔 (배당은 경기당 1행으로 축약 후 조인)."""
+    odds_bucket = _sql_case("rec_odds", ODDS_BUCKETS, "<")
+    conf_bucket = _sql_case("confidence", CONF_BUCKETS, ">=")
+    return f"""
+    WITH odds AS (
+        SELECT match_id,
+               ANY_VALUE(home_odds) AS home_odds,
+               ANY_VALUE(draw_odds) AS draw_odds,
+               ANY_VALUE(away_odds) AS away_odds
+        FROM `{project}.{dataset}.odds_history`
+        GROUP BY match_id
+    ),
+    leagues AS (
+        SELECT match_id, ANY_VALUE(league) AS league
+        FROM `{project}.{dataset}.matches_raw`
+        GROUP BY match_id
+    ),
+    base AS (
+        SELECT
+            l.league,
+            CASE p.recommendation
+                WHEN 'HOME' THEN o.home_odds
+                WHEN 'DRAW' THEN o.draw_odds
+                WHEN 'AWAY' THEN o.away_odds
+            END AS rec_odds,
+            p.confidence, p.recommendation, p.actual_result, p.correct, p.log_loss,
+            DATE(p.predicted_at) AS day
+        FROM `{project}.{dataset}.predictions_log` p
+        LEFT JOIN odds o ON p.match_id = o.match_id
+        LEFT JOIN leagues l ON p.match_id = l.match_id
+        WHERE p.actual_result IS NOT NULL
+          AND p.predicted_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {days} DAY)
+    )
+    SELECT
+        league,
+        IF(rec_odds > 0, {odds_bucket}, -1) AS ob,
+        {conf_bucket} AS cb,
+        recommendation AS rec,
+        actual_result AS act,
+        FORMAT_DATE('%Y-%m-%d', day) AS day,
+        COUNT(*) AS n,
+        COUNTIF(correct = true) AS c,
+        SUM(confidence) AS sc,
+        SUM(IF(correct = true, confidence, 0)) AS scc,
+        SUM(log_loss) AS sl,
+        COUNT(log_loss) AS nl
+    FROM base
+    GROUP BY league, ob, cb, rec, act, day
+    """
+
+
+def _pct(num: float, den: float) -> float:
+    return round(num / den * 100, 1) if den else 0
+
+
+def _avg(num: float, den: float, digits: int) -> Optional[float]:
+    return round(num / den, digits) if den else None
+
+
+class _Acc:
+    __slots__ = ("n", "c", "sc", "scc", "sl", "nl")
+
+    def __init__(self):
+        self.n = self.c = self.nl = 0
+        self.sc = self.scc = self.sl = 0.0
+
+    def add(self, cell: List):
+        self.n += cell[N]
+        self.c += cell[C]
+        self.sc += cell[SC] or 0.0
+        self.scc += cell[SCC] or 0.0
+        self.sl += cell[SL] or 0.0
+        self.nl += cell[NL]
+
+
+class InsightCube:
+    """메모리 상의 큐브 + 슬라이스 연산."""
+
+    def __init__(self, cells: List[List], day_seq: Dict[str, str], hits: List[Dict],
+                 misses: List[Dict], model_version: str = "unknown", built_at: Optional[str] = None):
+        self.cells = cells
+        self.day_seq = day_seq            # day → '1'/'0' 적중 시퀀스 (predicted_at 순)
+        self.hits = hits                  # 신뢰도 ≥ 0.70 적중 (신뢰도 내림차순)
+        self.misses = misses              # 신뢰도 ≥ 0.65 오답 (신뢰도 내림차순)
+        self.model_version = model_version
+        self.built_at = built_at or datetime.now(timezone.utc).isoformat()
+
+    # ─── Build / serialize ───
+
+    @classmethod
+    def from_rows(cls, cube_rows: Iterable[Dict], seq_rows: Iterable[Dict], detail_rows: Iterable[Dict],
+                  model_version: str = "unknown") -> "InsightCube":
+        cells = [
+            [r.get("league"), int(r.get("ob", -1)), int(r.get("cb", len(CONF_BUCKETS) - 1)),
+             r.get("rec"), r.get("act"), str(r.get("day")), int(r.get("n") or 0), int(r.get("c") or 0),
+             float(r.get("sc") or 0), float(r.get("scc") or 0), float(r.get("sl") or 0), int(r.get("nl") or 0)]
+            for r in cube_rows
+        ]
+        day_seq = {str(r["day"]): r.get("seq") or "" for r in seq_rows}
+        hits, misses = [], []
+        for r in detail_rows:
+            row = {k: (str(v) if k == "predicted_at" else v) for k, v in r.items()}
+            (hits if row.get("correct") else misses).append(row)
+        return cls(cells, day_seq, hits, misses, model_version)
+
+    def to_dict(self) -> Dict:
+        return {
+            "cells": self.cells, "day_seq": self.day_seq, "hits": self.hits, "misses": self.misses,
+            "model_version": self.model_version, "built_at": self.built_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InsightCube":
+        return cls(data.get("cells", []), data.get("day_seq", {}), data.get("hits", []),
+                   data.get("misses", []), data.get("model_version", "unknown"), data.get("built_at"))
+
+    # ─── Slicing ───
+
+    @staticmethod
+    def _since(days: int) -> str:
+        return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+    def _window(self, days: int) -> List[List]:
+        since = self._since(days)
+        return [c for c in self.cells if c[DAY] >= since]
+
+    def _group(self, cells: Iterable[List], key) -> Dict:
+        groups = defaultdict(_Acc)
+        for cell in cells:
+            k = key(cell)
+            if k is not None:
+                groups[k].add(cell)
+        return groups
+
+    def overall(self, days: int) -> Dict:
+        acc = _Acc()
+        for cell in self._window(days):
+            acc.add(cell)
+        return {
+            "total_predictions": acc.n,
+            "correct_count": acc.c,
+            "incorrect_count": acc.n - acc.c,
+            "accuracy_pct": _pct(acc.c, acc.n),
+            "avg_confidence": _avg(acc.sc, acc.n, 3) or 0,
+            "avg_log_loss": _avg(acc.sl, acc.nl, 4) or 0,
+            "avg_confidence_when_correct": _avg(acc.scc, acc.n, 3) or 0,
+            "avg_confidence_when_wrong": _avg(acc.sc - acc.scc, acc.n, 3) or 0,
+            "model_version": self.model_version,
+        }
+
+    def by_league(self, days: int) -> List[Dict]:
+        groups = self._group(self._window(days), lambda c: c[L])
+        rows = [
+            {"league": lg, "matches": a.n, "correct": a.c, "accuracy_pct": _pct(a.c, a.n),
+             "avg_confidence": _avg(a.sc, a.n, 3), "avg_log_loss": _avg(a.sl, a.nl, 4)}
+            for lg, a in groups.items() if a.n >= 10
+        ]
+        return sorted(rows, key=lambda r: r["accuracy_pct"], reverse=True)
+
+    def by_odds_range(self, days: int) -> List[Dict]:
+        groups = self._group(self._window(days), lambda c: c[OB] if c[OB] >= 0 else None)
+        return [
+            {"odds_range": ODDS_BUCKETS[b][1], "matches": a.n, "correct": a.c,
+             "accuracy_pct": _pct(a.c, a.n), "avg_confidence": _avg(a.sc, a.n, 3)}
+            for b, a in sorted(groups.items())
+        ]
+
+    def by_confidence(self, days: int) -> List[Dict]:
+        groups = self._group(self._window(days), lambda c: c[CB])
+        return [
+            {"confidence_tier": CONF_BUCKETS[b][1], "matches": a.n, "correct": a.c,
+             "accuracy_pct": _pct(a.c, a.n), "avg_confidence": _avg(a.sc, a.n, 3)}
+            for b, a in sorted(groups.items())
+        ]
+
+    def by_recommendation(self, days: int) -> List[Dict]:
+        groups = self._group(self._window(days), lambda c: c[REC])
+        rows = [{"recommendation": r, "total": a.n, "correct": a.c, "accuracy_pct": _pct(a.c, a.n)}
+                for r, a in groups.items()]
+        return sorted(rows, key=lambda r: r["accuracy_pct"])
+
+    def miss_patterns(self, days: int, limit: int = 10) -> List[Dict]:
+        wrong = []
+        for cell in self._window(days):
+            if cell[N] > cell[C]:
+                # 오답 몫만 남긴 셀
+                wrong.append(cell[:N] + [cell[N] - cell[C], 0, cell[SC] - cell[SCC], 0.0, 0.0, 0])
+        groups = self._group(wrong, lambda c: (c[REC], c[ACT]))
+        rows = [{"predicted": k[0], "actual": k[1], "miss_count": a.n,
+                 "avg_confidence_when_wrong": _avg(a.sc, a.n, 3)} for k, a in groups.items()]
+        return sorted(rows, key=lambda r: r["miss_count"], reverse=True)[:limit]
+
+    def _details(self, rows: List[Dict], days: int, limit: int = 20) -> List[Dict]:
+        since = self._since(days)
+        return [r for r in rows if str(r.get("predicted_at", ""))[:10] >= since][:limit]
+
+    def overconfident_misses(self, days: int) -> List[Dict]:
+        return self._details(self.misses, days)
+
+    def high_confidence_hits(self, days: int) -> List[Dict]:
+        return self._details(self.hits, days)
+
+    def max_streak(self, days: int) -> int:
+        since = self._since(days)
+        seq = "".join(s for d, s in sorted(self.day_seq.items()) if d >= since)
+        return max((len(run) for run in seq.split("0")), default=0)
+
+    def weekly_trend(self, days: int) -> List[Dict]:
+        def week_start(cell):
+            d = date.fromisoformat(cell[DAY])
+            return (d - timedelta(days=(d.weekday() + 1) % 7)).isoformat()  # BigQuery WEEK = 일요일 시작
+
+        groups = self._group(self._window(days), week_start)
+        return [
+            {"week_start": wk, "total": a.n, "correct": a.c, "accuracy_pct": _pct(a.c, a.n),
+             "avg_log_loss": _avg(a.sl, a.nl, 4), "avg_confidence": _avg(a.sc, a.n, 3)}
+            for wk, a in sorted(groups.items()) if a.n >= 5
+        ]
+
+    def draw_analysis(self, days: int) -> List[Dict]:
+        predicted, actual, hit = _Acc(), 0, 0
+        for cell in self._window(days):
+            if cell[REC] == "DRAW":
+                predicted.add(cell)
+            if cell[ACT] == "DRAW":
+                actual += cell[N]
+                if cell[REC] == "DRAW":
+                    hit += cell[N]
+        return [
+            {"scenario": "AI가 무승부 예측", "total": predicted.n, "correct": predicted.c,
+             "accuracy_pct": _pct(predicted.c, predicted.n)},
+            {"scenario": "실제 무승부를 맞춤", "total": actual, "correct": hit, "accuracy_pct": _pct(hit, actual)},
+        ]
+
+    def home_away_bias(self, days: int) -> List[Dict]:
+        groups = self._group(self._window(days), lambda c: c[REC])
+        total = sum(a.n for a in groups.values())
+        rows = [{"recommendation": r, "times_recommended": a.n, "correct": a.c,
+                 "accuracy_pct": _pct(a.c, a.n), "recommendation_pct": _pct(a.n, total)}
+                for r, a in groups.items()]
+        return sorted(rows, key=lambda r: r["times_recommended"], reverse=True)
@@ -14,18 +14,30 @@ Backtest Engine — AI 예측 모델 소급 검증 엔진.
   3. 약점 패턴 (무승부 예측 정확도 낮음, 언더독 과소평가 등)
   4. 시계열 트렌드 (모델 v1 → v2로 정확도 5% 향상)
   5. 상황별 강점 (홈팀 유리 시 87% 적중)
+
+인사이트 큐브:
+  매일 야간 파이프라인(또는 POST /api/backtest/cube/refresh)이 predictions_log 를
+  1회 스캔하여 다차원 큐브를 만들고 메모리 + Firestore(MARKET_CACHE)에 보관.
+  모든 get_* 는 큐브가 있으면 메모리에서 슬라이스, 없으면 기존 쿼리로 폴백.
 """
+import asyncio
+import json
 import logging
 from typing import Dict, List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.services import bigquery_service as bq
+from app.services.backtest_cube import CUBE_MAX_DAYS, InsightCube, cube_sql
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ID = bq.PROJECT_ID
 DATASET_ID = bq.DATASET_ID
 
+CUBE_CACHE_KEY = "backtest_insight_cube"
+CUBE_TTL = timedelta(hours=26)  # 야간 갱신 1회 누락까지 허용
+CUBE_MAX_BLOB_BYTES = 900_000    # Firestore 문서 1MiB 제한
+
 
 class BacktestEngine:
     """과거 데이터 기반 AI 모델 소급 검증 엔진."""
@@ -33,6 +45,106 @@ class BacktestEngine:
     def __init__(self):
         self._cache: Dict[str, any] = {}
         self._cache_expiry: Optional[datetime] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._restore_attempted = False
+
+    # ─── 인사이트 큐브 ───
+
+    async def refresh_cube(self) -> Dict:
+        """predictions_log 1회 스캔으로 큐브 재생성 (+ 스트릭/상세 목록 쿼리 동시 실행)."""
+        started = datetime.now(timezone.utc)
+        seq_sql = f"""
+        SELECT
+            FORMAT_DATE('%Y-%m-%d', DATE(predicted_at)) AS day,
+            STRING_AGG(IF(correct = true, '1', '0'), '' ORDER BY predicted_at) AS seq,
+            ARRAY_AGG(model_version ORDER BY predicted_at DESC LIMIT 1)[OFFSET(0)] AS model_version
+        FROM `{PROJECT_ID}.{DATASET_ID}.predictions_log`
+        WHERE actual_result IS NOT NULL
+          AND predicted_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {CUBE_MAX_DAYS} DAY)
+        GROUP BY day
+        """
+        detail_sql = f"""
+        SELECT
+            match_id, recommendation, actual_result, correct,
+            ROUND(confidence, 3) as confidence,
+            ROUND(log_loss, 4) as log_loss,
+            predicted_at
+        FROM `{PROJECT_ID}.{DATASET_ID}.predictions_log`
+        WHERE actual_result IS NOT NULL
+          AND predicted_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {CUBE_MAX_DAYS} DAY)
+          AND ((correct = true AND confidence >= 0.70) OR (correct = false AND confidence >= 0.65))
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY DATE(predicted_at), correct ORDER BY confidence DESC) <= 20
+        ORDER BY confidence DESC
+        """
+        cube_rows, seq_rows, detail_rows = await asyncio.gather(
+            bq.query(cube_sql(PROJECT_ID, DATASET_ID)),
+            bq.query(seq_sql),
+            bq.query(detail_sql),
+        )
+        latest = max(seq_rows or [], key=lambda r: str(r.get("day")), default={})
+        cube = InsightCube.from_rows(cube_rows or [], seq_rows or [], detail_rows or [],
+                                     model_version=latest.get("model_version") or "unknown")
+        self._set_cube(cube)
+        await self._persist_cube(cube)
+
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        logger.info(f"📦 Backtest cube rebuilt: {len(cube.cells)} cells in {elapsed:.1f}s")
+        return {"cells": len(cube.cells), "days": len(cube.day_seq), "built_at": cube.built_at,
+                "elapsed_sec": round(elapsed, 2)}
+
+    def _set_cube(self, cube: InsightCube):
+        self._cache["cube"] = cube
+        built = datetime.fromisoformat(cube.built_at)
+        self._cache_expiry = built + CUBE_TTL
+
+    async def _persist_cube(self, cube: InsightCube):
+        payload = cube.to_dict()
+        size = len(json.dumps(payload, ensure_ascii=False, default=str))
+        if size > CUBE_MAX_BLOB_BYTES:
+            logger.warning(f"Backtest cube too large to persist ({size} bytes) — memory only")
+            return
+        from app.models.bets_db import save_stats_cache
+        await save_stats_cache(CUBE_CACHE_KEY, payload)
+
+    async def _get_cube(self) -> Optional[InsightCube]:
+        """유효한 큐브 반환. 없으면 Firestore 복원 시도 후, 백그라운드 재생성 예약."""
+        now = datetime.now(timezone.utc)
+        cube = self._cache.get("cube")
+        if cube is not None and self._cache_expiry and now < self._cache_expiry:
+            return cube
+
+        if not self._restore_attempted:
+            self._restore_attempted = True
+            try:
+                from app.models.bets_db import load_stats_cache
+                data = await load_stats_cache(CUBE_CACHE_KEY)
+                if data.get("cells") is not None:
+                    restored = InsightCube.from_dict(data)
+                    self._set_cube(restored)
+                    if now < self._cache_expiry:
+                        return restored
+            except Exception as e:
+                logger.warning(f"Backtest cube restore failed: {e}")
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_quietly())
+        return None
+
+    async def _refresh_quietly(self):
+        try:
+            await self.refresh_cube()
+        except Exception as e:
+            logger.warning(f"Backtest cube refresh failed: {e}")
+
+    def cube_status(self) -> Dict:
+        cube = self._cache.get("cube")
+        return {
+            "ready": cube is not None,
+            "built_at": cube.built_at if cube else None,
+            "expires_at": self._cache_expiry.isoformat() if self._cache_expiry else None,
+            "cells": len(cube.cells) if cube else 0,
+            "refreshing": bool(self._refresh_task and not self._refresh_task.done()),
+        }
 
     # ─── 통합 인사이트 API ───
 
@@ -40,26 +152,31 @@ class BacktestEngine:
         """
         전체 백테스트 인사이트를 통합 반환.
         프론트엔드 대시보드에서 한 번에 호출.
+        큐브가 있으면 메모리 슬라이스, 없으면 9개 쿼리를 동시 실행.
         """
-        results = {}
-
-        # 병렬 실행을 위해 각각 호출
-        results["overall"] = await self.get_overall_accuracy(days)
-        results["by_league"] = await self.get_accuracy_by_league(days)
-        results["by_odds_range"] = await self.get_accuracy_by_odds_range(days)
-        results["by_confidence"] = await self.get_accuracy_by_confidence(days)
-        results["weak_patterns"] = await self.get_weak_patterns(days)
-        results["strong_patterns"] = await self.get_strong_patterns(days)
-        results["trend"] = await self.get_accuracy_trend(days)
-        results["draw_analysis"] = await self.get_draw_accuracy(days)
-        results["home_away_bias"] = await self.get_home_away_bias(days)
-
-        return results
+        keys = ["overall", "by_league", "by_odds_range", "by_confidence", "weak_patterns",
+                "strong_patterns", "trend", "draw_analysis", "home_away_bias"]
+        values = await asyncio.gather(
+            self.get_overall_accuracy(days),
+            self.get_accuracy_by_league(days),
+            self.get_accuracy_by_odds_range(days),
+            self.get_accuracy_by_confidence(days),
+            self.get_weak_patterns(days),
+            self.get_strong_patterns(days),
+            self.get_accuracy_trend(days),
+            self.get_draw_accuracy(days),
+            self.get_home_away_bias(days),
+        )
+        return dict(zip(keys, values))
 
     # ─── 1. 전체 적중률 ───
 
     async def get_overall_accuracy(self, days: int = 90) -> Dict:
         """전체 예측 모델의 정확도 요약."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.overall(days)
+
         sql = f"""
         SELECT
             COUNT(*) as total_predictions,
@@ -90,6 +207,10 @@ class BacktestEngine:
 
     async def get_accuracy_by_league(self, days: int = 90) -> List[Dict]:
         """리그별 AI 예측 적중률 — 어떤 리그에서 AI가 강한지."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.by_league(days)
+
         sql = f"""
         SELECT
             m.league,
@@ -113,6 +234,10 @@ class BacktestEngine:
 
     async def get_accuracy_by_odds_range(self, days: int = 90) -> List[Dict]:
         """배당 구간별 적중률 — 어떤 배당대에서 AI가 정확한지."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.by_odds_range(days)
+
         sql = f"""
         WITH odds_with_result AS (
             SELECT
@@ -159,6 +284,10 @@ class BacktestEngine:
 
     async def get_accuracy_by_confidence(self, days: int = 90) -> List[Dict]:
         """AI 신뢰도 구간별 실제 적중률 — 신뢰도가 높을수록 정말 잘 맞는가."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.by_confidence(days)
+
         sql = f"""
         SELECT
             CASE
@@ -183,6 +312,20 @@ class BacktestEngine:
 
     async def get_weak_patterns(self, days: int = 90) -> Dict:
         """AI가 자주 틀리는 패턴 탐지 — 오답 노트 기반."""
+        cube = await self._get_cube()
+        if cube:
+            by_recommendation = cube.by_recommendation(days)
+            miss_patterns = cube.miss_patterns(days)
+            overconfident_misses = cube.overconfident_misses(days)
+            return {
+                "by_recommendation": by_recommendation,
+                "miss_patterns": miss_patterns,
+                "overconfident_misses": overconfident_misses,
+                "analysis_summary": self._generate_weakness_summary(
+                    by_recommendation, miss_patterns, overconfident_misses
+                ),
+            }
+
         # (a) 추천별 정확도 (홈/무/원정)
         sql_by_rec = f"""
         SELECT
@@ -196,7 +339,6 @@ class BacktestEngine:
         GROUP BY recommendation
         ORDER BY accuracy_pct ASC
         """
-        by_recommendation = await bq.query(sql_by_rec)
 
         # (b) 틀린 예측의 공통 패턴 — 어떤 실제 결과로 자주 빗나가는가
         sql_miss_pattern = f"""
@@ -213,7 +355,6 @@ class BacktestEngine:
         ORDER BY miss_count DESC
         LIMIT 10
         """
-        miss_patterns = await bq.query(sql_miss_pattern)
 
         # (c) 고신뢰도인데 틀린 경우 (가장 위험한 패턴)
         sql_overconfident = f"""
@@ -232,7 +373,9 @@ class BacktestEngine:
         ORDER BY confidence DESC
         LIMIT 20
         """
-        overconfident_misses = await bq.query(sql_overconfident)
+        by_recommendation, miss_patterns, overconfident_misses = await asyncio.gather(
+            bq.query(sql_by_rec), bq.query(sql_miss_pattern), bq.query(sql_overconfident)
+        )
 
         return {
             "by_recommendation": by_recommendation,
@@ -247,6 +390,15 @@ class BacktestEngine:
 
     async def get_strong_patterns(self, days: int = 90) -> Dict:
         """AI가 특히 잘 맞추는 패턴 — 마케팅/신뢰도 강화용."""
+        cube = await self._get_cube()
+        if cube:
+            hits = cube.high_confidence_hits(days)
+            return {
+                "max_streak": cube.max_streak(days),
+                "high_confidence_hits": hits,
+                "total_high_confidence_hits": len(hits),
+            }
+
         # 연속 적중 최대 스트릭
         sql_streak = f"""
         WITH ordered AS (
@@ -268,7 +420,6 @@ class BacktestEngine:
             GROUP BY grp
         )
         """
-        streak_result = await bq.query(sql_streak)
 
         # 고신뢰도 + 적중 (가장 자신 있었고 맞춘 경기들)
         sql_best = f"""
@@ -286,7 +437,7 @@ class BacktestEngine:
         ORDER BY confidence DESC
         LIMIT 20
         """
-        best_calls = await bq.query(sql_best)
+        streak_result, best_calls = await asyncio.gather(bq.query(sql_streak), bq.query(sql_best))
 
         return {
             "max_streak": streak_result[0].get("max_correct_streak", 0) if streak_result else 0,
@@ -298,6 +449,10 @@ class BacktestEngine:
 
     async def get_accuracy_trend(self, days: int = 90) -> List[Dict]:
         """주간 적중률 트렌드 — AI가 시간이 갈수록 나아지고 있는가."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.weekly_trend(days)
+
         sql = f"""
         SELECT
             DATE_TRUNC(DATE(predicted_at), WEEK) as week_start,
@@ -319,6 +474,10 @@ class BacktestEngine:
 
     async def get_draw_accuracy(self, days: int = 90) -> Dict:
         """무승부 예측 상세 분석 — 대부분 AI 모델의 약점."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.draw_analysis(days)
+
         sql = f"""
         SELECT
             'AI가 무승부 예측' as scenario,
@@ -350,6 +509,10 @@ class BacktestEngine:
 
     async def get_home_away_bias(self, days: int = 90) -> Dict:
         """AI의 홈/원정 편향 분석."""
+        cube = await self._get_cube()
+        if cube:
+            return cube.home_away_bias(days)
+
         sql = f"""
         SELECT
             recommendation,
@@ -373,18 +536,13 @@ class BacktestEngine:
         특정 경기에 대한 과거 기반 인사이트.
         프론트엔드 매치 상세 페이지에서 호출.
         """
-        # H2H 전적
-        h2h = await bq.get_h2h_record(home_team, away_team)
-
-        # 이 리그에서의 AI 적중률
-        league_accuracy = await self._get_league_accuracy(league)
-
-        # 유사 배당대 경기에서의 적중률
-        # (현재 경기 배당을 받아야 하지만 비동기로 처리)
-
-        # 해당 팀이 관련된 과거 예측 성공률
-        home_as_home = await self._get_team_home_accuracy(home_team)
-        away_as_away = await self._get_team_away_accuracy(away_team)
+        # H2H 전적 / 리그 AI 적중률 / 팀별 과거 예측 성공률 — 동시 조회
+        h2h, league_accuracy, home_as_home, away_as_away = await asyncio.gather(
+            bq.get_h2h_record(home_team, away_team),
+            self._get_league_accuracy(league),
+            self._get_team_home_accuracy(home_team),
+            self._get_team_away_accuracy(away_team),
+        )
 
         return {
             "h2h": h2h,
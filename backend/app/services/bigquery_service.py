@@ -4,6 +4,7 @@ BigQuery Data Lake Service
 - matches_raw, team_stats, odds_history, predictions_log, feature_importance
 - Firestore 부하 경감을 위해 무거운 원본 데이터를 BQ로 이관
 """
+import asyncio
 import logging
 import os
 from datetime import datetime, timezone
@@ -106,6 +107,23 @@ TABLES = {
         {"name": "predicted_at", "type": "TIMESTAMP"},
         {"name": "settled_at", "type": "TIMESTAMP"},
     ],
+    # 섀도 평가: 경기당 1행 — 응답 모델(live) vs 후보(shadow) 확률
+    "shadow_predictions": [
+        {"name": "match_id", "type": "STRING", "mode": "REQUIRED"},
+        {"name": "live_version", "type": "STRING"},
+        {"name": "live_home", "type": "FLOAT"},
+        {"name": "live_draw", "type": "FLOAT"},
+        {"name": "live_away", "type": "FLOAT"},
+        {"name": "shadow_version", "type": "STRING"},
+        {"name": "shadow_home", "type": "FLOAT"},
+        {"name": "shadow_draw", "type": "FLOAT"},
+        {"name": "shadow_away", "type": "FLOAT"},
+        {"name": "live_ms", "type": "FLOAT"},
+        {"name": "shadow_ms", "type": "FLOAT"},
+        {"name": "canary", "type": "BOOLEAN"},
+        {"name": "predicted_at", "type": "TIMESTAMP"},
+        {"name": "ingested_at", "type": "TIMESTAMP"},
+    ],
     "feature_importance": [
         {"name": "model_version", "type": "STRING", "mode": "REQUIRED"},
         {"name": "feature", "type": "STRING", "mode": "REQUIRED"},
@@ -184,18 +202,20 @@ async def insert_rows(table_name: str, rows: List[Dict[str, Any]]) -> bool:
         return False
 
 
+def _run_query(client, sql: str) -> List[Dict[str, Any]]:
+    query_job = client.query(sql)
+    return [dict(row) for row in query_job.result()]
+
+
 async def query(sql: str) -> List[Dict[str, Any]]:
-    """Execute a BigQuery SQL query and return results as dicts."""
+    """Execute a BigQuery SQL query and return results as dicts.
+    The blocking job wait runs in a worker thread so concurrent queries overlap."""
     client = _get_bq_client()
     if not client:
         return []
 
     try:
-        query_job = client.query(sql)
-        results = query_job.result()
-        rows = []
-        for row in results:
-            rows.append(dict(row))
+        rows = await asyncio.to_thread(_run_query, client, sql)
         logger.info(f"BigQuery query returned {len(rows)} rows")
         return rows
     except Exception as e:
@@ -306,6 +326,52 @@ async def log_prediction(match_id: str, model_version: str,
     return await insert_rows("predictions_log", [row])
 
 
+async def log_predictions(predictions: List[Dict[str, Any]]) -> bool:
+    """Log a batch of predictions (log_prediction 필드) in one insert."""
+    now = datetime.now(timezone.utc).isoformat()
+    return await insert_rows("predictions_log", [dict(p, predicted_at=p.get("predicted_at", now)) for p in predictions])
+
+
+async def get_shadow_comparison(days: int = 30) -> List[Dict]:
+    """
+    섀도 평가 비교 — 정산된 경기에서 live / shadow 버전별 log-loss, Brier, 평균 채점 지연.
+    같은 경기·후보 버전은 마지막 예측 1건만 반영.
+    """
+    sql = f"""
+    WITH latest AS (
+      SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.shadow_predictions`
+      WHERE predicted_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {int(days)} DAY)
+      QUALIFY ROW_NUMBER() OVER (PARTITION BY match_id, shadow_version ORDER BY predicted_at DESC) = 1
+    ), results AS (
+      SELECT match_id, ANY_VALUE(result) AS result
+      FROM `{PROJECT_ID}.{DATASET_ID}.matches_raw`
+      WHERE result IN ('HOME', 'DRAW', 'AWAY')
+      GROUP BY match_id
+    )
+    SELECT
+        s.live_version, s.shadow_version,
+        COUNT(*) AS settled,
+        COUNTIF(s.canary) AS canary,
+        ROUND(AVG(-LN(GREATEST(CASE r.result WHEN 'HOME' THEN s.live_home
+            WHEN 'DRAW' THEN s.live_draw ELSE s.live_away END, 1e-10))), 4) AS live_log_loss,
+        ROUND(AVG(-LN(GREATEST(CASE r.result WHEN 'HOME' THEN s.shadow_home
+            WHEN 'DRAW' THEN s.shadow_draw ELSE s.shadow_away END, 1e-10))), 4) AS shadow_log_loss,
+        ROUND(AVG(POW(s.live_home - IF(r.result = 'HOME', 1, 0), 2)
+                + POW(s.live_draw - IF(r.result = 'DRAW', 1, 0), 2)
+                + POW(s.live_away - IF(r.result = 'AWAY', 1, 0), 2)), 4) AS live_brier,
+        ROUND(AVG(POW(s.shadow_home - IF(r.result = 'HOME', 1, 0), 2)
+                + POW(s.shadow_draw - IF(r.result = 'DRAW', 1, 0), 2)
+                + POW(s.shadow_away - IF(r.result = 'AWAY', 1, 0), 2)), 4) AS shadow_brier,
+        ROUND(AVG(s.live_ms), 2) AS live_ms,
+        ROUND(AVG(s.shadow_ms), 2) AS shadow_ms
+    FROM latest s
+    JOIN results r USING (match_id)
+    GROUP BY s.live_version, s.shadow_version
+    ORDER BY settled DESC
+    """
+    return await query(sql)
+
+
 async def log_feature_importance(model_version: str, features: Dict[str, float],
                                    prev_features: Optional[Dict[str, float]] = None) -> bool:
     """Log feature importance for a model version."""
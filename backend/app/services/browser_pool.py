@@ -0,0 +1,285 @@
+"""
+Browser Pool — 재사용 가능한 헤드리스 Chromium 풀.
+
+기존 캡처/녹화는 작업마다 async_playwright() → chromium.launch() 를 새로 띄우고
+고정 asyncio.sleep 으로 로딩을 기다렸음 (경기당 브라우저 기동 + 페이지 로드 + 2~4초 대기).
+
+- 브라우저 1개를 띄워 두고, 컨텍스트 옵션(뷰포트·로케일·UA 등)별로 웜 컨텍스트를 보관
+- 동시 작업에는 페이지를 임대 (세마포어로 동시 페이지 수 제한)
+- 녹화(record_video_dir)처럼 컨텍스트를 닫아야 결과가 나오는 작업은 일회용 컨텍스트로 임대
+- 메모리 누수 대비: MAX_USES 회 임대 후 또는 IDLE_SECONDS 동안 미사용 시 브라우저 재시작/종료
+- 이벤트 루프가 바뀌면(asyncio.run 재호출) 이전 루프의 객체는 버리고 새로 기동
+- 고정 대기 대신 준비 조건(wait_ready): load state → network idle → DOM 변경이 잠잠해질 때까지
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = ["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
+MOBILE_USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
+    "AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Version/17.0 Mobile/15E148 Safari/604.1"
+)
+MAX_PAGES = int(os.getenv("BROWSER_POOL_MAX_PAGES", "3"))
+MAX_CONTEXTS = 4
+MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+IDLE_SECONDS = float(os.getenv("BROWSER_POOL_IDLE_SECONDS", "120"))
+
+# 지정 시간 동안 DOM 변경이 없으면 resolve (timeout 초과 시에도 resolve — 준비 조건은 최선 노력)
+_DOM_QUIET_JS = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    let timer = setTimeout(done, quietMs);
+    const limit = setTimeout(done, timeoutMs);
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(limit);
+        resolve(true);
+    }
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+})
+"""
+
+# 지연 로딩 이미지까지 즉시 불러오도록 한 뒤, 모든 이미지 로드 완료 여부
+_IMAGES_EAGER_JS = "() => document.querySelectorAll('img[loading=\"lazy\"]').forEach(img => { img.loading = 'eager'; })"
+_IMAGES_READY_JS = "() => Array.from(document.images).every(img => img.complete)"
+
+
+async def wait_ready(page, selector: Optional[str] = None, network_idle: bool = True,
+                     quiet_ms: int = 250, timeout: float = 10.0) -> None:
+    """
+    페이지 준비 대기: DOMContentLoaded → (네트워크 유휴) → (selector 표시) → 이미지·웹폰트 → DOM 조용함.
+    각 단계는 timeout 안에서 최선 노력 — 실패해도 예외 없이 다음 단계로.
+    """
+    ms = int(timeout * 1000)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=ms)
+    except Exception:
+        pass
+    if network_idle:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=ms)
+        except Exception:
+            pass
+    if selector:
+        try:
+            await page.wait_for_selector(selector, state="visible", timeout=ms)
+        except Exception:
+            logger.debug(f"[BrowserPool] selector not visible: {selector}")
+    try:
+        await page.evaluate(_IMAGES_EAGER_JS)
+        await page.wait_for_function(_IMAGES_READY_JS, timeout=ms)
+    except Exception:
+        pass
+    try:
+        await page.evaluate("() => document.fonts ? document.fonts.ready.then(() => true) : true")
+        await page.evaluate(_DOM_QUIET_JS, [quiet_ms, ms])
+    except Exception:
+        pass
+
+
+def context_options(viewport_width: int, viewport_height: int, lang: Optional[str] = None,
+                    mobile: bool = True, **extra) -> Dict:
+    """캡처/녹화 공통 컨텍스트 옵션."""
+    options = {
+        "viewport": {"width": viewport_width, "height": viewport_height},
+        "device_scale_factor": 1,
+    }
+    if mobile:
+        options["user_agent"] = MOBILE_USER_AGENT
+    if lang:
+        options["locale"] = "ko-KR" if lang == "ko" else ("en-US" if lang == "en" else "ja-JP")
+    options.update(extra)
+    return options
+
+
+def _options_key(options: Dict) -> str:
+    return repr(sorted((k, repr(v)) for k, v in options.items()))
+
+
+class BrowserPool:
+    def __init__(self, max_pages: int = MAX_PAGES, max_contexts: int = MAX_CONTEXTS,
+                 max_uses: int = MAX_USES, idle_seconds: float = IDLE_SECONDS, headless: bool = True):
+        self.max_pages = max_pages
+        self.max_contexts = max_contexts
+        self.max_uses = max_uses
+        self.idle_seconds = idle_seconds
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._contexts: "OrderedDict[str, object]" = OrderedDict()
+        self._active = 0
+        self._uses = 0
+        self._idle_handle = None
+        self.launches = 0
+        self.leases = 0
+
+    # ── 수명 관리 ──
+
+    def _bind_loop(self):
+        """현재 루프에 맞는 동기화 객체 준비. 루프가 바뀌면 이전 브라우저 참조는 폐기."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._browser is not None:
+                logger.info("[BrowserPool] event loop changed — discarding previous browser")
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_pages)
+            self._playwright = self._browser = None
+            self._contexts.clear()
+            self._active = self._uses = 0
+            self._idle_handle = None
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                if self._uses < self.max_uses or self._active:
+                    return self._browser
+                # 임대 한도 도달 + 사용 중 페이지 없음 → 재시작 (Chromium 메모리 리셋)
+                await self._shutdown()
+            from playwright.async_api import async_playwright
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            self._uses = 0
+            self.launches += 1
+            logger.info(f"[BrowserPool] chromium launched (#{self.launches})")
+            return self._browser
+
+    async def _shutdown(self):
+        for context in list(self._contexts.values()):
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        self._browser = None
+
+    async def close(self):
+        """브라우저와 Playwright 드라이버 종료."""
+        if self._loop is not asyncio.get_running_loop():
+            self._playwright = self._browser = None
+            self._contexts.clear()
+            return
+        async with self._lock:
+            await self._shutdown()
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+
+    def _schedule_idle_close(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._active or self.idle_seconds <= 0 or self._browser is None:
+            return
+        loop = self._loop
+
+        def fire():
+            self._idle_handle = None
+            if not self._active:
+                loop.create_task(self.close())
+
+        self._idle_handle = loop.call_later(self.idle_seconds, fire)
+
+    # ── 임대 ──
+
+    async def _warm_context(self, options: Dict):
+        key = _options_key(options)
+        context = self._contexts.get(key)
+        if context is not None:
+            self._contexts.move_to_end(key)
+            return context
+        browser = await self._ensure_browser()
+        context = await browser.new_context(**options)
+        self._contexts[key] = context
+        while len(self._contexts) > self.max_contexts:
+            _, old = self._contexts.popitem(last=False)
+            try:
+                await old.close()
+            except Exception:
+                pass
+        return context
+
+    async def _acquire(self):
+        self._bind_loop()
+        await self._slots.acquire()
+        self._active += 1
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _release(self):
+        self._active -= 1
+        self._slots.release()
+        self._schedule_idle_close()
+
+    @asynccontextmanager
+    async def page(self, **options):
+        """페이지 임대 — 같은 옵션의 웜 컨텍스트에서 새 페이지를 열고, 반납 시 페이지만 닫음."""
+        await self._acquire()
+        page = None
+        try:
+            context = await self._warm_context(options)
+            page = await context.new_page()
+            self._uses += 1
+            self.leases += 1
+            yield page
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self._release()
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """일회용 컨텍스트 임대 (record_video_dir 처럼 컨텍스트를 닫아야 결과가 확정되는 작업)."""
+        await self._acquire()
+        context = None
+        try:
+            context = await (await self._ensure_browser()).new_context(**options)
+            self._uses += 1
+            self.leases += 1
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            self._release()
+
+    def stats(self) -> Dict:
+        return {
+            "connected": bool(self._browser is not None and self._browser.is_connected()),
+            "launches": self.launches,
+            "leases": self.leases,
+            "active_pages": self._active,
+            "warm_contexts": len(self._contexts),
+        }
+
+
+browser_pool = BrowserPool()
@@ -1,18 +1,20 @@
 """
-Browser Recorder Service — 스코어닉스 경기 분석 화면 캡처 (메모리 극최적화 버전)
+Browser Recorder Service — 스코어닉스 경기 분석 화면 캡처
 ================================================================
 /bets 페이지에서 각 경기 카드를 확장(더보기)하여 AI 분석 화면 스크린샷 캡처
 
-메모리 누수(OOM) 방지 설계:
-  1. 매 스크린샷 캡처 루프마다 Playwright 브라우저를 론칭/클로즈하여 Chromium 메모리를 완전 리셋.
-  2. 메모리 잔여 자원을 낭비하지 않도록 가비지 컬렉터(gc.collect)를 매 루프마다 명시적 호출.
+- 브라우저는 browser_pool 에서 임대 (경기마다 Chromium 재기동 없음)
+- 페이지는 1회 로드: 인트로 캡처 → 대상 카드 더보기 일괄 클릭 → 준비 조건 대기 1회 → 카드별 클립 캡처
+- 고정 sleep 대신 네트워크 유휴 / 카드 확장 / DOM 변경 종료를 기다림
+- 메모리: 풀이 임대 횟수·유휴 시간 기준으로 브라우저를 재시작/종료 (파이프라인은 캡처 후 즉시 close)
 """
 import os
 import asyncio
 import logging
 import tempfile
-import gc
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from app.services.browser_pool import BrowserPool, browser_pool, context_options, wait_ready
 
 logger = logging.getLogger(__name__)
 
@@ -39,115 +41,135 @@ DISABLE_TOUR_JS = """
 })();
 """
 
+MORE_BUTTONS_JS = """
+(limit) => {
+    const found = [];
+    for (const btn of document.querySelectorAll('button')) {
+        const text = btn.innerText || '';
+        if (!(text.includes('더보기') || text.includes('▼') || text.toLowerCase().includes('more'))) continue;
+        const idx = found.length;
+        btn.setAttribute('data-scorenix-more', String(idx));
+        const card = btn.closest('div[class*="rounded-2xl"]');
+        let name = null;
+        if (card) {
+            card.setAttribute('data-scorenix-card', String(idx));
+            for (const raw of card.innerText.split('\\n')) {
+                const line = raw.trim();
+                if (line && (line.toLowerCase().includes('vs') || line.length > 3)) { name = line.slice(0, 60); break; }
+            }
+        }
+        found.push({idx, name, height: card ? card.getBoundingClientRect().height : 0});
+    }
+    return {total: found.length, targets: found.slice(0, limit)};
+}
+"""
+
+# 클릭한 카드가 모두 펼쳐졌는지 (카드 높이가 클릭 전보다 커짐) — 고정 sleep 대신 준비 조건
+CARDS_EXPANDED_JS = """
+(targets) => targets.every(t => {
+    const card = document.querySelector(`[data-scorenix-card="${t.idx}"]`);
+    return !card || card.getBoundingClientRect().height > t.height;
+})
+"""
+
+# 버튼을 화면 세로 중앙에 두는 뷰포트 크기 클립 (scroll_into_view_if_needed 후 뷰포트 캡처와 같은 구도)
+CLIP_BOXES_JS = """
+([targets, width, height]) => {
+    const pageHeight = Math.max(document.documentElement.scrollHeight, document.body.scrollHeight, height);
+    return targets.map(t => {
+        const btn = document.querySelector(`[data-scorenix-more="${t.idx}"]`);
+        if (!btn) return null;
+        const rect = btn.getBoundingClientRect();
+        const center = rect.top + window.scrollY + rect.height / 2;
+        const y = Math.round(Math.min(Math.max(center - height / 2, 0), pageHeight - height));
+        return {x: 0, y, width, height};
+    });
+}
+"""
+
+
+def _bets_url(lang: str, base_url: Optional[str] = None) -> str:
+    base_url = (base_url or os.getenv("SCORENIX_BASE_URL", "https://scorenix.com")).rstrip("/")
+    return f"{base_url}/{lang}/bets" if lang != "ko" else f"{base_url}/bets"
+
+
+async def _open_bets_page(page, bets_url: str):
+    """페이지 로드 → 준비 조건 대기 → 온보딩 투어 제거."""
+    try:
+        await page.goto(bets_url, wait_until="domcontentloaded", timeout=25000)
+    except Exception as e:
+        logger.warning(f"[Recorder] 페이지 로드 지연: {e}")
+    await wait_ready(page, timeout=15.0)
+    try:
+        await page.evaluate(DISABLE_TOUR_JS)
+    except Exception:
+        pass
+
+
+async def _capture_cards(page, targets: List[Dict], shot_paths: List[str],
+                         viewport_width: int, viewport_height: int) -> List[Dict]:
+    """
+    대상 카드의 더보기를 모두 누르고 한 번만 대기한 뒤, 카드별 뷰포트 크기 클립을 캡처.
+    한 번의 페이지 로드에서 모든 카드를 처리 (카드마다 브라우저 재기동/재로드 없음).
+    """
+    for t in targets:
+        try:
+            await page.click(f'[data-scorenix-more="{t["idx"]}"]', timeout=5000)
+        except Exception as e:
+            logger.warning(f"[Recorder] 경기 {t['idx']} 더보기 클릭 실패: {e}")
+    try:
+        await page.wait_for_function(CARDS_EXPANDED_JS, arg=targets, timeout=10000)
+    except Exception:
+        logger.warning("[Recorder] 일부 카드 확장 확인 실패 — 현재 상태로 캡처")
+    await wait_ready(page, timeout=10.0)
+
+    boxes = await page.evaluate(CLIP_BOXES_JS, [targets, viewport_width, viewport_height])
+
+    async def shot(t, box, path):
+        if box is None:
+            return None
+        try:
+            await page.screenshot(path=path, clip=box, full_page=True)
+        except Exception as e:
+            logger.error(f"[Recorder] 경기 {t['idx']} 캡처 실패: {e}")
+            return None
+        return {
+            "screenshot_path": path,
+            "match_name": t.get("name") or f"Match {t['idx'] + 1}",
+            "scene": "match",
+        }
+
+    shots = await asyncio.gather(*(shot(t, box, path) for t, box, path in zip(targets, boxes, shot_paths)))
+    return [s for s in shots if s]
+
+
 async def capture_single_match_screenshot(
     bets_url: str,
     target_idx: int,
     output_path: str,
     viewport_width: int,
     viewport_height: int,
-    lang: str
+    lang: str,
+    pool: Optional[BrowserPool] = None,
 ) -> Dict:
     """
-    브라우저를 독립적으로 띄워 특정 인덱스의 경기 카드를 캡처하고 바로 종료합니다.
+    특정 인덱스의 경기 카드 하나를 캡처합니다 (풀에서 페이지 임대).
     """
-    from playwright.async_api import async_playwright
+    pool = pool or browser_pool
     match_name = f"Match {target_idx + 1}"
-
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
-            )
-
-            context = await browser.new_context(
-                viewport={"width": viewport_width, "height": viewport_height},
-                device_scale_factor=1,
-                user_agent=(
-                    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
-                    "AppleWebKit/605.1.15 (KHTML, like Gecko) "
-                    "Version/17.0 Mobile/15E148 Safari/604.1"
-                ),
-                locale="ko-KR" if lang == "ko" else ("en-US" if lang == "en" else "ja-JP"),
-                color_scheme="dark",
-            )
-
-            page = await context.new_page()
-
-            # /bets 페이지 로드
-            try:
-                await page.goto(bets_url, wait_until="networkidle", timeout=25000)
-            except Exception:
-                try:
-                    await page.goto(bets_url, wait_until="domcontentloaded", timeout=12000)
-                except Exception:
-                    pass
-
-            await asyncio.sleep(2.0)
-
-            # 온보딩 투어 제거
-            try:
-                await page.evaluate(DISABLE_TOUR_JS)
-            except Exception:
-                pass
-
-            # 전체 버튼들 중에서 더보기 버튼 인덱스 재탐색
-            expand_buttons = await page.query_selector_all('button')
-            more_buttons = []
-            for btn in expand_buttons:
-                try:
-                    text = await btn.inner_text()
-                    if '더보기' in text or '▼' in text or 'more' in text.lower():
-                        more_buttons.append(btn)
-                except Exception:
-                    continue
-
-            if not more_buttons or target_idx >= len(more_buttons):
+        options = context_options(viewport_width, viewport_height, lang, color_scheme="dark")
+        async with pool.page(**options) as page:
+            await _open_bets_page(page, bets_url)
+            found = await page.evaluate(MORE_BUTTONS_JS, target_idx + 1)
+            if target_idx >= found["total"]:
                 logger.warning(f"[Recorder] 경기 {target_idx} 더보기 버튼 찾지 못함.")
-                await context.close()
-                await browser.close()
                 return {"success": False, "match_name": match_name}
-
-            btn = more_buttons[target_idx]
-
-            # 경기명 파싱
-            try:
-                card_el = await btn.evaluate_handle(
-                    "el => el.closest('div[class*=\"rounded-2xl\"]')"
-                )
-                if card_el:
-                    card_text = await card_el.inner_text()
-                    lines = [l.strip() for l in card_text.split('\n') if l.strip()]
-                    for line in lines:
-                        if 'vs' in line.lower() or len(line) > 3:
-                            match_name = line[:60]
-                            break
-            except Exception:
-                pass
-
-            # 더보기 버튼 위치로 스크롤 및 클릭
-            await btn.scroll_into_view_if_needed()
-            await asyncio.sleep(0.2)
-            await btn.click()
-            
-            # 패널 확장 및 데이터 로딩 대기
-            await asyncio.sleep(1.5)
-
-            # 확장된 상태 스냅샷
-            await btn.scroll_into_view_if_needed()
-            await asyncio.sleep(0.3)
-            await page.screenshot(path=output_path, full_page=False)
-
-            await context.close()
-            await browser.close()
-
-            return {
-                "success": True,
-                "screenshot_path": output_path,
-                "match_name": match_name,
-                "scene": "match"
-            }
-
+            shots = await _capture_cards(page, found["targets"][target_idx:], [output_path],
+                                         viewport_width, viewport_height)
+        if not shots:
+            return {"success": False, "match_name": match_name}
+        return dict(shots[0], success=True)
     except Exception as e:
         logger.error(f"[Recorder] 단일 경기 캡처 {target_idx} 실패: {e}")
         return {"success": False, "match_name": match_name}
@@ -158,59 +180,25 @@ async def capture_match_screenshots(
     max_matches: int = 5,
     viewport_width: int = 1080,
     viewport_height: int = 1920,
+    bets_url: Optional[str] = None,
+    pool: Optional[BrowserPool] = None,
 ) -> List[Dict]:
     """
-    경기 리스트를 가져온 뒤, 각 경기를 개별 브라우저 론칭 방식으로 스크린샷 캡처합니다.
+    /bets 페이지를 한 번 로드해 인트로와 경기 카드들을 캡처합니다.
+    bets_url 을 지정하면 lang 기반 URL 대신 사용 (로컬 fixture 등).
     """
-    from playwright.async_api import async_playwright
-
-    base_url = "https://scorenix.com"
-    bets_url = f"{base_url}/{lang}/bets" if lang != "ko" else f"{base_url}/bets"
-
-    logger.info(f"[Recorder] [최적화] 경기 스크린샷 캡처 시작: {bets_url}")
+    pool = pool or browser_pool
+    bets_url = bets_url or _bets_url(lang)
+    logger.info(f"[Recorder] 경기 스크린샷 캡처 시작: {bets_url}")
 
     temp_dir = tempfile.mkdtemp(prefix="scorenix_shots_")
     results = []
-
-    # ── 1) 인트로 캡처용 론칭 ──────────────────────────────────
-    intro_path = os.path.join(temp_dir, "intro.png")
-    num_matches = 0
-
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            context = await browser.new_context(
-                viewport={"width": viewport_width, "height": viewport_height},
-                device_scale_factor=1,
-                user_agent=(
-                    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
-                    "AppleWebKit/605.1.15 (KHTML, like Gecko) "
-                    "Version/17.0 Mobile/15E148 Safari/604.1"
-                ),
-                locale="ko-KR" if lang == "ko" else ("en-US" if lang == "en" else "ja-JP"),
-                color_scheme="dark",
-            )
-            page = await context.new_page()
-
-            try:
-                await page.goto(bets_url, wait_until="networkidle", timeout=25000)
-            except Exception:
-                try:
-                    await page.goto(bets_url, wait_until="domcontentloaded", timeout=12000)
-                except Exception:
-                    pass
-
-            await asyncio.sleep(2.5)
-
-            # 온보딩 오버레이 제거
-            try:
-                await page.evaluate(DISABLE_TOUR_JS)
-            except Exception:
-                pass
+        options = context_options(viewport_width, viewport_height, lang, color_scheme="dark")
+        async with pool.page(**options) as page:
+            await _open_bets_page(page, bets_url)
 
+            intro_path = os.path.join(temp_dir, "intro.png")
             await page.screenshot(path=intro_path, full_page=False)
             results.append({
                 "screenshot_path": intro_path,
@@ -219,53 +207,13 @@ async def capture_match_screenshots(
             })
             logger.info("[Recorder] 인트로 스크린샷 완료")
 
-            # 경기 카드 개수 파악
-            expand_buttons = await page.query_selector_all('button')
-            more_buttons_count = 0
-            for btn in expand_buttons:
-                try:
-                    text = await btn.inner_text()
-                    if '더보기' in text or '▼' in text or 'more' in text.lower():
-                        more_buttons_count += 1
-                except Exception:
-                    continue
-
-            num_matches = min(more_buttons_count, max_matches)
-            logger.info(f"[Recorder] 캡처 대상 경기 카드 수: {num_matches}개")
-
-            await context.close()
-            await browser.close()
-    except Exception as intro_err:
-        logger.error(f"[Recorder] 인트로 캡처 실패: {intro_err}")
-
-    # 가비지 컬렉터 강제 실행
-    gc.collect()
-
-    # ── 2) 각 경기를 개별 브라우저 론칭으로 캡처 ─────────────────────────────
-    for idx in range(num_matches):
-        shot_path = os.path.join(temp_dir, f"match_{idx}.png")
-        logger.info(f"[Recorder] 경기 {idx+1}/{num_matches} 개별 캡처 시도...")
-        
-        res = await capture_single_match_screenshot(
-            bets_url=bets_url,
-            target_idx=idx,
-            output_path=shot_path,
-            viewport_width=viewport_width,
-            viewport_height=viewport_height,
-            lang=lang
-        )
-        
-        if res.get("success", False):
-            results.append({
-                "screenshot_path": res["screenshot_path"],
-                "match_name": res["match_name"],
-                "scene": "match"
-            })
-            logger.info(f"[Recorder] 경기 {idx+1} 캡처 성공: {res['match_name'][:30]}")
-        
-        # 메모리 반환
-        gc.collect()
-        await asyncio.sleep(0.5)
+            found = await page.evaluate(MORE_BUTTONS_JS, max_matches)
+            targets = found["targets"]
+            logger.info(f"[Recorder] 캡처 대상 경기 카드 수: {len(targets)}개")
+            shot_paths = [os.path.join(temp_dir, f"match_{t['idx']}.png") for t in targets]
+            results.extend(await _capture_cards(page, targets, shot_paths, viewport_width, viewport_height))
+    except Exception as e:
+        logger.error(f"[Recorder] 캡처 실패: {e}")
 
     logger.info(f"[Recorder] 총 {len(results)}개 리소스 확보 완료")
     return results
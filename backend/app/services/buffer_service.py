@@ -2,9 +2,10 @@
 Buffer API Service — SNS 마케팅 콘텐츠 자동 발행
 - Buffer REST API v1 (실제 발행)
 - Buffer GraphQL API (채널 조회)
-- Facebook, Instagram 동시 발행
+- Facebook, Instagram 동시 발행 (채널 병렬, publish_pipeline 의 Buffer 요청 제한 공유)
 - 예약 발행 지원
 """
+import asyncio
 import logging
 import os
 from typing import Optional, List, Dict
@@ -16,6 +17,42 @@ BUFFER_GRAPHQL_URL = "https://api.buffer.com"
 BUFFER_REST_URL = "https://api.bufferapp.com/1"
 
 
+CREATE_POST_MUTATION = """
+mutation CreatePost($input: CreatePostInput!) {
+    createPost(input: $input) {
+        ... on PostActionSuccess {
+            post {
+                id
+                text
+                status
+            }
+        }
+        ... on MutationError {
+            message
+        }
+    }
+}
+"""
+
+
+def summarize_posts(outcomes: List[Dict]) -> Dict:
+    """채널별 create_post 결과 → 기존 publish_post 응답 형식."""
+    results = [{k: o.get(k, "") for k in ("channel_id", "post_id", "status")} for o in outcomes if o.get("success")]
+    errors = [{"channel_id": o.get("channel_id"), "error": o.get("error")} for o in outcomes if not o.get("success")]
+    if results:
+        return {
+            "success": True,
+            "published": len(results),
+            "posts": results,
+            "errors": errors if errors else None,
+        }
+    return {
+        "success": False,
+        "error": "Failed to publish to all channels",
+        "details": errors,
+    }
+
+
 class BufferService:
     def __init__(self):
         self._channels_cache: List[Dict] = []
@@ -117,134 +154,114 @@ class BufferService:
             logger.error(f"Buffer channels error: {e}")
             return []
 
-    async def publish_post(
+    async def active_channels(self) -> List[Dict]:
+        """발행 대상 채널 (비활성 제외)."""
+        return [c for c in await self.get_channels() if not c.get("disabled")]
+
+    async def create_post(
         self,
+        channel_id: str,
         text: str,
-        channel_ids: Optional[List[str]] = None,
+        service: str = "",
         scheduled_at: Optional[str] = None,
         image_url: Optional[str] = None,
-        now: bool = True,
     ) -> Dict:
         """
-        Buffer GraphQL createPost mutation으로 SNS 채널에 실제 발행.
-        채널별로 개별 게시물 생성.
+        채널 1개에 createPost mutation.
+        Returns: {"success", "channel_id", "post_id", "status"} 또는 {"success": False, "channel_id", "error"}
         """
-        if not self.is_configured:
-            return {"success": False, "error": "BUFFER_ACCESS_TOKEN not configured"}
-
-        # 채널 ID가 없으면 전체 활성 채널
-        if not channel_ids:
-            channels = await self.get_channels()
-            channel_ids = [c["id"] for c in channels if not c.get("disabled")]
-            if not channel_ids:
-                return {"success": False, "error": "No active Buffer channels found"}
-
-        # createPost mutation
-        mutation = """
-        mutation CreatePost($input: CreatePostInput!) {
-            createPost(input: $input) {
-                ... on PostActionSuccess {
-                    post {
-                        id
-                        text
-                        status
-                    }
-                }
-                ... on MutationError {
-                    message
-                }
-            }
+        service = (service or "").lower()
+
+        # 인스타그램은 이미지 필수
+        if service == "instagram" and not image_url:
+            logger.warning(f"⚠️ Skipping Instagram channel {channel_id}: image required")
+            return {"success": False, "channel_id": channel_id, "error": "Instagram requires an image"}
+
+        # schedulingType + mode + metadata 모두 필수
+        # mode: shareNow(즉시) | addToQueue(큐) | customScheduled(예약)
+        share_mode = "customScheduled" if scheduled_at else "shareNow"
+
+        post_input: Dict = {
+            "text": text,
+            "channelId": channel_id,
+            "schedulingType": "automatic",
+            "mode": share_mode,
         }
-        """
 
-        results = []
-        errors = []
+        # 채널별 metadata (type 필수)
+        if service == "facebook":
+            post_input["metadata"] = {"facebook": {"type": "post"}}
+        elif service == "instagram":
+            post_input["metadata"] = {"instagram": {"type": "post", "shouldShareToFeed": True}}
 
-        # 채널 서비스 타입 조회 (인스타그램 이미지 필수 체크용)
-        channels_info = await self.get_channels()
-        channel_services = {c["id"]: c.get("service", "") for c in channels_info}
+        # 예약 발행 시간
+        if scheduled_at:
+            post_input["dueAt"] = scheduled_at
 
-        for ch_id in channel_ids:
-            service = channel_services.get(ch_id, "").lower()
+        # 이미지 첨부
+        if image_url:
+            post_input["assets"] = {"image": {"url": image_url}}
+            logger.info(f"📸 Attaching image to channel {channel_id}: {image_url[:80]}...")
 
-            # 인스타그램은 이미지 필수
-            if service == "instagram" and not image_url:
-                logger.warning(f"⚠️ Skipping Instagram channel {ch_id}: image required")
-                errors.append({"channel_id": ch_id, "error": "Instagram requires an image"})
-                continue
+        try:
+            result = await self._graphql(CREATE_POST_MUTATION, {"input": post_input})
+            logger.info(f"createPost result for {channel_id}: {str(result)[:500]}")
 
-            # schedulingType + mode + metadata 모두 필수
-            # mode: shareNow(즉시) | addToQueue(큐) | customScheduled(예약)
-            share_mode = "customScheduled" if scheduled_at else "shareNow"
+            if "errors" in result and result["errors"]:
+                error_msg = result["errors"][0].get("message", "Unknown error")
+                logger.error(f"Buffer publish error (ch={channel_id}): {error_msg}")
+                return {"success": False, "channel_id": channel_id, "error": error_msg}
 
-            post_input: Dict = {
-                "text": text,
-                "channelId": ch_id,
-                "schedulingType": "automatic",
-                "mode": share_mode,
-            }
+            data = result.get("data", {}).get("createPost", {})
 
-            # 채널별 metadata (type 필수)
-            if service == "facebook":
-                post_input["metadata"] = {"facebook": {"type": "post"}}
-            elif service == "instagram":
-                post_input["metadata"] = {"instagram": {"type": "post", "shouldShareToFeed": True}}
+            # MutationError 체크
+            if "message" in data:
+                logger.error(f"Buffer mutation error (ch={channel_id}): {data['message']}")
+                return {"success": False, "channel_id": channel_id, "error": data["message"]}
 
-            # 예약 발행 시간
-            if scheduled_at:
-                post_input["dueAt"] = scheduled_at
+            post = data.get("post", {})
+            post_id = post.get("id", "")
+            logger.info(f"✅ Published to channel {channel_id}: post_id={post_id}")
+            return {"success": True, "channel_id": channel_id, "post_id": post_id, "status": post.get("status", "")}
 
-            # 이미지 첨부
-            if image_url:
-                post_input["assets"] = {"image": {"url": image_url}}
-                logger.info(f"📸 Attaching image to channel {ch_id}: {image_url[:80]}...")
+        except Exception as e:
+            logger.error(f"Buffer publish error (ch={channel_id}): {e}")
+            return {"success": False, "channel_id": channel_id, "error": str(e)}
 
-            variables = {"input": post_input}
+    async def publish_post(
+        self,
+        text: str,
+        channel_ids: Optional[List[str]] = None,
+        scheduled_at: Optional[str] = None,
+        image_url: Optional[str] = None,
+        now: bool = True,
+    ) -> Dict:
+        """
+        Buffer GraphQL createPost mutation으로 SNS 채널에 실제 발행.
+        채널별로 개별 게시물 생성 (채널 동시 발행, Buffer 요청 제한 적용).
+        """
+        if not self.is_configured:
+            return {"success": False, "error": "BUFFER_ACCESS_TOKEN not configured"}
 
-            try:
-                result = await self._graphql(mutation, variables)
-                logger.info(f"createPost result for {ch_id}: {str(result)[:500]}")
+        # 채널 서비스 타입 조회 (인스타그램 이미지 필수 체크용)
+        channels_info = await self.get_channels()
+        channel_services = {c["id"]: c.get("service", "") for c in channels_info}
 
-                if "errors" in result and result["errors"]:
-                    error_msg = result["errors"][0].get("message", "Unknown error")
-                    logger.error(f"Buffer publish error (ch={ch_id}): {error_msg}")
-                    errors.append({"channel_id": ch_id, "error": error_msg})
-                    continue
+        # 채널 ID가 없으면 전체 활성 채널
+        if not channel_ids:
+            channel_ids = [c["id"] for c in channels_info if not c.get("disabled")]
+            if not channel_ids:
+                return {"success": False, "error": "No active Buffer channels found"}
 
-                data = result.get("data", {}).get("createPost", {})
+        from app.services.publish_pipeline import publish_pipeline
+        limiter = publish_pipeline.limiter("buffer")
 
-                # MutationError 체크
-                if "message" in data:
-                    logger.error(f"Buffer mutation error (ch={ch_id}): {data['message']}")
-                    errors.append({"channel_id": ch_id, "error": data["message"]})
-                    continue
+        async def send(ch_id):
+            async with limiter:
+                return await self.create_post(ch_id, text, channel_services.get(ch_id, ""), scheduled_at, image_url)
 
-                post = data.get("post", {})
-                post_id = post.get("id", "")
-                logger.info(f"✅ Published to channel {ch_id}: post_id={post_id}")
-                results.append({
-                    "channel_id": ch_id,
-                    "post_id": post_id,
-                    "status": post.get("status", ""),
-                })
-
-            except Exception as e:
-                logger.error(f"Buffer publish error (ch={ch_id}): {e}")
-                errors.append({"channel_id": ch_id, "error": str(e)})
-
-        if results:
-            return {
-                "success": True,
-                "published": len(results),
-                "posts": results,
-                "errors": errors if errors else None,
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Failed to publish to all channels",
-                "details": errors,
-            }
+        outcomes = await asyncio.gather(*(send(ch_id) for ch_id in channel_ids))
+        return summarize_posts(outcomes)
 
     async def get_recent_posts(self, limit: int = 10) -> List[Dict]:
         """최근 생성된 게시물 목록 (GraphQL Ideas)"""
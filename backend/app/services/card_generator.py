@@ -3,26 +3,153 @@ Match Analysis Card Generator — SNS 마케팅 이미지 생성
 - PIL/Pillow 기반 서버 사이드 이미지 생성
 - 경기 분석 결과를 시각적 카드로 변환
 - Firebase Storage 업로드 → 공개 URL 반환
+
+렌더링 구조:
+- 정적 배경(그라데이션·헤더·패널·라벨·워터마크 바)은 크기별 템플릿으로 1회만 그림 (NumPy 그라데이션)
+- 폰트는 프로세스 전역 캐시 (경로 확인/다운로드도 1회, 카드 렌더 중 네트워크 접근 없음)
+- 카드마다 템플릿 복사 후 팀명·확률·신뢰도/팩터 바·시각만 그림
+- 여러 장은 스레드(또는 프로세스) 풀에서 렌더, PNG(compress_level) / WebP(quality·method) 인코딩
 """
+import asyncio
 import io
 import logging
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+FONT_REGULAR = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
+FONT_BOLD = "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf"
+FONT_FALLBACK = "/tmp/NanumGothic.ttf"
+FONT_URL = "https://raw.githubusercontent.com/google/fonts/main/ofl/nanumgothic/NanumGothic-Bold.ttf"
+
+CARD_IMAGE_FORMAT = os.getenv("CARD_IMAGE_FORMAT", "png").lower()     # png / webp
+CARD_RENDER_WORKERS = int(os.getenv("CARD_RENDER_WORKERS", "4"))
+PNG_COMPRESS_LEVEL = 6        # optimize=True(레벨 9 + 필터 탐색) 대비 크기 +4%, 인코딩 ~3배 빠름
+WEBP_QUALITY = 90
+WEBP_METHOD = 2               # 0(빠름)~6(작음) — 4 이상은 2배 느리고 크기 차이 5% 이내
+
+CONTENT_TYPES = {"png": "image/png", "webp": "image/webp"}
+FACTOR_TOP, FACTOR_STEP = 710, 75
+FACTOR_COLORS = [
+    (100, 220, 160),
+    (100, 180, 255),
+    (255, 193, 7),
+    (234, 130, 130),
+]
+
+_font_lock = threading.Lock()
+_render_executor: Optional[ThreadPoolExecutor] = None
+
+
+# ─── 폰트 캐시 ───
+
+@lru_cache(maxsize=1)
+def _font_paths() -> tuple:
+    """(regular, bold) 경로 — 시스템 폰트가 없으면 1회만 다운로드."""
+    if os.path.exists(FONT_REGULAR):
+        return FONT_REGULAR, FONT_BOLD if os.path.exists(FONT_BOLD) else FONT_REGULAR
+    with _font_lock:
+        if not os.path.exists(FONT_FALLBACK):
+            import urllib.request
+            logger.info("Downloading NanumGothic font dynamically...")
+            try:
+                req = urllib.request.Request(FONT_URL, headers={'User-Agent': 'Mozilla/5.0'})
+                tmp = f"{FONT_FALLBACK}.{os.getpid()}.part"
+                with urllib.request.urlopen(req, timeout=15) as response, open(tmp, 'wb') as out_file:
+                    out_file.write(response.read())
+                os.replace(tmp, FONT_FALLBACK)
+            except Exception as e:
+                logger.error(f"Failed to download font: {e}")
+    return FONT_FALLBACK, FONT_FALLBACK
 
-def _create_match_card(match_data: Dict, width: int = 1080, height: int = 1080) -> bytes:
-    """
-    PIL을 사용하여 경기 분석 카드 이미지 생성 (Instagram 정사각형).
-    Returns: PNG bytes
-    """
+
+@lru_cache(maxsize=32)
+def _font(size: int, bold: bool = False):
+    """크기/굵기별 FreeTypeFont (프로세스 전역 캐시)."""
+    from PIL import ImageFont
+    regular, bold_path = _font_paths()
     try:
-        from PIL import Image, ImageDraw, ImageFont
-    except ImportError:
-        logger.error("Pillow not installed. Run: pip install Pillow")
-        return b""
+        return ImageFont.truetype(bold_path if bold else regular, size)
+    except (OSError, IOError):
+        return ImageFont.load_default()
+
+
+def _fonts() -> Dict:
+    return {"lg": _font(48, bold=True), "md": _font(36), "sm": _font(28), "xs": _font(22)}
+
+
+# ─── 정적 배경 템플릿 ───
+
+def _vertical_gradient(width: int, height: int, top: tuple, bottom: tuple, span: Optional[int] = None):
+    """행마다 int(top + (bottom-top)·y/span) — 기존 draw.line 루프와 같은 색을 NumPy 로 한 번에."""
+    import numpy as np
+    span = span or height
+    y = np.arange(height, dtype=np.float64)[:, None] / span
+    top_arr, bottom_arr = np.array(top, dtype=np.float64), np.array(bottom, dtype=np.float64)
+    rows = (top_arr + (bottom_arr - top_arr) * y).astype(np.uint8)        # 양수라 astype = int() 절삭
+    return np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+
+
+@lru_cache(maxsize=4)
+def _card_template(width: int = 1080, height: int = 1080):
+    """카드마다 같은 부분을 미리 그린 배경 (복사해서 사용, 직접 수정 금지)."""
+    from PIL import Image, ImageDraw
+    pixels = _vertical_gradient(width, height, (15, 15, 25), (25, 20, 45))
+    # 핑크-퍼플 그라데이션 헤더 바
+    pixels[:80] = _vertical_gradient(width, 80, (147, 51, 234), (99, 102, 241), span=80)
+    img = Image.fromarray(pixels, "RGB")
+    draw = ImageDraw.Draw(img)
+    fonts = _fonts()
+
+    draw.text((40, 20), "SCORENIX", fill=(255, 255, 255), font=fonts["lg"])
+    draw.text((380, 30), "AI MATCH ANALYSIS", fill=(220, 220, 255), font=fonts["sm"])
+
+    # VS 카드 영역
+    draw.rounded_rectangle([(40, 180), (520, 360)], radius=16, fill=(30, 30, 50))
+    draw.text((60, 200), "HOME", fill=(130, 130, 180), font=fonts["xs"])
+    draw.text((525, 240), "VS", fill=(147, 51, 234), font=fonts["lg"])
+    draw.rounded_rectangle([(600, 180), (1040, 360)], radius=16, fill=(30, 30, 50))
+    draw.text((620, 200), "AWAY", fill=(130, 130, 180), font=fonts["xs"])
+    draw.rounded_rectangle([(350, 370), (730, 430)], radius=12, fill=(40, 40, 60))
+
+    # AI 추천 영역 (신뢰도 바 트랙 포함)
+    draw.rounded_rectangle([(40, 470), (1040, 620)], radius=16, fill=(25, 25, 45))
+    draw.text((60, 490), "🧠 AI RECOMMENDATION", fill=(147, 51, 234), font=fonts["sm"])
+    draw.rounded_rectangle([(500, 545), (1020, 585)], radius=10, fill=(50, 50, 70))
+
+    draw.text((40, 660), "📊 KEY FACTORS", fill=(147, 51, 234), font=fonts["sm"])
+
+    # 하단 워터마크
+    draw.rounded_rectangle([(0, height - 70), (width, height)], radius=0, fill=(20, 20, 35))
+    draw.text((40, height - 55), "scorenix.com", fill=(147, 51, 234), font=fonts["sm"])
+    return img
+
+
+@lru_cache(maxsize=4)
+def _factor_row_tiles(width: int = 1080, height: int = 1080) -> list:
+    """팩터 행(행 배경 + 스코어 바 트랙) 4줄 타일 — 모서리 밖은 각 위치의 그라데이션 배경."""
+    from PIL import ImageDraw
+    tiles = []
+    for i in range(len(FACTOR_COLORS)):
+        y = FACTOR_TOP + i * FACTOR_STEP
+        tile = _card_template(width, height).crop((0, y, width, y + 61))
+        draw = ImageDraw.Draw(tile)
+        draw.rounded_rectangle([(40, 0), (1040, 60)], radius=10, fill=(30, 30, 50))
+        draw.rounded_rectangle([(550, 15), (980, 45)], radius=8, fill=(50, 50, 70))
+        tiles.append(tile)
+    return tiles
+
+
+# ─── 카드 렌더링 ───
+
+def _render_card_image(match_data: Dict, width: int = 1080, height: int = 1080):
+    """템플릿 복사 + 경기별 텍스트/바만 그린 PIL 이미지."""
+    from PIL import ImageDraw
 
     # ── 데이터 추출 ──
     home = match_data.get("team_home_ko", match_data.get("team_home", "홈팀"))
@@ -37,187 +164,178 @@ def _create_match_card(match_data: Dict, width: int = 1080, height: int = 1080)
 
     rec_text = "홈 승" if recommendation == "HOME" else "원정 승" if recommendation == "AWAY" else "무승부"
 
-    # ── 이미지 생성 ──
-    img = Image.new("RGB", (width, height), color=(15, 15, 25))
+    img = _card_template(width, height).copy()
     draw = ImageDraw.Draw(img)
+    fonts = _fonts()
 
-    # 폰트 설정 (시스템 기본 사용 또는 동적 다운로드)
-    font_path_regular = "/usr/share/fonts/truetype/nanum/NanumGothic.ttf"
-    font_path_bold = "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf"
-
-    if not os.path.exists(font_path_regular):
-        import urllib.request
-        logger.info("Downloading NanumGothic font dynamically...")
-        tmp_font = "/tmp/NanumGothic.ttf"
-        if not os.path.exists(tmp_font):
-            try:
-                url = "https://raw.githubusercontent.com/google/fonts/main/ofl/nanumgothic/NanumGothic-Bold.ttf"
-                req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-                with urllib.request.urlopen(req) as response, open(tmp_font, 'wb') as out_file:
-                    out_file.write(response.read())
-            except Exception as e:
-                logger.error(f"Failed to download font: {e}")
-        font_path_regular = tmp_font
-        font_path_bold = tmp_font
-    
-    try:
-        font_lg = ImageFont.truetype(font_path_bold, 48)
-        font_md = ImageFont.truetype(font_path_regular, 36)
-        font_sm = ImageFont.truetype(font_path_regular, 28)
-        font_xs = ImageFont.truetype(font_path_regular, 22)
-    except (OSError, IOError):
-        font_lg = ImageFont.load_default()
-        font_md = font_lg
-        font_sm = font_lg
-        font_xs = font_lg
-
-    # ── 배경 그라데이션 효과 ──
-    for y in range(height):
-        r = int(15 + (25 - 15) * y / height)
-        g = int(15 + (20 - 15) * y / height)
-        b = int(25 + (45 - 25) * y / height)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-
-    # ── 상단 로고/브랜드 영역 ──
-    # 핑크-퍼플 그라데이션 헤더 바
-    for y in range(0, 80):
-        ratio = y / 80
-        r = int(147 + (99 - 147) * ratio)
-        g = int(51 + (102 - 51) * ratio)
-        b = int(234 + (241 - 234) * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-
-    draw.text((40, 20), "SCORENIX", fill=(255, 255, 255), font=font_lg)
-    draw.text((380, 30), "AI MATCH ANALYSIS", fill=(220, 220, 255), font=font_sm)
-
-    # ── 리그 표시 ──
-    draw.text((40, 110), f"📍 {league}", fill=(180, 180, 220), font=font_md)
-
-    # ── VS 카드 영역 ──
-    # 홈팀 영역
-    draw.rounded_rectangle([(40, 180), (520, 360)], radius=16, fill=(30, 30, 50))
-    draw.text((60, 200), "HOME", fill=(130, 130, 180), font=font_xs)
-    draw.text((60, 240), home, fill=(255, 255, 255), font=font_md)
-    draw.text((60, 300), f"{home_prob:.1f}%", fill=(100, 220, 160), font=font_lg)
+    # ── 리그 / 팀 / 확률 ──
+    draw.text((40, 110), f"📍 {league}", fill=(180, 180, 220), font=fonts["md"])
+    draw.text((60, 240), home, fill=(255, 255, 255), font=fonts["md"])
+    draw.text((60, 300), f"{home_prob:.1f}%", fill=(100, 220, 160), font=fonts["lg"])
+    draw.text((620, 240), away, fill=(255, 255, 255), font=fonts["md"])
+    draw.text((620, 300), f"{away_prob:.1f}%", fill=(234, 100, 100), font=fonts["lg"])
+    draw.text((380, 380), f"DRAW  {draw_prob:.1f}%", fill=(200, 200, 230), font=fonts["sm"])
 
-    # VS
-    draw.text((525, 240), "VS", fill=(147, 51, 234), font=font_lg)
-
-    # 원정팀 영역
-    draw.rounded_rectangle([(600, 180), (1040, 360)], radius=16, fill=(30, 30, 50))
-    draw.text((620, 200), "AWAY", fill=(130, 130, 180), font=font_xs)
-    draw.text((620, 240), away, fill=(255, 255, 255), font=font_md)
-    draw.text((620, 300), f"{away_prob:.1f}%", fill=(234, 100, 100), font=font_lg)
-
-    # 무승부 확률
-    draw.rounded_rectangle([(350, 370), (730, 430)], radius=12, fill=(40, 40, 60))
-    draw.text((380, 380), f"DRAW  {draw_prob:.1f}%", fill=(200, 200, 230), font=font_sm)
-
-    # ── AI 추천 영역 ──
-    # 신뢰도 색상
+    # ── AI 추천 (신뢰도 색상 / 바) ──
     if confidence >= 70:
         conf_color = (0, 230, 118)  # 초록
     elif confidence >= 55:
         conf_color = (255, 193, 7)  # 노랑
     else:
         conf_color = (234, 100, 100)  # 빨강
-
-    draw.rounded_rectangle([(40, 470), (1040, 620)], radius=16, fill=(25, 25, 45))
-    # 상단 라벨
-    draw.text((60, 490), "🧠 AI RECOMMENDATION", fill=(147, 51, 234), font=font_sm)
-    # 추천 텍스트
-    draw.text((60, 540), rec_text, fill=conf_color, font=font_lg)
-    # 신뢰도 바
+    draw.text((60, 540), rec_text, fill=conf_color, font=fonts["lg"])
     bar_w = int(500 * confidence / 100)
-    draw.rounded_rectangle([(500, 545), (1020, 585)], radius=10, fill=(50, 50, 70))
     if bar_w > 0:
         draw.rounded_rectangle([(500, 545), (500 + bar_w, 585)], radius=10, fill=conf_color)
-    draw.text((500 + bar_w + 10, 548), f"{confidence:.0f}%", fill=conf_color, font=font_sm)
-
-    # ── 핵심 팩터 영역 ──
-    draw.text((40, 660), "📊 KEY FACTORS", fill=(147, 51, 234), font=font_sm)
+    draw.text((500 + bar_w + 10, 548), f"{confidence:.0f}%", fill=conf_color, font=fonts["sm"])
 
-    factor_y = 710
-    factor_colors = [
-        (100, 220, 160),
-        (100, 180, 255),
-        (255, 193, 7),
-        (234, 130, 130),
-    ]
+    # ── 핵심 팩터 (행 배경은 타일 붙여넣기) ──
+    tiles = _factor_row_tiles(width, height)
     for i, factor in enumerate(factors):
+        factor_y = FACTOR_TOP + i * FACTOR_STEP
         name = factor.get("name", f"Factor {i+1}")
         score = factor.get("score", 0)
-        color = factor_colors[i % len(factor_colors)]
+        color = FACTOR_COLORS[i % len(FACTOR_COLORS)]
 
-        draw.rounded_rectangle([(40, factor_y), (1040, factor_y + 60)], radius=10, fill=(30, 30, 50))
-        draw.text((60, factor_y + 12), name, fill=(200, 200, 230), font=font_sm)
-        # 스코어 바
+        img.paste(tiles[i], (0, factor_y))
+        draw.text((60, factor_y + 12), name, fill=(200, 200, 230), font=fonts["sm"])
         bar_x = 550
         bar_len = int(430 * abs(score) / 100) if score != 0 else 0
-        draw.rounded_rectangle([(bar_x, factor_y + 15), (bar_x + 430, factor_y + 45)], radius=8, fill=(50, 50, 70))
         if bar_len > 0:
             draw.rounded_rectangle([(bar_x, factor_y + 15), (bar_x + bar_len, factor_y + 45)], radius=8, fill=color)
-        draw.text((bar_x + bar_len + 8, factor_y + 15), f"{score:.0f}", fill=color, font=font_xs)
-        factor_y += 75
+        draw.text((bar_x + bar_len + 8, factor_y + 15), f"{score:.0f}", fill=color, font=fonts["xs"])
 
-    # ── 하단 워터마크 ──
-    draw.rounded_rectangle([(0, height - 70), (width, height)], radius=0, fill=(20, 20, 35))
-    draw.text((40, height - 55), "scorenix.com", fill=(147, 51, 234), font=font_sm)
     now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-    draw.text((700, height - 50), now_str, fill=(120, 120, 160), font=font_xs)
+    draw.text((700, height - 50), now_str, fill=(120, 120, 160), font=fonts["xs"])
+    return img
+
 
-    # ── PNG 변환 ──
+def _encode_image(img, image_format: str = "png") -> bytes:
+    """PNG(compress_level) / WebP(quality, method) 인코딩."""
     buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
+    if image_format == "webp":
+        img.save(buf, format="WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD)
+    else:
+        img.save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     return buf.getvalue()
 
 
-async def generate_card_and_upload(match_data: Dict) -> Optional[str]:
+def _create_match_card(match_data: Dict, width: int = 1080, height: int = 1080,
+                       image_format: str = "png") -> bytes:
+    """
+    PIL을 사용하여 경기 분석 카드 이미지 생성 (Instagram 정사각형).
+    Returns: 이미지 bytes (image_format: png / webp), 실패 시 b""
+    """
+    try:
+        return _encode_image(_render_card_image(match_data, width, height), image_format)
+    except ImportError:
+        logger.error("Pillow not installed. Run: pip install Pillow")
+        return b""
+
+
+def _render_executor_pool() -> ThreadPoolExecutor:
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(max_workers=CARD_RENDER_WORKERS, thread_name_prefix="card-render")
+    return _render_executor
+
+
+def render_cards(matches: List[Dict], image_format: str = "png", max_workers: Optional[int] = None,
+                 use_processes: bool = False) -> List[bytes]:
+    """
+    여러 카드를 풀에서 렌더 (입력 순서 유지). 템플릿/폰트는 첫 카드 전에 준비.
+    스레드 풀은 PNG/WebP 인코딩(GIL 해제) 구간이 겹치고, use_processes 는 텍스트 렌더까지 병렬.
+    """
+    if not matches:
+        return []
+    _card_template()
+    _factor_row_tiles()
+    if len(matches) == 1:
+        return [_create_match_card(matches[0], image_format=image_format)]
+    if use_processes:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(matches), os.cpu_count() or 1)) as pool:
+            return list(pool.map(_create_match_card, matches, [1080] * len(matches), [1080] * len(matches),
+                                 [image_format] * len(matches)))
+    pool = _render_executor_pool() if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return list(pool.map(lambda m: _create_match_card(m, image_format=image_format), matches))
+    finally:
+        if max_workers is not None:
+            pool.shutdown(wait=False)
+
+
+@lru_cache(maxsize=1)
+def _storage_bucket():
+    from google.cloud import storage as gcs
+    bucket_name = os.getenv("FIREBASE_STORAGE_BUCKET", "smart-proto-inv-2026-sns-assets")
+    return gcs.Client().bucket(bucket_name)
+
+
+def _upload_card(image_bytes: bytes, match_id: str, image_format: str = "png") -> str:
+    """Firebase Storage 업로드 (동기) → 공개 URL."""
+    bucket = _storage_bucket()
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    blob_path = f"marketing/cards/{timestamp}_{match_id}.{image_format}"
+
+    blob = bucket.blob(blob_path)
+    blob.upload_from_string(image_bytes, content_type=CONTENT_TYPES.get(image_format, "image/png"))
+
+    try:
+        blob.make_public()
+        public_url = blob.public_url
+    except Exception as acl_e:
+        logger.warning(f"Failed to make_public: {acl_e}. Using assumed URL...")
+        public_url = f"https://storage.googleapis.com/{bucket.name}/{blob_path}"
+
+    logger.info(f"✅ Card uploaded: {public_url}")
+    return public_url
+
+
+async def generate_card_and_upload(match_data: Dict, image_format: Optional[str] = None) -> Optional[str]:
     """
     경기 분석 카드 이미지를 생성하고 Firebase Storage에 업로드.
     Returns: 공개 URL or None
     """
+    image_format = image_format or CARD_IMAGE_FORMAT
     try:
-        # 1. 이미지 생성
-        png_bytes = _create_match_card(match_data)
-        if not png_bytes:
+        # 1. 이미지 생성 (이벤트 루프 밖 렌더 풀)
+        loop = asyncio.get_running_loop()
+        image_bytes = await loop.run_in_executor(
+            _render_executor_pool(), lambda: _create_match_card(match_data, image_format=image_format)
+        )
+        if not image_bytes:
             return None
 
         # 2. Firebase Storage에 업로드
-        from google.cloud import storage as gcs
-        bucket_name = os.getenv("FIREBASE_STORAGE_BUCKET", "smart-proto-inv-2026-sns-assets")
-        client = gcs.Client()
-        bucket = client.bucket(bucket_name)
-
         match_id = match_data.get("match_id", "unknown")
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        blob_path = f"marketing/cards/{timestamp}_{match_id}.png"
-
-        blob = bucket.blob(blob_path)
-        blob.upload_from_string(png_bytes, content_type="image/png")
-        
-        try:
-            blob.make_public()
-            public_url = blob.public_url
-        except Exception as acl_e:
-            logger.warning(f"Failed to make_public: {acl_e}. Using assumed URL...")
-            public_url = f"https://storage.googleapis.com/{bucket_name}/{blob_path}"
-
-        logger.info(f"✅ Card uploaded: {public_url}")
-        return public_url
+        return await asyncio.to_thread(_upload_card, image_bytes, match_id, image_format)
 
     except Exception as e:
         logger.error(f"Card generation/upload error: {e}")
         return None
 
 
-async def generate_cards_for_predictions(predictions: list) -> list:
-    """여러 경기에 대한 카드 이미지를 생성하고 URL 반환"""
-    results = []
-    for pred in predictions[:3]:  # 최대 3장
-        url = await generate_card_and_upload(pred)
-        results.append({
-            "match_id": pred.get("match_id", ""),
-            "image_url": url,
-        })
-    return results
+async def generate_cards_for_predictions(predictions: list, image_format: Optional[str] = None) -> list:
+    """여러 경기에 대한 카드 이미지를 한 번에 렌더(풀)하고 동시에 업로드해 URL 반환"""
+    image_format = image_format or CARD_IMAGE_FORMAT
+    targets = predictions[:3]  # 최대 3장
+    try:
+        images = await asyncio.to_thread(render_cards, targets, image_format)
+    except Exception as e:
+        logger.error(f"Card batch render error: {e}")
+        images = [b""] * len(targets)
+
+    async def upload(pred, image_bytes):
+        if not image_bytes:
+            return None
+        try:
+            return await asyncio.to_thread(_upload_card, image_bytes, pred.get("match_id", "unknown"), image_format)
+        except Exception as e:
+            logger.error(f"Card upload error: {e}")
+            return None
+
+    urls = await asyncio.gather(*[upload(pred, image) for pred, image in zip(targets, images)])
+    return [
+        {"match_id": pred.get("match_id", ""), "image_url": url}
+        for pred, url in zip(targets, urls)
+    ]
@@ -0,0 +1,221 @@
+"""
+Feature Matrix Store — 야간 재학습용 append-only 특성 행렬.
+
+기존 야간 재학습은 매번 최근 500경기 전체를 extract_features_with_odds 로 다시 추출
+(경기당 BigQuery 10여 회)했음. 정산된 경기는 특성이 바뀌지 않으므로 한 번만 추출해 누적.
+
+레이아웃 (data/feature_matrix/):
+  index.json            — feature_names, parts 목록, 전체 match_id 행 색인, 학습 메타
+  part-<stamp>.npz      — X(float32) / y(int8, LABELS 순서) / match_ids / predicted_at
+
+- feature_names 가 바뀌면 기존 행렬은 폐기하고 새로 누적 (열 의미가 달라지므로)
+- 파트가 COMPACT_PARTS 개를 넘으면 하나로 병합
+- GCS(model_store 버킷, features/ prefix)에 미러링 → Cloud Run 인스턴스가 바뀌어도 유지
+"""
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("AWAY", "DRAW", "HOME")   # sklearn LabelEncoder 정렬 순서 — 기존 부스터와 클래스 인덱스 호환
+LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
+COMPACT_PARTS = 30
+GCS_PREFIX = "features/"
+
+_DEFAULT_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "feature_matrix"
+)
+
+
+class FeatureMatrixStore:
+    def __init__(self, root: str = _DEFAULT_ROOT, mirror: bool = True):
+        self.root = root
+        self.mirror = mirror
+        self._index: Optional[Dict] = None
+
+    # ── 색인 ──
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _empty_index(self, feature_names: Sequence[str]) -> Dict:
+        return {"feature_names": list(feature_names), "parts": [], "match_ids": [], "meta": {},
+                "created_at": datetime.now(timezone.utc).isoformat()}
+
+    def load_index(self, feature_names: Sequence[str]) -> Dict:
+        """색인 로드 (로컬 → GCS 복원). feature_names 가 다르면 새 행렬로 시작."""
+        if self._index is None:
+            if not os.path.exists(self.index_path) and self.mirror:
+                self._download_all()
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = None
+        if self._index is None or self._index.get("feature_names") != list(feature_names):
+            if self._index is not None:
+                logger.info("[FeatureMatrix] feature schema changed — starting a new matrix")
+            self._index = self._empty_index(feature_names)
+        return self._index
+
+    def known_ids(self, feature_names: Sequence[str]) -> set:
+        return set(self.load_index(feature_names)["match_ids"])
+
+    def rows(self, feature_names: Sequence[str]) -> int:
+        return len(self.load_index(feature_names)["match_ids"])
+
+    @property
+    def meta(self) -> Dict:
+        return (self._index or {}).get("meta", {})
+
+    def set_meta(self, **values):
+        if self._index is not None:
+            self._index.setdefault("meta", {}).update(values)
+            self._write_index()
+
+    # ── 추가 / 조회 ──
+
+    def append(self, feature_names: Sequence[str], X: np.ndarray, labels: Sequence[str],
+               match_ids: Sequence[str], predicted_at: Sequence[str]) -> int:
+        """새 행 추가 (이미 있는 match_id 는 무시). 반환: 추가된 행 수."""
+        index = self.load_index(feature_names)
+        known = set(index["match_ids"])
+        keep = [i for i, mid in enumerate(match_ids) if mid not in known and labels[i] in LABEL_INDEX]
+        # 같은 배치 안의 중복 match_id 제거
+        seen, unique = set(), []
+        for i in keep:
+            if match_ids[i] not in seen:
+                seen.add(match_ids[i])
+                unique.append(i)
+        if not unique:
+            return 0
+
+        os.makedirs(self.root, exist_ok=True)
+        name = f"part-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}.npz"
+        np.savez_compressed(
+            os.path.join(self.root, name),
+            X=np.asarray(X, dtype=np.float32)[unique],
+            y=np.array([LABEL_INDEX[labels[i]] for i in unique], dtype=np.int8),
+            match_ids=np.array([str(match_ids[i]) for i in unique]),
+            predicted_at=np.array([str(predicted_at[i]) for i in unique]),
+        )
+        index["parts"].append({"file": name, "rows": len(unique)})
+        index["match_ids"].extend(str(match_ids[i]) for i in unique)
+        self._upload(name)
+        if len(index["parts"]) > COMPACT_PARTS:
+            self.compact(feature_names)
+        else:
+            self._write_index()
+        return len(unique)
+
+    def load(self, feature_names: Sequence[str], last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """(X, y, match_ids) — 추가 순서. last 지정 시 마지막 last 행만 (필요한 파트만 읽음)."""
+        index = self.load_index(feature_names)
+        parts = index["parts"]
+        if last is not None:
+            needed, chosen = 0, []
+            for part in reversed(parts):
+                chosen.append(part)
+                needed += part["rows"]
+                if needed >= last:
+                    break
+            parts = list(reversed(chosen))
+        Xs, ys, ids = [], [], []
+        for part in parts:
+            with np.load(os.path.join(self.root, part["file"])) as data:
+                Xs.append(data["X"])
+                ys.append(data["y"])
+                ids.extend(data["match_ids"].tolist())
+        if not Xs:
+            return np.zeros((0, len(feature_names)), dtype=np.float32), np.zeros(0, dtype=np.int8), []
+        X, y = np.concatenate(Xs), np.concatenate(ys)
+        if last is not None and len(y) > last:
+            X, y, ids = X[-last:], y[-last:], ids[-last:]
+        return X, y, ids
+
+    def compact(self, feature_names: Sequence[str]):
+        """모든 파트를 하나로 병합."""
+        index = self.load_index(feature_names)
+        if len(index["parts"]) <= 1:
+            return
+        old_parts = [p["file"] for p in index["parts"]]
+        Xs, ys, ids, at = [], [], [], []
+        for file in old_parts:
+            with np.load(os.path.join(self.root, file)) as data:
+                Xs.append(data["X"])
+                ys.append(data["y"])
+                ids.append(data["match_ids"])
+                at.append(data["predicted_at"])
+        name = f"part-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}-c.npz"
+        np.savez_compressed(os.path.join(self.root, name), X=np.concatenate(Xs), y=np.concatenate(ys),
+                            match_ids=np.concatenate(ids), predicted_at=np.concatenate(at))
+        index["parts"] = [{"file": name, "rows": int(sum(len(y) for y in ys))}]
+        self._upload(name)
+        self._write_index()
+        for file in old_parts:
+            try:
+                os.remove(os.path.join(self.root, file))
+            except OSError:
+                pass
+            self._delete_remote(file)
+
+    # ── 저장 ──
+
+    def _write_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_path)
+        self._upload("index.json")
+
+    def _bucket(self):
+        if not self.mirror:
+            return None
+        try:
+            from app.core.model_store import _get_storage_client, _ensure_bucket
+            return _ensure_bucket() if _get_storage_client() else None
+        except Exception:
+            return None
+
+    def _upload(self, name: str):
+        bucket = self._bucket()
+        if bucket is None:
+            return
+        try:
+            bucket.blob(f"{GCS_PREFIX}{name}").upload_from_filename(os.path.join(self.root, name))
+        except Exception as e:
+            logger.warning(f"[FeatureMatrix] GCS upload failed ({name}): {e}")
+
+    def _delete_remote(self, name: str):
+        bucket = self._bucket()
+        if bucket is None:
+            return
+        try:
+            bucket.blob(f"{GCS_PREFIX}{name}").delete()
+        except Exception:
+            pass
+
+    def _download_all(self):
+        bucket = self._bucket()
+        if bucket is None:
+            return
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            for blob in bucket.list_blobs(prefix=GCS_PREFIX):
+                name = blob.name[len(GCS_PREFIX):]
+                if name and "/" not in name:
+                    blob.download_to_filename(os.path.join(self.root, name))
+            logger.info("[FeatureMatrix] restored from GCS")
+        except Exception as e:
+            logger.warning(f"[FeatureMatrix] GCS restore failed: {e}")
+
+
+feature_matrix = FeatureMatrixStore()
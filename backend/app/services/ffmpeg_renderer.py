@@ -0,0 +1,454 @@
+"""
+FFmpeg Renderer — 장면 목록을 ffmpeg filter_complex 1회 호출로 렌더링.
+
+MoviePy 경로는 장면 합성(ImageClip / concatenate_videoclips / CompositeAudioClip)을 프레임마다
+Python 에서 수행한 뒤 libx264 파이프로 넘김. 여기서는 장면 목록을 필터 그래프로 컴파일해
+디코드·스케일·자막·연결·BGM 믹스·덕킹을 모두 ffmpeg 안에서 처리.
+
+- 정지 이미지: 1회만 스케일/포맷 변환 후 loop 필터로 프레임 복제
+- 영상 소스: 장면 길이에 맞춰 fps 변환 + trim (짧으면 마지막 프레임 유지)
+- 자막: drawtext (장면 기준 시각), 텍스트는 textfile 로 전달해 이스케이프 문제 회피
+- 덕킹: 엔벨로프(게인 배열)를 stdin f32le 게인 트랙으로 넘겨 amultiply
+- 스트림 복사: 모든 장면이 같은 코덱/해상도/fps 영상이고 가공이 없으면 concat demuxer + -c:v copy,
+  오디오도 가공(BGM)이 없고 코덱이 같으면 -c:a copy
+
+타이밍은 MoviePy 와 동일: 장면 k 의 프레임 수 = start_k ≤ i/fps < end_k 인 프레임 수
+(write_videofile 이 t = i/fps 로 프레임을 뽑고 concatenate_videoclips 가 start ≤ t 인 장면을 고르는 규칙),
+오디오는 장면마다 정확한 초 단위 길이로 패딩/절단 후 연결.
+"""
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+# mp4 컨테이너에 그대로 복사할 수 있는 코덱
+MP4_VIDEO_CODECS = {"h264", "hevc", "av1", "vp9", "mpeg4"}
+MP4_AUDIO_CODECS = {"aac", "mp3", "opus", "alac"}
+AUDIO_RATE = 44100
+GAIN_TRACK_RATE = 1000      # 덕킹 게인 트랙 샘플레이트 (엔벨로프를 계단식으로 확장, 1ms 단위)
+
+
+@dataclass
+class Overlay:
+    """장면 위 자막 (시각은 장면 시작 기준 초)"""
+    text: str
+    start: float = 0.0
+    end: Optional[float] = None
+    position: str = "bottom"        # top / center / bottom
+    font_size: int = 52
+    color: str = "white"
+    box_color: str = "black@0.6"
+    font: Optional[str] = None      # fontconfig 이름 (예: 'Malgun Gothic', 'NanumGothic')
+
+
+@dataclass
+class Scene:
+    """렌더링 단위 장면. source 가 없으면 단색 배경."""
+    source: Optional[str] = None
+    duration: Optional[float] = None    # None → audio 길이 → 영상 소스 길이
+    audio: Optional[str] = None         # None 이고 영상 소스에 오디오가 있으면 원본 오디오 사용
+    overlays: List[Overlay] = field(default_factory=list)
+    color: str = "0x0c0c19"
+
+
+@dataclass
+class MediaInfo:
+    path: str
+    duration: float = 0.0
+    video_codec: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    audio_codec: Optional[str] = None
+
+
+@dataclass
+class RenderPlan:
+    """컴파일 결과 — 실행 전 검사/테스트용으로 그대로 노출."""
+    cmd: List[str]
+    durations: List[float]
+    frames: List[int]
+    video_copy: bool = False
+    audio_copy: bool = False
+    stdin: Optional[bytes] = None
+    work_dir: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return sum(self.durations)
+
+
+# ─── ffmpeg 탐색 / 프로브 ─────────────────────────────
+
+def find_ffmpeg() -> Optional[str]:
+    """ffmpeg 실행 경로 (환경변수 → PATH → imageio-ffmpeg 번들)."""
+    for env in ("FFMPEG_BINARY", "IMAGEIO_FFMPEG_EXE"):
+        path = os.getenv(env)
+        if path and os.path.isfile(path):
+            return path
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+_INPUT_RE = re.compile(r"^Input #(\d+)", re.M)
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+).*?, (\d{2,5})x(\d{2,5})")
+_FPS_RE = re.compile(r"Stream #\d+:\d+.*?: Video: .*?(\d+(?:\.\d+)?) (?:fps|tbr)")
+_AUDIO_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (\w+)")
+
+
+def probe(paths: Sequence[str], ffmpeg: Optional[str] = None) -> List[MediaInfo]:
+    """
+    ffmpeg 1회 호출로 여러 파일의 길이/코덱/해상도 조회.
+    길이는 컨테이너 헤더의 Duration (MoviePy ffmpeg_parse_infos 와 같은 값).
+    """
+    if not paths:
+        return []
+    ffmpeg = ffmpeg or find_ffmpeg()
+    cmd = [ffmpeg, "-hide_banner"]
+    for path in paths:
+        cmd += ["-i", path]
+    stderr = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace").stderr
+    blocks = {}
+    marks = list(_INPUT_RE.finditer(stderr))
+    for mark, nxt in zip(marks, marks[1:] + [None]):
+        blocks[int(mark.group(1))] = stderr[mark.start():nxt.start() if nxt else len(stderr)]
+
+    infos = []
+    for i, path in enumerate(paths):
+        block = blocks.get(i)
+        if block is None:
+            raise RuntimeError(f"ffmpeg probe failed: {path}")
+        info = MediaInfo(path=path)
+        m = _DURATION_RE.search(block)
+        if m:
+            info.duration = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+        m = _VIDEO_RE.search(block)
+        if m:
+            info.video_codec, info.width, info.height = m.group(1), int(m.group(2)), int(m.group(3))
+            fps = _FPS_RE.search(block)
+            info.fps = float(fps.group(1)) if fps else 0.0
+        m = _AUDIO_RE.search(block)
+        if m:
+            info.audio_codec = m.group(1)
+        infos.append(info)
+    return infos
+
+
+def probe_durations(paths: Sequence[str], ffmpeg: Optional[str] = None) -> List[float]:
+    return [info.duration for info in probe(paths, ffmpeg)]
+
+
+# ─── 타이밍 ────────────────────────────────────────────
+
+def scene_frames(durations: Sequence[float], fps: float) -> List[int]:
+    """
+    장면별 프레임 수 — MoviePy 와 같은 부동소수점 연산으로 계산.
+    write_videofile 은 np.arange(0, D, 1/fps) 시각의 프레임을 뽑고, concatenate_videoclips 는
+    cumsum(durations) 경계에서 start ≤ t 인 마지막 장면을 고름 (경계가 정확히 맞물리는 경우 포함).
+    """
+    import numpy as np
+    starts = np.cumsum([0] + [float(d) for d in durations])
+    times = np.arange(0, starts[-1], 1.0 / fps)
+    # arange 끝값이 오차로 총 길이와 같아지는 경우는 마지막 장면 프레임으로
+    owner = np.minimum(np.searchsorted(starts, times, side="right") - 1, len(durations) - 1)
+    return np.bincount(owner, minlength=len(durations)).tolist()
+
+
+def _is_image(path: Optional[str]) -> bool:
+    return bool(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+
+# ─── 필터 구성 요소 ───────────────────────────────────
+
+def _filter_path(path: str) -> str:
+    """필터 옵션 값으로 쓸 경로 (역슬래시 → /, 콜론·따옴표 이스케이프)."""
+    path = path.replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+    return f"'{path}'"
+
+
+def _drawtext(overlay: Overlay, text_file: str) -> str:
+    if overlay.position == "top":
+        y = "h*0.08"
+    elif overlay.position == "center":
+        y = "(h-text_h)/2"
+    else:
+        y = "h*0.82"
+    parts = [
+        f"drawtext=textfile={_filter_path(text_file)}",
+        "expansion=none",
+        f"fontsize={overlay.font_size}",
+        f"fontcolor={overlay.color}",
+        "box=1",
+        f"boxcolor={overlay.box_color}",
+        "boxborderw=12",
+        "x=(w-text_w)/2",
+        f"y={y}",
+    ]
+    if overlay.font:
+        parts.append(f"font={_filter_path(overlay.font)}")
+    end = overlay.end if overlay.end is not None else 1e9
+    parts.append(f"enable='between(t,{overlay.start:.3f},{end:.3f})'")
+    return ":".join(parts)
+
+
+def _video_codec_args(codec: str, preset: str, bitrate: Optional[str], crf: Optional[int],
+                      threads: int) -> List[str]:
+    args = ["-c:v", codec, "-preset", preset, "-pix_fmt", "yuv420p"]
+    if bitrate:
+        args += ["-b:v", bitrate]
+    elif crf is not None:
+        args += ["-crf", str(crf)]
+    return args + ["-threads", str(max(1, threads))]
+
+
+def _copyable(infos: List[MediaInfo], scenes: Sequence[Scene], width: int, height: int,
+              fps: Optional[float]) -> bool:
+    """모든 장면이 가공 없이 이어 붙일 수 있는 동일 규격 영상인지."""
+    first = infos[0]
+    if len({bool(info.audio_codec) for info in infos}) > 1:
+        return False        # 오디오 유무가 섞이면 concat demuxer 로 이어 붙일 수 없음
+    for scene, info in zip(scenes, infos):
+        if scene.overlays or scene.duration is not None or scene.audio or _is_image(scene.source):
+            return False
+        if info.video_codec not in MP4_VIDEO_CODECS:
+            return False
+        if (info.video_codec, info.width, info.height) != (first.video_codec, first.width, first.height):
+            return False
+        if (info.width, info.height) != (width, height):
+            return False
+        if abs(info.fps - (fps if fps is not None else first.fps)) > 0.01:
+            return False
+    return True
+
+
+# ─── 컴파일 ────────────────────────────────────────────
+
+def compile_scenes(
+    scenes: Sequence[Scene],
+    output_path: str,
+    width: int,
+    height: int,
+    fps: Optional[float] = 24,
+    bgm: Optional[str] = None,
+    bgm_volume: float = 0.08,
+    bgm_gain: Optional[Sequence[float]] = None,
+    gain_fps: int = 10,
+    video_codec: str = "libx264",
+    preset: str = "ultrafast",
+    bitrate: Optional[str] = None,
+    crf: Optional[int] = 20,
+    threads: int = 1,
+    work_dir: Optional[str] = None,
+    ffmpeg: Optional[str] = None,
+) -> RenderPlan:
+    """
+    장면 목록 → ffmpeg 명령 (RenderPlan). 실행은 render().
+    fps=None 이면 첫 영상 소스의 fps 유지 (스트림 복사 허용), 영상 소스가 없으면 24.
+    bgm_gain 을 주면 bgm_volume 대신 gain_fps 해상도의 게인 엔벨로프를 BGM 에 곱함 (덕킹).
+    drawtext 텍스트 파일·concat 목록은 work_dir(없으면 임시 디렉터리)에 생성.
+    """
+    if not scenes:
+        raise ValueError("no scenes to render")
+    ffmpeg = ffmpeg or find_ffmpeg()
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg not found")
+
+    # ── 장면 길이 확정 (명시 → 오디오 → 영상 소스) ──
+    probe_paths = []
+    for scene in scenes:
+        if scene.source and not _is_image(scene.source):
+            probe_paths.append(scene.source)
+        if scene.audio and scene.duration is None:
+            probe_paths.append(scene.audio)
+    infos: Dict[str, MediaInfo] = {info.path: info for info in probe(sorted(set(probe_paths)), ffmpeg)}
+    durations = []
+    for scene in scenes:
+        if scene.duration is not None:
+            d = scene.duration
+        elif scene.audio:
+            d = infos[scene.audio].duration
+        elif scene.source and not _is_image(scene.source):
+            d = infos[scene.source].duration
+        else:
+            raise ValueError(f"scene without duration: {scene}")
+        durations.append(max(0.0, float(d)))
+    total = sum(durations)
+
+    video_infos = [infos.get(scene.source) for scene in scenes]
+    video_copy = all(video_infos) and _copyable(video_infos, scenes, width, height, fps)
+    if fps is None:
+        fps = next((info.fps for info in video_infos if info and info.fps), 24)
+    frames = scene_frames(durations, fps)
+
+    if work_dir is None:
+        work_dir = tempfile.mkdtemp(prefix="scorenix_ffr_")
+    cmd = [ffmpeg, "-y", "-hide_banner", "-v", "error"]
+    graph, inputs = [], 0
+
+    def add_input(*args):
+        nonlocal inputs
+        cmd.extend(args)
+        inputs += 1
+        return inputs - 1
+
+    # ── 영상 ──
+    scene_audio = []    # 장면별 오디오 입력 라벨 (없으면 None)
+    if video_copy:
+        list_path = os.path.join(work_dir, "concat.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for scene in scenes:
+                escaped = os.path.abspath(scene.source).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        idx = add_input("-f", "concat", "-safe", "0", "-i", list_path)
+        video_label = f"{idx}:v"
+        # 오디오는 concat demuxer 가 이어 붙인 스트림 사용
+        concat_audio = f"{idx}:a" if video_infos[0].audio_codec else None
+        audio_copy = bgm is None and concat_audio is not None \
+            and len({info.audio_codec for info in video_infos}) == 1 \
+            and video_infos[0].audio_codec in MP4_AUDIO_CODECS
+    else:
+        audio_copy = False
+        concat_audio = None
+        labels = []
+        for k, (scene, n) in enumerate(zip(scenes, frames)):
+            label = f"v{k}"
+            scale = f"scale={width}:{height},setsar=1,format=yuv420p"
+            if scene.source and _is_image(scene.source):
+                idx = add_input("-i", scene.source)
+                # 스케일/포맷 변환은 1회, 이후 프레임 복제
+                chain = f"[{idx}:v]{scale},loop=loop={max(n - 1, 0)}:size=1:start=0,settb=expr=1/{fps},setpts=N"
+            elif scene.source:
+                idx = add_input("-i", scene.source)
+                chain = f"[{idx}:v]setpts=PTS-STARTPTS,fps={fps},{scale}"
+                if durations[k] > infos[scene.source].duration:
+                    chain += ",tpad=stop_mode=clone:stop=-1"
+                chain += f",trim=end_frame={n},setpts=PTS-STARTPTS"
+            else:
+                chain = f"color=c={scene.color}:s={width}x{height}:r={fps},format=yuv420p,trim=end_frame={n}"
+            for j, overlay in enumerate(scene.overlays):
+                text_file = os.path.join(work_dir, f"text_{k}_{j}.txt")
+                with open(text_file, "w", encoding="utf-8") as f:
+                    f.write(overlay.text)
+                chain += "," + _drawtext(overlay, text_file)
+            if n > 0:
+                graph.append(f"{chain}[{label}]")
+                labels.append(label)
+
+            if scene.audio:
+                scene_audio.append(f"{add_input('-i', scene.audio)}:a")
+            elif scene.source and not _is_image(scene.source) and infos[scene.source].audio_codec:
+                scene_audio.append(f"{idx}:a")
+            else:
+                scene_audio.append(None)
+        if not labels:
+            raise ValueError("scenes are shorter than one frame")
+        if len(labels) > 1:
+            graph.append("".join(f"[{label}]" for label in labels) + f"concat=n={len(labels)}:v=1:a=0[vout]")
+        else:
+            graph.append(f"[{labels[0]}]null[vout]")
+        video_label = "[vout]"
+
+    # ── 오디오: 장면별 정확한 길이로 패딩/절단 → 연결 ──
+    fmt = f"aformat=sample_fmts=fltp:sample_rates={AUDIO_RATE}:channel_layouts=stereo"
+    audio_label = None
+    if concat_audio:
+        audio_label = concat_audio if audio_copy else None
+        if not audio_copy:
+            graph.append(f"[{concat_audio}]{fmt},atrim=0:{total:.6f}[speech]")
+            audio_label = "[speech]"
+    elif len(scenes) == 1 and not bgm and not scenes[0].audio and scenes[0].duration is None \
+            and scene_audio and scene_audio[0] and video_infos[0].audio_codec in MP4_AUDIO_CODECS:
+        # 단일 영상에 자막만 입히는 경우 오디오는 그대로 복사
+        audio_label, audio_copy = scene_audio[0], True
+    elif any(scene_audio):
+        parts = []
+        for k, (label, d) in enumerate(zip(scene_audio, durations)):
+            if label:
+                graph.append(f"[{label}]{fmt},apad=whole_dur={d:.6f},atrim=0:{d:.6f}[a{k}]")
+            else:
+                graph.append(f"anullsrc=r={AUDIO_RATE}:cl=stereo,atrim=0:{d:.6f},{fmt}[a{k}]")
+            parts.append(f"[a{k}]")
+        if len(parts) > 1:
+            graph.append("".join(parts) + f"concat=n={len(parts)}:v=0:a=1[speech]")
+        else:
+            graph.append(f"{parts[0]}anull[speech]")
+        audio_label = "[speech]"
+
+    # ── BGM (반복 → 길이 절단 → 고정 볼륨 또는 덕킹 게인) ──
+    stdin = None
+    if bgm:
+        bgm_idx = add_input("-stream_loop", "-1", "-i", bgm)
+        graph.append(f"[{bgm_idx}:a]{fmt},atrim=0:{total:.6f},asetpts=PTS-STARTPTS[bgm_raw]")
+        if bgm_gain is not None and len(bgm_gain):
+            import numpy as np
+            step = GAIN_TRACK_RATE // gain_fps
+            gain = np.repeat(np.asarray(bgm_gain, dtype=np.float32), step)
+            needed = int(math.ceil(total * GAIN_TRACK_RATE)) + 1
+            if len(gain) < needed:
+                gain = np.pad(gain, (0, needed - len(gain)), mode="edge")
+            stdin = gain.tobytes()
+            gain_idx = add_input("-f", "f32le", "-ar", str(GAIN_TRACK_RATE), "-ac", "1", "-i", "pipe:0")
+            graph.append(f"[{gain_idx}:a]aresample={AUDIO_RATE},aformat=sample_fmts=fltp:channel_layouts=mono,"
+                         f"pan=stereo|c0=c0|c1=c0[gain]")
+            graph.append("[bgm_raw][gain]amultiply[bgm]")
+        else:
+            graph.append(f"[bgm_raw]volume={bgm_volume}[bgm]")
+        if audio_label:
+            # CompositeAudioClip 처럼 단순 합산 (amix 정규화 끔)
+            graph.append(f"{audio_label}[bgm]amix=inputs=2:duration=first:normalize=0[aout]")
+        else:
+            graph.append("[bgm]anull[aout]")
+        audio_label = "[aout]"
+
+    if graph:
+        cmd += ["-filter_complex", ";".join(graph)]
+    cmd += ["-map", video_label]
+    if video_copy:
+        cmd += ["-c:v", "copy"]
+    else:
+        cmd += _video_codec_args(video_codec, preset, bitrate, crf, threads) + ["-r", f"{fps:g}"]
+    if audio_label:
+        cmd += ["-map", audio_label]
+        cmd += ["-c:a", "copy"] if audio_copy else ["-c:a", "aac", "-ar", str(AUDIO_RATE)]
+    cmd += ["-movflags", "+faststart", output_path]
+    return RenderPlan(cmd=cmd, durations=durations, frames=frames, video_copy=video_copy,
+                      audio_copy=audio_copy, stdin=stdin, work_dir=work_dir)
+
+
+def render(scenes: Sequence[Scene], output_path: str, width: int, height: int, timeout: float = 900,
+           **options) -> RenderPlan:
+    """
+    compile_scenes → ffmpeg 1회 실행. 실패 시 RuntimeError (stderr 끝부분 포함).
+    work_dir 를 지정하지 않으면 임시 디렉터리는 실행 후 삭제.
+    """
+    own_dir = options.get("work_dir") is None
+    plan = compile_scenes(scenes, output_path, width, height, **options)
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    try:
+        logger.debug(f"[FFmpegRenderer] {' '.join(plan.cmd)}")
+        result = subprocess.run(plan.cmd, input=plan.stdin, capture_output=True, timeout=timeout,
+                                **({} if plan.stdin is not None else {"stdin": subprocess.DEVNULL}))
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", errors="replace")[-2000:]
+            raise RuntimeError(f"ffmpeg render failed ({result.returncode}): {err}")
+    finally:
+        if own_dir and plan.work_dir:
+            shutil.rmtree(plan.work_dir, ignore_errors=True)
+    return plan
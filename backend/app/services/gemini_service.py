@@ -7,12 +7,14 @@ Gemini AI Service — 스포츠 베팅 분석 LLM 연동
 import logging
 from typing import Optional
 from app.models.config import config
+from app.services.llm_gateway import gateway_from_env
 
 logger = logging.getLogger(__name__)
 
 # Lazy load
 _client = None
 _initialized = False
+MODEL_NAME = "gemini-2.5-flash"
 
 
 def _init_gemini() -> bool:
@@ -30,7 +32,7 @@ def _init_gemini() -> bool:
     try:
         import google.generativeai as genai
         genai.configure(api_key=api_key)
-        _client = genai.GenerativeModel("gemini-2.5-flash")
+        _client = genai.GenerativeModel(MODEL_NAME)
         logger.info("✅ Gemini client initialized (google-generativeai SDK)")
         return True
     except ImportError:
@@ -41,6 +43,14 @@ def _init_gemini() -> bool:
         return False
 
 
+def _get_client():
+    return _client if _init_gemini() else None
+
+
+# 모든 Gemini 호출은 게이트웨이를 통해 워커 풀에서 실행 (event loop 차단 방지 + 응답 캐시)
+llm_gateway = gateway_from_env(_get_client, MODEL_NAME)
+
+
 SYSTEM_PROMPT = """당신은 Scorenix의 'AI 수석 데이터 분석관'입니다. 
 당신의 목표는 단순한 예측을 넘어, 제공된 방대한 데이터를 종합하여 유저에게 '데이터 기반의 통찰력'을 제공하는 것입니다. 
 한국어로 답변하되, 매우 전문적이고 분석적인 어조를 유지하세요.
@@ -155,8 +165,7 @@ async def analyze_match(match_data: dict, query: str) -> str:
     if _init_gemini() and _client is not None:
         try:
             prompt = SYSTEM_PROMPT + "\n\n" + _build_match_prompt(match_data, query)
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt) or ""
             if text:
                 logger.info(f"Gemini analysis generated ({len(text)} chars)")
                 return text
@@ -278,8 +287,7 @@ async def generate_ml_report(ml_result: dict) -> str:
             prompt = REPORTER_PROMPT + "\n\nML 예측 결과 JSON:\n" + json.dumps(ml_result, ensure_ascii=False, indent=2)
             prompt += "\n\n위 JSON 결과를 바탕으로 이 경기의 분석 리포트를 작성하세요."
 
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt) or ""
             if text:
                 logger.info(f"ML report generated ({len(text)} chars)")
                 return text
@@ -301,8 +309,7 @@ async def generate_error_note_report(error_note: dict) -> Optional[str]:
             prompt = ERROR_NOTE_PROMPT + "\n\n오답 분석 JSON:\n" + json.dumps(error_note, ensure_ascii=False, indent=2)
             prompt += "\n\n위 데이터를 바탕으로 AI 학습 노트를 작성하세요."
 
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt) or ""
             if text:
                 logger.info(f"Error note report generated ({len(text)} chars)")
                 return text
@@ -422,8 +429,7 @@ async def generate_sns_content(predictions: list) -> list:
             prompt = SNS_MARKETING_PROMPT + "\n\n오늘의 AI 추천 경기 데이터:\n" + json.dumps(match_summaries, ensure_ascii=False, indent=2)
             prompt += "\n\n위 데이터를 바탕으로 각 경기별 SNS 게시물을 작성하세요."
 
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt, cache=False) or ""
 
             if text:
                 # Parse individual posts separated by ---
@@ -511,8 +517,7 @@ async def generate_generic_promo() -> Optional[str]:
     
     if _init_gemini() and _client is not None:
         try:
-            response = _client.generate_content(SNS_GENERIC_MARKETING_PROMPT)
-            text = response.text.strip()
+            text = await llm_gateway.generate(SNS_GENERIC_MARKETING_PROMPT, cache=False) or ""
             if text:
                 logger.info(f"✅ Generic SNS promo generated ({len(text)} chars)")
                 return f"{text}\\n\\n[Ref: {stamp}]"
@@ -592,8 +597,7 @@ async def generate_winning_proof_sns(hits: list) -> Optional[str]:
             import json
             prompt = SNS_WINNING_PROOF_PROMPT + "\n\n최근 적중 경기 데이터:\n" + json.dumps(hits, ensure_ascii=False, indent=2)
             prompt += "\n\n위 데이터를 바탕으로 신뢰성 높은 적중 인증 게시글을 작성하세요."
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt, cache=False) or ""
             if text:
                 logger.info(f"✅ Winning proof SNS content generated ({len(text)} chars)")
                 return text
@@ -631,8 +635,7 @@ async def generate_educational_sns(topic: Optional[str] = None) -> Optional[str]
         try:
             prompt = SNS_EDUCATIONAL_PROMPT + f"\n\n선택된 교육 주제:\n{selected_topic}"
             prompt += "\n\n위 주제를 바탕으로 초보자도 이해하기 쉬운 1줄 지식을 포함한 트렌디한 마케팅 글을 작성하세요."
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt, cache=False) or ""
             if text:
                 logger.info(f"✅ Educational SNS content generated ({len(text)} chars)")
                 return text
@@ -661,8 +664,7 @@ async def generate_top_picks_sns(predictions: list) -> Optional[str]:
             import json
             prompt = SNS_TOP_PICKS_PROMPT + "\n\n오늘의 상위 추천 경기 데이터:\n" + json.dumps(top_3, ensure_ascii=False, indent=2)
             prompt += "\n\n위 경기 목록을 바탕으로 호기심을 유발하는 종합 추천 매치 리스트를 작성하세요."
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt, cache=False) or ""
             if text:
                 logger.info(f"✅ Top picks SNS content generated ({len(text)} chars)")
                 return text
@@ -733,8 +735,7 @@ async def generate_blogger_content(match_data: dict, match_url_path: str) -> Opt
             prompt = BLOGGER_SEO_PROMPT + "\n\n오늘의 분석 대상 경기:\n" + json.dumps(match_data, ensure_ascii=False, indent=2)
             prompt += f"\n\n매치 상세 링크 파라미터: https://scorenix.com/ko/match/{match_url_path}?utm_source=blogger&utm_medium=auto_post"
             
-            response = _client.generate_content(prompt)
-            text = response.text.strip()
+            text = await llm_gateway.generate(prompt) or ""
             
             if text.startswith("```html"):
                 text = text[7:]
@@ -797,18 +798,20 @@ def _generate_blogger_fallback(match_data: dict, match_url_path: str) -> dict:
     return {"title": title, "html": html}
 
 
+_TRANSLATE_TARGETS = {
+    "en": "English (Sports betting prediction analyst tone)",
+    "ja": "Japanese (Sports tipping / prediction tone)",
+    "ko": "Korean (Sports analyst tone)"
+}
+
+
 def translate_text(text: str, target_lang: str) -> str:
     """Gemini 1.5 Flash를 사용하여 텍스트를 고품질 번역합니다. 실패 시 원본 반환."""
     if not _init_gemini():
         logger.warning("Gemini not initialized for translation. Returning original text.")
         return text
 
-    target_names = {
-        "en": "English (Sports betting prediction analyst tone)",
-        "ja": "Japanese (Sports tipping / prediction tone)",
-        "ko": "Korean (Sports analyst tone)"
-    }
-    target_name = target_names.get(target_lang, target_lang)
+    target_name = _TRANSLATE_TARGETS.get(target_lang, target_lang)
 
     prompt = (
         f"Translate the following text to {target_name}. "
@@ -818,14 +821,54 @@ def translate_text(text: str, target_lang: str) -> str:
     )
 
     try:
-        response = _client.generate_content(prompt)
-        if response and response.text:
-            return response.text.strip()
+        translated = llm_gateway.generate_blocking(prompt)
+        if translated:
+            return translated
     except Exception as e:
         logger.error(f"Gemini translation error to {target_lang}: {e}")
     return text
 
 
+def translate_batch(texts: list, target_lang: str) -> list:
+    """
+    여러 문장을 1회 요청으로 번역 (JSON 배열 입출력).
+    중복 문장은 한 번만 번역하며, 응답 파싱 실패 시 문장별 translate_text로 폴백.
+    """
+    if not texts:
+        return []
+    if not _init_gemini():
+        logger.warning("Gemini not initialized for translation. Returning original texts.")
+        return list(texts)
+
+    import json
+    unique = list(dict.fromkeys(texts))
+    target_name = _TRANSLATE_TARGETS.get(target_lang, target_lang)
+    prompt = (
+        f"Translate every string in the following JSON array to {target_name}. "
+        f"Keep each string's structure, line breaks, team names, numbers, and professional tone. "
+        f"Return ONLY a JSON array of {len(unique)} translated strings in the same order, without any explanations.\n\n"
+        f"{json.dumps(unique, ensure_ascii=False)}"
+    )
+
+    try:
+        raw = llm_gateway.generate_blocking(prompt) or ""
+        if "```" in raw:
+            raw = raw.split("```")[1]
+            if raw.startswith("json"):
+                raw = raw[4:]
+        parsed = json.loads(raw.strip())
+        if isinstance(parsed, list) and len(parsed) == len(unique) and all(isinstance(t, str) for t in parsed):
+            mapping = dict(zip(unique, parsed))
+            logger.info(f"Batch translated {len(unique)} strings to {target_lang} in one request")
+            return [mapping[t] for t in texts]
+        logger.warning(f"Batch translation returned malformed array, falling back to per-string ({target_lang})")
+    except Exception as e:
+        logger.error(f"Gemini batch translation error to {target_lang}: {e}")
+
+    translated = {t: translate_text(t, target_lang) for t in unique}
+    return [translated[t] for t in texts]
+
+
 def generate_video_script_korean(matches: list, mode: str = "membership") -> list:
     """
     Gemini 2.5 Flash를 활용해 숏츠 영상용 앵커 대본(나레이션) 및 자막 목록을 실시간 작문(Generate)합니다.
@@ -879,9 +922,8 @@ def generate_video_script_korean(matches: list, mode: str = "membership") -> lis
     )
 
     try:
-        response = _client.generate_content(prompt)
-        if response and response.text:
-            text = response.text.strip()
+        text = llm_gateway.generate_blocking(prompt) or ""
+        if text:
             # JSON만 추출하기 위한 안전 장치
             if "```json" in text:
                 text = text.split("```json")[1].split("```")[0].strip()
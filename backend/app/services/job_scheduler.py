@@ -0,0 +1,544 @@
+"""
+Job Scheduler — 인스턴스 간 리더 선출(lease) 기반 주기 작업 스케줄러.
+
+Cloud Run 이 스케일 아웃되면 startup_event 의 주기 작업(배당 갱신, 정산, 통계 수집, 야간 재학습,
+SNS/블로그 발행)이 인스턴스마다 중복 실행되어 API 쿼터를 낭비함.
+
+- 작업마다 lease 문서 1개 (scheduler_leases/{job}) — holder, 만료 시각, 펜싱 토큰, 마지막 완료 슬롯
+- 슬롯 = 주기 구간 (interval 작업: epoch 기준 n*interval, daily 작업: 해당 KST 시각)
+  → 슬롯당 정확히 1회 실행, 완료 기록은 lease 토큰이 일치할 때만 반영 (펜싱)
+- 실행 원장 (scheduler_runs) — 시작/종료/소요시간/결과, 작업별 소요시간 이력 → 성능 회귀 감지
+- 콜드 스타트 시 현재 슬롯이 미완료면 즉시 따라잡기(catch-up)
+- 실패한 슬롯은 지수 백오프로 재시도 (슬롯별 실패 횟수 / 다음 재시도 시각을 lease 에 기록),
+  max_attempts 회 실패하면 그 슬롯은 outcome="error" 로 완료 처리 → 계속 실패하는 작업이 쿼터를 소진하지 않음
+- 실행 중 lease 하트비트 갱신, 리더 인스턴스가 죽으면 TTL 만료 후 다른 인스턴스가 인계
+
+백엔드: Firestore (운영) / SQLite (로컬·테스트). SCHEDULER_LEASE_BACKEND=firestore|sqlite 로 강제 가능.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+LEASES_COLLECTION = "scheduler_leases"
+RUNS_COLLECTION = "scheduler_runs"
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+_SQLITE_PATH = os.path.join(_DATA_DIR, "scheduler.db")
+
+# acquire() 결과
+ACQUIRED = "acquired"
+HELD = "held"        # 다른 인스턴스가 실행 중
+DONE = "done"        # 이 슬롯은 이미 완료
+BACKOFF = "backoff"  # 이 슬롯은 실패 후 재시도 대기 중
+
+HISTORY_LIMIT = 50
+RESULT_MAX_CHARS = 2000
+
+
+def _default_holder() -> str:
+    instance = os.getenv("K_REVISION") or socket.gethostname()
+    return f"{instance}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def _result_summary(result) -> Optional[str]:
+    if result is None:
+        return None
+    try:
+        text = json.dumps(result, ensure_ascii=False, default=str)
+    except Exception:
+        text = str(result)
+    return text[:RESULT_MAX_CHARS]
+
+
+# ─────────────────────────────────────────────
+# JOB SPEC
+# ─────────────────────────────────────────────
+
+@dataclass
+class JobSpec:
+    """
+    주기 작업 정의.
+    interval: N초 간격 (슬롯 경계 = epoch 기준 N의 배수)
+    daily_at: KST (시, 분) 목록 — 매일 해당 시각
+    """
+    name: str
+    func: Callable[[], Awaitable]
+    interval: Optional[float] = None
+    daily_at: Sequence[Tuple[int, int]] = ()
+    initial_delay: float = 0.0
+    lease_ttl: float = 15 * 60
+    catch_up: bool = True
+    max_attempts: int = 4          # 슬롯당 최대 실행 횟수 (실패 포함)
+    retry_base: float = 5 * 60     # 첫 재시도 대기, 이후 2배씩
+    retry_max: float = 60 * 60
+
+    def __post_init__(self):
+        if not self.interval and not self.daily_at:
+            raise ValueError(f"Job {self.name}: interval or daily_at required")
+
+    def retry_delay(self, failures: int) -> float:
+        """failures 번째 실패 후 재시도까지 대기 (초)."""
+        return min(self.retry_base * 2 ** (failures - 1), self.retry_max)
+
+    def slot_at(self, now: float) -> int:
+        """now 가 속한 슬롯의 시작 시각 (epoch 초)."""
+        if self.interval:
+            return int(now // self.interval * self.interval)
+        now_kst = datetime.fromtimestamp(now, KST)
+        starts = []
+        for h, m in self.daily_at:
+            t = now_kst.replace(hour=h, minute=m, second=0, microsecond=0)
+            if t > now_kst:
+                t -= timedelta(days=1)
+            starts.append(t)
+        return int(max(starts).timestamp())
+
+    def next_slot(self, now: float) -> int:
+        """다음 슬롯 시작 시각."""
+        if self.interval:
+            return self.slot_at(now) + int(self.interval)
+        now_kst = datetime.fromtimestamp(now, KST)
+        nexts = []
+        for h, m in self.daily_at:
+            t = now_kst.replace(hour=h, minute=m, second=0, microsecond=0)
+            if t <= now_kst:
+                t += timedelta(days=1)
+            nexts.append(t)
+        return int(min(nexts).timestamp())
+
+    @property
+    def schedule(self) -> str:
+        if self.interval:
+            return f"every {self.interval / 3600:g}h"
+        return "daily " + ", ".join(f"{h:02d}:{m:02d}" for h, m in self.daily_at) + " KST"
+
+
+# ─────────────────────────────────────────────
+# LEASE STORES (동기 — 스케줄러가 to_thread 로 호출)
+# ─────────────────────────────────────────────
+
+class SQLiteLeaseStore:
+    """로컬/테스트용 lease 저장소 (같은 파일을 공유하는 프로세스 간에도 동작)."""
+
+    def __init__(self, path: str = _SQLITE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    job TEXT PRIMARY KEY, holder TEXT, token INTEGER NOT NULL DEFAULT 0,
+                    expires_at REAL NOT NULL DEFAULT 0, last_slot INTEGER, last_success_at REAL);
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, job TEXT, slot INTEGER, token INTEGER,
+                    holder TEXT, started_at REAL, ended_at REAL, duration_sec REAL,
+                    outcome TEXT, error TEXT, result TEXT, fenced INTEGER DEFAULT 0);
+                CREATE INDEX IF NOT EXISTS runs_job ON runs(job, id);
+            """)
+            # 재시도 상태 컬럼 (이전 스키마 파일에도 추가)
+            for column in ("fail_slot INTEGER", "failures INTEGER NOT NULL DEFAULT 0", "retry_at REAL NOT NULL DEFAULT 0"):
+                try:
+                    self._conn.execute(f"ALTER TABLE leases ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return out
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def acquire(self, job: str, holder: str, slot: int, ttl: float, now: float) -> Tuple[str, Optional[int]]:
+        def fn(c):
+            row = c.execute("SELECT holder, token, expires_at, last_slot, fail_slot, retry_at FROM leases WHERE job=?",
+                            (job,)).fetchone()
+            if row is None:
+                c.execute("INSERT INTO leases(job, holder, token, expires_at) VALUES (?, ?, 1, ?)", (job, holder, now + ttl))
+                return ACQUIRED, 1
+            cur_holder, token, expires_at, last_slot, fail_slot, retry_at = row
+            if last_slot is not None and last_slot >= slot:
+                return DONE, None
+            if fail_slot == slot and retry_at > now:
+                return BACKOFF, None
+            if cur_holder and cur_holder != holder and expires_at > now:
+                return HELD, None
+            c.execute("UPDATE leases SET holder=?, token=?, expires_at=? WHERE job=?", (holder, token + 1, now + ttl, job))
+            return ACQUIRED, token + 1
+        return self._tx(fn)
+
+    def renew(self, job: str, holder: str, token: int, ttl: float, now: float) -> bool:
+        def fn(c):
+            cur = c.execute("UPDATE leases SET expires_at=? WHERE job=? AND holder=? AND token=?",
+                            (now + ttl, job, holder, token))
+            return cur.rowcount == 1
+        return self._tx(fn)
+
+    def complete(self, job: str, holder: str, token: int, slot: Optional[int], record: Dict,
+                 retry: Optional[Tuple[int, int, float]] = None) -> bool:
+        """
+        토큰이 현재 lease 와 일치할 때만 슬롯 완료/해제 반영. 원장 기록은 항상 (fenced 표시).
+        retry=(실패 슬롯, 실패 횟수, 재시도 시각): 슬롯은 미완료로 두고 재시도 상태 기록.
+        """
+        def fn(c):
+            row = c.execute("SELECT holder, token FROM leases WHERE job=?", (job,)).fetchone()
+            valid = row is not None and row[0] == holder and row[1] == token
+            if valid:
+                if slot is not None:
+                    c.execute("UPDATE leases SET holder=NULL, expires_at=0, last_slot=?, fail_slot=NULL, failures=0, "
+                              "retry_at=0 WHERE job=?", (slot, job))
+                    if record["outcome"] == "success":
+                        c.execute("UPDATE leases SET last_success_at=? WHERE job=?", (record["ended_at"], job))
+                elif retry is not None:
+                    c.execute("UPDATE leases SET holder=NULL, expires_at=0, fail_slot=?, failures=?, retry_at=? "
+                              "WHERE job=?", (*retry, job))
+                else:
+                    c.execute("UPDATE leases SET holder=NULL, expires_at=0 WHERE job=?", (job,))
+            c.execute(
+                "INSERT INTO runs(job, slot, token, holder, started_at, ended_at, duration_sec, outcome, error, result, fenced) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job, record["slot"], token, holder, record["started_at"], record["ended_at"], record["duration_sec"],
+                 record["outcome"], record.get("error"), record.get("result"), 0 if valid else 1),
+            )
+            return valid
+        return self._tx(fn)
+
+    def lease(self, job: str) -> Optional[Dict]:
+        cols = ("holder", "token", "expires_at", "last_slot", "last_success_at", "fail_slot", "failures", "retry_at")
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(cols)} FROM leases WHERE job=?", (job,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(cols, row))
+
+    def history(self, job: str, limit: int = HISTORY_LIMIT) -> List[Dict]:
+        cols = ("slot", "token", "holder", "started_at", "ended_at", "duration_sec", "outcome", "error", "result", "fenced")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(cols)} FROM runs WHERE job=? ORDER BY id DESC LIMIT ?", (job, limit)).fetchall()
+        return [dict(zip(cols, r), fenced=bool(r[-1])) for r in rows]
+
+
+class FirestoreLeaseStore:
+    """운영용 lease 저장소 — Firestore 트랜잭션으로 compare-and-set."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def acquire(self, job: str, holder: str, slot: int, ttl: float, now: float) -> Tuple[str, Optional[int]]:
+        from google.cloud import firestore
+        ref = self.db.collection(LEASES_COLLECTION).document(job)
+
+        @firestore.transactional
+        def fn(transaction):
+            snap = ref.get(transaction=transaction)
+            data = snap.to_dict() if snap.exists else {}
+            last_slot = data.get("last_slot")
+            if last_slot is not None and last_slot >= slot:
+                return DONE, None
+            if data.get("fail_slot") == slot and data.get("retry_at", 0) > now:
+                return BACKOFF, None
+            if data.get("holder") and data.get("holder") != holder and data.get("expires_at", 0) > now:
+                return HELD, None
+            token = int(data.get("token", 0)) + 1
+            transaction.set(ref, {"holder": holder, "token": token, "expires_at": now + ttl}, merge=True)
+            return ACQUIRED, token
+
+        return fn(self.db.transaction())
+
+    def renew(self, job: str, holder: str, token: int, ttl: float, now: float) -> bool:
+        from google.cloud import firestore
+        ref = self.db.collection(LEASES_COLLECTION).document(job)
+
+        @firestore.transactional
+        def fn(transaction):
+            data = ref.get(transaction=transaction).to_dict() or {}
+            if data.get("holder") != holder or data.get("token") != token:
+                return False
+            transaction.update(ref, {"expires_at": now + ttl})
+            return True
+
+        return fn(self.db.transaction())
+
+    def complete(self, job: str, holder: str, token: int, slot: Optional[int], record: Dict,
+                 retry: Optional[Tuple[int, int, float]] = None) -> bool:
+        from google.cloud import firestore
+        ref = self.db.collection(LEASES_COLLECTION).document(job)
+        run_ref = self.db.collection(RUNS_COLLECTION).document()
+
+        @firestore.transactional
+        def fn(transaction):
+            data = ref.get(transaction=transaction).to_dict() or {}
+            valid = data.get("holder") == holder and data.get("token") == token
+            if valid:
+                update = {"holder": None, "expires_at": 0}
+                if slot is not None:
+                    update.update({"last_slot": slot, "fail_slot": None, "failures": 0, "retry_at": 0})
+                    if record["outcome"] == "success":
+                        update["last_success_at"] = record["ended_at"]
+                elif retry is not None:
+                    update.update(dict(zip(("fail_slot", "failures", "retry_at"), retry)))
+                transaction.update(ref, update)
+            transaction.set(run_ref, {**record, "job": job, "token": token, "holder": holder, "fenced": not valid})
+            return valid
+
+        return fn(self.db.transaction())
+
+    def lease(self, job: str) -> Optional[Dict]:
+        snap = self.db.collection(LEASES_COLLECTION).document(job).get()
+        return snap.to_dict() if snap.exists else None
+
+    def history(self, job: str, limit: int = HISTORY_LIMIT) -> List[Dict]:
+        from google.cloud import firestore
+        docs = (self.db.collection(RUNS_COLLECTION)
+                .where("job", "==", job)
+                .order_by("started_at", direction=firestore.Query.DESCENDING)
+                .limit(limit).stream())
+        return [d.to_dict() for d in docs]
+
+
+def get_lease_store():
+    """Firestore 사용 가능하면 Firestore, 아니면 로컬 SQLite (단일 인스턴스 개발 환경)."""
+    backend = os.getenv("SCHEDULER_LEASE_BACKEND", "").lower()
+    if backend != "sqlite":
+        try:
+            from app.db.firestore import get_firestore_db
+            db = get_firestore_db()
+            if db is not None:
+                return FirestoreLeaseStore(db)
+        except Exception as e:
+            if backend == "firestore":
+                raise
+            logger.warning(f"[JobScheduler] Firestore unavailable, using SQLite leases: {e}")
+    return SQLiteLeaseStore()
+
+
+# ─────────────────────────────────────────────
+# SCHEDULER
+# ─────────────────────────────────────────────
+
+class JobScheduler:
+    def __init__(self, store=None, holder: Optional[str] = None, poll_interval: float = 300.0,
+                 clock: Callable[[], float] = time.time):
+        self._store = store
+        self.holder = holder or _default_holder()
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.jobs: Dict[str, JobSpec] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._done_slot: Dict[str, int] = {}      # 로컬 캐시 — 완료 확인된 슬롯은 저장소 재조회 안 함
+        self._running: Dict[str, float] = {}
+        self._last: Dict[str, Dict] = {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_lease_store()
+        return self._store
+
+    def register(self, spec: JobSpec) -> JobSpec:
+        self.jobs[spec.name] = spec
+        return spec
+
+    def start(self):
+        """등록된 작업마다 루프 태스크 시작 (중복 호출 안전)."""
+        for name, spec in self.jobs.items():
+            if name not in self._tasks or self._tasks[name].done():
+                self._tasks[name] = asyncio.create_task(self._loop(spec))
+        logger.info(f"🗓️ [JobScheduler] {len(self.jobs)} jobs started (holder={self.holder})")
+
+    async def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    async def _loop(self, spec: JobSpec):
+        await asyncio.sleep(spec.initial_delay)
+        if not spec.catch_up:
+            # 콜드 스타트 시 현재 슬롯은 건너뛰고 다음 경계부터
+            self._done_slot[spec.name] = spec.slot_at(self.clock())
+        while True:
+            try:
+                await self.run_if_due(spec.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[JobScheduler] {spec.name} error: {e}")
+            now = self.clock()
+            wait = min(spec.next_slot(now) - now, self.poll_interval)
+            await asyncio.sleep(max(wait, 1.0))
+
+    async def run_if_due(self, name: str, force: bool = False) -> Optional[Dict]:
+        """
+        현재 슬롯이 미완료이고 lease 를 얻으면 실행. 실행하지 않았으면 None.
+        force=True: 슬롯 완료 여부와 무관하게 lease 만 얻으면 실행 (수동 트리거 — 슬롯은 갱신하지 않음).
+        """
+        spec = self.jobs[name]
+        now = self.clock()
+        slot = spec.slot_at(now)
+        if not force and self._done_slot.get(name, -1) >= slot:
+            return None
+
+        acquire_slot = 2 ** 62 if force else slot
+        status, token = await asyncio.to_thread(self.store.acquire, name, self.holder, acquire_slot, spec.lease_ttl, now)
+        if status == DONE:
+            self._done_slot[name] = slot
+            return None
+        if status == HELD:
+            logger.debug(f"[JobScheduler] {name}: lease held by another instance")
+            return None
+        if status == BACKOFF:
+            logger.debug(f"[JobScheduler] {name}: waiting to retry failed slot")
+            return None
+        return await self._execute(spec, token, None if force else slot)
+
+    async def _execute(self, spec: JobSpec, token: int, slot: Optional[int]) -> Dict:
+        name = spec.name
+        started = self.clock()
+        self._running[name] = started
+        heartbeat = asyncio.create_task(self._heartbeat(spec, token))
+        outcome, error, result = "success", None, None
+        t0 = time.perf_counter()
+        logger.info(f"▶️ [JobScheduler] {name} start (slot={slot}, token={token})")
+        try:
+            result = await spec.func()
+        except asyncio.CancelledError:
+            outcome, error = "cancelled", "cancelled"
+            raise
+        except Exception as e:
+            outcome, error = "error", str(e)[:500]
+            logger.warning(f"[JobScheduler] {name} failed: {e}")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(name, None)
+            duration = time.perf_counter() - t0
+            record = {
+                "slot": slot, "started_at": started, "ended_at": started + duration,
+                "duration_sec": round(duration, 3), "outcome": outcome, "error": error,
+                "result": _result_summary(result),
+            }
+            # 실패 → 백오프 후 재시도, max_attempts 회째 실패면 error 로 슬롯 완료 (수동 실행은 슬롯 무관)
+            done_slot, retry = (slot if outcome == "success" else None), None
+            if outcome == "error" and slot is not None:
+                done_slot, retry = await self._failure_state(spec, slot, self.clock())
+                record["attempt"] = retry[1] if retry else spec.max_attempts
+            try:
+                valid = await asyncio.to_thread(self.store.complete, name, self.holder, token, done_slot, record, retry)
+            except Exception as e:
+                valid = False
+                logger.warning(f"[JobScheduler] {name} ledger write failed: {e}")
+            if not valid:
+                logger.warning(f"[JobScheduler] {name} lease lost during run (token={token}) — result fenced")
+            elif done_slot is not None:
+                self._done_slot[name] = done_slot
+            record.update({"token": token, "fenced": not valid})
+            self._last[name] = record
+            logger.info(f"⏹️ [JobScheduler] {name} {outcome} in {duration:.1f}s")
+        return record
+
+    async def _failure_state(self, spec: JobSpec, slot: int, now: float) -> Tuple[Optional[int], Optional[Tuple]]:
+        """(완료 처리할 슬롯, 재시도 상태) — lease 를 쥐고 있으므로 실패 횟수는 이 인스턴스만 갱신."""
+        try:
+            lease = await asyncio.to_thread(self.store.lease, spec.name) or {}
+        except Exception as e:
+            logger.warning(f"[JobScheduler] {spec.name} lease read failed: {e}")
+            lease = {}
+        failures = (lease.get("failures") or 0) + 1 if lease.get("fail_slot") == slot else 1
+        if failures >= spec.max_attempts:
+            logger.warning(f"[JobScheduler] {spec.name} gave up on slot {slot} after {failures} attempts")
+            return slot, None
+        delay = spec.retry_delay(failures)
+        logger.info(f"[JobScheduler] {spec.name} retry {failures + 1}/{spec.max_attempts} in {delay:.0f}s")
+        return None, (slot, failures, now + delay)
+
+    async def _heartbeat(self, spec: JobSpec, token: int):
+        interval = max(spec.lease_ttl / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                ok = await asyncio.to_thread(self.store.renew, spec.name, self.holder, token,
+                                             spec.lease_ttl, self.clock())
+            except Exception as e:
+                logger.warning(f"[JobScheduler] {spec.name} heartbeat failed: {e}")
+                continue
+            if not ok:
+                logger.warning(f"[JobScheduler] {spec.name} lease taken over (token={token})")
+                return
+
+    # ── 조회 ──
+
+    @staticmethod
+    def duration_stats(history: List[Dict]) -> Dict:
+        """성공 실행 소요시간 통계 + 회귀 표시 (최근 실행이 이전 중앙값의 2배 초과)."""
+        durations = [h["duration_sec"] for h in history if h.get("outcome") == "success"]
+        if not durations:
+            return {"runs": 0}
+        ordered = sorted(durations)
+        previous = durations[1:]
+        baseline = statistics.median(previous) if previous else None
+        return {
+            "runs": len(durations),
+            "last_sec": durations[0],
+            "p50_sec": round(statistics.median(ordered), 3),
+            "p95_sec": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max_sec": ordered[-1],
+            "regression": bool(baseline and durations[0] > 2 * baseline),
+        }
+
+    async def history(self, name: str, limit: int = HISTORY_LIMIT) -> List[Dict]:
+        return await asyncio.to_thread(self.store.history, name, limit)
+
+    async def status(self) -> Dict:
+        now = self.clock()
+
+        async def one(spec: JobSpec):
+            lease, history = await asyncio.gather(
+                asyncio.to_thread(self.store.lease, spec.name),
+                asyncio.to_thread(self.store.history, spec.name, HISTORY_LIMIT),
+            )
+            lease = lease or {}
+            holder = lease.get("holder")
+            return spec.name, {
+                "schedule": spec.schedule,
+                "current_slot": datetime.fromtimestamp(spec.slot_at(now), KST).isoformat(),
+                "next_slot": datetime.fromtimestamp(spec.next_slot(now), KST).isoformat(),
+                "last_completed_slot": (datetime.fromtimestamp(lease["last_slot"], KST).isoformat()
+                                        if lease.get("last_slot") is not None else None),
+                "lease_holder": holder if holder and lease.get("expires_at", 0) > now else None,
+                "held_by_me": holder == self.holder and lease.get("expires_at", 0) > now,
+                "fencing_token": lease.get("token"),
+                "failures": (lease.get("failures") or 0) if lease.get("fail_slot") == spec.slot_at(now) else 0,
+                "retry_at": (datetime.fromtimestamp(lease["retry_at"], KST).isoformat()
+                             if lease.get("fail_slot") == spec.slot_at(now) and lease.get("retry_at") else None),
+                "running_here_sec": round(now - self._running[spec.name], 1) if spec.name in self._running else None,
+                "last_run": history[0] if history else None,
+                "durations": self.duration_stats(history),
+            }
+
+        results = await asyncio.gather(*(one(s) for s in self.jobs.values()), return_exceptions=True)
+        jobs = {}
+        for spec, r in zip(self.jobs.values(), results):
+            jobs[spec.name] = {"error": str(r)} if isinstance(r, Exception) else r[1]
+        return {"holder": self.holder, "backend": type(self.store).__name__, "jobs": jobs}
+
+
+job_scheduler = JobScheduler()
@@ -0,0 +1,397 @@
+"""
+Leaderboard Service — 정렬 키별 순위 색인 + 버전 스냅샷.
+
+기존 /api/league/leaderboard 는 요청마다 get_all_users(limit=1000) 후 hit_rate 재계산·정렬을
+반복했고, created_at 기준 1,000명 밖의 유저는 순위에서 빠졌음. /api/prediction/leaderboard 는
+prediction_users 를 별도 쿼리로 조회.
+
+보드:
+  slips  — users.stats (베팅 슬립 정산) : total_roi / hit_rate / won
+  league — prediction_users (예측 리그) : points / accuracy
+
+- 보드별 행(row)은 user_id → 작은 dict, 정렬 키별 Ranking 은 (-score, user_id) 정렬 배열
+  → 순위/내 순위 조회는 bisect O(log n), 페이지는 슬라이스 O(limit)
+- 정산이 유저 통계를 바꿀 때마다 apply() 로 해당 유저만 재배치 (전체 재정렬 없음)
+- 스냅샷: MARKET_CACHE 의 leaderboard_{board}_shard{i} (컬럼형 JSON, 문서당 SNAPSHOT_MAX_BLOB_BYTES 이하로 분할)
+  + leaderboard_{board}_version ({version, shards}) — 샤드를 먼저 쓰고 버전 문서는 마지막
+  정산 잡 종료 시 persist(), 다른 인스턴스는 SNAPSHOT_POLL 초마다 버전 문서만 확인 후 교체
+- 로컬 변경(예측 제출 등 persist 하지 않는 경로 포함)은 pending 으로 보관 → 원격 스냅샷을 받으면
+  그 위에 다시 적용 (유저별 변경 버전이 원격보다 새로운 것만)
+- 스냅샷이 없으면 전체 스캔 1회로 재구성 (limit 없음). 재구성은 버전을 올리지 않음
+  (스냅샷이 아예 없을 때만 초기 스냅샷 저장 → 다른 인스턴스가 연쇄 재적재/재스캔하지 않도록)
+"""
+import asyncio
+import json
+import logging
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_POLL = 60.0
+SNAPSHOT_MAX_BLOB_BYTES = 900_000    # Firestore 문서 1MiB 제한 (샤드 1개 상한)
+
+
+def _num(value, default=0.0) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value == value else default   # NaN → default
+
+
+def _blob_size(payload: dict) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class Ranking:
+    """(-score, user_id) 정렬 배열. 동점은 user_id 순."""
+
+    def __init__(self):
+        self._keys: List[Tuple[float, str]] = []
+        self._key_of: Dict[str, Tuple[float, str]] = {}
+
+    @classmethod
+    def build(cls, scores: Dict[str, float]) -> "Ranking":
+        ranking = cls()
+        ranking._key_of = {uid: (-score, uid) for uid, score in scores.items()}
+        ranking._keys = sorted(ranking._key_of.values())
+        return ranking
+
+    def upsert(self, user_id: str, score: float):
+        self.remove(user_id)
+        key = (-score, user_id)
+        insort(self._keys, key)
+        self._key_of[user_id] = key
+
+    def remove(self, user_id: str):
+        old = self._key_of.pop(user_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, old)]
+
+    def rank(self, user_id: str) -> Optional[int]:
+        key = self._key_of.get(user_id)
+        return None if key is None else bisect_left(self._keys, key) + 1
+
+    def page(self, offset: int, limit: int) -> List[str]:
+        return [uid for _, uid in self._keys[offset:offset + limit]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# ── 보드 정의 ──
+
+def slip_row(user: dict) -> Optional[dict]:
+    """users 문서 → slips 보드 행 (예측 이력이 없으면 None)."""
+    stats = user.get("stats") or {}
+    if stats.get("prediction_count", 0) <= 0:
+        return None
+    won, lost, partial = stats.get("won", 0), stats.get("lost", 0), stats.get("partial", 0)
+    decided = won + lost + partial
+    return {
+        "id": user.get("id"),
+        "email": user.get("email"),
+        "nickname": user.get("nickname") or (user.get("email") or "").split("@")[0],
+        "role": user.get("role", "free"),
+        "prediction_count": stats.get("prediction_count", 0),
+        "won": won,
+        "lost": lost,
+        "total_roi": stats.get("total_roi", 0.0),
+        "hit_rate": round(won / decided * 100, 2) if decided > 0 else 0.0,
+    }
+
+
+def league_row(stats: dict) -> Optional[dict]:
+    """prediction_users 문서 → league 보드 행."""
+    user_id = stats.get("user_id") or stats.get("id")
+    if not user_id:
+        return None
+    return {
+        "id": user_id,
+        "user_id": user_id,
+        "points": stats.get("points", 0),
+        "accuracy": stats.get("accuracy", 0.0),
+        "tier": stats.get("tier", "Rookie"),
+        "total_predictions": stats.get("total_predictions", 0),
+        "wins": stats.get("wins", 0),
+    }
+
+
+BOARDS: Dict[str, dict] = {
+    "slips": {"sort_keys": ("total_roi", "hit_rate", "won"), "default": "total_roi", "row": slip_row},
+    "league": {"sort_keys": ("points", "accuracy"), "default": "points", "row": league_row},
+}
+
+
+class Leaderboard:
+    def __init__(self, name: str, rows: Optional[Dict[str, dict]] = None, version: int = 0,
+                 stamps: Optional[Dict[str, int]] = None):
+        self.name = name
+        self.sort_keys = BOARDS[name]["sort_keys"]
+        self.rows: Dict[str, dict] = rows or {}
+        self.rankings = {k: Ranking.build({uid: _num(r.get(k)) for uid, r in self.rows.items()})
+                         for k in self.sort_keys}
+        self.version = version
+        self.base_version = version                     # 마지막으로 맞춘 원격 스냅샷 버전
+        self.stamps: Dict[str, int] = stamps or {}      # 유저별 마지막 변경 버전
+        self.pending: Dict[str, Optional[dict]] = {}    # 스냅샷에 아직 없는 로컬 변경
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.pending)
+
+    def apply(self, row: Optional[dict], user_id: Optional[str] = None, stamp: Optional[int] = None):
+        """한 유저의 행 갱신 (None 이면 보드에서 제거) — 정렬 키별 O(log n) 탐색."""
+        uid = (row or {}).get("id") or user_id
+        if not uid:
+            return
+        if row is None:
+            self.rows.pop(uid, None)
+            for ranking in self.rankings.values():
+                ranking.remove(uid)
+        else:
+            self.rows[uid] = row
+            for key, ranking in self.rankings.items():
+                ranking.upsert(uid, _num(row.get(key)))
+        self.version = max(self.version + 1, int(time.time() * 1000))
+        self.stamps[uid] = stamp or self.version
+        self.pending[uid] = row
+
+    def rebase(self, remote: "Leaderboard") -> "Leaderboard":
+        """원격 스냅샷 위에 이 보드의 미반영 로컬 변경을 다시 적용 (원격이 더 최신인 유저는 원격 유지)."""
+        for uid, row in self.pending.items():
+            stamp = self.stamps.get(uid, 0)
+            if remote.stamps.get(uid, 0) < stamp:
+                remote.apply(row, user_id=uid, stamp=stamp)
+        return remote
+
+    def sort_key(self, sort_by: Optional[str]) -> str:
+        return sort_by if sort_by in self.rankings else BOARDS[self.name]["default"]
+
+    def page(self, sort_by: Optional[str] = None, offset: int = 0, limit: int = 50) -> List[dict]:
+        key = self.sort_key(sort_by)
+        offset = max(offset, 0)
+        return [{**self.rows[uid], "rank": offset + i + 1}
+                for i, uid in enumerate(self.rankings[key].page(offset, limit))]
+
+    def rank_of(self, user_id: str, sort_by: Optional[str] = None) -> Optional[dict]:
+        key = self.sort_key(sort_by)
+        rank = self.rankings[key].rank(user_id)
+        if rank is None:
+            return None
+        return {**self.rows[user_id], "rank": rank, "total": len(self.rows), "sort_by": key}
+
+    # ── 컬럼형 스냅샷 ──
+
+    def to_dict(self, ids: Optional[List[str]] = None) -> dict:
+        ids = list(self.rows) if ids is None else ids
+        fields = sorted({f for uid in ids for f in self.rows[uid]})
+        return {
+            "board": self.name,
+            "version": self.version,
+            "ids": ids,
+            "stamps": [self.stamps.get(uid, 0) for uid in ids],
+            "columns": {f: [self.rows[uid].get(f) for uid in ids] for f in fields},
+        }
+
+    def to_shards(self, max_bytes: Optional[int] = None) -> List[dict]:
+        """문서 1개당 max_bytes(기본 SNAPSHOT_MAX_BLOB_BYTES) 이하가 되도록 유저 구간별로 나눈 스냅샷."""
+        max_bytes = max_bytes or SNAPSHOT_MAX_BLOB_BYTES
+        ids = list(self.rows)
+        if not ids:
+            return [self.to_dict([])]
+        count = max(1, -(-_blob_size(self.to_dict()) // int(max_bytes * 0.9)))
+        while True:
+            size = -(-len(ids) // count)
+            shards = [self.to_dict(ids[i:i + size]) for i in range(0, len(ids), size)]
+            if size == 1 or all(_blob_size(shard) <= max_bytes for shard in shards):
+                return shards
+            count *= 2
+
+    @classmethod
+    def from_shards(cls, shards: List[dict]) -> "Leaderboard":
+        rows, stamps = {}, {}
+        for data in shards:
+            ids, columns = data.get("ids", []), data.get("columns", {})
+            shard_stamps = data.get("stamps") or [0] * len(ids)
+            for i, uid in enumerate(ids):
+                rows[uid] = {f: col[i] for f, col in columns.items()}
+                stamps[uid] = int(shard_stamps[i] or 0)
+        return cls(shards[0]["board"], rows, int(shards[0].get("version", 0)), stamps)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Leaderboard":
+        return cls.from_shards([data])
+
+
+# ── 데이터 소스 (전체 스캔) ──
+
+def _scan_slips() -> List[dict]:
+    from app.models import user_db
+    if not user_db._is_firestore_available():
+        return user_db._load_local_users()
+    from app.db.firestore import get_firestore_db
+    db = get_firestore_db()
+    docs = db.collection("users").select(["email", "nickname", "role", "stats"]).stream()
+    return [{**(d.to_dict() or {}), "id": d.id} for d in docs]
+
+
+def _scan_league() -> List[dict]:
+    from app.models.prediction_db import PREDICTION_USERS_COLLECTION
+    from app.db.firestore import get_firestore_db
+    db = get_firestore_db()
+    return [{**(d.to_dict() or {}), "id": d.id} for d in db.collection(PREDICTION_USERS_COLLECTION).stream()]
+
+
+SCANNERS: Dict[str, Callable[[], List[dict]]] = {"slips": _scan_slips, "league": _scan_league}
+
+
+class LeaderboardService:
+    def __init__(self, scanners: Optional[Dict[str, Callable]] = None, snapshots: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.scanners = scanners or SCANNERS
+        self.snapshots = snapshots
+        self.clock = clock
+        self.boards: Dict[str, Leaderboard] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self.rebuilds = 0
+        self.snapshot_loads = 0
+
+    # ── 적재 ──
+
+    async def board(self, name: str) -> Leaderboard:
+        if name not in BOARDS:
+            raise ValueError(f"Unknown leaderboard: {name}")
+        board = self.boards.get(name)
+        if board is not None and self.clock() - self._checked_at.get(name, 0.0) < SNAPSHOT_POLL:
+            return board
+        async with self._lock:
+            board = self.boards.get(name)
+            if board is not None and self.clock() - self._checked_at.get(name, 0.0) < SNAPSHOT_POLL:
+                return board
+            if board is None:
+                board = await self._restore(name) or await self.rebuild(name)
+            else:
+                board = await self._sync(name, board)
+            self.boards[name] = board
+            self._checked_at[name] = self.clock()
+            return board
+
+    async def rebuild(self, name: str) -> Leaderboard:
+        """
+        전체 스캔으로 보드 재구성 (스냅샷 없음 / 관리자 요청).
+        버전은 원격 스냅샷 버전 그대로 — 스냅샷이 아예 없을 때만 초기 스냅샷으로 저장.
+        """
+        docs = await asyncio.to_thread(self.scanners[name])
+        row_fn = BOARDS[name]["row"]
+        rows = {}
+        for doc in docs:
+            row = row_fn(doc)
+            if row:
+                rows[row["id"]] = row
+        remote = int((await self._remote_meta(name)).get("version", 0))
+        board = Leaderboard(name, rows, version=remote or 1)
+        self.boards[name] = board
+        self._checked_at[name] = self.clock()
+        self.rebuilds += 1
+        logger.info(f"[Leaderboard] {name} rebuilt from scan: {len(rows)} users")
+        if not remote and self.snapshots:
+            await self._write(name, board)
+        return board
+
+    async def _remote_meta(self, name: str) -> dict:
+        if not self.snapshots:
+            return {}
+        from app.models.bets_db import load_stats_cache
+        return await load_stats_cache(f"leaderboard_{name}_version")
+
+    async def _restore(self, name: str, meta: Optional[dict] = None) -> Optional[Leaderboard]:
+        """원격 스냅샷 적재. 샤드 버전이 버전 문서와 다르면 (쓰는 중) None."""
+        if not self.snapshots:
+            return None
+        try:
+            from app.models.bets_db import load_stats_cache
+            meta = await self._remote_meta(name) if meta is None else meta
+            version, count = int(meta.get("version", 0)), int(meta.get("shards") or 0)
+            if count:
+                shards = await asyncio.gather(*(load_stats_cache(f"leaderboard_{name}_shard{i}") for i in range(count)))
+                if any(int(shard.get("version", -1)) != version for shard in shards):
+                    logger.info(f"[Leaderboard] {name} snapshot v{version} incomplete — keeping current board")
+                    return None
+            else:
+                # 샤딩 도입 전 단일 문서 스냅샷
+                data = await load_stats_cache(f"leaderboard_{name}")
+                shards = [data] if data.get("ids") is not None else []
+            if shards:
+                self.snapshot_loads += 1
+                return Leaderboard.from_shards(shards)
+        except Exception as e:
+            logger.warning(f"[Leaderboard] snapshot restore failed ({name}): {e}")
+        return None
+
+    async def _sync(self, name: str, board: Leaderboard) -> Leaderboard:
+        """원격 스냅샷이 더 새로우면 교체하고 로컬 미반영 변경을 그 위에 다시 적용."""
+        meta = await self._remote_meta(name)
+        if int(meta.get("version", 0)) <= board.base_version:
+            return board
+        restored = await self._restore(name, meta)
+        return board if restored is None else board.rebase(restored)
+
+    async def _write(self, name: str, board: Leaderboard):
+        from app.models.bets_db import save_stats_cache
+        written, version = dict(board.pending), board.version
+        shards = board.to_shards()
+        # 샤드 먼저, 버전 문서는 마지막 (읽는 쪽은 버전이 다른 샤드가 섞이면 적재하지 않음)
+        for i, shard in enumerate(shards):
+            await save_stats_cache(f"leaderboard_{name}_shard{i}", shard)
+        await save_stats_cache(f"leaderboard_{name}_version", {"version": version, "shards": len(shards)})
+        board.base_version = max(board.base_version, version)
+        for uid, row in written.items():
+            if board.pending.get(uid) is row:    # 저장 중 다시 바뀐 유저는 남김
+                del board.pending[uid]
+
+    async def persist(self, name: Optional[str] = None):
+        """변경된 보드 스냅샷 저장 (정산 잡 종료 시 호출) — 다른 인스턴스가 먼저 저장했으면 그 위에 병합 후 저장."""
+        for board_name in ([name] if name else list(self.boards)):
+            board = self.boards.get(board_name)
+            if board is None or not board.dirty:
+                continue
+            if not self.snapshots:
+                board.pending.clear()
+                continue
+            board = self.boards[board_name] = await self._sync(board_name, board)
+            await self._write(board_name, board)
+
+    # ── 증분 갱신 (정산 경로에서 호출) ──
+
+    async def record(self, name: str, doc: dict):
+        """유저 문서/통계 변경 반영 — 보드가 메모리에 없으면 먼저 적재 (스냅샷이 변경을 놓치지 않도록)."""
+        board = await self.board(name)
+        row = BOARDS[name]["row"](doc)
+        board.apply(row, user_id=doc.get("id") or doc.get("user_id"))
+
+    # ── 조회 ──
+
+    async def page(self, name: str, sort_by: Optional[str] = None, offset: int = 0, limit: int = 50) -> dict:
+        board = await self.board(name)
+        key = board.sort_key(sort_by)
+        return {"users": board.page(key, offset, limit), "sort_by": key, "offset": offset,
+                "total": len(board.rows), "version": board.version}
+
+    async def rank_of(self, name: str, user_id: str, sort_by: Optional[str] = None) -> Optional[dict]:
+        board = await self.board(name)
+        return board.rank_of(user_id, sort_by)
+
+    def stats(self) -> dict:
+        return {
+            "boards": {n: {"users": len(b.rows), "version": b.version, "dirty": b.dirty}
+                       for n, b in self.boards.items()},
+            "rebuilds": self.rebuilds,
+            "snapshot_loads": self.snapshot_loads,
+        }
+
+
+leaderboard_service = LeaderboardService()
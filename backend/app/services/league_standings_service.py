@@ -2,11 +2,17 @@
 football-data.org 연동 서비스
 - 리그 순위, 경기 결과, 득점자
 - 완전 무료 (12개 대회, 10건/분)
+- 엔드포인트별 캐시 + ETag/If-Modified-Since 조건부 요청 (304 → 캐시 재사용)
+- 리그 병렬 수집 (10건/분 슬라이딩 윈도우 제한기)
+- 팀명 → 순위 행 인덱스 (O(1) 순위/폼 조회)
 - Docs: https://www.football-data.org/documentation/api
 """
+import asyncio
 import httpx
 import logging
 import os
+import time
+from collections import deque
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
 from app.schemas.predictions import TeamStats
@@ -23,6 +29,35 @@ COMPETITION_MAP = {
     "soccer_uefa_champs_league": "CL",  # Champions League
 }
 
+# 엔드포인트별 캐시 유효 시간 (초) — 만료 후에는 조건부 요청으로 재검증
+STANDINGS_TTL = 30 * 60
+MATCHES_TTL = 15 * 60
+SCORERS_TTL = 60 * 60
+
+RATE_LIMIT_CALLS = 10   # football-data.org 무료 플랜: 10건/분
+RATE_LIMIT_PERIOD = 60.0
+
+
+class _SlidingWindowLimiter:
+    """최근 period초 동안 max_calls건 이하로 호출을 제한 (초과 시 대기)"""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls: deque = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._calls[0]))
+
 
 class LeagueStandingsService:
     def __init__(self):
@@ -31,6 +66,15 @@ class LeagueStandingsService:
         self._cache: Dict[str, List[TeamStats]] = {}
         self._last_fetch: Optional[str] = None
 
+        # endpoint → {"data", "etag", "last_modified", "fetched_at"}
+        self._responses: Dict[str, Dict] = {}
+        self._endpoint_locks: Dict[str, asyncio.Lock] = {}
+        # league_key → {team_name.lower(): TeamStats}
+        self._team_index: Dict[str, Dict[str, TeamStats]] = {}
+        self._limiter = _SlidingWindowLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+        self._restored = False
+        self.stats = {"requests": 0, "not_modified": 0, "cache_hits": 0}
+
         if self.api_key:
             logger.info("✅ football-data.org key loaded")
         else:
@@ -39,23 +83,67 @@ class LeagueStandingsService:
     def _headers(self) -> Dict:
         return {"X-Auth-Token": self.api_key}
 
-    async def _get(self, endpoint: str) -> Optional[Dict]:
+    @staticmethod
+    def _is_fresh(entry: Optional[Dict], ttl: float) -> bool:
+        return bool(entry) and entry["fetched_at"] is not None and time.monotonic() - entry["fetched_at"] < ttl
+
+    async def _get(self, endpoint: str, ttl: float = 0) -> Optional[Dict]:
+        """
+        캐시 우선 GET.
+        - ttl 이내: 네트워크 없이 캐시 반환
+        - 만료: ETag/Last-Modified로 조건부 요청, 304면 캐시 갱신 후 반환
+        - 동일 엔드포인트 동시 요청은 락으로 1회만 호출
+        """
         if not self.api_key:
             return None
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(url, headers=self._headers())
+
+        entry = self._responses.get(endpoint)
+        if self._is_fresh(entry, ttl):
+            self.stats["cache_hits"] += 1
+            return entry["data"]
+
+        lock = self._endpoint_locks.setdefault(endpoint, asyncio.Lock())
+        async with lock:
+            # 락 대기 중 다른 요청이 갱신했으면 재사용
+            entry = self._responses.get(endpoint)
+            if self._is_fresh(entry, ttl):
+                self.stats["cache_hits"] += 1
+                return entry["data"]
+
+            headers = self._headers()
+            if entry:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+            url = f"{self.base_url}/{endpoint}"
+            try:
+                await self._limiter.acquire()
+                self.stats["requests"] += 1
+                async with httpx.AsyncClient(timeout=15.0) as client:
+                    resp = await client.get(url, headers=headers)
+                if resp.status_code == 304 and entry:
+                    self.stats["not_modified"] += 1
+                    entry["fetched_at"] = time.monotonic()
+                    return entry["data"]
                 if resp.status_code == 429:
                     logger.warning("⚠️ football-data.org rate limited (10/min)")
-                    return None
+                    return entry["data"] if entry else None
                 if resp.status_code != 200:
                     logger.warning(f"football-data.org {endpoint}: HTTP {resp.status_code}")
-                    return None
-                return resp.json()
-        except Exception as e:
-            logger.error(f"football-data.org error: {e}")
-            return None
+                    return entry["data"] if entry else None
+                data = resp.json()
+                self._responses[endpoint] = {
+                    "data": data,
+                    "etag": resp.headers.get("etag"),
+                    "last_modified": resp.headers.get("last-modified"),
+                    "fetched_at": time.monotonic(),
+                }
+                return data
+            except Exception as e:
+                logger.error(f"football-data.org error: {e}")
+                return entry["data"] if entry else None
 
     # ─── Standings ───
     async def fetch_standings(self, league_key: str) -> List[TeamStats]:
@@ -64,7 +152,7 @@ class LeagueStandingsService:
         if not comp_code:
             return []
 
-        data = await self._get(f"competitions/{comp_code}/standings")
+        data = await self._get(f"competitions/{comp_code}/standings", ttl=STANDINGS_TTL)
         if not data:
             return []
 
@@ -123,7 +211,7 @@ class LeagueStandingsService:
         if not comp_code:
             return []
 
-        data = await self._get(f"competitions/{comp_code}/scorers?limit={limit}")
+        data = await self._get(f"competitions/{comp_code}/scorers?limit={limit}", ttl=SCORERS_TTL)
         if not data:
             return []
 
@@ -151,7 +239,7 @@ class LeagueStandingsService:
         if not comp_code:
             return []
 
-        data = await self._get(f"competitions/{comp_code}/matches?status=FINISHED&limit={limit}")
+        data = await self._get(f"competitions/{comp_code}/matches?status=FINISHED&limit={limit}", ttl=MATCHES_TTL)
         if not data:
             return []
 
@@ -175,38 +263,121 @@ class LeagueStandingsService:
 
     # ─── Batch Collection ───
     async def collect_all(self) -> Dict:
-        """전체 리그 순위 수집 (완전 무료)"""
+        """전체 리그 순위 병렬 수집 (완전 무료, 10건/분 제한 내)"""
         if not self.api_key:
             logger.info("⏭️ football-data.org skipped (no key)")
             return {}
 
+        await self._restore_persisted()
+
+        leagues = list(COMPETITION_MAP)
+        fetched = await asyncio.gather(
+            *[self.fetch_standings(k) for k in leagues], return_exceptions=True
+        )
+
         result = {}
-        for league_key in COMPETITION_MAP:
-            standings = await self.fetch_standings(league_key)
+        for league_key, standings in zip(leagues, fetched):
+            if isinstance(standings, BaseException):
+                logger.warning(f"  ⚠️ {league_key}: {standings}")
+                standings = None
             if standings:
-                result[league_key] = [s.model_dump() for s in standings]
+                self._set_league(league_key, standings)
                 logger.info(f"  📊 {league_key}: {len(standings)} teams")
+            if league_key in self._cache:
+                # 실패한 리그는 직전 캐시 유지
+                result[league_key] = [s.model_dump() for s in self._cache[league_key]]
 
-        self._cache = {k: [TeamStats(**s) for s in v] for k, v in result.items()}
         self._last_fetch = datetime.now(timezone.utc).isoformat()
-        logger.info(f"✅ football-data.org collection complete: {len(result)} leagues")
+        await self._persist()
+        logger.info(f"✅ football-data.org collection complete: {len(result)} leagues ({self.stats})")
         return result
 
+    def _set_league(self, league_key: str, standings: List[TeamStats]):
+        self._cache[league_key] = standings
+        self._team_index[league_key] = {t.team_name.lower(): t for t in standings}
+
+    # ─── Persistence (Firestore stats cache — 콜드 스타트 후에도 조건부 요청 가능) ───
+    async def _persist(self):
+        try:
+            from app.models.bets_db import save_stats_cache
+        except Exception:
+            return
+        for league_key, comp_code in COMPETITION_MAP.items():
+            entry = self._responses.get(f"competitions/{comp_code}/standings")
+            if not entry:
+                continue
+            await save_stats_cache(f"fd_standings_{league_key}", {
+                "data": entry["data"],
+                "etag": entry.get("etag"),
+                "last_modified": entry.get("last_modified"),
+            })
+
+    async def _restore_persisted(self):
+        if self._restored:
+            return
+        self._restored = True
+        try:
+            from app.models.bets_db import load_stats_cache
+        except Exception:
+            return
+        for league_key, comp_code in COMPETITION_MAP.items():
+            endpoint = f"competitions/{comp_code}/standings"
+            if endpoint in self._responses:
+                continue
+            try:
+                saved = await load_stats_cache(f"fd_standings_{league_key}")
+            except Exception:
+                saved = {}
+            if saved.get("data"):
+                # fetched_at=None → 만료 상태로 두어 조건부 요청으로 재검증
+                self._responses[endpoint] = {
+                    "data": saved["data"],
+                    "etag": saved.get("etag"),
+                    "last_modified": saved.get("last_modified"),
+                    "fetched_at": None,
+                }
+
     def get_team_rank(self, league_key: str, team_name: str) -> int:
-        """팀 순위 조회 (캐시)"""
-        standings = self._cache.get(league_key, [])
-        for team in standings:
-            if team.team_name.lower() == team_name.lower():
-                return team.rank
-        return 0
+        """팀 순위 조회 (캐시 인덱스, O(1))"""
+        team = self._team_index.get(league_key, {}).get(team_name.lower())
+        return team.rank if team else 0
 
     def get_team_form(self, league_key: str, team_name: str) -> str:
-        """팀 최근 폼 조회 (캐시)"""
-        standings = self._cache.get(league_key, [])
-        for team in standings:
-            if team.team_name.lower() == team_name.lower():
-                return team.form
-        return ""
+        """팀 최근 폼 조회 (캐시 인덱스, O(1))"""
+        team = self._team_index.get(league_key, {}).get(team_name.lower())
+        return team.form if team else ""
 
     def get_cached(self) -> Dict:
         return {k: [s.model_dump() for s in v] for k, v in self._cache.items()}
+
+    async def get_league_table(self, league_key: str) -> Dict:
+        """
+        리그 순위표 + 최근 경기 + 득점 순위.
+        캐시에서 조립하며, 만료된 항목만 조건부 요청 (요청 수와 무관하게 최대 3건).
+        """
+        standings = self._cache.get(league_key)
+        if standings is None:
+            standings = await self.fetch_standings(league_key)
+            if standings:
+                self._set_league(league_key, standings)
+
+        recent_matches, scorers = await asyncio.gather(
+            self.fetch_recent_matches(league_key, limit=10),
+            self.fetch_scorers(league_key, limit=5),
+        )
+        return {
+            "standings": [s.model_dump() for s in standings or []],
+            "recent_matches": recent_matches,
+            "top_scorers": scorers,
+        }
+
+
+_shared_service: Optional[LeagueStandingsService] = None
+
+
+def get_league_standings_service() -> LeagueStandingsService:
+    """프로세스 공용 인스턴스 (엔드포인트 간 캐시 공유)"""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = LeagueStandingsService()
+    return _shared_service
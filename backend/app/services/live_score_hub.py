@@ -0,0 +1,207 @@
+"""
+Live Score Hub — 실시간 스코어 단일 폴러 + 푸시 팬아웃
+- 인스턴스당 1개의 백그라운드 폴러가 업스트림(Live-Score-Api / API-Football)을 조회
+- 연속 스냅샷을 비교하여 경기별 변경 이벤트 생성 (goal, status, minute, match_start, match_end)
+- 구독자(SSE)별 리그 필터 + 접속 시 스냅샷 전송
+- 업스트림 호출 수는 접속자 수와 무관하게 폴링 주기에만 비례
+- 구독자/최근 조회가 없으면 폴링 중단 (API 쿼타 보호)
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def match_key(match: Dict) -> str:
+    key = match.get("match_id") or match.get("fixture_id")
+    if key is not None:
+        return str(key)
+    return f"{match.get('home', '')}_{match.get('away', '')}"
+
+
+def match_in_league(match: Dict, league: Optional[str]) -> bool:
+    """?league=soccer_epl 필터 (league_id 일치 또는 league_name 부분 일치)"""
+    if not league:
+        return True
+    from app.services.football_stats_service import LEAGUE_MAP
+    league_id = LEAGUE_MAP.get(league)
+    if league_id and match.get("league_id") == league_id:
+        return True
+    name = league.replace("soccer_", "").replace("_", " ").lower()
+    return bool(name) and name in (match.get("league_name") or "").lower()
+
+
+def _event(kind: str, match: Dict, **extra) -> Dict:
+    event = {
+        "type": kind,
+        "match_id": match_key(match),
+        "league_id": match.get("league_id"),
+        "league_name": match.get("league_name", ""),
+        "home": match.get("home", ""),
+        "away": match.get("away", ""),
+        "home_goals": match.get("home_goals", 0),
+        "away_goals": match.get("away_goals", 0),
+        "status": match.get("status", ""),
+        "elapsed": match.get("elapsed", 0),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+    event.update(extra)
+    return event
+
+
+def diff_snapshots(prev: Dict[str, Dict], curr: Dict[str, Dict]) -> List[Dict]:
+    """두 스냅샷(match_key → match)을 경기별 변경 이벤트 목록으로 변환"""
+    events = []
+    for key, m in curr.items():
+        old = prev.get(key)
+        if old is None:
+            events.append(_event("match_start", m))
+            continue
+        if (m.get("home_goals", 0), m.get("away_goals", 0)) != (old.get("home_goals", 0), old.get("away_goals", 0)):
+            side = "home" if (m.get("home_goals", 0) or 0) > (old.get("home_goals", 0) or 0) else "away"
+            events.append(_event("goal", m, side=side))
+        if m.get("status") != old.get("status"):
+            events.append(_event("status", m, previous_status=old.get("status")))
+        elif m.get("elapsed") != old.get("elapsed"):
+            events.append(_event("minute", m))
+    for key, old in prev.items():
+        if key not in curr:
+            events.append(_event("match_end", old))
+    return events
+
+
+class Subscription:
+    def __init__(self, league: Optional[str], queue_size: int):
+        self.league = league
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+
+class LiveScoreHub:
+    """
+    fetcher: 업스트림 조회 코루틴 → {"matches": [...], "source": str, ...meta}
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[], Awaitable[Dict]],
+        interval: float = 30.0,
+        idle_timeout: float = 300.0,
+        queue_size: int = 100,
+    ):
+        self._fetcher = fetcher
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.queue_size = queue_size
+
+        self._matches: Dict[str, Dict] = {}
+        self._meta: Dict = {"source": "none"}
+        self._fetched_at: Optional[float] = None
+        self._updated_at: str = ""
+        self._last_read: float = 0.0
+
+        self._lock = asyncio.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.stats_counters = {"upstream_calls": 0, "events_published": 0, "polls_skipped_idle": 0}
+
+    # ─── Snapshot ───
+    def _is_fresh(self) -> bool:
+        return self._fetched_at is not None and time.monotonic() - self._fetched_at < self.interval
+
+    async def refresh(self, force: bool = False) -> None:
+        """스냅샷 갱신 (single-flight: 동시 호출은 1회 업스트림 조회를 공유)"""
+        if not force and self._is_fresh():
+            return
+        async with self._lock:
+            if not force and self._is_fresh():
+                return
+            self.stats_counters["upstream_calls"] += 1
+            try:
+                result = await self._fetcher()
+            except Exception as e:
+                logger.warning(f"[LiveHub] upstream error: {e}")
+                self._fetched_at = time.monotonic()  # 에러 시에도 주기 유지 (폭주 방지)
+                return
+
+            matches = result.get("matches", []) or []
+            current = {match_key(m): m for m in matches}
+            first = self._fetched_at is None
+            events = [] if first else diff_snapshots(self._matches, current)
+
+            self._matches = current
+            self._meta = {k: v for k, v in result.items() if k != "matches"}
+            self._updated_at = result.get("updated_at") or datetime.now(timezone.utc).isoformat()
+            self._fetched_at = time.monotonic()
+
+        if events:
+            self._publish(events)
+
+    def snapshot(self, league: Optional[str] = None) -> Dict:
+        self._last_read = time.monotonic()
+        matches = [m for m in self._matches.values() if match_in_league(m, league)]
+        return {
+            "matches": matches,
+            "live_count": len(matches),
+            "total_live": len(self._matches),
+            "updated_at": self._updated_at,
+            **self._meta,
+        }
+
+    # ─── Fan-out ───
+    def subscribe(self, league: Optional[str] = None) -> Subscription:
+        sub = Subscription(league, self.queue_size)
+        self._subscribers.add(sub)
+        self.ensure_started()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def _publish(self, events: List[Dict]) -> None:
+        for sub in list(self._subscribers):
+            for ev in events:
+                if not match_in_league(ev, sub.league):
+                    continue
+                try:
+                    sub.queue.put_nowait(ev)
+                except asyncio.QueueFull:
+                    # 느린 구독자: 밀린 이벤트를 버리고 스냅샷으로 재동기화
+                    sub.dropped += 1
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    sub.queue.put_nowait({"type": "snapshot", **self.snapshot(sub.league)})
+                    break
+        self.stats_counters["events_published"] += len(events)
+
+    # ─── Poller ───
+    def ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"[LiveHub] poller started (interval={self.interval:.0f}s)")
+
+    def _has_audience(self) -> bool:
+        return bool(self._subscribers) or time.monotonic() - self._last_read < self.idle_timeout
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._has_audience():
+                    await self.refresh(force=True)
+                else:
+                    self.stats_counters["polls_skipped_idle"] += 1
+            except Exception as e:
+                logger.warning(f"[LiveHub] poll error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "live_matches": len(self._matches),
+            "interval_seconds": self.interval,
+            "poller_running": self._task is not None and not self._task.done(),
+            **self.stats_counters,
+        }
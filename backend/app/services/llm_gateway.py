@@ -0,0 +1,150 @@
+"""
+LLM Gateway — Gemini 호출 비동기화 + 응답 캐시
+- 동기 SDK 호출(generate_content)을 제한된 워커 풀에서 실행 → event loop 차단 방지
+- 호출별 타임아웃
+- 프롬프트 해시 + 모델명 기반 응답 캐시 (TTL + LRU 상한)
+- 동일 프롬프트 동시 요청은 1회 호출로 합침 (in-flight coalescing)
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class LLMGateway:
+    """Async front door for a blocking `generate_content` client."""
+
+    def __init__(
+        self,
+        client_provider: Callable[[], Any],
+        model_name: str,
+        max_workers: int = 4,
+        timeout: float = 60.0,
+        cache_size: int = 512,
+        cache_ttl: float = 6 * 3600,
+    ):
+        self._client_provider = client_provider
+        self.model_name = model_name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm")
+        return self._executor
+
+    def cache_key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _call(self, client: Any, prompt: str) -> str:
+        self.calls += 1
+        response = client.generate_content(prompt)
+        return (response.text or "").strip() if response else ""
+
+    async def generate(self, prompt: str, cache: bool = True, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Run the prompt on the worker pool and return the stripped text.
+        Returns None when no client is configured. SDK errors and timeouts propagate
+        so callers keep their existing rule-based fallbacks.
+        `cache=False` bypasses both the response cache and coalescing (매번 다른 문구가 필요한 SNS 등).
+        """
+        client = self._client_provider()
+        if client is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        call_timeout = timeout or self.timeout
+
+        if not cache:
+            return await self._run(loop, client, prompt, call_timeout)
+
+        key = self.cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            text = await self._run(loop, client, prompt, call_timeout)
+            if text:
+                self._cache.set(key, text)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 "never retrieved" 경고 방지
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, client: Any, prompt: str, timeout: float) -> str:
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), self._call, client, prompt),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"LLM call timed out after {timeout:.0f}s ({self.model_name})")
+            raise
+
+    def generate_blocking(self, prompt: str, cache: bool = True, timeout: Optional[float] = None) -> Optional[str]:
+        """Synchronous variant for scripts (shorts pipeline) that run outside the event loop."""
+        client = self._client_provider()
+        if client is None:
+            return None
+
+        key = self.cache_key(prompt)
+        if cache:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        future = self._get_executor().submit(self._call, client, prompt)
+        text = future.result(timeout=timeout or self.timeout)
+        if text and cache:
+            self._cache.set(key, text)
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "inflight": len(self._inflight),
+            "cache": self._cache.stats(),
+        }
+
+
+def gateway_from_env(client_provider: Callable[[], Any], model_name: str) -> LLMGateway:
+    """환경변수(LLM_MAX_WORKERS, LLM_TIMEOUT_SECONDS, LLM_CACHE_SIZE, LLM_CACHE_TTL)로 게이트웨이 생성"""
+    return LLMGateway(
+        client_provider=client_provider,
+        model_name=model_name,
+        max_workers=int(os.getenv("LLM_MAX_WORKERS", "4")),
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+        cache_size=int(os.getenv("LLM_CACHE_SIZE", "512")),
+        cache_ttl=float(os.getenv("LLM_CACHE_TTL", str(6 * 3600))),
+    )
@@ -1,9 +1,9 @@
 import os
-import lightgbm as lgb
-import pandas as pd
 import numpy as np
 from typing import Dict, Any, List
 import logging
+from app.core.model_store import model_registry
+from app.core.calibration import probability_calibrator
 from app.services.ml.soccer_features import calculate_soccer_features
 from app.services.ml.baseball_features import calculate_baseball_features
 
@@ -11,32 +11,61 @@ logger = logging.getLogger(__name__)
 
 MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "ml_models")
 
+HEURISTIC_INPUTS = (
+    "home_xG_advantage", "away_xG_advantage", "form_diff", "ppda_diff", "deep_diff",
+    "xg_eff_diff", "possession_diff", "fatigue_diff", "injury_impact_diff",
+)
+
+
+def heuristic_probs_np(home_xG_advantage, away_xG_advantage, form_diff, ppda_diff, deep_diff,
+                       xg_eff_diff, possession_diff, fatigue_diff, injury_impact_diff) -> np.ndarray:
+    """
+    휴리스틱 확률 엔진의 벡터화 버전 — 입력은 같은 길이의 배열, 출력은 (n, 3) [HOME, DRAW, AWAY] 확률.
+    MLInferenceService 단건 예측과 오프라인 백테스터가 같은 수식을 공유.
+    """
+    # 1. xG 주도권 (가장 높은 가중치)
+    h_score = home_xG_advantage * 1.8
+    a_score = away_xG_advantage * 1.8
+
+    # 2~5. 폼/압박(PPDA)/위험지역 진입(Deep)/결정력 — 우세한 쪽에 가산
+    for diff, weight in ((form_diff, 0.8), (ppda_diff, 0.4), (deep_diff / 10.0, 0.5), (xg_eff_diff, 0.6)):
+        h_score = h_score + np.where(diff > 0, diff * weight, 0.0)
+        a_score = a_score + np.where(diff > 0, 0.0, np.abs(diff) * weight)
+
+    # 6. 점유율/피로도/부상
+    h_score = h_score + possession_diff * 0.01 - fatigue_diff * 0.3 - injury_impact_diff * 0.4
+
+    # Softmax 변환 — 무승부 베이스라인 (점수가 비슷할수록 무승부 확률 상승)
+    exp_h = np.exp(h_score)
+    exp_a = np.exp(a_score)
+    exp_d = np.exp(np.maximum(h_score, a_score) * 0.4)
+    total = exp_h + exp_a + exp_d
+    return np.stack([exp_h / total, exp_d / total, exp_a / total], axis=1)
+
+
 class MLInferenceService:
     def __init__(self):
-        self.soccer_model = None
-        self.baseball_model = None
         self._load_models()
         
     def _load_models(self):
         """
         Cloud Run 컨테이너 메모리에 모델을 로드합니다.
+        model_registry 공유 인스턴스 — 레지스트리가 비어 있으면 MODELS_DIR/{name}_lgb.txt.
         """
-        soccer_model_path = os.path.join(MODELS_DIR, "soccer_model_lgb.txt")
-        baseball_model_path = os.path.join(MODELS_DIR, "baseball_model_lgb.txt")
-        
-        if os.path.exists(soccer_model_path):
-            try:
-                self.soccer_model = lgb.Booster(model_file=soccer_model_path)
-                logger.info(f"Loaded Soccer Model from {soccer_model_path}")
-            except Exception as e:
-                logger.error(f"Failed to load soccer model: {e}")
-            
-        if os.path.exists(baseball_model_path):
-            try:
-                self.baseball_model = lgb.Booster(model_file=baseball_model_path)
-                logger.info(f"Loaded Baseball Model from {baseball_model_path}")
-            except Exception as e:
-                logger.error(f"Failed to load baseball model: {e}")
+        for name in ("soccer_model", "baseball_model"):
+            handle = model_registry.current(name)
+            if handle is not None:
+                logger.info(f"Loaded {name} {handle.version} ({handle.load_ms}ms)")
+
+    @property
+    def soccer_model(self):
+        handle = model_registry.current("soccer_model")
+        return handle.model if handle else None
+
+    @property
+    def baseball_model(self):
+        handle = model_registry.current("baseball_model")
+        return handle.model if handle else None
             
     def _format_prediction(self, match: Dict[str, Any], probs: Dict[str, float]) -> Dict[str, Any]:
         h_prob = probs.get("HOME", 33.3)
@@ -81,59 +110,36 @@ class MLInferenceService:
 
     def _calculate_heuristic_probs(self, features: Dict[str, float]) -> Dict[str, float]:
         """고차원 지표(xG, PPDA, Deep) 기반의 정밀 확률 계산 엔진"""
-        h_score = 0.0
-        a_score = 0.0
-        
-        # 1. xG 주도권 (가장 높은 가중치)
-        h_score += features.get("home_xG_advantage", 0) * 1.8
-        a_score += features.get("away_xG_advantage", 0) * 1.8
-        
-        # 2. 폼 및 모멘텀
-        f_diff = features.get("form_diff", 0)
-        if f_diff > 0: h_score += f_diff * 0.8
-        else: a_score += abs(f_diff) * 0.8
-        
-        # 3. 압박 강도 (PPDA)
-        p_diff = features.get("ppda_diff", 0)
-        if p_diff > 0: h_score += p_diff * 0.4
-        else: a_score += abs(p_diff) * 0.4
-        
-        # 4. 위험 지역 진입 (Deep Completions)
-        d_diff = features.get("deep_diff", 0) / 10.0
-        if d_diff > 0: h_score += d_diff * 0.5
-        else: a_score += abs(d_diff) * 0.5
-        
-        # 5. 결정력 효율 (xG Overperformance)
-        e_diff = features.get("xg_eff_diff", 0)
-        if e_diff > 0: h_score += e_diff * 0.6
-        else: a_score += abs(e_diff) * 0.6
-        
-        # 6. 점유율/피로도/부상
-        h_score += features.get("possession_diff", 0) * 0.01
-        h_score -= features.get("fatigue_diff", 0) * 0.3
-        h_score -= features.get("injury_impact_diff", 0) * 0.4
-        
-        # Softmax 변환
-        exp_h = np.exp(h_score)
-        exp_a = np.exp(a_score)
-        # 무승부 베이스라인 (점수가 비슷할수록 무승부 확률 상승)
-        exp_d = np.exp(max(h_score, a_score) * 0.4) 
-        
-        total = exp_h + exp_a + exp_d
+        probs = heuristic_probs_np(
+            **{name: np.array([features.get(name, 0)], dtype=np.float64) for name in HEURISTIC_INPUTS}
+        )[0]
         return {
-            "HOME": round((exp_h / total) * 100, 1),
-            "DRAW": round((exp_d / total) * 100, 1),
-            "AWAY": round((exp_a / total) * 100, 1)
+            "HOME": round(probs[0] * 100, 1),
+            "DRAW": round(probs[1] * 100, 1),
+            "AWAY": round(probs[2] * 100, 1)
         }
 
     def _heuristic_soccer_predict(self, matches: List[Dict[str, Any]], stats_db: Dict[str, Any]) -> List[Dict[str, Any]]:
-        preds = []
+        # 특성 → 확률 행렬 1회 계산 → 리그별 보정 1회 (경기마다 따로 계산하지 않음)
+        featured = []
         for match in matches:
             try:
-                feats = calculate_soccer_features(match, stats_db)
-                probs = self._calculate_heuristic_probs(feats)
-                
+                featured.append((match, calculate_soccer_features(match, stats_db)))
+            except Exception as e:
+                logger.warning(f"Heuristic failed for {match.get('team_home')}: {e}")
+        if not featured:
+            return []
+        raw = heuristic_probs_np(
+            **{name: np.array([f.get(name, 0) for _, f in featured], dtype=np.float64) for name in HEURISTIC_INPUTS}
+        ) * 100
+        calibrated = probability_calibrator.apply("ai", [m.get("league", "") for m, _ in featured], raw, percent=True)
+
+        preds = []
+        for (match, _), raw_row, row in zip(featured, raw, calibrated):
+            try:
+                probs = {"HOME": round(float(row[0]), 1), "DRAW": round(float(row[1]), 1), "AWAY": round(float(row[2]), 1)}
                 prediction = self._format_prediction(match, probs)
+                prediction["raw_probs"] = [round(float(p), 2) for p in raw_row]
                 
                 # Align factors list with the 7-Factor Sports Data Scoring Engine
                 from app.services.factor_scorer import calculate_factor_scores
@@ -209,4 +215,18 @@ class MLInferenceService:
             preds.append(self._format_prediction(match, probs))
         return preds
 
-ml_inference_service = MLInferenceService()
+# Lazy singleton — 모델 로드는 첫 사용 시 (import 시점 아님, ml_predictor 와 동일 패턴)
+_ml_inference_instance = None
+
+def _get_ml_inference_service():
+    global _ml_inference_instance
+    if _ml_inference_instance is None:
+        _ml_inference_instance = MLInferenceService()
+    return _ml_inference_instance
+
+class _LazyMLInferenceService:
+    """Proxy that delays MLInferenceService instantiation until first attribute access."""
+    def __getattr__(self, name):
+        return getattr(_get_ml_inference_service(), name)
+
+ml_inference_service = _LazyMLInferenceService()
@@ -6,13 +6,39 @@ Firestore에 저장된 FCM 토큰으로 Push 알림을 전송합니다.
 1. 밸류벳 발견 시 → 구독 사용자에게 즉시 알림
 2. 오늘의 추천 Pick 발행 시 → 전체 사용자
 3. 적중 결과 알림 → 해당 사용자
+
+전체 발송(send_to_all) 파이프라인:
+- 토큰: fcm_tokens 1회 스트림 (token 필드만 select)
+- 알림 설정: notification_prefs 를 get_all 로 묶어서 조회 (사용자당 1회 읽기 → 300명당 1회 왕복)
+- 멀티캐스트: 500개씩, 동시 FCM_FANOUT_CONCURRENCY 배치까지 병렬 전송
+- 배치 응답의 토큰별 결과로 만료 토큰을 모아 WriteBatch 로 일괄 비활성화
+- 발송 리포트에 단계별 소요 시간과 처리량 포함
 """
+import asyncio
 import logging
-from typing import Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
 from app.db.firestore import get_firestore_db, _init_firebase
 
 logger = logging.getLogger(__name__)
 
+MULTICAST_SIZE = 500          # FCM 멀티캐스트 최대 토큰 수
+PREF_READ_CHUNK = 300         # get_all 1회당 문서 수
+WRITE_BATCH_SIZE = 450        # Firestore WriteBatch 한도(500) 이하
+FANOUT_CONCURRENCY = int(os.getenv("FCM_FANOUT_CONCURRENCY", "16"))
+
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run_blocking(func, *args):
+    """팬아웃 전용 스레드 풀에서 실행 — 기본 to_thread 풀(CPU+4)에 병렬도가 묶이지 않도록."""
+    global _fanout_executor
+    if _fanout_executor is None:
+        _fanout_executor = ThreadPoolExecutor(max_workers=FANOUT_CONCURRENCY, thread_name_prefix="fcm-fanout")
+    return asyncio.get_running_loop().run_in_executor(_fanout_executor, func, *args)
+
 
 class FCMNotificationService:
     """FCM을 통한 Push 알림 발송"""
@@ -56,7 +82,7 @@ class FCMNotificationService:
         """특정 사용자의 활성 FCM 토큰 조회"""
         try:
             db = get_firestore_db()
-            doc = db.collection("fcm_tokens").document(user_id).get()
+            doc = await asyncio.to_thread(db.collection("fcm_tokens").document(user_id).get)
             if doc.exists:
                 data = doc.to_dict()
                 if data.get("active", False):
@@ -69,18 +95,56 @@ class FCMNotificationService:
     async def get_all_active_tokens(self) -> list[dict]:
         """모든 활성 사용자의 FCM 토큰 조회"""
         try:
-            db = get_firestore_db()
-            docs = db.collection("fcm_tokens").where("active", "==", True).stream()
-            return [{"user_id": d.id, "token": d.to_dict()["token"]} for d in docs]
+            return await asyncio.to_thread(self._stream_active_tokens)
         except Exception as e:
             logger.error(f"전체 FCM 토큰 조회 실패: {e}")
             return []
 
+    def _stream_active_tokens(self) -> list[dict]:
+        db = get_firestore_db()
+        docs = db.collection("fcm_tokens").where("active", "==", True).select(["token"]).stream()
+        entries = []
+        for d in docs:
+            token = (d.to_dict() or {}).get("token")
+            if token:
+                entries.append({"user_id": d.id, "token": token})
+        return entries
+
+    async def load_disabled_users(self, user_ids: List[str], pref_key: str) -> Set[str]:
+        """pref_key 알림을 끈 사용자 집합 — notification_prefs 를 get_all 묶음으로 병렬 조회.
+        조회 실패한 묶음은 기본 허용 (check_user_preference 와 동일)."""
+        if not user_ids or not pref_key:
+            return set()
+        db = get_firestore_db()
+        semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+        def read_chunk(chunk):
+            refs = [db.collection("notification_prefs").document(uid) for uid in chunk]
+            disabled = set()
+            for snap in db.get_all(refs, field_paths=[pref_key]):
+                if snap.exists and not (snap.to_dict() or {}).get(pref_key, True):
+                    disabled.add(snap.id)
+            return disabled
+
+        async def run(chunk):
+            async with semaphore:
+                try:
+                    return await _run_blocking(read_chunk, chunk)
+                except Exception as e:
+                    logger.warning(f"알림 설정 일괄 조회 실패 ({len(chunk)}명, 기본 허용): {e}")
+                    return set()
+
+        chunks = [user_ids[i:i + PREF_READ_CHUNK] for i in range(0, len(user_ids), PREF_READ_CHUNK)]
+        disabled: Set[str] = set()
+        for part in await asyncio.gather(*[run(c) for c in chunks]):
+            disabled |= part
+        return disabled
+
     async def check_user_preference(self, user_id: str, pref_key: str) -> bool:
         """사용자의 알림 설정 확인"""
         try:
             db = get_firestore_db()
-            doc = db.collection("notification_prefs").document(user_id).get()
+            doc = await asyncio.to_thread(db.collection("notification_prefs").document(user_id).get)
             if doc.exists:
                 return doc.to_dict().get(pref_key, True)  # 기본값: True
             return True  # 설정 없으면 기본 허용
@@ -101,11 +165,9 @@ class FCMNotificationService:
 
         # 1. 사용자 알림 설정 확인
         pref_key = notif_config.get("pref_key", "")
-        if pref_key:
-            allowed = await self.check_user_preference(user_id, pref_key)
-            if not allowed:
-                logger.info(f"알림 비활성화됨 (user={user_id}, type={notification_type})")
-                return False
+        if pref_key and not await self.check_user_preference(user_id, pref_key):
+            logger.info(f"알림 비활성화됨 (user={user_id}, type={notification_type})")
+            return False
 
         # 2. FCM 토큰 조회
         tokens = await self.get_user_tokens(user_id)
@@ -163,66 +225,103 @@ class FCMNotificationService:
         data: Optional[dict] = None,
         lang: str = "ko",
     ) -> dict:
-        """모든 활성 사용자에게 Push 알림 전송"""
+        """모든 활성 사용자에게 Push 알림 전송 (일괄 설정 조회 → 병렬 멀티캐스트 → 만료 토큰 일괄 정리)"""
+        started = time.perf_counter()
         messaging = self._get_messaging()
         notif_config = self.NOTIFICATION_TYPES.get(notification_type, {})
         title_key = f"title_{lang}" if f"title_{lang}" in notif_config else "title_ko"
         title = notif_config.get(title_key, "Scorenix")
+        report = {"sent": 0, "failed": 0, "skipped": 0, "deactivated": 0, "tokens": 0, "batches": 0}
 
         # 전체 활성 토큰 조회
         token_entries = await self.get_all_active_tokens()
+        report["tokens"] = len(token_entries)
+        t_tokens = time.perf_counter()
         if not token_entries:
-            return {"sent": 0, "failed": 0, "skipped": 0}
+            return self._finish_report(report, started, t_tokens, t_tokens)
 
-        # 알림 설정 확인 후 필터링
+        # 알림 설정 일괄 조회 후 필터링
         pref_key = notif_config.get("pref_key", "")
-        filtered = []
-        skipped = 0
-        for entry in token_entries:
-            if pref_key:
-                allowed = await self.check_user_preference(entry["user_id"], pref_key)
-                if not allowed:
-                    skipped += 1
-                    continue
-            filtered.append(entry)
-
+        disabled = await self.load_disabled_users([e["user_id"] for e in token_entries], pref_key)
+        filtered = [e for e in token_entries if e["user_id"] not in disabled]
+        report["skipped"] = len(token_entries) - len(filtered)
+        t_prefs = time.perf_counter()
         if not filtered:
-            return {"sent": 0, "failed": 0, "skipped": skipped}
+            return self._finish_report(report, started, t_tokens, t_prefs)
 
-        # 멀티캐스트 전송 (최대 500개씩)
-        sent = 0
-        failed = 0
-        for i in range(0, len(filtered), 500):
-            batch_tokens = [e["token"] for e in filtered[i:i+500]]
-            try:
-                message = messaging.MulticastMessage(
-                    notification=messaging.Notification(
-                        title=title,
-                        body=body,
-                    ),
-                    data={
-                        "type": notification_type,
-                        "url": data.get("url", "/") if data else "/",
-                        **(data or {}),
-                    },
-                    webpush=messaging.WebpushConfig(
-                        notification=messaging.WebpushNotification(
-                            icon="/icons/icon-192.png",
-                            badge="/icons/badge-72.png",
-                            tag=f"scorenix-{notification_type}",
-                        ),
+        # 멀티캐스트 전송 (최대 500개씩, 동시 FANOUT_CONCURRENCY 배치)
+        batches = [filtered[i:i + MULTICAST_SIZE] for i in range(0, len(filtered), MULTICAST_SIZE)]
+        report["batches"] = len(batches)
+        semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+        invalid_users: List[str] = []
+
+        async def send_batch(entries):
+            message = messaging.MulticastMessage(
+                notification=messaging.Notification(
+                    title=title,
+                    body=body,
+                ),
+                data={
+                    "type": notification_type,
+                    "url": data.get("url", "/") if data else "/",
+                    **(data or {}),
+                },
+                webpush=messaging.WebpushConfig(
+                    notification=messaging.WebpushNotification(
+                        icon="/icons/icon-192.png",
+                        badge="/icons/badge-72.png",
+                        tag=f"scorenix-{notification_type}",
                     ),
-                    tokens=batch_tokens,
-                )
-                response = messaging.send_each_for_multicast(message)
-                sent += response.success_count
-                failed += response.failure_count
-                logger.info(f"📤 FCM 멀티캐스트: {response.success_count} 성공, {response.failure_count} 실패")
-            except Exception as e:
-                logger.error(f"❌ FCM 멀티캐스트 실패: {e}")
-                failed += len(batch_tokens)
+                ),
+                tokens=[e["token"] for e in entries],
+            )
+            async with semaphore:
+                try:
+                    response = await _run_blocking(messaging.send_each_for_multicast, message)
+                except Exception as e:
+                    logger.error(f"❌ FCM 멀티캐스트 실패: {e}")
+                    report["failed"] += len(entries)
+                    return
+            report["sent"] += response.success_count
+            report["failed"] += response.failure_count
+            for entry, result in zip(entries, response.responses):
+                if not result.success and self._is_invalid_token_error(messaging, result.exception):
+                    invalid_users.append(entry["user_id"])
 
-        return {"sent": sent, "failed": failed, "skipped": skipped}
+        await asyncio.gather(*[send_batch(b) for b in batches])
+        t_send = time.perf_counter()
+
+        # 만료/무효 토큰 일괄 비활성화
+        if invalid_users:
+            report["deactivated"] = await self._deactivate_tokens(invalid_users)
+
+        result = self._finish_report(report, started, t_tokens, t_prefs, t_send)
+        logger.info(
+            f"📤 FCM 전체 발송: {result['sent']} 성공, {result['failed']} 실패, {result['skipped']} 설정 off, "
+            f"{result['deactivated']} 토큰 정리 — {result['elapsed_ms']}ms ({result['throughput_per_sec']}/s)"
+        )
+        return result
+
+    @staticmethod
+    def _is_invalid_token_error(messaging, exc) -> bool:
+        """토큰 자체가 무효인 오류만 (페이로드 오류 등으로 전체 토큰이 비활성화되지 않도록)"""
+        return isinstance(exc, (messaging.UnregisteredError, messaging.SenderIdMismatchError))
+
+    @staticmethod
+    def _finish_report(report: dict, started: float, t_tokens: float, t_prefs: float,
+                       t_send: Optional[float] = None) -> dict:
+        now = time.perf_counter()
+        elapsed = now - started
+        report["timings_ms"] = {
+            "tokens": round((t_tokens - started) * 1000, 1),
+            "preferences": round((t_prefs - t_tokens) * 1000, 1),
+            "send": round(((t_send or t_prefs) - t_prefs) * 1000, 1),
+            "deactivate": round((now - (t_send or t_prefs)) * 1000, 1),
+        }
+        report["elapsed_ms"] = round(elapsed * 1000, 1)
+        delivered = report["sent"] + report["failed"]
+        report["throughput_per_sec"] = round(delivered / elapsed, 1) if elapsed > 0 and delivered else 0.0
+        return report
 
     async def send_value_bet_alert(
         self,
@@ -275,6 +374,27 @@ class FCMNotificationService:
         except Exception as e:
             logger.error(f"토큰 비활성화 실패: {e}")
 
+    async def _deactivate_tokens(self, user_ids: List[str]) -> int:
+        """만료된 FCM 토큰 일괄 비활성화 (WriteBatch). 반환: 반영된 문서 수"""
+        def commit():
+            db = get_firestore_db()
+            done = 0
+            unique = list(dict.fromkeys(user_ids))
+            for i in range(0, len(unique), WRITE_BATCH_SIZE):
+                batch = db.batch()
+                chunk = unique[i:i + WRITE_BATCH_SIZE]
+                for uid in chunk:
+                    batch.update(db.collection("fcm_tokens").document(uid), {"active": False})
+                batch.commit()
+                done += len(chunk)
+            return done
+
+        try:
+            return await asyncio.to_thread(commit)
+        except Exception as e:
+            logger.error(f"토큰 일괄 비활성화 실패 ({len(user_ids)}건): {e}")
+            return 0
+
 
 # 싱글턴 인스턴스
 notification_service = FCMNotificationService()
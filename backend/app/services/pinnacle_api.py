@@ -93,6 +93,8 @@ class PinnacleService(BaseOddsProvider):
         사용자 요청용 — Firestore/메모리 캐시에서만 읽기.
         절대로 외부 API를 호출하지 않습니다.
         토큰 소모: 0
+        메모리 캐시는 _cache_duration 동안만 사용하고, 이후 Firestore 스냅샷을 다시 읽음
+        (배당 갱신은 lease 를 쥔 인스턴스만 하므로 다른 인스턴스는 공유 스냅샷으로 따라감).
         """
         if not self.api_key or self.api_key.strip() == "":
             logger.info("No API Key configured. Using Mock Data.")
@@ -100,8 +102,8 @@ class PinnacleService(BaseOddsProvider):
 
         cache_key = "odds_snapshot"
 
-        # 1. Try in-memory cache first (fastest)
-        if self._cache and len(self._cache) > 0:
+        # 1. Try in-memory cache first (fastest) — 만료 전까지만
+        if self._cache and time.time() - self._last_fetch_time < self._cache_duration:
             logger.info(f"Serving from in-memory cache ({len(self._cache)} items)")
             return self._cache
 
@@ -140,7 +142,12 @@ class PinnacleService(BaseOddsProvider):
         except Exception as e:
             logger.warning(f"Firestore cache unavailable: {e}")
 
-        # 3. No cache available — return mock data
+        # 3. Firestore 를 읽지 못하면 만료된 메모리 캐시라도 제공
+        if self._cache:
+            logger.warning(f"Serving stale in-memory cache ({len(self._cache)} items)")
+            return self._cache
+
+        # 4. No cache available — return mock data
         logger.warning("No cached odds available. Returning mock data.")
         return self._get_mock_data()
 
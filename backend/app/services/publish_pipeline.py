@@ -0,0 +1,444 @@
+"""
+Publish Pipeline — SNS(Buffer) / Blogger / WordPress 발행 공통 파이프라인.
+
+기존 발행 작업은 실행할 때마다 현재 예측으로 Gemini 콘텐츠를 다시 만들고(LLM 호출),
+채널마다 순차로 게시했으며, 중간에 죽은 뒤 재실행하면 같은 글이 다시 올라갔음.
+
+- 입력 지문(fingerprint): 콘텐츠 종류 + 프롬프트 템플릿 + TEMPLATE_VERSION + 정규화한 입력(예측 세트 등)
+- 콘텐츠 캐시 (publish_content/{fingerprint}): 같은 지문이면 저장된 문구 재사용 → 재실행 시 LLM 호출 0회
+- 발행 원장 (publish_ledger/{platform-channel-content}): 채널별 pending → published / failed
+    · published  → 동일 게시물이므로 건너뜀
+    · pending    → 다른 실행이 발행 중이거나 게시 직후 죽은 경우 (결과 불명) → 중복 방지를 위해 건너뜀
+                   PENDING_TTL 이 지난 pending 은 죽은 실행으로 보고 재시도 (영구 누락 방지)
+    · failed     → 재시도
+    원장 claim 자체가 실패하면 발행하지 않음 (원장 없이 올리면 중복 방지가 깨짐) → failed 로 보고, 다음 실행에서 재시도
+- 채널 동시 발행 + 플랫폼별 제한 (동시 요청 수, 요청 간 최소 간격)
+- 콘텐츠 생성(LLM)도 "gemini" 제한 공유 → 경기별 동시 처리 경로에서 Gemini 동시 호출 폭주 방지
+- 단계별 소요시간 (content / publish / total) 기록 → 응답·로그·recent_runs
+
+백엔드: Firestore (운영) / SQLite (로컬·테스트). PUBLISH_STORE_BACKEND=firestore|sqlite 로 강제 가능.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_COLLECTION = "publish_content"
+LEDGER_COLLECTION = "publish_ledger"
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+_SQLITE_PATH = os.path.join(_DATA_DIR, "publish.db")
+
+# 후처리/파싱 로직이 바뀌면 올림 (프롬프트 문구 변경은 template 해시로 자동 반영)
+TEMPLATE_VERSION = "1"
+
+# platform → (동시 요청 수, 요청 시작 간 최소 간격 초)
+PLATFORM_LIMITS: Dict[str, Tuple[int, float]] = {
+    "buffer": (4, 0.5),
+    "blogger": (1, 1.0),
+    "wordpress": (2, 0.5),
+    "gemini": (2, 1.0),       # 콘텐츠 생성 (캐시 미스 시 LLM 호출) — 모든 발행 경로 공용
+}
+DEFAULT_LIMIT = (2, 0.5)
+GENERATION_LIMIT = "gemini"
+# 이 시간이 지나도 finish 되지 않은 pending 은 중단된 실행으로 보고 재시도
+PENDING_TTL = float(os.getenv("PUBLISH_PENDING_TTL", str(30 * 60)))
+
+# claim() 결과
+CLAIMED = "claimed"
+PUBLISHED = "published"
+PENDING = "pending"
+
+RECENT_RUNS = 50
+# 원장에 남기는 발행 결과 필드 (WordPress 응답처럼 본문 전체가 오는 경우 대비)
+RESULT_KEYS = ("success", "id", "post_id", "url", "link", "status", "channel_id", "error")
+
+
+def fingerprint(kind: str, inputs: Any, template: str = "") -> str:
+    """콘텐츠 종류 + 템플릿 + 입력의 안정적인 해시 (dict 키 순서 무관)."""
+    payload = json.dumps(
+        {"kind": kind, "version": TEMPLATE_VERSION, "template": hashlib.sha256(template.encode()).hexdigest(),
+         "inputs": inputs},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def prediction_inputs(predictions: List[Dict]) -> List[Dict]:
+    """발행 문구에 영향을 주는 예측 필드만 정규화 (확률은 소수 1자리 — 배당 미세 변동으로 재생성 방지)."""
+    def num(value):
+        try:
+            return round(float(value or 0), 1)
+        except (TypeError, ValueError):
+            return 0.0
+
+    return [
+        {
+            "match_id": p.get("match_id", ""),
+            "home": p.get("team_home_ko") or p.get("team_home", ""),
+            "away": p.get("team_away_ko") or p.get("team_away", ""),
+            "league": p.get("league", ""),
+            "match_time": p.get("match_time") or "",
+            "recommendation": p.get("recommendation", ""),
+            "confidence": num(p.get("confidence")),
+            "probs": [num(p.get("home_win_prob")), num(p.get("draw_prob")), num(p.get("away_win_prob"))],
+            "factors": [f.get("name", "") for f in (p.get("factors") or [])[:3]],
+        }
+        for p in predictions
+    ]
+
+
+def ledger_key(platform: str, channel: str, content_fp: str) -> str:
+    """원장 문서 ID (채널 값에 '/' 등이 있어도 안전하도록 채널은 해시)."""
+    return f"{platform}-{hashlib.sha1(str(channel).encode()).hexdigest()[:12]}-{content_fp}"
+
+
+# ─────────────────────────────────────────────
+# STORES (동기 — 파이프라인이 to_thread 로 호출)
+# ─────────────────────────────────────────────
+
+class SQLitePublishStore:
+    """로컬/테스트용 콘텐츠 캐시 + 발행 원장."""
+
+    def __init__(self, path: str = _SQLITE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS content (
+                    fingerprint TEXT PRIMARY KEY, kind TEXT, payload TEXT, created_at REAL);
+                CREATE TABLE IF NOT EXISTS ledger (
+                    key TEXT PRIMARY KEY, platform TEXT, channel TEXT, content_fp TEXT, status TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0, claimed_at REAL, finished_at REAL,
+                    latency_ms REAL, result TEXT);
+                CREATE INDEX IF NOT EXISTS ledger_claimed ON ledger(claimed_at);
+            """)
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return out
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_content(self, fp: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM content WHERE fingerprint=?", (fp,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_content(self, fp: str, kind: str, payload: Any, now: float) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO content(fingerprint, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                               (fp, kind, json.dumps(payload, ensure_ascii=False, default=str), now))
+
+    def claim(self, key: str, platform: str, channel: str, content_fp: str, now: float,
+              pending_ttl: float = PENDING_TTL) -> Tuple[str, Optional[Dict]]:
+        def fn(c):
+            row = c.execute("SELECT status, result, claimed_at FROM ledger WHERE key=?", (key,)).fetchone()
+            if row is None:
+                c.execute("INSERT INTO ledger(key, platform, channel, content_fp, status, attempts, claimed_at) "
+                          "VALUES (?, ?, ?, ?, 'pending', 1, ?)", (key, platform, channel, content_fp, now))
+                return CLAIMED, None
+            status, result, claimed_at = row
+            if status == PUBLISHED or (status == PENDING and now - (claimed_at or 0) < pending_ttl):
+                return status, json.loads(result) if result else None
+            c.execute("UPDATE ledger SET status='pending', attempts=attempts+1, claimed_at=? WHERE key=?", (now, key))
+            return CLAIMED, None
+        return self._tx(fn)
+
+    def finish(self, key: str, status: str, result: Any, latency_ms: float, now: float) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE ledger SET status=?, result=?, latency_ms=?, finished_at=? WHERE key=?",
+                               (status, json.dumps(result, ensure_ascii=False, default=str), latency_ms, now, key))
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        cols = ("platform", "channel", "content_fp", "status", "attempts", "claimed_at", "finished_at", "latency_ms")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(cols)} FROM ledger ORDER BY claimed_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(zip(cols, r)) for r in rows]
+
+
+class FirestorePublishStore:
+    """운영용 — 원장 claim 은 Firestore 트랜잭션으로 compare-and-set."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_content(self, fp: str) -> Optional[Any]:
+        snap = self.db.collection(CONTENT_COLLECTION).document(fp).get()
+        return (snap.to_dict() or {}).get("payload") if snap.exists else None
+
+    def put_content(self, fp: str, kind: str, payload: Any, now: float) -> None:
+        self.db.collection(CONTENT_COLLECTION).document(fp).set({"kind": kind, "payload": payload, "created_at": now})
+
+    def claim(self, key: str, platform: str, channel: str, content_fp: str, now: float,
+              pending_ttl: float = PENDING_TTL) -> Tuple[str, Optional[Dict]]:
+        from google.cloud import firestore
+        ref = self.db.collection(LEDGER_COLLECTION).document(key)
+
+        @firestore.transactional
+        def fn(transaction):
+            snap = ref.get(transaction=transaction)
+            data = snap.to_dict() if snap.exists else None
+            status = (data or {}).get("status")
+            if status == PUBLISHED or (status == PENDING and now - (data.get("claimed_at") or 0) < pending_ttl):
+                return status, data.get("result")
+            transaction.set(ref, {
+                "platform": platform, "channel": channel, "content_fp": content_fp, "status": PENDING,
+                "attempts": int((data or {}).get("attempts", 0)) + 1, "claimed_at": now,
+            }, merge=True)
+            return CLAIMED, None
+
+        return fn(self.db.transaction())
+
+    def finish(self, key: str, status: str, result: Any, latency_ms: float, now: float) -> None:
+        self.db.collection(LEDGER_COLLECTION).document(key).set(
+            {"status": status, "result": result, "latency_ms": latency_ms, "finished_at": now}, merge=True)
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        from google.cloud import firestore
+        docs = (self.db.collection(LEDGER_COLLECTION)
+                .order_by("claimed_at", direction=firestore.Query.DESCENDING)
+                .limit(limit).stream())
+        return [{k: v for k, v in d.to_dict().items() if k != "result"} for d in docs]
+
+
+def get_publish_store():
+    """Firestore 사용 가능하면 Firestore, 아니면 로컬 SQLite."""
+    backend = os.getenv("PUBLISH_STORE_BACKEND", "").lower()
+    if backend != "sqlite":
+        try:
+            from app.db.firestore import get_firestore_db
+            db = get_firestore_db()
+            if db is not None:
+                return FirestorePublishStore(db)
+        except Exception as e:
+            if backend == "firestore":
+                raise
+            logger.warning(f"[Publish] Firestore unavailable, using SQLite store: {e}")
+    return SQLitePublishStore()
+
+
+# ─────────────────────────────────────────────
+# RATE LIMIT
+# ─────────────────────────────────────────────
+
+class PlatformLimiter:
+    """동시 요청 수 + 요청 시작 간 최소 간격. 이벤트 루프가 바뀌면 동기화 객체 재생성."""
+
+    def __init__(self, concurrency: int, min_interval: float):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._loop = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._next_at = 0.0
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._lock = asyncio.Lock()
+            self._next_at = 0.0
+        return loop
+
+    async def __aenter__(self):
+        loop = self._bind()
+        await self._slots.acquire()
+        async with self._lock:
+            wait = self._next_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_at = loop.time() + self.min_interval
+        return self
+
+    async def __aexit__(self, *exc):
+        self._slots.release()
+        return False
+
+
+# ─────────────────────────────────────────────
+# PIPELINE
+# ─────────────────────────────────────────────
+
+@dataclass
+class PublishTarget:
+    platform: str                                   # "buffer" | "blogger" | "wordpress"
+    channel: str                                    # Buffer 채널 ID / 블로그 ID / 사이트 URL
+    send: Callable[[], Awaitable[Optional[Dict]]]   # 실패 시 None 또는 {"success": False, ...}
+
+
+def _compact(result):
+    if isinstance(result, dict):
+        return {k: result[k] for k in RESULT_KEYS if k in result}
+    return result
+
+
+def _succeeded(result) -> bool:
+    if result is None or result is False:
+        return False
+    return bool(result.get("success", True)) if isinstance(result, dict) else True
+
+
+class PublishRun:
+    """한 번의 발행 실행 — 단계별 소요시간(동시 구간은 첫 시작~마지막 종료)과 결과 집계."""
+
+    def __init__(self, pipeline: "PublishPipeline", name: str):
+        self.pipeline = pipeline
+        self.name = name
+        self.started = time.perf_counter()
+        self._spans: Dict[str, List[float]] = {}
+        self.content_hits = 0
+        self.content_misses = 0
+        self.results: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            span = self._spans.get(name)
+            self._spans[name] = [min(span[0], start), max(span[1], end)] if span else [start, end]
+
+    async def content(self, kind: str, inputs: Any, generate: Callable[[], Awaitable[Any]],
+                      template: str = "") -> Tuple[Any, str]:
+        with self.stage("content"):
+            payload, fp, cached = await self.pipeline.content(kind, inputs, generate, template)
+        if cached:
+            self.content_hits += 1
+        else:
+            self.content_misses += 1
+        return payload, fp
+
+    async def publish(self, content_fp: str, targets: List[PublishTarget]) -> List[Dict]:
+        with self.stage("publish"):
+            results = await self.pipeline.publish(content_fp, targets)
+        self.results.extend(results)
+        return results
+
+    def summary(self) -> Dict:
+        timings = {name: round((end - start) * 1000, 1) for name, (start, end) in self._spans.items()}
+        timings["total"] = round((time.perf_counter() - self.started) * 1000, 1)
+        counts: Dict[str, int] = {}
+        for r in self.results:
+            counts[r["status"]] = counts.get(r["status"], 0) + 1
+        return {
+            "name": self.name,
+            "timings_ms": timings,
+            "content_cache": {"hits": self.content_hits, "misses": self.content_misses},
+            "counts": counts,
+        }
+
+    def finish(self) -> Dict:
+        summary = self.summary()
+        self.pipeline.recent_runs.append(dict(summary, finished_at=time.time()))
+        logger.info(f"[Publish] {self.name}: {summary['counts']} cache={summary['content_cache']} "
+                    f"timings={summary['timings_ms']}")
+        return summary
+
+
+class PublishPipeline:
+    def __init__(self, store=None, limits: Optional[Dict[str, Tuple[int, float]]] = None,
+                 pending_ttl: float = PENDING_TTL):
+        self._store = store
+        self.pending_ttl = pending_ttl
+        self.limits = dict(PLATFORM_LIMITS, **(limits or {}))
+        self._limiters: Dict[str, PlatformLimiter] = {}
+        self.recent_runs: deque = deque(maxlen=RECENT_RUNS)
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_publish_store()
+        return self._store
+
+    async def _store_call(self, method: str, *args):
+        """저장소 오류는 None (콘텐츠 캐시는 미스로 동작, 원장 claim 실패는 발행 보류 — _publish_one)."""
+        try:
+            return await asyncio.to_thread(getattr(self.store, method), *args)
+        except Exception as e:
+            logger.warning(f"[Publish] store.{method} failed: {e}")
+            return None
+
+    def limiter(self, platform: str) -> PlatformLimiter:
+        limiter = self._limiters.get(platform)
+        if limiter is None:
+            limiter = self._limiters[platform] = PlatformLimiter(*self.limits.get(platform, DEFAULT_LIMIT))
+        return limiter
+
+    def start(self, name: str) -> PublishRun:
+        return PublishRun(self, name)
+
+    async def content(self, kind: str, inputs: Any, generate: Callable[[], Awaitable[Any]],
+                      template: str = "") -> Tuple[Any, str, bool]:
+        """(payload, fingerprint, cached). 생성 결과가 비어 있으면 캐시하지 않음."""
+        fp = fingerprint(kind, inputs, template)
+        cached = await self._store_call("get_content", fp)
+        if cached is not None:
+            return cached, fp, True
+        async with self.limiter(GENERATION_LIMIT):
+            payload = await generate()
+        if payload:
+            await self._store_call("put_content", fp, kind, payload, time.time())
+        return payload, fp, False
+
+    async def _publish_one(self, content_fp: str, target: PublishTarget) -> Dict:
+        key = ledger_key(target.platform, target.channel, content_fp)
+        entry = {"platform": target.platform, "channel": target.channel}
+        claim = await self._store_call("claim", key, target.platform, target.channel, content_fp, time.time(),
+                                       self.pending_ttl)
+        if claim is None:
+            logger.warning(f"[Publish] {target.platform}/{target.channel}: ledger unavailable, not posting")
+            return dict(entry, status="failed", error="ledger claim failed")
+        state, previous = claim
+        if state == PUBLISHED:
+            return dict(entry, status="skipped", result=previous)
+        if state == PENDING:
+            logger.warning(f"[Publish] {target.platform}/{target.channel}: pending entry exists, not re-posting")
+            return dict(entry, status="in_doubt")
+
+        started = time.perf_counter()
+        async with self.limiter(target.platform):
+            try:
+                result = await target.send()
+                error = None
+            except Exception as e:
+                result, error = None, str(e)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        status = "published" if _succeeded(result) else "failed"
+        await self._store_call("finish", key, status, _compact(result) if error is None else {"error": error},
+                               latency_ms, time.time())
+        out = dict(entry, status=status, result=result, latency_ms=latency_ms)
+        if error:
+            out["error"] = error
+        return out
+
+    async def publish(self, content_fp: str, targets: List[PublishTarget]) -> List[Dict]:
+        """대상 채널에 동시 발행 (플랫폼별 제한 적용). 채널 순서대로 결과 반환."""
+        return list(await asyncio.gather(*(self._publish_one(content_fp, t) for t in targets)))
+
+    async def recent_ledger(self, limit: int = 20) -> List[Dict]:
+        return await self._store_call("recent", limit) or []
+
+
+publish_pipeline = PublishPipeline()
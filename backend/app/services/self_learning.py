@@ -4,33 +4,82 @@ Self-Learning Pipeline (오답 노트 기반 자가 학습)
   Step 1: 어제 경기 결과 수집 → 예측과 비교
   Step 2: Loss 계산 → LightGBM Incremental Retraining
   Step 3: Feature Importance Shift 추출 → 오답 노트 JSON 생성
+
+증분 처리:
+  - 정산: 대기 예측 + matches_raw 결과를 JOIN 1회로 조회, predictions_log 반영은 MERGE 1회
+  - 특성: data/feature_matrix 에 누적된 행렬 재사용, 아직 없는 경기만 추출 (동시 FEATURIZE_CONCURRENCY)
+  - 학습: 이전 부스터에서 init_model 웜 스타트 (신규 행 + 최근 REPLAY_ROWS 행, WARM_ROUNDS 라운드)
+          FULL_RETRAIN_DAYS 마다 / 부스터 없음 / 특성 스키마 변경 시 전체 재학습
+  - 단계별 소요 시간(ms)을 결과의 timings 에 기록
 """
+import asyncio
 import logging
 import os
 import math
+import time
+from contextlib import contextmanager
 import numpy as np
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from app.services import bigquery_service as bq
 from app.services.feature_store import extract_features_with_odds, get_feature_names
+from app.services.feature_matrix import feature_matrix, LABELS
 from app.core.model_store import save_model, load_model
+from app.core.shadow_eval import shadow_evaluator
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ID = bq.PROJECT_ID
 DATASET_ID = bq.DATASET_ID
 
+SETTLE_BATCH = 500            # 1회 정산 최대 예측 수
+BACKFILL_LIMIT = 500          # 행렬에 없는 과거 정산 경기 추출 상한 (최초 실행 시)
+FEATURIZE_CONCURRENCY = 8
+REPLAY_ROWS = 2000            # 웜 스타트 시 함께 학습할 최근 행 (망각 방지)
+WARM_ROUNDS = 50
+FULL_ROUNDS = 200
+FULL_RETRAIN_DAYS = int(os.getenv("FULL_RETRAIN_DAYS", "7"))
+
+LGB_PARAMS = {
+    "objective": "multiclass",
+    "num_class": 3,
+    "metric": "multi_logloss",
+    "learning_rate": 0.05,
+    "num_leaves": 31,
+    "max_depth": 6,
+    "min_child_samples": 5,
+    "feature_fraction": 0.8,
+    "bagging_fraction": 0.8,
+    "bagging_freq": 5,
+    "verbose": -1,
+}
+
+
+def _sql_str(value) -> str:
+    """BigQuery 문자열 리터럴 (작은따옴표/역슬래시 이스케이프)."""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
 
 class SelfLearningPipeline:
     """
     오답 노트 기반 ML 모델 자가 학습 파이프라인.
     """
 
-    def __init__(self):
+    def __init__(self, matrix=None):
         self.results = []
         self.error_report = {}
         self.retraining_summary = {}
+        self.matrix = matrix if matrix is not None else feature_matrix
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def _timed(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = round((time.perf_counter() - started) * 1000, 1)
 
     async def run_nightly(self) -> Dict:
         """
@@ -38,15 +87,19 @@ class SelfLearningPipeline:
         Returns summary of what was learned.
         """
         logger.info("🌙 Starting nightly self-learning pipeline...")
+        self.timings = {}
+        started = time.perf_counter()
 
         # Step 1: Collect yesterday's results
-        results = await self._step1_collect_results()
+        with self._timed("collect_results"):
+            results = await self._step1_collect_results()
         if not results:
             logger.info("No completed matches found for yesterday. Skipping.")
-            return {"status": "skipped", "reason": "no_completed_matches"}
+            return {"status": "skipped", "reason": "no_completed_matches", "timings": self._timings(started)}
 
         # Step 2: Calculate loss and retrain
-        error_report = self._step2_calculate_loss(results)
+        with self._timed("calculate_loss"):
+            error_report = self._step2_calculate_loss(results)
 
         # Step 3: Retrain model if we have enough data
         retrain_result = await self._step3_retrain_model(results, error_report)
@@ -62,16 +115,24 @@ class SelfLearningPipeline:
             "avg_log_loss": error_report.get("avg_log_loss", 0),
             "model_updated": retrain_result.get("model_updated", False),
             "new_model_version": retrain_result.get("new_version", ""),
+            "training_mode": retrain_result.get("training_mode", ""),
+            "training_samples": retrain_result.get("training_samples", 0),
+            "new_feature_rows": retrain_result.get("new_feature_rows", 0),
             "error_note": error_note,
+            "timings": self._timings(started),
         }
 
         logger.info(f"✅ Nightly pipeline complete: {summary}")
         return summary
 
+    def _timings(self, started: float) -> Dict[str, float]:
+        return {**self.timings, "total": round((time.perf_counter() - started) * 1000, 1)}
+
     async def _step1_collect_results(self) -> List[Dict]:
         """
         Step 1: Collect yesterday's match results from API-Football.
         Map actual results to predictions in BigQuery.
+        대기 예측과 결과를 JOIN 1회로 조회하고, 정산 결과는 MERGE 1회로 반영.
         """
         # Get yesterday's predictions that haven't been settled yet
         yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
@@ -79,60 +140,63 @@ class SelfLearningPipeline:
         SELECT p.match_id, p.model_version,
                p.pred_home, p.pred_draw, p.pred_away,
                p.recommendation, p.confidence,
-               p.predicted_at
+               p.predicted_at,
+               m.result AS actual_result, m.home_score, m.away_score,
+               m.home_team, m.away_team, m.league
         FROM `{PROJECT_ID}.{DATASET_ID}.predictions_log` p
+        JOIN (
+          SELECT match_id,
+                 ANY_VALUE(result) AS result, ANY_VALUE(home_score) AS home_score,
+                 ANY_VALUE(away_score) AS away_score, ANY_VALUE(home_team) AS home_team,
+                 ANY_VALUE(away_team) AS away_team, ANY_VALUE(league) AS league
+          FROM `{PROJECT_ID}.{DATASET_ID}.matches_raw`
+          WHERE result IS NOT NULL
+          GROUP BY match_id
+        ) m ON p.match_id = m.match_id
         WHERE p.actual_result IS NULL
           AND DATE(p.predicted_at) <= '{yesterday}'
         ORDER BY p.predicted_at DESC
-        LIMIT 100
+        LIMIT {SETTLE_BATCH}
         """
-        predictions = await bq.query(sql)
-        if not predictions:
+        settled = [p for p in await bq.query(sql) if p.get("actual_result")]
+        if not settled:
             return []
 
-        # Try to match with actual results from matches_raw
-        settled = []
-        for pred in predictions:
-            match_id = pred["match_id"]
-
-            # Look up actual result
-            result_sql = f"""
-            SELECT result, home_score, away_score
-            FROM `{PROJECT_ID}.{DATASET_ID}.matches_raw`
-            WHERE match_id = '{match_id}'
-            LIMIT 1
-            """
-            results = await bq.query(result_sql)
-            if results and results[0].get("result"):
-                actual = results[0]["result"]  # HOME / DRAW / AWAY
-                pred["actual_result"] = actual
-                pred["home_score"] = results[0].get("home_score")
-                pred["away_score"] = results[0].get("away_score")
-
-                # Update predictions_log with actual result
-                correct = pred["recommendation"] == actual
-                log_loss = self._calc_log_loss(
-                    pred["pred_home"], pred["pred_draw"], pred["pred_away"], actual
-                )
-                update_sql = f"""
-                UPDATE `{PROJECT_ID}.{DATASET_ID}.predictions_log`
-                SET actual_result = '{actual}',
-                    correct = {str(correct).upper()},
-                    log_loss = {log_loss},
-                    settled_at = CURRENT_TIMESTAMP()
-                WHERE match_id = '{match_id}'
-                  AND actual_result IS NULL
-                """
-                try:
-                    await bq.query(update_sql)
-                except Exception as e:
-                    logger.warning(f"Failed to update prediction log: {e}")
-
-                settled.append(pred)
-
-        logger.info(f"Step 1: {len(settled)} matches settled out of {len(predictions)} pending")
+        await self._merge_settlements(settled)
+        # 섀도 / 카나리 평가: 이 인스턴스가 채점한 버전별 온라인 log-loss / Brier
+        shadow_evaluator.record_outcomes({p["match_id"]: p["actual_result"] for p in settled})
+        logger.info(f"Step 1: {len(settled)} predictions settled")
         return settled
 
+    async def _merge_settlements(self, settled: List[Dict]):
+        """predictions_log 정산 반영 — match_id 당 1행 소스로 MERGE 1회 (기존: 예측마다 UPDATE)."""
+        # 같은 경기의 여러 예측 행은 기존 UPDATE 와 동일하게 모두 정산 — correct/log_loss 는 행별 계산
+        results = {pred["match_id"]: pred["actual_result"] for pred in settled}
+        source = ",\n".join(
+            f"STRUCT({_sql_str(mid)} AS match_id, {_sql_str(actual)} AS actual_result)"
+            for mid, actual in results.items()
+        )
+        merge_sql = f"""
+        MERGE `{PROJECT_ID}.{DATASET_ID}.predictions_log` p
+        USING UNNEST([
+        {source}
+        ]) s
+        ON p.match_id = s.match_id AND p.actual_result IS NULL
+        WHEN MATCHED THEN UPDATE SET
+          actual_result = s.actual_result,
+          correct = (p.recommendation = s.actual_result),
+          -- _calc_log_loss 와 동일: -ln(max(p_actual, 1e-10))
+          log_loss = -LN(GREATEST(CASE s.actual_result
+                                    WHEN 'HOME' THEN p.pred_home
+                                    WHEN 'DRAW' THEN p.pred_draw
+                                    ELSE p.pred_away END, 1e-10)),
+          settled_at = CURRENT_TIMESTAMP()
+        """
+        try:
+            await bq.query(merge_sql)
+        except Exception as e:
+            logger.warning(f"Failed to update prediction log: {e}")
+
     def _step2_calculate_loss(self, results: List[Dict]) -> Dict:
         """
         Step 2: Calculate prediction accuracy and loss metrics.
@@ -195,6 +259,7 @@ class SelfLearningPipeline:
     async def _step3_retrain_model(self, results: List[Dict], error_report: Dict) -> Dict:
         """
         Step 3: Incremental retraining of LightGBM model.
+        특성 행렬에 새 경기만 추가한 뒤 이전 부스터에서 웜 스타트 (주기적으로 전체 재학습).
         """
         # Need minimum data for meaningful retraining
         MIN_SAMPLES = 10
@@ -207,115 +272,60 @@ class SelfLearningPipeline:
 
         try:
             import lightgbm as lgb
-            from sklearn.preprocessing import LabelEncoder
 
-            # Load current model for comparison
-            old_model = load_model("lightgbm_predictor")
-            old_importances = {}
-            if old_model:
-                feature_names = get_feature_names()
-                try:
-                    old_importances = {
-                        name: float(imp)
-                        for name, imp in zip(feature_names, old_model.feature_importances_)
-                    }
-                except Exception:
-                    pass
-
-            # Build training data from BigQuery (last 30 days of settled predictions)
-            training_sql = f"""
-            SELECT p.match_id, p.pred_home, p.pred_draw, p.pred_away,
-                   p.actual_result,
-                   m.home_team, m.away_team, m.league
-            FROM `{PROJECT_ID}.{DATASET_ID}.predictions_log` p
-            JOIN `{PROJECT_ID}.{DATASET_ID}.matches_raw` m
-              ON p.match_id = m.match_id
-            WHERE p.actual_result IS NOT NULL
-            ORDER BY p.predicted_at DESC
-            LIMIT 500
-            """
-            training_data = await bq.query(training_sql)
+            feature_names = get_feature_names()
 
-            if len(training_data) < MIN_SAMPLES:
+            # Load current model for comparison / warm start
+            with self._timed("load_model"):
+                old_model = load_model("lightgbm_predictor")
+            old_importances = self._importances(old_model, feature_names)
+
+            # 새로 정산된 경기만 특성 추출 → 행렬에 추가
+            with self._timed("featurize"):
+                new_rows = await self._update_feature_matrix(results, feature_names)
+            total_rows = self.matrix.rows(feature_names)
+            if total_rows < MIN_SAMPLES:
                 return {
                     "model_updated": False,
-                    "reason": f"Insufficient training data ({len(training_data)})",
+                    "reason": f"Insufficient training data ({total_rows})",
                     "new_version": "",
+                    "new_feature_rows": new_rows,
                 }
 
-            # Extract features for each match
-            feature_names = get_feature_names()
-            X_list = []
-            y_list = []
-
-            for td in training_data:
-                try:
-                    features = await extract_features_with_odds(
-                        home_team=td.get("home_team", ""),
-                        away_team=td.get("away_team", ""),
-                        league=td.get("league", ""),
-                        home_odds=1 / max(td.get("pred_home", 0.33), 0.01),
-                        draw_odds=1 / max(td.get("pred_draw", 0.33), 0.01),
-                        away_odds=1 / max(td.get("pred_away", 0.33), 0.01),
-                    )
-                    X_row = [features.get(f, 0.0) for f in feature_names]
-                    X_list.append(X_row)
-                    y_list.append(td["actual_result"])  # HOME / DRAW / AWAY
-                except Exception as e:
-                    logger.warning(f"Feature extraction failed for {td.get('match_id')}: {e}")
-                    continue
-
-            if len(X_list) < MIN_SAMPLES:
+            mode = self._training_mode(old_model, feature_names)
+            if mode == "warm" and new_rows == 0:
                 return {
                     "model_updated": False,
-                    "reason": "Feature extraction yielded too few samples",
+                    "reason": "No new feature rows since last training",
                     "new_version": "",
+                    "new_feature_rows": 0,
                 }
 
-            X = np.array(X_list)
-            le = LabelEncoder()
-            y = le.fit_transform(y_list)
-
-            # Train new LightGBM model
-            train_data = lgb.Dataset(X, label=y, feature_name=feature_names)
-            params = {
-                "objective": "multiclass",
-                "num_class": 3,
-                "metric": "multi_logloss",
-                "learning_rate": 0.05,
-                "num_leaves": 31,
-                "max_depth": 6,
-                "min_child_samples": 5,
-                "feature_fraction": 0.8,
-                "bagging_fraction": 0.8,
-                "bagging_freq": 5,
-                "verbose": -1,
-            }
-
-            # If we have an old model, use warm start
-            if old_model:
-                new_model = lgb.train(
-                    params,
-                    train_data,
-                    num_boost_round=50,
-                    init_model=old_model,
-                )
-            else:
-                new_model = lgb.train(
-                    params,
-                    train_data,
-                    num_boost_round=200,
+            with self._timed("train"):
+                if mode == "warm":
+                    # 새 행은 행렬 끝에 추가되므로 마지막 (신규 + 재생) 행만 읽음
+                    X, y, _ = self.matrix.load(feature_names, last=new_rows + REPLAY_ROWS)
+                    rounds, init_model = WARM_ROUNDS, old_model
+                else:
+                    X, y, _ = self.matrix.load(feature_names)
+                    rounds, init_model = FULL_ROUNDS, None
+                train_data = lgb.Dataset(X, label=y, feature_name=feature_names, free_raw_data=False)
+                new_model = await asyncio.to_thread(
+                    lgb.train, LGB_PARAMS, train_data, num_boost_round=rounds, init_model=init_model,
                 )
 
             # Save new model
-            new_version = datetime.now(timezone.utc).strftime("%Y%m%d")
-            model_path = save_model(new_model, "lightgbm_predictor", new_version)
+            with self._timed("save_model"):
+                new_version = datetime.now(timezone.utc).strftime("%Y%m%d")
+                model_path = await asyncio.to_thread(save_model, new_model, "lightgbm_predictor", new_version)
+                now_iso = datetime.now(timezone.utc).isoformat()
+                meta = {"last_train_at": now_iso, "last_train_mode": mode, "trees": new_model.num_trees()}
+                if mode == "full":
+                    meta["last_full_train_at"] = now_iso
+                self.matrix.set_meta(**meta)
 
             # Calculate new feature importances
-            new_importances = {
-                name: float(imp)
-                for name, imp in zip(feature_names, new_model.feature_importance())
-            }
+            new_importances = self._importances(new_model, feature_names)
 
             # Log feature importance changes to BigQuery
             await bq.log_feature_importance(
@@ -341,14 +351,17 @@ class SelfLearningPipeline:
             # Sort by absolute shift
             importance_shifts.sort(key=lambda x: abs(x["shift_pct"]), reverse=True)
 
-            logger.info(f"✅ Model retrained. Version: v{new_version}, Path: {model_path}")
+            logger.info(f"✅ Model retrained ({mode}). Version: v{new_version}, Path: {model_path}")
             logger.info(f"Top shifts: {importance_shifts[:3]}")
 
             return {
                 "model_updated": True,
                 "new_version": f"v{new_version}",
                 "model_path": model_path,
-                "training_samples": len(X_list),
+                "training_mode": mode,
+                "training_samples": int(len(y)),
+                "new_feature_rows": new_rows,
+                "feature_matrix_rows": total_rows,
                 "importance_shifts": importance_shifts[:10],
                 "new_importances": new_importances,
             }
@@ -360,6 +373,97 @@ class SelfLearningPipeline:
             logger.error(f"Retraining failed: {e}")
             return {"model_updated": False, "reason": str(e), "new_version": ""}
 
+    async def _update_feature_matrix(self, results: List[Dict], feature_names: List[str]) -> int:
+        """행렬에 없는 정산 경기만 특성 추출 후 추가. 반환: 추가된 행 수."""
+        known = self.matrix.known_ids(feature_names)
+        candidates = list(results)
+
+        # 최초 실행(행렬이 작을 때)만 과거 정산 경기로 백필
+        if len(known) < BACKFILL_LIMIT:
+            backfill_sql = f"""
+            SELECT p.match_id, p.pred_home, p.pred_draw, p.pred_away,
+                   p.actual_result, p.predicted_at,
+                   m.home_team, m.away_team, m.league
+            FROM `{PROJECT_ID}.{DATASET_ID}.predictions_log` p
+            JOIN `{PROJECT_ID}.{DATASET_ID}.matches_raw` m
+              ON p.match_id = m.match_id
+            WHERE p.actual_result IS NOT NULL
+            ORDER BY p.predicted_at DESC
+            LIMIT {BACKFILL_LIMIT}
+            """
+            candidates.extend(await bq.query(backfill_sql))
+
+        pending, seen = [], set(known)
+        for td in candidates:
+            mid = td.get("match_id")
+            if mid and mid not in seen and td.get("actual_result") in LABELS:
+                seen.add(mid)
+                pending.append(td)
+        if not pending:
+            return 0
+        # 오래된 것부터 추가 → 웜 스타트가 행렬 끝의 최신 행을 읽음
+        pending.sort(key=lambda td: str(td.get("predicted_at", "")))
+
+        semaphore = asyncio.Semaphore(FEATURIZE_CONCURRENCY)
+
+        async def featurize(td):
+            async with semaphore:
+                try:
+                    features = await extract_features_with_odds(
+                        home_team=td.get("home_team", ""),
+                        away_team=td.get("away_team", ""),
+                        league=td.get("league", ""),
+                        home_odds=1 / max(td.get("pred_home", 0.33), 0.01),
+                        draw_odds=1 / max(td.get("pred_draw", 0.33), 0.01),
+                        away_odds=1 / max(td.get("pred_away", 0.33), 0.01),
+                    )
+                    return [features.get(f, 0.0) for f in feature_names]
+                except Exception as e:
+                    logger.warning(f"Feature extraction failed for {td.get('match_id')}: {e}")
+                    return None
+
+        rows = await asyncio.gather(*[featurize(td) for td in pending])
+        ok = [(td, row) for td, row in zip(pending, rows) if row is not None]
+        if not ok:
+            return 0
+        added = self.matrix.append(
+            feature_names,
+            np.array([row for _, row in ok], dtype=np.float32),
+            [td["actual_result"] for td, _ in ok],
+            [td["match_id"] for td, _ in ok],
+            [str(td.get("predicted_at", "")) for td, _ in ok],
+        )
+        logger.info(f"Feature matrix: +{added} rows ({len(pending) - len(ok)} failed)")
+        return added
+
+    def _training_mode(self, old_model, feature_names: List[str]) -> str:
+        """warm: 호환되는 이전 부스터가 있고 최근 FULL_RETRAIN_DAYS 안에 전체 재학습함 / 그 외 full."""
+        try:
+            if old_model is None or old_model.num_feature() != len(feature_names):
+                return "full"
+        except AttributeError:
+            return "full"     # Booster 가 아닌 모델 (init_model 불가)
+        last_full = self.matrix.meta.get("last_full_train_at")
+        if not last_full:
+            return "full"
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(last_full)
+        return "warm" if age < timedelta(days=FULL_RETRAIN_DAYS) else "full"
+
+    @staticmethod
+    def _importances(model, feature_names: List[str]) -> Dict[str, float]:
+        if model is None:
+            return {}
+        try:
+            values = model.feature_importance()
+        except AttributeError:
+            try:
+                values = model.feature_importances_
+            except Exception:
+                return {}
+        except Exception:
+            return {}
+        return {name: float(imp) for name, imp in zip(feature_names, values)}
+
     def _generate_error_note(self, error_report: Dict, retrain_result: Dict) -> Dict:
         """
         Generate structured 오답 노트 JSON for Gemini to narrate.
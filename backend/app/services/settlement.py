@@ -177,10 +177,20 @@ async def auto_settle_slips() -> dict:
         except Exception as e:
             logger.error(f"Failed to grade slip {slip_id}: {e}")
 
+    await _persist_leaderboards()
     logger.info(f"Auto-settlement complete: {stats}")
     return stats
 
 
+async def _persist_leaderboards():
+    """정산으로 바뀐 리더보드 스냅샷 저장 (다른 인스턴스는 버전 확인 후 교체)."""
+    try:
+        from app.services.leaderboard import leaderboard_service
+        await leaderboard_service.persist()
+    except Exception as e:
+        logger.warning(f"Leaderboard snapshot save failed: {e}")
+
+
 # ──────────────────────────────────────────────
 # 3. Prediction Auto-Settlement (투표 자동 정산)
 # ──────────────────────────────────────────────
@@ -298,6 +308,7 @@ async def auto_settle_predictions() -> dict:
             logger.error(f"Error settling {match_id}: {e}")
             stats["no_result"] += 1
 
+    await _persist_leaderboards()
     logger.info(f"📊 Auto-settlement complete: {stats}")
     return stats
 
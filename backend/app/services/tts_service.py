@@ -0,0 +1,375 @@
+"""
+TTS Service — 콘텐츠 주소 기반 디스크 캐시 + 동시 합성.
+
+기존 generate_tts 는 장면마다 asyncio.run 으로 한 줄씩 합성하고 캐시가 없어서
+인트로/아웃트로/고지 문구처럼 매번 같은 문장도 렌더링·언어마다 다시 합성했음.
+
+- 캐시 키: sha256(text, voice, rate, pitch, engine) → data/tts_cache/<key>.mp3
+- 크기 제한 LRU (TTS_CACHE_MAX_MB), 색인(index.json)에 길이·엔진·마지막 사용 시각 보관
+- 엔진 우선순위: ElevenLabs → Edge TTS → gTTS. 조회도 같은 순서로 하므로
+  폴백 엔진으로 만든 음성도 캐시 적중으로 재사용됨. 단 상위 엔진 실패로 만든 하위 엔진 음성은
+  TTS_FALLBACK_TTL 동안만 유효 → 일시 장애(쿼터 등)가 풀리면 상위 엔진으로 다시 합성
+- 캐시에 없는 문장만 TTS_CONCURRENCY 개까지 동시 합성, 같은 배치의 중복 문장은 1회만 합성
+- 길이는 MP3 프레임 헤더(Xing/VBRI/CBR)나 WAV 헤더에서 읽음 — 파일 전체를 디코드하지 않음
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "6"))
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "512"))
+TTS_FALLBACK_TTL = float(os.getenv("TTS_FALLBACK_TTL", str(6 * 3600)))   # 폴백 엔진 음성 유효 시간(초)
+
+_DEFAULT_ROOT = os.getenv("TTS_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "tts_cache"
+)
+
+
+@dataclass(frozen=True)
+class TTSRequest:
+    text: str
+    lang: str = "ko"
+    voice: str = ""
+    rate: str = "+0%"
+    pitch: str = "+0Hz"
+
+
+@dataclass
+class TTSResult:
+    path: str
+    duration: Optional[float]
+    engine: str
+    cached: bool
+
+
+# ── 길이 메타데이터 ──
+
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],   # MPEG1 Layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],       # MPEG2/2.5 Layer III
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(10)
+        offset = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            offset = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        f.seek(offset)
+        data = f.read(8192)
+        f.seek(max(0, size - 128))
+        has_id3v1 = f.read(3) == b"TAG"
+
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            continue
+        header = struct.unpack(">I", data[i:i + 4])[0]
+        version = (header >> 19) & 0x3          # 3: MPEG1, 2: MPEG2, 0: MPEG2.5
+        layer = (header >> 17) & 0x3            # 1: Layer III
+        bitrate_idx = (header >> 12) & 0xF
+        rate_idx = (header >> 10) & 0x3
+        if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+            continue
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_idx] * 1000
+        samples_per_frame = 1152 if version == 3 else 576
+        mono = ((header >> 6) & 0x3) == 3
+
+        # VBR 헤더 (Xing/Info 는 side info 뒤, VBRI 는 헤더 + 32바이트 뒤)
+        side = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        xing = i + 4 + side
+        if data[xing:xing + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+            if flags & 0x1:
+                frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+                return frames * samples_per_frame / sample_rate
+        if data[i + 36:i + 40] == b"VBRI":
+            frames = struct.unpack(">I", data[i + 50:i + 54])[0]
+            return frames * samples_per_frame / sample_rate
+
+        audio_bytes = size - offset - i - (128 if has_id3v1 else 0)
+        return audio_bytes * 8 / bitrate
+    return None
+
+
+def _wav_duration(path: str) -> Optional[float]:
+    import wave
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / float(w.getframerate())
+
+
+def audio_duration(path: str) -> Optional[float]:
+    """파일 헤더로 재생 길이(초) 계산. 알 수 없는 형식이면 None."""
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(4)
+        if magic == b"RIFF":
+            return _wav_duration(path)
+        return _mp3_duration(path)
+    except Exception as e:
+        logger.debug(f"[TTS] duration probe failed ({path}): {e}")
+        return None
+
+
+# ── 디스크 캐시 ──
+
+class TTSCache:
+    """<key>.mp3 파일 + index.json (LRU 순서). 프로세스 내 스레드 안전."""
+
+    def __init__(self, root: str = _DEFAULT_ROOT, max_bytes: int = int(TTS_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: Optional["OrderedDict[str, Dict]"] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str, voice: str, rate: str, pitch: str, engine: str) -> str:
+        raw = json.dumps([text, voice, rate, pitch, engine], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.mp3")
+
+    def _load(self) -> "OrderedDict[str, Dict]":
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                pass
+            ordered = sorted(entries.items(), key=lambda kv: kv[1].get("last_used", 0))
+            self._entries = OrderedDict((k, v) for k, v in ordered if os.path.exists(self.path_for(k)))
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None or not os.path.exists(self.path_for(key)):
+                if entry is not None:
+                    entries.pop(key, None)
+                return None
+            entry["last_used"] = time.time()
+            entries.move_to_end(key)
+            self._dirty = True
+            return dict(entry, path=self.path_for(key))
+
+    def put(self, key: str, src_path: str, engine: str, ttl: Optional[float] = None) -> Dict:
+        """합성된 임시 파일을 캐시로 이동 (원자적 rename) 후 LRU 한도 적용. ttl 이 있으면 expires_at 기록."""
+        dst = self.path_for(key)
+        os.replace(src_path, dst)
+        now = time.time()
+        entry = {"bytes": os.path.getsize(dst), "duration": audio_duration(dst),
+                 "engine": engine, "last_used": now}
+        if ttl is not None:
+            entry["expires_at"] = now + ttl
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            entries.move_to_end(key)
+            self._evict(keep=key)
+            self._dirty = True
+        return dict(entry, path=dst)
+
+    def _evict(self, keep: str):
+        total = sum(e.get("bytes", 0) for e in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            key, entry = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            self._entries.pop(key)
+            total -= entry.get("bytes", 0)
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    def flush(self):
+        """색인 저장 (배치 끝에 1회)."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._load()
+            return {"entries": len(entries), "bytes": sum(e.get("bytes", 0) for e in entries.values()),
+                    "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+# ── 엔진 ──
+
+Engine = Callable[[TTSRequest, str], Awaitable[bool]]
+
+
+async def _elevenlabs_engine(req: TTSRequest, path: str) -> bool:
+    from ai_avatar_service import elevenlabs_tts, is_elevenlabs_available
+    if not is_elevenlabs_available():
+        return False
+    return bool(await asyncio.to_thread(elevenlabs_tts, req.text, path))
+
+
+async def _edge_engine(req: TTSRequest, path: str) -> bool:
+    import edge_tts
+    communicate = edge_tts.Communicate(req.text, req.voice, rate=req.rate, pitch=req.pitch)
+    await communicate.save(path)
+    return True
+
+
+async def _gtts_engine(req: TTSRequest, path: str) -> bool:
+    from gtts import gTTS
+    await asyncio.to_thread(lambda: gTTS(text=req.text, lang=req.lang).save(path))
+    return True
+
+
+def _elevenlabs_available() -> bool:
+    try:
+        from ai_avatar_service import is_elevenlabs_available
+        return is_elevenlabs_available()
+    except ImportError:
+        return False
+
+
+def default_engines() -> "OrderedDict[str, Engine]":
+    engines = OrderedDict()
+    if _elevenlabs_available():
+        engines["elevenlabs"] = _elevenlabs_engine
+    engines["edge"] = _edge_engine
+    engines["gtts"] = _gtts_engine
+    return engines
+
+
+def _engine_params(engine: str, req: TTSRequest):
+    """엔진별로 음성에 영향을 주는 값만 키에 포함."""
+    if engine == "elevenlabs":
+        from ai_avatar_service import ELEVENLABS_VOICE_ID
+        return ELEVENLABS_VOICE_ID, "", ""
+    if engine == "gtts":
+        return req.lang, "", ""
+    return req.voice, req.rate, req.pitch
+
+
+class TTSService:
+    def __init__(self, cache: Optional[TTSCache] = None, engines: Optional[Dict[str, Engine]] = None,
+                 concurrency: int = TTS_CONCURRENCY, fallback_ttl: float = TTS_FALLBACK_TTL):
+        self.cache = cache if cache is not None else TTSCache()
+        self._engines = engines
+        self.concurrency = concurrency
+        self.fallback_ttl = fallback_ttl
+        self.synthesized: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    @property
+    def engines(self) -> Dict[str, Engine]:
+        return self._engines if self._engines is not None else default_engines()
+
+    def _keys(self, req: TTSRequest, engines) -> List[tuple]:
+        return [(name, self.cache.key(req.text, *_engine_params(name, req), name)) for name in engines]
+
+    def lookup(self, req: TTSRequest, engines=None) -> Optional[TTSResult]:
+        """최상위 엔진 음성은 항상, 하위 엔진 음성은 expires_at 이전에만 적중 (만료되면 상위 엔진부터 재합성)."""
+        now = time.time()
+        for tier, (name, key) in enumerate(self._keys(req, engines or self.engines)):
+            entry = self.cache.get(key)
+            if entry is not None and (tier == 0 or entry.get("expires_at", 0) > now):
+                self.hits += 1
+                return TTSResult(entry["path"], entry.get("duration"), entry.get("engine", name), True)
+        self.misses += 1
+        return None
+
+    async def _synthesize(self, req: TTSRequest, engines) -> TTSResult:
+        os.makedirs(self.cache.root, exist_ok=True)
+        last_error = None
+        for tier, (name, key) in enumerate(self._keys(req, engines)):
+            fd, tmp = tempfile.mkstemp(dir=self.cache.root, suffix=".part")
+            os.close(fd)
+            try:
+                if await engines[name](req, tmp) and os.path.getsize(tmp) > 0:
+                    ttl = None if tier == 0 else self.fallback_ttl
+                    entry = await asyncio.to_thread(self.cache.put, key, tmp, name, ttl)
+                    self.synthesized[name] = self.synthesized.get(name, 0) + 1
+                    return TTSResult(entry["path"], entry.get("duration"), name, False)
+                logger.warning(f"[TTS] {name} produced no audio, trying next engine")
+            except Exception as e:
+                last_error = e
+                logger.warning(f"[TTS] {name} failed ({e}), trying next engine")
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        self.failures += 1
+        raise RuntimeError(f"All TTS engines failed: {last_error}")
+
+    async def synthesize_many(self, requests: Sequence[TTSRequest], return_exceptions: bool = False) -> List:
+        """
+        캐시 적중은 즉시, 나머지는 동시 합성. 입력 순서대로 TTSResult 반환.
+        return_exceptions=True 면 실패한 문장 자리에 예외 객체 (아니면 첫 실패를 raise).
+        """
+        engines = self.engines
+        results: List = [None] * len(requests)
+        pending: Dict[TTSRequest, List[int]] = {}
+        for i, req in enumerate(requests):
+            hit = self.lookup(req, engines)
+            if hit is not None:
+                results[i] = hit
+            else:
+                pending.setdefault(req, []).append(i)
+
+        if pending:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def run(req):
+                async with semaphore:
+                    return await self._synthesize(req, engines)
+
+            done = await asyncio.gather(*[run(req) for req in pending], return_exceptions=True)
+            for indices, result in zip(pending.values(), done):
+                for i in indices:
+                    results[i] = result
+        await asyncio.to_thread(self.cache.flush)
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+
+    async def synthesize(self, req: TTSRequest) -> TTSResult:
+        return (await self.synthesize_many([req]))[0]
+
+    def stats(self) -> Dict:
+        return {"cache": self.cache.stats(), "hits": self.hits, "misses": self.misses,
+                "synthesized": dict(self.synthesized), "failures": self.failures,
+                "concurrency": self.concurrency}
+
+
+tts_service = TTSService()
@@ -0,0 +1,777 @@
+"""
+Walk-forward Backtester — 과거 경기에 예측 모델을 소급 재생(replay)하는 오프라인 백테스터.
+
+backtest_engine 은 predictions_log 에 "기록된" 예측만 집계하므로
+"모델 v2 / AIPredictor 휴리스틱이 지난 시즌에 얼마나 맞췄을까"에는 답하지 못함.
+이 모듈은 matches_raw + odds_history (BigQuery 또는 로컬 Parquet/CSV export)를
+컬럼 배열로 올려 시점(point-in-time) 피처를 만들고, 임의의 예측기를 walk-forward 폴드로 재생.
+
+- 피처: 경기일 단위 배치로 계산 → 같은 날/이후 경기 결과는 절대 보지 않음 (lookahead 없음)
+  정의는 feature_store.extract_features_with_odds 와 동일 (전체 기간 조회 → 해당 시점 이전으로 제한)
+- 예측기: LightGBM 모델 파일 / 폴드별 재학습 LightGBM / AIPredictor / MLInferenceService 휴리스틱 / 시장 배당
+- 지표: 정확도, log-loss, Brier, 캘리브레이션(ECE), ROI(가치 베팅), CLV(시가 대비 마감 배당)
+- 네트워크 없이 실행 가능 (BigQuery 로드는 --bigquery 선택 시에만)
+
+사용법:
+  python -m app.services.walkforward_backtest --data ./exports --predictor all
+  python -m app.services.walkforward_backtest --bigquery --export ./exports      # 1회 export
+  python -m app.services.walkforward_backtest --synthetic 50000 --predictor all  # 성능 벤치마크
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.feature_store import get_feature_names
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("HOME", "DRAW", "AWAY")   # 모든 확률 행렬의 열 순서
+RESULT_CODE = {name: i for i, name in enumerate(OUTCOMES)}
+LABEL_ENCODER_ORDER = ("AWAY", "DRAW", "HOME")  # sklearn LabelEncoder 정렬 순서 (initial_train / self_learning)
+
+HISTORY_WINDOW = 10
+NO_DAY = -(10 ** 9)
+
+# feature_store.extract_features_with_odds 와 동일한 리그별 홈 어드밴티지
+LEAGUE_HOME_ADV = {
+    "soccer_epl": 1.05, "soccer_spain_la_liga": 1.12,
+    "soccer_germany_bundesliga": 1.08, "soccer_italy_serie_a": 1.10,
+    "soccer_france_ligue_one": 1.06, "soccer_turkey_super_lig": 1.25,
+    "soccer_greece_super_league": 1.20, "soccer_serbia_superliga": 1.18,
+    "soccer_portugal_liga": 1.10, "soccer_belgium_pro_league": 1.05,
+    "soccer_brazil_serie_a": 1.15, "soccer_mexico_liga_mx": 1.20,
+    "soccer_argentina_liga": 1.18, "soccer_egypt_premier_league": 1.22,
+    "soccer_korea_kleague": 1.06, "soccer_japan_jleague": 1.02,
+    "soccer_usa_mls": 1.08, "soccer_saudi_pro_league": 1.18,
+    "soccer_china_super_league": 1.15,
+}
+
+
+# ─────────────────────────────────────────────
+# DATA
+# ─────────────────────────────────────────────
+
+@dataclass
+class MatchArrays:
+    """경기 단위 컬럼 배열 (경기일 오름차순 정렬)."""
+    match_id: np.ndarray
+    day: np.ndarray          # int64 (epoch days)
+    league: np.ndarray       # object
+    season: np.ndarray       # object
+    home: np.ndarray         # int32 team index
+    away: np.ndarray         # int32 team index
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    result: np.ndarray       # int8, OUTCOMES 인덱스
+    open_odds: np.ndarray    # (n, 3) float64, 없으면 NaN
+    close_odds: np.ndarray   # (n, 3) float64, 없으면 NaN
+    teams: List[str]
+
+    def __len__(self) -> int:
+        return len(self.result)
+
+    @classmethod
+    def from_frames(cls, matches: pd.DataFrame, odds: Optional[pd.DataFrame] = None) -> "MatchArrays":
+        m = matches.dropna(subset=["home_team", "away_team", "match_date"]).copy()
+        m["match_date"] = pd.to_datetime(m["match_date"], utc=True, errors="coerce")
+        m = m.dropna(subset=["match_date"])
+
+        result = m["result"].map(RESULT_CODE) if "result" in m else pd.Series(np.nan, index=m.index)
+        hs, as_ = _score_column(m, "home_score"), _score_column(m, "away_score")
+        from_score = np.select([hs > as_, hs == as_, hs < as_], [0, 1, 2], default=-1)
+        result = result.fillna(pd.Series(from_score, index=m.index).where(lambda x: x >= 0))
+        m["_result"] = result
+        m = m.dropna(subset=["_result"]).sort_values("match_date", kind="stable").reset_index(drop=True)
+
+        codes, teams = pd.factorize(pd.concat([m["home_team"], m["away_team"]], ignore_index=True))
+        n = len(m)
+        match_id = m["match_id"].astype(str).to_numpy() if "match_id" in m else np.arange(n).astype(str)
+
+        open_odds = np.full((n, 3), np.nan)
+        close_odds = np.full((n, 3), np.nan)
+        if odds is not None and len(odds):
+            open_odds, close_odds = _open_close_odds(odds, match_id)
+
+        return cls(
+            match_id=match_id,
+            day=m["match_date"].dt.tz_convert(None).dt.floor("D").to_numpy().astype("datetime64[D]").astype(np.int64),
+            league=m["league"].fillna("").astype(str).to_numpy(dtype=object) if "league" in m else np.full(n, "", object),
+            season=m["season"].fillna("").astype(str).to_numpy(dtype=object) if "season" in m else np.full(n, "", object),
+            home=codes[:n].astype(np.int32),
+            away=codes[n:].astype(np.int32),
+            # 점수는 정렬·필터 후 프레임에서 다시 읽음 (경기 행과 순서 일치)
+            home_goals=_score_column(m, "home_score").fillna(0).to_numpy(dtype=np.float64),
+            away_goals=_score_column(m, "away_score").fillna(0).to_numpy(dtype=np.float64),
+            result=m["_result"].to_numpy().astype(np.int8),
+            open_odds=open_odds,
+            close_odds=close_odds,
+            teams=[str(t) for t in teams],
+        )
+
+
+def _score_column(frame: pd.DataFrame, name: str) -> pd.Series:
+    """점수 컬럼 (숫자 변환 실패·컬럼 없음 → NaN)."""
+    if name not in frame:
+        return pd.Series(np.nan, index=frame.index, dtype=np.float64)
+    return pd.to_numeric(frame[name], errors="coerce")
+
+
+def _open_close_odds(odds: pd.DataFrame, match_id: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """경기별 시가(첫 수집) / 마감(마지막 수집) 배당."""
+    cols = ["home_odds", "draw_odds", "away_odds"]
+    o = odds.copy()
+    o["match_id"] = o["match_id"].astype(str)
+    for c in cols:
+        o[c] = pd.to_numeric(o[c], errors="coerce")
+    o = o[(o["home_odds"] > 1) & (o["away_odds"] > 1)]
+    ts_col = next((c for c in ("collected_at", "recorded_at", "match_time") if c in o), None)
+    if ts_col:
+        o["_ts"] = pd.to_datetime(o[ts_col], utc=True, errors="coerce")
+        o = o.sort_values("_ts", kind="stable")
+    grouped = o.groupby("match_id", sort=False)[cols]
+    first = grouped.first().reindex(match_id)
+    last = grouped.last().reindex(match_id)
+    return first.to_numpy(dtype=np.float64), last.to_numpy(dtype=np.float64)
+
+
+def _read_table(directory: str, name: str, required: bool = True) -> Optional[pd.DataFrame]:
+    for ext, reader in ((".parquet", pd.read_parquet), (".csv", pd.read_csv)):
+        path = os.path.join(directory, name + ext)
+        if os.path.exists(path):
+            return reader(path)
+    if required:
+        raise FileNotFoundError(f"{name}.parquet/.csv not found in {directory}")
+    return None
+
+
+def load_local(directory: str) -> MatchArrays:
+    """로컬 export(matches_raw / odds_history 의 .parquet 또는 .csv) 로드 — 오프라인."""
+    return MatchArrays.from_frames(_read_table(directory, "matches_raw"),
+                                   _read_table(directory, "odds_history", required=False))
+
+
+def load_bigquery(export_dir: Optional[str] = None) -> MatchArrays:
+    """BigQuery 에서 로드 (선택적으로 Parquet export → 이후 오프라인 재실행)."""
+    from app.services import bigquery_service as bq
+    client = bq._get_bq_client()
+    if client is None:
+        raise RuntimeError("BigQuery client unavailable")
+    prefix = f"`{bq.PROJECT_ID}.{bq.DATASET_ID}"
+    matches = client.query(
+        f"SELECT match_id, league, season, home_team, away_team, match_date, home_score, away_score, result "
+        f"FROM {prefix}.matches_raw` WHERE result IN ('HOME', 'DRAW', 'AWAY')"
+    ).to_dataframe()
+    odds = client.query(f"SELECT * FROM {prefix}.odds_history`").to_dataframe()
+    if export_dir:
+        os.makedirs(export_dir, exist_ok=True)
+        matches.to_parquet(os.path.join(export_dir, "matches_raw.parquet"))
+        odds.to_parquet(os.path.join(export_dir, "odds_history.parquet"))
+        logger.info(f"Exported {len(matches)} matches / {len(odds)} odds rows to {export_dir}")
+    return MatchArrays.from_frames(matches, odds)
+
+
+def synthetic_frames(n_matches: int = 50_000, n_leagues: int = 5, teams_per_league: int = 20,
+                     seed: int = 7) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """벤치마크/테스트용 합성 데이터 (팀 전력 랜덤워크 + 포아송 득점 + 마진/노이즈 포함 시가·마감 배당)."""
+    rng = np.random.default_rng(seed)
+    n_teams = n_leagues * teams_per_league
+    per_day = n_leagues * (teams_per_league // 2)
+    n_days = math.ceil(n_matches / per_day)
+    strength = rng.normal(0, 0.35, n_teams)
+
+    home_idx, away_idx, day_idx, league_idx = [], [], [], []
+    strengths_h, strengths_a = [], []
+    for d in range(n_days):
+        strength += rng.normal(0, 0.02, n_teams)
+        for lg in range(n_leagues):
+            perm = rng.permutation(teams_per_league) + lg * teams_per_league
+            h, a = perm[0::2], perm[1::2]
+            home_idx.append(h)
+            away_idx.append(a)
+            day_idx.append(np.full(len(h), d))
+            league_idx.append(np.full(len(h), lg))
+            strengths_h.append(strength[h].copy())
+            strengths_a.append(strength[a].copy())
+    home_idx, away_idx = np.concatenate(home_idx)[:n_matches], np.concatenate(away_idx)[:n_matches]
+    day_idx, league_idx = np.concatenate(day_idx)[:n_matches], np.concatenate(league_idx)[:n_matches]
+    sh, sa = np.concatenate(strengths_h)[:n_matches], np.concatenate(strengths_a)[:n_matches]
+
+    lam_h = np.exp(0.25 + sh - sa)
+    lam_a = np.exp(0.0 + sa - sh)
+    goals = np.arange(11)
+    log_fact = np.array([math.lgamma(k + 1) for k in goals])
+    pmf_h = np.exp(goals * np.log(lam_h[:, None]) - lam_h[:, None] - log_fact)
+    pmf_a = np.exp(goals * np.log(lam_a[:, None]) - lam_a[:, None] - log_fact)
+    joint = pmf_h[:, :, None] * pmf_a[:, None, :]
+    p_home = np.tril(np.ones((11, 11)), -1)
+    true_p = np.stack([(joint * p_home).sum((1, 2)), np.trace(joint, axis1=1, axis2=2),
+                       (joint * p_home.T).sum((1, 2))], axis=1)
+    true_p /= true_p.sum(1, keepdims=True)
+
+    hg, ag = rng.poisson(lam_h), rng.poisson(lam_a)
+    margin = 1.05
+    # 마진 포함 내재확률 상한 → 모든 배당 > 1 (_open_close_odds 가 배당 <= 1 행을 버리므로)
+    max_implied = 0.95
+
+    def to_odds(p):
+        return 1 / np.minimum(p / p.sum(1, keepdims=True) * margin, max_implied)
+
+    open_odds = to_odds(true_p * np.exp(rng.normal(0, 0.08, true_p.shape)))
+    close_odds = to_odds(true_p * np.exp(rng.normal(0, 0.03, true_p.shape)))
+
+    start = np.datetime64("2015-07-01")
+    dates = start + (day_idx * 3.5).astype("timedelta64[D]")
+    match_id = np.array([f"syn{i}" for i in range(n_matches)])
+    names = np.array([f"Team {i:03d}" for i in range(n_teams)])
+    matches = pd.DataFrame({
+        "match_id": match_id,
+        "league": np.array([f"league_{lg}" for lg in range(n_leagues)])[league_idx],
+        "season": (day_idx // 110).astype(str),
+        "home_team": names[home_idx], "away_team": names[away_idx],
+        "match_date": pd.to_datetime(dates),
+        "home_score": hg, "away_score": ag,
+    })
+    kickoff = pd.to_datetime(dates)
+    odds = pd.concat([
+        pd.DataFrame({"match_id": match_id, "home_odds": open_odds[:, 0], "draw_odds": open_odds[:, 1],
+                      "away_odds": open_odds[:, 2], "collected_at": kickoff - pd.Timedelta(days=3)}),
+        pd.DataFrame({"match_id": match_id, "home_odds": close_odds[:, 0], "draw_odds": close_odds[:, 1],
+                      "away_odds": close_odds[:, 2], "collected_at": kickoff - pd.Timedelta(minutes=5)}),
+    ], ignore_index=True)
+    return matches, odds
+
+
+# ─────────────────────────────────────────────
+# POINT-IN-TIME FEATURES
+# ─────────────────────────────────────────────
+
+@dataclass
+class FeatureMatrix:
+    X: np.ndarray                 # (n, F) float32 — get_feature_names() 순서
+    names: List[str]
+    history: np.ndarray           # 두 팀 중 적은 쪽의 이전 경기 수
+    ctx: Dict[str, np.ndarray] = field(default_factory=dict)  # AIPredictor/휴리스틱 재생용 원자료
+
+    def col(self, name: str) -> np.ndarray:
+        return self.X[:, self.names.index(name)]
+
+
+def build_features(data: MatchArrays, window: int = HISTORY_WINDOW) -> FeatureMatrix:
+    """
+    경기일 배치 단위로 피처 계산 후 상태 갱신 → 각 경기는 전날까지의 결과만 사용.
+    """
+    n, n_teams = len(data), len(data.teams)
+    names = get_feature_names()
+    X = np.zeros((n, len(names)), dtype=np.float32)
+    c = {name: i for i, name in enumerate(names)}
+    home, away, result = data.home, data.away, data.result.astype(np.int64)
+
+    # 팀 상태 (최신 경기가 마지막 열)
+    hist_res = np.full((n_teams, window), -1, np.int8)      # 2=W 1=D 0=L
+    hist_gf = np.full((n_teams, window), np.nan, np.float32)
+    hist_ga = np.full((n_teams, window), np.nan, np.float32)
+    hist_day = np.full((n_teams, window), NO_DAY, np.int64)
+    played = np.zeros(n_teams, np.int32)
+    venue = np.zeros((n_teams, 2, 3), np.int32)             # [팀, 홈/원정, W/D/L]
+
+    # 상대전적: 팀 쌍 인덱스
+    lo, hi = np.minimum(home, away).astype(np.int64), np.maximum(home, away).astype(np.int64)
+    _, pair_idx = np.unique(lo * n_teams + hi, return_inverse=True)
+    n_pairs = pair_idx.max() + 1 if n else 0
+    h2h_by_result = np.zeros((n_pairs, 3), np.int32)        # feature_store 방식 (결과 코드별 집계)
+    h2h_by_team = np.zeros((n_pairs, 3), np.int32)          # lo 팀 승 / 무 / hi 팀 승
+
+    # 리그-시즌 순위표
+    _, group = np.unique(np.char.add(data.league.astype(str), "|" + data.season.astype(str)) if n else [],
+                         return_inverse=True)
+    n_groups = group.max() + 1 if n else 1
+    _, tg = np.unique(np.concatenate([home * n_groups + group, away * n_groups + group]).astype(np.int64),
+                      return_inverse=True)
+    tg_home, tg_away = tg[:n], tg[n:]
+    tg_group = np.empty(tg.max() + 1 if n else 0, np.int64)
+    tg_group[tg_home], tg_group[tg_away] = group, group
+    points = np.zeros(len(tg_group), np.int32)
+    games = np.zeros(len(tg_group), np.int32)
+    order = np.argsort(tg_group, kind="stable")
+    members = np.split(order, np.flatnonzero(np.diff(tg_group[order])) + 1) if len(order) else []
+
+    ctx = {
+        "home_form": np.full((n, window), -1, np.int8), "away_form": np.full((n, window), -1, np.int8),
+        "home_rank": np.zeros(n, np.int32), "away_rank": np.zeros(n, np.int32), "n_teams": np.zeros(n, np.int32),
+        "home_venue": np.zeros((n, 3), np.int32), "away_venue": np.zeros((n, 3), np.int32),
+        "h2h_team": np.zeros((n, 3), np.int32),                # 이번 경기 홈팀 기준 승/무/패
+        "matches14_home": np.zeros(n, np.int32), "matches14_away": np.zeros(n, np.int32),
+    }
+    history = np.zeros(n, np.int32)
+
+    starts = np.r_[0, np.flatnonzero(np.diff(data.day)) + 1] if n else np.array([], int)
+    ends = np.r_[starts[1:], n] if n else np.array([], int)
+    pts_for = np.array([3, 1, 0])
+
+    for s, e in zip(starts, ends):
+        h, a, d = home[s:e], away[s:e], data.day[s]
+
+        # ── 폼 (최근 5경기) ──
+        for side, t in (("home", h), ("away", a)):
+            res = hist_res[t]
+            ctx[f"{side}_form"][s:e] = res
+            last5 = res[:, -5:]
+            cnt = (last5 >= 0).sum(1)
+            X[s:e, c[f"{side}_win_rate_last5"]] = np.where(cnt > 0, (last5 == 2).sum(1) / np.maximum(cnt, 1), 0.33)
+            X[s:e, c[f"{side}_draw_rate_last5"]] = np.where(cnt > 0, (last5 == 1).sum(1) / np.maximum(cnt, 1), 0.33)
+
+            # 득실 평균 (최근 10경기)
+            gf, ga = hist_gf[t], hist_ga[t]
+            n_g = (~np.isnan(gf)).sum(1)
+            X[s:e, c[f"{side}_goals_for_avg"]] = np.where(n_g > 0, np.nansum(gf, 1) / np.maximum(n_g, 1), 1.2)
+            X[s:e, c[f"{side}_goals_against_avg"]] = np.where(n_g > 0, np.nansum(ga, 1) / np.maximum(n_g, 1), 1.2)
+
+            # 휴식일 / 14일 내 경기 수
+            last = hist_day[t, -1]
+            X[s:e, c[f"{side}_rest_days"]] = np.where(last > NO_DAY, np.clip(d - last, 0, 30), 7.0)
+            ctx[f"matches14_{side}"][s:e] = (hist_day[t] >= d - 14).sum(1)
+
+        history[s:e] = np.minimum(played[h], played[a])
+
+        # ── 홈/원정 성적 ──
+        hv, av = venue[h, 0], venue[a, 1]
+        ctx["home_venue"][s:e], ctx["away_venue"][s:e] = hv, av
+        hv_n, av_n = hv.sum(1), av.sum(1)
+        X[s:e, c["home_team_home_win_rate"]] = np.where(hv_n > 0, hv[:, 0] / np.maximum(hv_n, 1), 0.4)
+        X[s:e, c["away_team_away_win_rate"]] = np.where(av_n > 0, av[:, 0] / np.maximum(av_n, 1), 0.3)
+
+        # ── 상대전적 ──
+        pi = pair_idx[s:e]
+        by_res = h2h_by_result[pi]
+        total = by_res.sum(1)
+        X[s:e, c["h2h_home_win_rate"]] = by_res[:, 0] / np.maximum(total, 1)
+        X[s:e, c["h2h_draw_rate"]] = by_res[:, 1] / np.maximum(total, 1)
+        X[s:e, c["h2h_total_matches"]] = total
+        by_team = h2h_by_team[pi]
+        home_is_lo = (h < a)[:, None]
+        ctx["h2h_team"][s:e] = np.where(home_is_lo, by_team, by_team[:, ::-1])
+
+        # ── 순위/승점 (리그-시즌 누적) ──
+        g = group[s:e]
+        th, ta = tg_home[s:e], tg_away[s:e]
+        rank_h = np.full(e - s, 10, np.int32)
+        rank_a = np.full(e - s, 10, np.int32)
+        n_tm = np.zeros(e - s, np.int32)
+        for grp in np.unique(g):
+            mem = members[grp]
+            sel = g == grp
+            n_tm[sel] = len(mem)
+            active = points[mem][games[mem] > 0]
+            if not len(active):
+                continue
+            ranked = np.sort(active)
+            for t_idx, out in ((th, rank_h), (ta, rank_a)):
+                tv = t_idx[sel]
+                r = len(ranked) - np.searchsorted(ranked, points[tv], side="right") + 1
+                out[sel] = np.where(games[tv] > 0, r, 10)
+        ctx["home_rank"][s:e], ctx["away_rank"][s:e], ctx["n_teams"][s:e] = rank_h, rank_a, n_tm
+        X[s:e, c["home_rank"]], X[s:e, c["away_rank"]] = rank_h, rank_a
+        X[s:e, c["home_points"]] = np.where(games[th] > 0, points[th], 30)
+        X[s:e, c["away_points"]] = np.where(games[ta] > 0, points[ta], 30)
+
+        # ── 상태 갱신 (이 날의 결과) ──
+        res = result[s:e]
+        home_code, away_code = (2 - res).astype(np.int8), res.astype(np.int8)
+        hg = data.home_goals[s:e].astype(np.float32)
+        ag = data.away_goals[s:e].astype(np.float32)
+        for t, code, gf, ga in ((h, home_code, hg, ag), (a, away_code, ag, hg)):
+            hist_res[t] = np.concatenate([hist_res[t][:, 1:], code[:, None]], 1)
+            hist_gf[t] = np.concatenate([hist_gf[t][:, 1:], gf[:, None]], 1)
+            hist_ga[t] = np.concatenate([hist_ga[t][:, 1:], ga[:, None]], 1)
+            hist_day[t] = np.concatenate([hist_day[t][:, 1:], np.full((len(t), 1), d)], 1)
+            played[t] += 1
+        np.add.at(venue, (h, 0, 2 - home_code), 1)
+        np.add.at(venue, (a, 1, 2 - away_code), 1)
+        np.add.at(h2h_by_result, (pi, res), 1)
+        np.add.at(h2h_by_team, (pi, np.where(h < a, res, 2 - res)), 1)
+        np.add.at(points, th, pts_for[res])
+        np.add.at(points, ta, pts_for[2 - res])
+        np.add.at(games, th, 1)
+        np.add.at(games, ta, 1)
+
+    # ── 파생 피처 (feature_store.extract_features_with_odds 와 동일) ──
+    X[:, c["rank_diff"]] = X[:, c["away_rank"]] - X[:, c["home_rank"]]
+    X[:, c["points_diff"]] = X[:, c["home_points"]] - X[:, c["away_points"]]
+
+    o = data.open_odds
+    valid = (o[:, 0] > 1) & (o[:, 2] > 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = np.where(np.nan_to_num(o) > 1, 1 / o, 0.0)
+    total_implied = inv.sum(1)
+    for j, name in enumerate(("implied_prob_home", "implied_prob_draw", "implied_prob_away")):
+        X[:, c[name]] = np.where(valid & (total_implied > 0), inv[:, j] / np.where(total_implied > 0, total_implied, 1), 0.33)
+    X[:, c["odds_margin"]] = np.where(valid, total_implied - 1.0, 0.0)
+
+    gf_h, ga_h = X[:, c["home_goals_for_avg"]], X[:, c["home_goals_against_avg"]]
+    gf_a, ga_a = X[:, c["away_goals_for_avg"]], X[:, c["away_goals_against_avg"]]
+    X[:, c["goal_diff_home"]] = gf_h - ga_h
+    X[:, c["goal_diff_away"]] = gf_a - ga_a
+    X[:, c["goal_diff_gap"]] = (gf_h - ga_h) - (gf_a - ga_a)
+    for name in ("api_pred_home", "api_pred_draw", "api_pred_away"):
+        X[:, c[name]] = 0.33
+    leagues, inverse = np.unique(data.league.astype(str), return_inverse=True) if n else ([], [])
+    X[:, c["league_home_adv"]] = np.array([LEAGUE_HOME_ADV.get(lg, 1.05) for lg in leagues])[inverse] if n else 0
+    X[:, c["momentum_home"]] = X[:, c["home_win_rate_last5"]] - 0.5
+    X[:, c["momentum_away"]] = X[:, c["away_win_rate_last5"]] - 0.5
+    h2h_total = X[:, c["h2h_total_matches"]]
+    X[:, c["h2h_recency_score"]] = X[:, c["h2h_home_win_rate"]] * np.minimum(np.log(h2h_total + 1) / math.log(11), 1.0)
+    # 부상 정보는 과거 데이터에 없음 → 0 유지
+
+    return FeatureMatrix(X=X, names=names, history=history, ctx=ctx)
+
+
+# ─────────────────────────────────────────────
+# PREDICTORS — predict_proba(data, fm, rows) → (len(rows), 3) [HOME, DRAW, AWAY]
+# ─────────────────────────────────────────────
+
+class MarketPredictor:
+    """시가 배당 내재 확률 (기준선)."""
+    name = "market"
+    trainable = False
+
+    def predict_proba(self, data: MatchArrays, fm: FeatureMatrix, rows: np.ndarray) -> np.ndarray:
+        return np.stack([fm.col("implied_prob_home")[rows], fm.col("implied_prob_draw")[rows],
+                         fm.col("implied_prob_away")[rows]], axis=1).astype(np.float64)
+
+
+class LightGBMPredictor:
+    """
+    LightGBM 재생.
+    - model / model_path 지정: 저장된 모델 그대로 평가 (.pkl joblib 또는 .txt Booster)
+    - 미지정: 폴드마다 이전 구간으로 재학습 (scheduler.initial_train 과 같은 파라미터)
+    """
+    DEFAULT_PARAMS = {
+        "objective": "multiclass", "num_class": 3, "metric": "multi_logloss",
+        "learning_rate": 0.05, "num_leaves": 31, "max_depth": 6, "min_child_samples": 5,
+        "feature_fraction": 0.8, "bagging_fraction": 0.8, "bagging_freq": 5, "verbose": -1,
+    }
+
+    def __init__(self, model=None, model_path: Optional[str] = None, params: Optional[Dict] = None,
+                 num_boost_round: int = 200, name: Optional[str] = None):
+        if model is None and model_path:
+            model = self.load(model_path)
+        self.model = model
+        self.trainable = model is None
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
+        self.num_boost_round = num_boost_round
+        self.name = name or ("lightgbm_walkforward" if self.trainable else "lightgbm_model")
+
+    @staticmethod
+    def load(path: str):
+        import lightgbm as lgb
+        if path.endswith(".txt"):
+            return lgb.Booster(model_file=path)
+        import joblib
+        return joblib.load(path)
+
+    def fit(self, data: MatchArrays, fm: FeatureMatrix, rows: np.ndarray):
+        import lightgbm as lgb
+        # LabelEncoder 순서(AWAY=0, DRAW=1, HOME=2)로 학습 — 운영 학습 코드와 동일
+        y = 2 - data.result[rows].astype(np.int64)
+        self.model = lgb.train(self.params, lgb.Dataset(fm.X[rows], label=y, feature_name=fm.names),
+                               num_boost_round=self.num_boost_round)
+
+    def predict_proba(self, data: MatchArrays, fm: FeatureMatrix, rows: np.ndarray) -> np.ndarray:
+        X = fm.X[rows]
+        if hasattr(self.model, "predict_proba"):
+            probs = self.model.predict_proba(X)
+            classes = [c if isinstance(c, str) else LABEL_ENCODER_ORDER[int(c)] for c in self.model.classes_]
+        else:
+            probs = self.model.predict(X)
+            classes = list(LABEL_ENCODER_ORDER)
+        order = [classes.index(o) for o in OUTCOMES]
+        return np.asarray(probs, dtype=np.float64)[:, order]
+
+
+class HeuristicPredictor:
+    """
+    MLInferenceService 휴리스틱 재생 (heuristic_probs_np 공유).
+    과거 데이터에 xG/PPDA 가 없으므로 시점 득실 평균을 xG 대용으로, 최근 5경기 경기당 승점을 form_index 로 사용.
+    """
+    name = "ml_heuristic"
+    trainable = False
+
+    def predict_proba(self, data: MatchArrays, fm: FeatureMatrix, rows: np.ndarray) -> np.ndarray:
+        from app.services.ml_service import heuristic_probs_np
+
+        def form_index(form):
+            last5 = form[rows][:, -5:]
+            cnt = (last5 >= 0).sum(1)
+            pts = np.where(last5 == 2, 3, np.where(last5 == 1, 1, 0)).sum(1)
+            return np.where(cnt > 0, pts / np.maximum(cnt, 1) / 1.5, 1.0)
+
+        zeros = np.zeros(len(rows))
+        fatigue = (np.minimum(fm.ctx["matches14_home"][rows] * 0.15, 1.0)
+                   - np.minimum(fm.ctx["matches14_away"][rows] * 0.15, 1.0))
+        return heuristic_probs_np(
+            home_xG_advantage=fm.col("home_goals_for_avg")[rows] - fm.col("away_goals_against_avg")[rows],
+            away_xG_advantage=fm.col("away_goals_for_avg")[rows] - fm.col("home_goals_against_avg")[rows],
+            form_diff=form_index(fm.ctx["home_form"]) - form_index(fm.ctx["away_form"]),
+            ppda_diff=zeros, deep_diff=zeros, xg_eff_diff=zeros, possession_diff=zeros,
+            fatigue_diff=fatigue, injury_impact_diff=zeros,
+        ).astype(np.float64)
+
+
+class AIPredictorReplay:
+    """
+    AIPredictor(7-Factor) 재생 — 경기마다 시점 순위표/폼/홈원정/상대전적을 주입해 predict_match 호출.
+    순위표는 리그 팀 수만큼 채워 순위 정규화가 운영과 같도록 함.
+    """
+    name = "ai_predictor"
+    trainable = False
+    _FORM_CHARS = np.array(["L", "D", "W"])
+
+    def __init__(self, predictor=None):
+        from app.core.ai_predictor import AIPredictor
+        self.predictor = predictor or AIPredictor(calibrate=False)
+        self._padding: Dict[int, list] = {}
+
+    def _pad(self, size: int, league: str) -> list:
+        from app.schemas.predictions import TeamStats
+        if size not in self._padding:
+            self._padding[size] = [TeamStats(team_name=f"\x00pad{i}", league=league, season="")
+                                   for i in range(max(size - 2, 0))]
+        return self._padding[size]
+
+    def _form(self, codes: np.ndarray) -> str:
+        return "".join(self._FORM_CHARS[codes[codes >= 0]])
+
+    def predict_proba(self, data: MatchArrays, fm: FeatureMatrix, rows: np.ndarray) -> np.ndarray:
+        from app.schemas.odds import OddsItem
+        from app.schemas.predictions import TeamStats
+
+        ctx = fm.ctx
+        out = np.empty((len(rows), 3))
+        for k, i in enumerate(rows):
+            league = data.league[i]
+            home_name, away_name = data.teams[data.home[i]], data.teams[data.away[i]]
+            hv, av = ctx["home_venue"][i], ctx["away_venue"][i]
+            home_ts = TeamStats(team_name=home_name, league=league, season="", rank=int(ctx["home_rank"][i]),
+                                form=self._form(ctx["home_form"][i]),
+                                home_wins=int(hv[0]), home_draws=int(hv[1]), home_losses=int(hv[2]))
+            away_ts = TeamStats(team_name=away_name, league=league, season="", rank=int(ctx["away_rank"][i]),
+                                form=self._form(ctx["away_form"][i]),
+                                away_wins=int(av[0]), away_draws=int(av[1]), away_losses=int(av[2]))
+            if ctx["home_rank"][i] == 10 and ctx["away_rank"][i] == 10 and ctx["n_teams"][i] == 0:
+                standings = []
+            else:
+                standings = [home_ts, away_ts] + self._pad(int(ctx["n_teams"][i]), league)
+            self.predictor.update_data(standings={league: standings})
+
+            w, dr, l = (int(x) for x in ctx["h2h_team"][i])
+            self.predictor._h2h_cache = {
+                "replay": {"home_team": home_name, "away_team": away_name, "team_a_wins": w,
+                           "team_b_wins": l, "draws": dr, "total_matches": w + dr + l, "recent_results": []}
+            } if w + dr + l else {}
+
+            o = np.nan_to_num(data.open_odds[i])
+            pred = self.predictor.predict_match(OddsItem(
+                provider="backtest", home_odds=float(o[0]), draw_odds=float(o[1]), away_odds=float(o[2]),
+                team_home=home_name, team_away=away_name, league=league, sport="Soccer",
+            ))
+            out[k] = (pred.home_win_prob, pred.draw_prob, pred.away_win_prob)
+        return out / out.sum(1, keepdims=True)
+
+
+# ─────────────────────────────────────────────
+# METRICS
+# ─────────────────────────────────────────────
+
+def evaluate(probs: np.ndarray, y: np.ndarray, open_odds: np.ndarray, close_odds: np.ndarray,
+             ev_threshold: float = 0.0, n_bins: int = 10) -> Dict:
+    """정확도 / log-loss / Brier / 캘리브레이션 / ROI / CLV (전부 벡터 연산)."""
+    n = len(y)
+    if n == 0:
+        return {"n": 0}
+    p = np.clip(probs, 1e-12, None)
+    p = p / p.sum(1, keepdims=True)
+    idx = np.arange(n)
+    pick = p.argmax(1)
+    hit = pick == y
+    onehot = np.zeros_like(p)
+    onehot[idx, y] = 1.0
+
+    # 캘리브레이션 (top-label reliability)
+    top = p[idx, pick]
+    bins = np.minimum((top * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    conf_sum = np.bincount(bins, weights=top, minlength=n_bins)
+    hit_sum = np.bincount(bins, weights=hit.astype(float), minlength=n_bins)
+    nz = counts > 0
+    ece = float(np.abs(conf_sum[nz] - hit_sum[nz]).sum() / n)
+    calibration = [
+        {"bin": f"{b / n_bins:.1f}-{(b + 1) / n_bins:.1f}", "n": int(counts[b]),
+         "avg_confidence": round(conf_sum[b] / counts[b], 4), "hit_rate": round(hit_sum[b] / counts[b], 4)}
+        for b in np.flatnonzero(nz)
+    ]
+
+    # 가치 베팅 ROI (시가 배당, 1 unit flat) + CLV (시가/마감 - 1)
+    pick_open = open_odds[idx, pick]
+    pick_close = close_odds[idx, pick]
+    with np.errstate(invalid="ignore"):
+        bet = (pick_open > 1) & (top * pick_open - 1 > ev_threshold)
+        profit = np.where(hit, pick_open - 1, -1.0)[bet]
+        has_close = bet & (pick_close > 1)
+        clv = pick_open[has_close] / pick_close[has_close] - 1
+
+    return {
+        "n": int(n),
+        "accuracy": round(float(hit.mean()), 4),
+        "log_loss": round(float(-np.log(p[idx, y]).mean()), 4),
+        "brier": round(float(((p - onehot) ** 2).sum(1).mean()), 4),
+        "ece": round(ece, 4),
+        "calibration": calibration,
+        "bets": int(bet.sum()),
+        "profit_units": round(float(profit.sum()), 2),
+        "roi": round(float(profit.mean()), 4) if len(profit) else None,
+        "clv_mean": round(float(clv.mean()), 4) if len(clv) else None,
+        "clv_positive_rate": round(float((clv > 0).mean()), 4) if len(clv) else None,
+    }
+
+
+# ─────────────────────────────────────────────
+# WALK-FORWARD
+# ─────────────────────────────────────────────
+
+def fold_ids(data: MatchArrays, eligible: np.ndarray, n_folds: int) -> np.ndarray:
+    """대상 경기를 날짜 경계로 n_folds+1 구간으로 분할 (같은 날 경기는 같은 구간). 비대상은 -1."""
+    ids = np.full(len(data), -1, np.int32)
+    rows = np.flatnonzero(eligible)
+    if not len(rows):
+        return ids
+    cut_rows = rows[[int(len(rows) * k / (n_folds + 1)) for k in range(1, n_folds + 1)]]
+    ids[rows] = np.searchsorted(data.day[cut_rows], data.day[rows], side="right")
+    return ids
+
+
+def walk_forward(data: MatchArrays, predictors: Sequence, n_folds: int = 5, min_history: int = 3,
+                 ev_threshold: float = 0.0, features: Optional[FeatureMatrix] = None) -> Dict:
+    """
+    모든 예측기를 같은 폴드에서 평가. 구간 0 은 학습 전용, 구간 1..n_folds 가 테스트.
+    trainable 예측기는 테스트 구간 이전의 모든 구간으로 재학습 (expanding window).
+    """
+    t0 = time.perf_counter()
+    fm = features or build_features(data)
+    feature_sec = time.perf_counter() - t0
+    folds = fold_ids(data, fm.history >= min_history, n_folds)
+
+    report = {
+        "matches": len(data),
+        "eligible": int((folds >= 0).sum()),
+        "folds": n_folds,
+        "feature_build_sec": round(feature_sec, 3),
+        "predictors": {},
+    }
+    day0 = np.datetime64(0, "D")
+    for predictor in predictors:
+        per_fold, all_rows, all_probs = [], [], []
+        fit_sec = predict_sec = 0.0
+        for k in range(1, n_folds + 1):
+            test = np.flatnonzero(folds == k)
+            if not len(test):
+                continue
+            if predictor.trainable:
+                t = time.perf_counter()
+                predictor.fit(data, fm, np.flatnonzero((folds >= 0) & (folds < k)))
+                fit_sec += time.perf_counter() - t
+            t = time.perf_counter()
+            probs = predictor.predict_proba(data, fm, test)
+            predict_sec += time.perf_counter() - t
+            metrics = evaluate(probs, data.result[test], data.open_odds[test], data.close_odds[test], ev_threshold)
+            metrics.pop("calibration")
+            metrics["from"] = str(day0 + int(data.day[test[0]]))
+            metrics["to"] = str(day0 + int(data.day[test[-1]]))
+            per_fold.append(metrics)
+            all_rows.append(test)
+            all_probs.append(probs)
+
+        rows = np.concatenate(all_rows) if all_rows else np.array([], int)
+        overall = evaluate(np.concatenate(all_probs) if all_probs else np.zeros((0, 3)), data.result[rows],
+                           data.open_odds[rows], data.close_odds[rows], ev_threshold)
+        report["predictors"][predictor.name] = {
+            "overall": overall,
+            "per_fold": per_fold,
+            "fit_sec": round(fit_sec, 3),
+            "predict_sec": round(predict_sec, 3),
+        }
+    report["total_sec"] = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def make_predictors(kind: str, model_path: Optional[str] = None) -> List:
+    kinds = ["market", "lightgbm", "heuristic", "ai"] if kind == "all" else kind.split(",")
+    out = []
+    for k in kinds:
+        if k == "market":
+            out.append(MarketPredictor())
+        elif k == "lightgbm":
+            out.append(LightGBMPredictor(model_path=model_path) if model_path else LightGBMPredictor())
+        elif k == "heuristic":
+            out.append(HeuristicPredictor())
+        elif k == "ai":
+            out.append(AIPredictorReplay())
+        else:
+            raise ValueError(f"Unknown predictor: {k}")
+    return out
+
+
+def _print_report(report: Dict):
+    print(f"\n📊 Walk-forward backtest — {report['matches']} matches "
+          f"({report['eligible']} eligible, {report['folds']} folds), "
+          f"features {report['feature_build_sec']}s, total {report['total_sec']}s")
+    print(f"{'predictor':<22}{'acc':>8}{'logloss':>9}{'brier':>8}{'ece':>8}{'bets':>8}{'roi':>9}{'clv':>9}{'sec':>8}")
+    for name, r in report["predictors"].items():
+        o = r["overall"]
+        fmt = lambda v: "-" if v is None else f"{v:.4f}"
+        print(f"{name:<22}{o.get('accuracy', 0):>8.4f}{o.get('log_loss', 0):>9.4f}{o.get('brier', 0):>8.4f}"
+              f"{o.get('ece', 0):>8.4f}{o.get('bets', 0):>8}{fmt(o.get('roi')):>9}{fmt(o.get('clv_mean')):>9}"
+              f"{r['fit_sec'] + r['predict_sec']:>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline walk-forward backtester")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--data", help="matches_raw / odds_history .parquet|.csv 디렉터리")
+    src.add_argument("--bigquery", action="store_true", help="BigQuery 에서 로드 (온라인)")
+    src.add_argument("--synthetic", type=int, help="합성 경기 N개로 실행 (벤치마크)")
+    parser.add_argument("--export", help="--bigquery 로드 결과를 Parquet 로 저장할 디렉터리")
+    parser.add_argument("--predictor", default="all", help="market,lightgbm,heuristic,ai 또는 all")
+    parser.add_argument("--model", help="평가할 LightGBM 모델 파일 (.pkl/.txt). 없으면 폴드별 재학습")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-history", type=int, default=3)
+    parser.add_argument("--ev-threshold", type=float, default=0.0)
+    parser.add_argument("--json", help="리포트 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    if args.data:
+        data = load_local(args.data)
+    elif args.bigquery:
+        data = load_bigquery(args.export)
+    else:
+        data = MatchArrays.from_frames(*synthetic_frames(args.synthetic))
+    print(f"Loaded {len(data)} matches, {len(data.teams)} teams in {time.perf_counter() - t:.2f}s")
+
+    report = walk_forward(data, make_predictors(args.predictor, args.model), n_folds=args.folds,
+                          min_history=args.min_history, ev_threshold=args.ev_threshold)
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
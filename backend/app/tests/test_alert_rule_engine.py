@@ -0,0 +1,119 @@
+import sys
+import os
+import asyncio
+import random
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.api.endpoints.vip_alerts import _matches_rule
+from app.services.alert_rule_engine import AlertRuleEngine, RuleIndex
+
+
+class FakeStore:
+    def __init__(self, rules):
+        self.rules = rules
+        self.ver = 1
+        self.loads = 0
+        self.flushed = []
+
+    def load_rules(self):
+        self.loads += 1
+        return [r for r in self.rules if r[2].get("enabled") is True]
+
+    def version(self):
+        return self.ver
+
+    def flush_counters(self, counters):
+        self.flushed.append(dict(counters))
+
+
+def _random_rules(n, rng):
+    fields = {
+        "efficiency": ["5", "10", "15", "20.5", "abc"],
+        "kelly_pct": ["1", "3", "5"],
+        "league_name": ["Premier League", "La Liga", "premier league", "Serie A"],
+        "team_name": ["Arsenal", "Real Madrid", "arsenal"],
+    }
+    ops = [">", ">=", "<", "<=", "==", "contains", "!="]
+    rules = []
+    for i in range(n):
+        name = rng.choice(list(fields))
+        rules.append((f"u{i % 37}", f"r{i}", {
+            "field": name, "operator": rng.choice(ops), "value": rng.choice(fields[name]),
+            "enabled": rng.random() > 0.1,
+        }))
+        if i % 50 == 0:
+            del rules[-1][2]["enabled"]     # enabled 필드 없는 레거시 규칙
+    return rules
+
+
+def test_index_matches_linear_scan_semantics():
+    rng = random.Random(7)
+    rules = _random_rules(2000, rng)
+    index = RuleIndex(rules)
+    for _ in range(300):
+        match = {
+            "efficiency": rng.choice([0, 5, 10, 14.9, 15, 25, "n/a", None]),
+            "kelly_pct": rng.choice([0.5, 3, 5, 7]),
+            "league_name": rng.choice(["English Premier League", "La Liga 2", "Bundesliga", "15"]),
+            "team_name": rng.choice(["Arsenal", "ARSENAL", "Chelsea"]),
+        }
+        expected = sorted((u, r) for u, r, rule in rules if rule.get("enabled") is True and _matches_rule(rule, match))
+        got = sorted((u, r) for u, r, _ in index.match(match))
+        assert got == expected
+
+
+def test_engine_reloads_on_version_change_and_batches_counters():
+    clock = [0.0]
+    store = FakeStore([
+        ("u1", "a", {"field": "efficiency", "operator": ">=", "value": "10", "enabled": True}),
+        ("u2", "b", {"field": "league_name", "operator": "contains", "value": "Premier", "enabled": True}),
+    ])
+    engine = AlertRuleEngine(store=store, clock=lambda: clock[0], refresh_poll=30, flush_interval=60)
+
+    async def run():
+        slate = [{"efficiency": 12, "league_name": "Premier League"}, {"efficiency": 3, "league_name": "Serie A"}]
+        first = await engine.evaluate(slate)
+        await engine.evaluate(slate)
+        assert store.loads == 1
+        assert await engine.flush() == 0          # 주기 전에는 보류
+
+        store.rules.append(("u3", "c", {"field": "efficiency", "operator": "<", "value": "5", "enabled": True}))
+        store.ver = 2
+        clock[0] = 31.0
+        second = await engine.evaluate(slate)
+        clock[0] = 61.0
+        flushed = await engine.flush()
+        return first, second, flushed
+
+    first, second, flushed = asyncio.run(run())
+    assert sorted(m["rule_id"] for m in first) == ["a", "b"]
+    assert sorted(m["rule_id"] for m in second) == ["a", "b", "c"]
+    assert store.loads == 2 and flushed == 3
+    assert len(store.flushed) == 1
+    assert store.flushed[0][("u1", "a")][0] == 3 and store.flushed[0][("u3", "c")][0] == 1
+
+
+def test_invalidate_during_reload_is_not_lost():
+    store = FakeStore([("u1", "a", {"field": "efficiency", "operator": ">=", "value": "10", "enabled": True})])
+    engine = AlertRuleEngine(store=store, clock=lambda: 0.0, refresh_poll=30)
+    load_rules = store.load_rules
+
+    def racing_load():
+        # 적재 도중 같은 인스턴스에서 규칙 추가 + invalidate (버전은 그대로)
+        rules = load_rules()
+        if store.loads == 1:
+            store.rules.append(("u2", "b", {"field": "efficiency", "operator": "<", "value": "5", "enabled": True}))
+            engine.invalidate()
+        return rules
+
+    store.load_rules = racing_load
+    slate = [{"efficiency": 3}]
+
+    async def run():
+        return await engine.evaluate(slate), await engine.evaluate(slate)
+
+    first, second = asyncio.run(run())
+    assert first == [] and [m["rule_id"] for m in second] == ["b"]
+    assert store.loads == 2
@@ -0,0 +1,113 @@
+import sys
+import os
+import asyncio
+import httpx
+import pytest
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import backfill
+
+
+def _fixture(fid):
+    return {
+        "fixture": {"id": fid, "date": "2024-01-01T15:00:00+00:00", "venue": {"name": "Stadium"}},
+        "teams": {"home": {"name": "Home"}, "away": {"name": "Away"}},
+        "goals": {"home": 2, "away": 1},
+        "league": {"round": "Regular Season - 1"},
+    }
+
+
+class FakeApiFootball:
+    def __init__(self, throttle_first=0):
+        self.requests = []
+        self.throttle_first = throttle_first
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.path, dict(request.url.params)))
+        if self.throttle_first > 0:
+            self.throttle_first -= 1
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if request.url.path.endswith("/fixtures"):
+            return httpx.Response(200, json={"response": [_fixture(1), _fixture(2)]})
+        return httpx.Response(200, json={"response": []})
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    api = FakeApiFootball()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(backfill.httpx, "AsyncClient",
+                        lambda **kw: real_client(transport=httpx.MockTransport(api.handler), **kw))
+
+    store = {}
+    eng = backfill.HistoricalBackfill(limiter=backfill.AdaptiveRateLimiter(max_per_minute=60000))
+    eng.api = api
+    eng.store = store
+    eng.inserted = []
+
+    async def load():
+        return dict(store.get("ckpt", {}))
+
+    async def save():
+        store["ckpt"] = {**eng._checkpoint, "units": dict(eng._checkpoint["units"])}
+
+    async def insert(table, rows):
+        eng.inserted.append((table, len(rows)))
+        return True
+
+    monkeypatch.setattr(eng, "_load_checkpoint", load)
+    monkeypatch.setattr(eng, "_save_checkpoint", save)
+    monkeypatch.setattr(eng, "_insert_rows", insert)
+    return eng
+
+
+def test_budget_stop_then_resume_skips_completed_units(engine):
+    leagues = ["soccer_epl", "soccer_italy_serie_a"]
+    # matches 1건 + odds 2건(bookmaker 폴백) = 리그당 3건 → 예산 4건이면 일부만 완료
+    engine.daily_budget = 4
+    first = asyncio.run(engine.run_full_backfill(seasons=[2024], leagues=leagues, concurrency=1))
+    assert first["status"] == "rate_limit_reached"
+    assert first["remaining_units"]
+
+    done_first = {uid for uid, u in engine.store["ckpt"]["units"].items() if u["status"] == "done"}
+    requests_first = len(engine.api.requests)
+
+    engine.daily_budget = 100
+    second = asyncio.run(engine.run_full_backfill(seasons=[2024], leagues=leagues, concurrency=3))
+    assert second["remaining_units"] == []
+
+    units = engine.store["ckpt"]["units"]
+    assert all(u["status"] == "done" and u["attempts"] == 1 for u in units.values())
+    assert len(units) == 4
+    # 재실행은 남은 단위만 호출
+    assert second["api_requests_used"] == len(engine.api.requests) - requests_first
+    fixture_calls = [params["league"] for path, params in engine.api.requests if path.endswith("/fixtures")]
+    assert sorted(fixture_calls) == ["135", "39"]
+    assert done_first
+    status = asyncio.run(engine.get_status())
+    assert status["percent"] == 100.0 and status["remaining"] == 0
+
+
+def test_throttled_requests_back_off_and_retry(engine):
+    engine.api.throttle_first = 2
+    result = asyncio.run(engine.run_full_backfill(seasons=[2024], leagues=["soccer_epl"], concurrency=1))
+    assert result["total_matches_collected"] == 2
+    assert result["remaining_units"] == []
+    assert engine.limiter.backoff > 1.0
+
+
+def test_concurrent_workers_never_exceed_daily_budget(engine):
+    # 4단위(6건) + 429 재시도 2건을 동시 4개 워커로 — 예산 5건을 넘겨 보내지 않음
+    engine.api.throttle_first = 2
+    engine.daily_budget = 5
+    leagues = ["soccer_epl", "soccer_italy_serie_a"]
+    result = asyncio.run(engine.run_full_backfill(seasons=[2024], leagues=leagues, concurrency=4))
+    assert result["status"] == "rate_limit_reached"
+    assert len(engine.api.requests) == 5
+    ckpt = engine.store["ckpt"]
+    assert ckpt["requests_today"] == 5
+    # 예산 때문에 끊긴 단위는 실패로 기록하지 않음 → 다음 실행에서 처음부터
+    assert all(u["status"] == "done" for u in ckpt["units"].values())
+    assert result["remaining_units"]
@@ -0,0 +1,84 @@
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.backtest_cube import InsightCube
+from app.services.backtest_engine import BacktestEngine
+
+
+def _day(offset):
+    return (datetime.now(timezone.utc).date() - timedelta(days=offset)).isoformat()
+
+
+def _cell(league, ob, cb, rec, act, day, n, c, conf=0.6, ll=0.9):
+    return {"league": league, "ob": ob, "cb": cb, "rec": rec, "act": act, "day": day,
+            "n": n, "c": c, "sc": conf * n, "scc": conf * c, "sl": ll * n, "nl": n}
+
+
+def _cube():
+    rows = [
+        _cell("soccer_epl", 1, 1, "HOME", "HOME", _day(1), 8, 8),
+        _cell("soccer_epl", 1, 1, "HOME", "AWAY", _day(1), 2, 0),
+        _cell("soccer_epl", 3, 2, "DRAW", "DRAW", _day(2), 1, 1),
+        _cell("soccer_epl", 3, 2, "DRAW", "HOME", _day(2), 3, 0),
+        _cell(None, -1, 3, "AWAY", "AWAY", _day(40), 5, 5),
+    ]
+    seq = [{"day": _day(40), "seq": "11111"}, {"day": _day(2), "seq": "1000"}, {"day": _day(1), "seq": "1111111011"}]
+    detail = [
+        {"match_id": "m1", "correct": True, "confidence": 0.8, "predicted_at": _day(1) + " 12:00:00+00:00"},
+        {"match_id": "m2", "correct": False, "confidence": 0.7, "predicted_at": _day(40) + " 12:00:00+00:00"},
+    ]
+    return InsightCube.from_rows(rows, seq, detail, model_version="v7")
+
+
+def test_cube_slices_match_window():
+    cube = _cube()
+    overall = cube.overall(30)
+    assert (overall["total_predictions"], overall["correct_count"]) == (14, 9)
+    assert overall["accuracy_pct"] == 64.3
+    assert overall["model_version"] == "v7"
+    assert cube.overall(90)["total_predictions"] == 19
+
+    assert cube.by_league(30) == [{"league": "soccer_epl", "matches": 14, "correct": 9, "accuracy_pct": 64.3,
+                                   "avg_confidence": 0.6, "avg_log_loss": 0.9}]
+    assert [r["odds_range"][:7] for r in cube.by_odds_range(90)] == ["1.3-1.6", "2.0-2.5"]
+    assert cube.miss_patterns(30)[0] == {"predicted": "DRAW", "actual": "HOME", "miss_count": 3,
+                                         "avg_confidence_when_wrong": 0.6}
+    draw = cube.draw_analysis(30)
+    assert (draw[0]["total"], draw[0]["correct"], draw[1]["total"], draw[1]["correct"]) == (4, 1, 1, 1)
+    bias = {r["recommendation"]: r["recommendation_pct"] for r in cube.home_away_bias(30)}
+    assert bias == {"HOME": 71.4, "DRAW": 28.6}
+
+
+def test_streak_and_detail_lists_respect_window():
+    cube = _cube()
+    assert cube.max_streak(30) == 7
+    assert cube.max_streak(90) == 7
+    assert [r["match_id"] for r in cube.high_confidence_hits(30)] == ["m1"]
+    assert cube.overconfident_misses(30) == []
+    assert [r["match_id"] for r in cube.overconfident_misses(90)] == ["m2"]
+
+
+def test_engine_serves_endpoints_from_cube_without_queries(monkeypatch):
+    from app.services import backtest_engine as be
+
+    calls = []
+
+    async def fake_query(sql):
+        calls.append(sql)
+        return []
+
+    monkeypatch.setattr(be.bq, "query", fake_query)
+    engine = BacktestEngine()
+    engine._restore_attempted = True
+    engine._set_cube(InsightCube.from_dict(_cube().to_dict()))
+
+    insights = asyncio.run(engine.get_full_insights(days=30))
+    assert calls == []
+    assert insights["overall"]["total_predictions"] == 14
+    assert insights["strong_patterns"]["max_streak"] == 7
+    assert "DRAW" in insights["weak_patterns"]["analysis_summary"]
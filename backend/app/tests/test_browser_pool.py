@@ -0,0 +1,131 @@
+import sys
+import os
+import asyncio
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import browser_recorder
+from app.services.browser_pool import BrowserPool, context_options
+
+FIXTURE_URL = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "bets.html")
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+def test_pool_reuses_warm_contexts_and_limits_pages(monkeypatch):
+    browser = FakeBrowser()
+    pool = BrowserPool(max_pages=2, idle_seconds=0)
+
+    async def fake_ensure_browser():
+        return browser
+
+    monkeypatch.setattr(pool, "_ensure_browser", fake_ensure_browser)
+    peak = {"now": 0, "max": 0}
+    leased = []
+
+    async def job(lang):
+        async with pool.page(**context_options(540, 960, lang)) as page:
+            leased.append(page)
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(job("ko" if i % 2 else "en") for i in range(6)))
+        async with pool.context(record_video_dir="/tmp/x") as context:
+            recording = context
+        return recording
+
+    recording = asyncio.run(run())
+    assert peak["max"] == 2
+    assert len(leased) == 6 and all(page.closed for page in leased)
+    # 옵션(로케일)별 웜 컨텍스트 2개만 생성, 반납 후에도 열린 채 유지 / 녹화 컨텍스트는 일회용
+    warm = [c for c in browser.contexts if "record_video_dir" not in c.options]
+    assert len(warm) == 2 and not any(c.closed for c in warm)
+    assert recording.closed and pool.stats()["leases"] == 7
+
+
+def _chromium_available():
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        return False
+
+    async def probe():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(probe())
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _chromium_available(), reason="playwright chromium not available")
+def test_capture_all_cards_from_single_page_load():
+    pool = BrowserPool(idle_seconds=0)
+
+    async def run():
+        try:
+            return await browser_recorder.capture_match_screenshots(
+                max_matches=7, viewport_width=540, viewport_height=960, bets_url=FIXTURE_URL, pool=pool)
+        finally:
+            await pool.close()
+
+    shots = asyncio.run(run())
+    assert [s["scene"] for s in shots] == ["intro"] + ["match"] * 7
+    assert [s["match_name"] for s in shots[1:]] == [f"Team {i} vs Rival {i}" for i in range(1, 8)]
+    assert pool.launches == 1 and pool.leases == 1
+
+    for shot in shots[1:]:
+        with Image.open(shot["screenshot_path"]) as image:
+            assert image.size == (540, 960)
+            pixels = np.asarray(image.convert("RGB")).reshape(-1, 3)
+        # 고정 sleep 없이도 지연 로딩된 분석 패널(#00c853)이 펼쳐진 상태로 캡처
+        assert (np.abs(pixels.astype(int) - (0, 200, 83)).sum(axis=1) < 10).mean() > 0.05
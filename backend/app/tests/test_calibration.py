@@ -0,0 +1,110 @@
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core import calibration as cal
+from app.core.model_store import ModelRegistry
+
+
+def _overconfident(n, seed):
+    # 실제 확률 → 과신(temperature 0.5) 된 예측 확률 + 그 실제 확률로 뽑은 결과
+    rng = np.random.default_rng(seed)
+    true = rng.dirichlet([3, 2, 3], size=n)
+    logits = np.log(true) / 0.5
+    pred = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    y = np.array([rng.choice(3, p=p) for p in true])
+    return pred, y
+
+
+def test_fit_league_reduces_ece_and_falls_back_when_sparse():
+    pred, y = _overconfident(2000, 0)
+    entry = cal.fit_league(pred, y)
+    assert entry["method"] in ("isotonic", "temperature")
+    holdout = entry["holdout"]
+    assert holdout["ece_after"] < holdout["ece_before"]
+    assert holdout["log_loss_after"] <= holdout["log_loss_before"]
+    assert sum(b["count"] for b in holdout["reliability_after"]) == holdout["n"]
+
+    temperature = cal.fit_temperature(pred, y)
+    assert 1.5 < temperature < 2.6   # 과신 T=0.5 → 되돌리는 T≈2
+    out = cal.apply_map({"method": "temperature", "t": temperature}, pred)
+    assert np.allclose(out.sum(axis=1), 1) and out.max() < pred.max()
+
+    assert cal.fit_league(pred[:cal.TEMPERATURE_MIN - 1], y[:cal.TEMPERATURE_MIN - 1]) is None
+
+
+def test_incremental_refit_publishes_maps_and_applies_per_league(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path / "registry"), remote=False, check_seconds=3600)
+    pred, y = _overconfident(1200, 1)
+    rows = [
+        {"key": f"m{i}", "league": "EPL" if i % 2 else "KL1", "probs": list(p), "label": cal.OUTPUT_LABELS[c],
+         "at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00"}
+        for i, (p, c) in enumerate(zip(pred, y))
+    ]
+    calls = []
+
+    async def fetch(since):
+        calls.append(since)
+        return [r for r in rows if since is None or r["at"] > since]
+
+    calibrator = cal.ProbabilityCalibrator(root=str(tmp_path / "samples"), registry=registry, mirror=False,
+                                           fetchers={"ml": fetch})
+    summary = asyncio.run(calibrator.refit(["ml"]))
+    assert summary["ml"]["total_rows"] == 1200
+    assert set(summary["ml"]["refit_leagues"]) == {"EPL", "KL1", cal.POOLED}
+    version = registry.current(cal.REGISTRY_NAME).version
+
+    # 새 정산분 없음 → 재적합 / 재발행 없음, 워터마크로 조회
+    asyncio.run(calibrator.refit(["ml"]))
+    assert calls[-1] == rows[-1]["at"]
+    assert registry.current(cal.REGISTRY_NAME).version == version
+
+    probs = np.array([[0.8, 0.1, 0.1], [0.8, 0.1, 0.1], [0.8, 0.1, 0.1]])
+    out = calibrator.apply("ml", ["EPL", "Unknown", "EPL"], probs)
+    assert np.allclose(out.sum(axis=1), 1) and (out[:, 0] < 0.8).all()
+    assert np.allclose(out[0], out[2])
+    # 맵 없는 소스 / percent 스케일
+    assert np.allclose(calibrator.apply("ai", ["EPL"], probs[:1]), probs[:1])
+    assert np.isclose(sum(calibrator.apply_one("ml", "EPL", (80, 10, 10), percent=True)), 100)
+
+    report = calibrator.report("ml", "EPL")
+    entry = report["sources"]["ml"]["EPL"]
+    assert "table" not in entry and entry["holdout"]["reliability_after"]
+
+
+def test_apply_does_not_load_maps_on_the_calling_thread(tmp_path, monkeypatch):
+    import threading
+
+    registry = ModelRegistry(root=str(tmp_path / "registry"), remote=False, check_seconds=3600)
+    pred, y = _overconfident(600, 2)
+    registry.publish({"sources": {"ai": {cal.POOLED: cal.fit_league(pred, y)}}}, cal.REGISTRY_NAME, None, "current")
+
+    loads = []
+    refresh = registry.refresh
+
+    def tracking_refresh(name):
+        loads.append(threading.current_thread() is threading.main_thread())
+        return refresh(name)
+
+    monkeypatch.setattr(registry, "refresh", tracking_refresh)
+    calibrator = cal.ProbabilityCalibrator(root=str(tmp_path / "samples"), registry=registry, mirror=False)
+
+    # 로드 전 — 보정 없이 그대로 반환, 로드는 백그라운드 스레드에서
+    probs = (80.0, 10.0, 10.0)
+    assert calibrator.apply_one("ai", "EPL", probs, percent=True) == probs
+    for thread in threading.enumerate():
+        if thread.name.startswith("model-refresh-"):
+            thread.join(5)
+    assert loads == [False]
+    assert calibrator.apply_one("ai", "EPL", probs, percent=True)[0] < 80.0
+
+    # 시작 시 미리 로드
+    warm = cal.ProbabilityCalibrator(root=str(tmp_path / "samples"), mirror=False,
+                                     registry=ModelRegistry(root=str(tmp_path / "registry"), remote=False))
+    asyncio.run(warm.load())
+    assert warm.apply_one("ai", "EPL", probs, percent=True)[0] < 80.0
@@ -0,0 +1,72 @@
+import sys
+import os
+import asyncio
+
+import numpy as np
+from PIL import ImageFont
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import card_generator as cg
+
+MATCH = {
+    "match_id": "m1", "team_home": "Arsenal", "team_away": "Chelsea", "league": "EPL",
+    "confidence": 72, "recommendation": "HOME", "home_win_prob": 55.2, "draw_prob": 24.1, "away_win_prob": 20.7,
+    "factors": [{"name": "Form", "score": 80}, {"name": "xG", "score": -40}],
+}
+
+
+def test_gradient_matches_line_loop():
+    pixels = cg._vertical_gradient(4, 1080, (15, 15, 25), (25, 20, 45))
+    for y in (0, 1, 107, 540, 1079):
+        expected = (int(15 + (25 - 15) * y / 1080), int(15 + (20 - 15) * y / 1080), int(25 + (45 - 25) * y / 1080))
+        assert tuple(pixels[y, 0]) == expected and tuple(pixels[y, 3]) == expected
+    header = cg._vertical_gradient(2, 80, (147, 51, 234), (99, 102, 241), span=80)
+    assert tuple(header[79, 1]) == (int(147 - 48 * 79 / 80), int(51 + 51 * 79 / 80), int(234 + 7 * 79 / 80))
+
+
+def test_fonts_and_template_are_built_once(monkeypatch):
+    calls = []
+    real_truetype = ImageFont.truetype
+
+    def counting_truetype(path, size, *args, **kwargs):
+        calls.append(size)
+        return real_truetype(path, size)
+
+    # 네트워크 폰트 다운로드 없이 (없는 경로면 load_default 폴백)
+    dejavu = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    monkeypatch.setattr(cg, "_font_paths", lambda: (dejavu, dejavu))
+    monkeypatch.setattr(ImageFont, "truetype", counting_truetype)
+    for fn in (cg._font, cg._card_template, cg._factor_row_tiles):
+        fn.cache_clear()
+    try:
+        images = cg.render_cards([MATCH, dict(MATCH, factors=[]), dict(MATCH, confidence=0)], "png", max_workers=2)
+        assert len(calls) == 4          # 크기별 1회 (카드 수와 무관)
+        assert all(image.startswith(b"\x89PNG") for image in images)
+        webp = cg._create_match_card(MATCH, image_format="webp")
+        assert webp[:4] == b"RIFF" and webp[8:12] == b"WEBP"
+        assert len(calls) == 4
+
+        # 팩터가 없는 카드에는 행 타일이 붙지 않아 배경 그라데이션 그대로
+        from PIL import Image
+        import io
+        bare = np.asarray(Image.open(io.BytesIO(images[1])).convert("RGB"))
+        template = np.asarray(cg._card_template())
+        assert (bare[720:760, 45:60] == template[720:760, 45:60]).all()
+    finally:
+        for fn in (cg._font, cg._card_template, cg._factor_row_tiles):
+            fn.cache_clear()
+
+
+def test_generate_cards_for_predictions_renders_batch_and_uploads(monkeypatch):
+    uploads = []
+    monkeypatch.setattr(cg, "render_cards", lambda matches, fmt: [f"{m['match_id']}-{fmt}".encode() for m in matches])
+    monkeypatch.setattr(cg, "_upload_card",
+                        lambda data, match_id, fmt: uploads.append((data, match_id, fmt)) or f"https://x/{match_id}.{fmt}")
+
+    preds = [dict(MATCH, match_id=f"m{i}") for i in range(5)]
+    results = asyncio.run(cg.generate_cards_for_predictions(preds, image_format="webp"))
+    assert [r["match_id"] for r in results] == ["m0", "m1", "m2"]
+    assert [r["image_url"] for r in results] == ["https://x/m0.webp", "https://x/m1.webp", "https://x/m2.webp"]
+    assert sorted(u[0] for u in uploads) == [b"m0-webp", b"m1-webp", b"m2-webp"]
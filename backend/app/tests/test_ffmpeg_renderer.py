@@ -0,0 +1,108 @@
+import sys
+import os
+import wave
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import ffmpeg_renderer as fr
+
+
+def _moviepy_scene_frames(durations, fps):
+    """write_videofile(t = i/fps) + concatenate_videoclips(start ≤ t) 규칙으로 장면별 프레임 수."""
+    tt = np.cumsum([0] + list(durations))
+    counts = [0] * len(durations)
+    for t in np.arange(0, tt[-1], 1.0 / fps):
+        counts[min(max(i for i, e in enumerate(tt) if e <= t), len(durations) - 1)] += 1
+    return counts
+
+
+def _write_wav(path, seconds, freq=220.0):
+    t = np.arange(int(seconds * 44100)) / 44100
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(44100)
+        w.writeframes((0.3 * np.sin(2 * np.pi * freq * t) * 32767).astype(np.int16).tobytes())
+
+
+def test_scene_frames_match_moviepy_timeline():
+    rng = np.random.default_rng(3)
+    for fps in (24, 30):
+        for _ in range(50):
+            durations = np.round(rng.uniform(0.3, 9.0, rng.integers(1, 8)), 2).tolist()
+            assert fr.scene_frames(durations, fps) == _moviepy_scene_frames(durations, fps)
+
+
+def test_compile_stills_with_overlay_and_ducked_bgm(tmp_path):
+    scenes = [
+        fr.Scene(source="a.png", duration=1.37, audio="a.mp3",
+                 overlays=[fr.Overlay("12:30 'Arsenal' 100%", start=0.2, end=1.0, font="NanumGothic")]),
+        fr.Scene(duration=2.11, audio="b.mp3"),
+        fr.Scene(source="c.png", duration=0.5),
+    ]
+    plan = fr.compile_scenes(scenes, "out.mp4", 1080, 1920, fps=24, bgm="bgm.mp3",
+                             bgm_gain=[0.12, 0.03, 0.05], gain_fps=10, work_dir=str(tmp_path), ffmpeg="ffmpeg")
+    graph = plan.cmd[plan.cmd.index("-filter_complex") + 1]
+
+    assert plan.frames == [33, 51, 12]
+    # 정지 이미지는 1회 변환 후 loop 로 프레임 복제, 단색 장면은 color 소스
+    assert "loop=loop=32:size=1" in graph and "color=c=0x0c0c19:s=1080x1920" in graph
+    assert "concat=n=3:v=1:a=0" in graph and "concat=n=3:v=0:a=1" in graph
+    # 오디오 없는 장면은 무음으로 길이 유지, BGM 은 게인 트랙과 곱한 뒤 정규화 없이 합산
+    assert "anullsrc" in graph and "apad=whole_dur=1.370000" in graph
+    assert "amultiply" in graph and "normalize=0" in graph
+    assert plan.stdin is not None and len(plan.stdin) >= int(plan.duration * fr.GAIN_TRACK_RATE) * 4
+    # 자막 원문은 textfile 로 전달 (필터 이스케이프 불필요)
+    with open(tmp_path / "text_0_0.txt", encoding="utf-8") as f:
+        assert f.read() == "12:30 'Arsenal' 100%"
+    assert "expansion=none" in graph and "between(t,0.200,1.000)" in graph
+    assert not plan.video_copy and "-c:v" in plan.cmd and plan.cmd[plan.cmd.index("-c:v") + 1] == "libx264"
+
+
+def test_compile_uses_stream_copy_for_matching_inputs(tmp_path, monkeypatch):
+    def fake_probe(paths, ffmpeg=None):
+        return [fr.MediaInfo(path=p, duration=4.0, video_codec="h264", width=540, height=960,
+                             fps=25.0, audio_codec="aac") for p in paths]
+
+    monkeypatch.setattr(fr, "probe", fake_probe)
+    scenes = [fr.Scene(source="a.mp4"), fr.Scene(source="b.mp4")]
+    plan = fr.compile_scenes(scenes, "out.mp4", 540, 960, fps=None, work_dir=str(tmp_path), ffmpeg="ffmpeg")
+    assert plan.video_copy and plan.audio_copy
+    assert plan.cmd[plan.cmd.index("-c:v") + 1] == "copy" and "-filter_complex" not in plan.cmd
+    assert plan.frames == [100, 100]
+
+    # BGM 을 섞으면 오디오만 재인코딩, 영상은 여전히 복사
+    plan = fr.compile_scenes(scenes, "out.mp4", 540, 960, fps=None, bgm="bgm.mp3",
+                             work_dir=str(tmp_path), ffmpeg="ffmpeg")
+    assert plan.video_copy and not plan.audio_copy
+
+    # 해상도가 다르면 스케일 → 재인코딩
+    plan = fr.compile_scenes(scenes, "out.mp4", 1080, 1920, fps=None, work_dir=str(tmp_path), ffmpeg="ffmpeg")
+    assert not plan.video_copy and "fps=25.0" in plan.cmd[plan.cmd.index("-filter_complex") + 1]
+
+
+@pytest.mark.skipif(fr.find_ffmpeg() is None, reason="ffmpeg not available")
+def test_render_matches_scene_timing(tmp_path):
+    for i, color in enumerate([(200, 0, 0), (0, 0, 200)]):
+        Image.new("RGB", (54, 96), color).save(tmp_path / f"s{i}.png")
+        _write_wav(str(tmp_path / f"s{i}.wav"), [0.9, 1.3][i])
+    _write_wav(str(tmp_path / "bgm.wav"), 0.5, 110)
+
+    scenes = [fr.Scene(source=str(tmp_path / f"s{i}.png"), audio=str(tmp_path / f"s{i}.wav")) for i in range(2)]
+    out = str(tmp_path / "out.mp4")
+    plan = fr.render(scenes, out, 108, 192, fps=24, bgm=str(tmp_path / "bgm.wav"), bgm_gain=[0.1] * 22)
+    assert plan.durations == [0.9, 1.3] and plan.frames == [22, 31]
+
+    info = fr.probe([out])[0]
+    assert (info.width, info.height, info.video_codec) == (108, 192, "h264")
+    assert info.audio_codec == "aac" and abs(info.duration - 2.2) < 0.1
+
+    # 같은 규격 결과물끼리 병합은 스트림 복사
+    merged = fr.render([fr.Scene(source=out), fr.Scene(source=out)], str(tmp_path / "merged.mp4"), 108, 192, fps=None)
+    assert merged.video_copy
+    assert abs(fr.probe([str(tmp_path / "merged.mp4")])[0].duration - 2 * info.duration) < 0.1
@@ -0,0 +1,159 @@
+import sys
+import os
+import asyncio
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.job_scheduler import JobScheduler, JobSpec, SQLiteLeaseStore, ACQUIRED, HELD, DONE, BACKOFF
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(store, clock, holder, calls, delay=0.0):
+    async def job():
+        calls.append(holder)
+        await asyncio.sleep(delay)
+        return {"ok": True}
+
+    sched = JobScheduler(store=store, holder=holder, clock=clock)
+    sched.register(JobSpec("odds_refresh", job, interval=3600, lease_ttl=60))
+    return sched
+
+
+def test_one_instance_runs_each_slot(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    clock = FakeClock()
+    calls = []
+    a = _scheduler(store, clock, "a", calls, delay=0.05)
+    b = _scheduler(store, clock, "b", calls, delay=0.05)
+
+    async def run():
+        return await asyncio.gather(a.run_if_due("odds_refresh"), b.run_if_due("odds_refresh"))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sum(r is not None for r in results) == 1
+
+    # 같은 슬롯 재시도 → 실행 안 함 (콜드 스타트 인스턴스 포함)
+    c = _scheduler(store, clock, "c", calls)
+    assert asyncio.run(c.run_if_due("odds_refresh")) is None
+    assert len(calls) == 1
+
+    # 다음 슬롯 → 정확히 한 번 더
+    clock.now += 3600
+    asyncio.run(run())
+    assert len(calls) == 2
+    history = store.history("odds_refresh")
+    assert [h["outcome"] for h in history] == ["success", "success"]
+    assert history[0]["token"] > history[1]["token"]
+
+
+def test_cold_start_catches_up_missed_slot(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    clock = FakeClock()
+    calls = []
+    asyncio.run(_scheduler(store, clock, "a", calls).run_if_due("odds_refresh"))
+
+    # 인스턴스 없이 3시간 경과 → 새 인스턴스가 현재 슬롯 1회만 실행
+    clock.now += 3 * 3600
+    fresh = _scheduler(store, clock, "fresh", calls)
+    asyncio.run(fresh.run_if_due("odds_refresh"))
+    asyncio.run(fresh.run_if_due("odds_refresh"))
+    assert calls == ["a", "fresh"]
+
+
+def test_expired_lease_is_taken_over_and_stale_holder_fenced(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    slot = 3600
+    assert store.acquire("job", "a", slot, ttl=60, now=0) == (ACQUIRED, 1)
+    assert store.acquire("job", "b", slot, ttl=60, now=30) == (HELD, None)
+
+    # a 의 lease 만료 → b 가 인계 (토큰 증가)
+    assert store.acquire("job", "b", slot, ttl=60, now=61) == (ACQUIRED, 2)
+    assert store.renew("job", "a", 1, ttl=60, now=62) is False
+
+    record = {"slot": slot, "started_at": 0, "ended_at": 70, "duration_sec": 70, "outcome": "success"}
+    assert store.complete("job", "a", 1, slot, record) is False
+    assert store.lease("job")["last_slot"] is None
+    assert store.complete("job", "b", 2, slot, record) is True
+    assert store.acquire("job", "c", slot, ttl=60, now=80) == (DONE, None)
+    assert [h["fenced"] for h in store.history("job")] == [False, True]
+
+
+def test_failed_run_is_retried_and_durations_reported(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    clock = FakeClock()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("quota")
+        return "ok"
+
+    sched = JobScheduler(store=store, holder="a", clock=clock)
+    sched.register(JobSpec("nightly_retrain", flaky, daily_at=[(3, 0)]))
+    first = asyncio.run(sched.run_if_due("nightly_retrain"))
+    # 재시도 대기 중 → 다음 폴링에서 바로 재실행하지 않음
+    assert asyncio.run(sched.run_if_due("nightly_retrain")) is None
+    clock.now += sched.jobs["nightly_retrain"].retry_base
+    second = asyncio.run(sched.run_if_due("nightly_retrain"))
+    assert (first["outcome"], second["outcome"]) == ("error", "success")
+    assert asyncio.run(sched.run_if_due("nightly_retrain")) is None
+
+    status = asyncio.run(sched.status())["jobs"]["nightly_retrain"]
+    assert status["durations"]["runs"] == 1
+    assert status["last_run"]["outcome"] == "success"
+    assert status["schedule"] == "daily 03:00 KST"
+
+
+def test_persistent_failure_backs_off_and_gives_up_on_slot(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    clock = FakeClock()
+    attempts = []
+
+    async def broken():
+        attempts.append(clock.now)
+        raise RuntimeError("quota exceeded")
+
+    spec = JobSpec("stats_collection", broken, daily_at=[(9, 0)], max_attempts=3, retry_base=300)
+    a = JobScheduler(store=store, holder="a", clock=clock)
+    a.register(spec)
+    b = JobScheduler(store=store, holder="b", clock=clock)
+    b.register(spec)
+    slot = spec.slot_at(clock.now)
+
+    # 하루 동안 5분마다 두 인스턴스가 폴링해도 슬롯당 max_attempts 회만 실행
+    for _ in range(288):
+        asyncio.run(a.run_if_due("stats_collection"))
+        asyncio.run(b.run_if_due("stats_collection"))
+        clock.now += 300
+        if spec.slot_at(clock.now) != slot:
+            break
+    assert len(attempts) == 3
+    assert [t - attempts[0] for t in attempts] == [0, 300, 900]   # 300s, 600s 백오프
+
+    lease = store.lease("stats_collection")
+    assert lease["last_slot"] == slot and lease["last_success_at"] is None
+    history = store.history("stats_collection")
+    assert [h["outcome"] for h in history] == ["error"] * 3
+    assert store.acquire("stats_collection", "c", slot, ttl=60, now=clock.now) == (DONE, None)
+
+
+def test_backoff_blocks_acquire_until_retry_time(tmp_path):
+    store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    slot = 3600
+    assert store.acquire("job", "a", slot, ttl=60, now=0) == (ACQUIRED, 1)
+    record = {"slot": slot, "started_at": 0, "ended_at": 10, "duration_sec": 10, "outcome": "error"}
+    assert store.complete("job", "a", 1, None, record, retry=(slot, 1, 310)) is True
+    assert store.acquire("job", "b", slot, ttl=60, now=100) == (BACKOFF, None)
+    assert store.acquire("job", "b", slot, ttl=60, now=311) == (ACQUIRED, 2)
+    # 다음 슬롯은 이전 슬롯 실패와 무관
+    assert store.acquire("job", "c", slot + 3600, ttl=60, now=312)[0] in (HELD, ACQUIRED)
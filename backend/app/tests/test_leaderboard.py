@@ -0,0 +1,168 @@
+import sys
+import os
+import asyncio
+import json
+import random
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.models import bets_db
+from app.services import leaderboard
+from app.services.leaderboard import SNAPSHOT_POLL, Leaderboard, LeaderboardService, slip_row
+
+
+def _user(i, rng):
+    won, lost = rng.randint(0, 20), rng.randint(0, 20)
+    return {"id": f"u{i:04d}", "email": f"u{i}@x.com", "nickname": f"n{i}",
+            "stats": {"prediction_count": won + lost, "won": won, "lost": lost, "partial": 0,
+                      "total_roi": round(rng.uniform(-500, 500), 2)}}
+
+
+def _expected(users, key):
+    rows = [r for r in (slip_row(u) for u in users.values()) if r]
+    return [r["id"] for r in sorted(rows, key=lambda r: (-float(r[key]), r["id"]))]
+
+
+def test_incremental_updates_match_full_sort_and_snapshot_roundtrip():
+    rng = random.Random(3)
+    users = {f"u{i:04d}": _user(i, rng) for i in range(500)}
+    board = Leaderboard("slips", {r["id"]: r for r in (slip_row(u) for u in users.values()) if r})
+
+    for _ in range(300):
+        uid = f"u{rng.randrange(520):04d}"
+        users[uid] = _user(int(uid[1:]), rng)
+        board.apply(slip_row(users[uid]), user_id=uid)
+
+    for key in ("total_roi", "hit_rate", "won"):
+        expected = _expected(users, key)
+        assert [r["id"] for r in board.page(key, 0, len(expected))] == expected
+        assert [r["id"] for r in board.page(key, 40, 10)] == expected[40:50]
+        probe = expected[123]
+        assert board.rank_of(probe, key)["rank"] == 124
+
+    restored = Leaderboard.from_dict(board.to_dict())
+    assert restored.version == board.version
+    assert restored.page("hit_rate", 0, 30) == board.page("hit_rate", 0, 30)
+
+
+def test_service_builds_once_without_row_limit_and_records_changes():
+    rng = random.Random(5)
+    users = [_user(i, rng) for i in range(1500)]
+    scans = []
+
+    def scan():
+        scans.append(1)
+        return users
+
+    service = LeaderboardService(scanners={"slips": scan}, snapshots=False)
+
+    async def run():
+        first = await service.page("slips", "total_roi", 0, 10)
+        await service.page("slips", "won", 100, 10)
+        # 1,000명 밖의 유저도 순위에 포함
+        last = users[-1]
+        last["stats"]["total_roi"] = 10_000.0
+        await service.record("slips", last)
+        top = await service.page("slips", "total_roi", 0, 1)
+        mine = await service.rank_of("slips", last["id"], "total_roi")
+        return first, top, mine
+
+    first, top, mine = asyncio.run(run())
+    assert len(scans) == 1
+    assert first["total"] == sum(1 for u in users if u["stats"]["prediction_count"] > 0)
+    assert top["users"][0]["id"] == users[-1]["id"] and top["version"] > first["version"]
+    assert mine["rank"] == 1
+
+
+class FakeCache:
+    """MARKET_CACHE 대역 — 인스턴스 간 공유 스냅샷 저장소."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def save(self, key, data):
+        self.docs[key] = json.loads(json.dumps(data, default=str))
+
+    async def load(self, key):
+        return json.loads(json.dumps(self.docs.get(key, {})))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _shared(monkeypatch, users, scans):
+    cache = FakeCache()
+    monkeypatch.setattr(bets_db, "save_stats_cache", cache.save)
+    monkeypatch.setattr(bets_db, "load_stats_cache", cache.load)
+
+    def scan():
+        scans.append(1)
+        return list(users.values())
+
+    return cache, scan
+
+
+def test_local_changes_are_applied_on_top_of_remote_snapshots(monkeypatch):
+    rng = random.Random(7)
+    users = {f"u{i:04d}": _user(i, rng) for i in range(200)}
+    scans = []
+    cache, scan = _shared(monkeypatch, users, scans)
+    clock = FakeClock()
+    settler = LeaderboardService(scanners={"slips": scan}, clock=clock)
+    submitter = LeaderboardService(scanners={"slips": scan}, clock=clock)
+
+    async def run():
+        await settler.page("slips")
+        await submitter.page("slips")
+        # 예측 제출 인스턴스: 로컬 변경만 (persist 안 함)
+        users["u0001"]["stats"]["total_roi"] = 9_000.0
+        await submitter.record("slips", users["u0001"])
+        # 정산 인스턴스: 다른 유저 변경 후 스냅샷 저장
+        users["u0002"]["stats"]["total_roi"] = 8_000.0
+        await settler.record("slips", users["u0002"])
+        await settler.persist()
+        clock.now += SNAPSHOT_POLL + 1
+        return await submitter.page("slips", "total_roi", 0, 2)
+
+    top = asyncio.run(run())
+    assert [u["id"] for u in top["users"]] == ["u0001", "u0002"]
+    assert len(scans) == 1 and submitter.snapshot_loads == 2
+    assert submitter.boards["slips"].dirty   # u0001 은 아직 스냅샷에 없음 → 계속 유지
+
+
+def test_large_snapshot_is_sharded_and_restored_without_rescan(monkeypatch):
+    rng = random.Random(9)
+    users = {f"u{i:04d}": _user(i, rng) for i in range(2000)}
+    scans = []
+    cache, scan = _shared(monkeypatch, users, scans)
+    monkeypatch.setattr(leaderboard, "SNAPSHOT_MAX_BLOB_BYTES", 40_000)
+    clock = FakeClock()
+    first = LeaderboardService(scanners={"slips": scan}, clock=clock)
+    second = LeaderboardService(scanners={"slips": scan}, clock=clock)
+
+    async def run():
+        await first.page("slips")
+        users["u0005"]["stats"]["total_roi"] = 50_000.0
+        await first.record("slips", users["u0005"])
+        await first.persist()
+        page = await second.page("slips", "total_roi", 0, 20)
+        version = cache.docs["leaderboard_slips_version"]["version"]
+        # 관리자 재구성은 버전을 올리지 않음 → 다른 인스턴스가 다시 적재하지 않음
+        await second.rebuild("slips")
+        clock.now += SNAPSHOT_POLL + 1
+        await first.page("slips")
+        return page, version
+
+    page, version = asyncio.run(run())
+    meta = cache.docs["leaderboard_slips_version"]
+    assert meta["shards"] > 1 and meta["version"] == version
+    assert all(len(json.dumps(cache.docs[f"leaderboard_slips_shard{i}"], ensure_ascii=False).encode()) <= 40_000
+               for i in range(meta["shards"]))
+    assert page["users"][0]["id"] == "u0005" and page["total"] == len(first.boards["slips"].rows)
+    assert len(scans) == 2 and second.snapshot_loads == 1 and first.snapshot_loads == 0
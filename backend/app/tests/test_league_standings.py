@@ -0,0 +1,110 @@
+import sys
+import os
+import asyncio
+import httpx
+import pytest
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import league_standings_service as lss
+
+
+def _standings_payload(code):
+    return {
+        "season": {"startDate": "2025-08-15"},
+        "standings": [{
+            "type": "TOTAL",
+            "table": [
+                {"position": 1, "team": {"id": 1, "name": f"{code} Alpha"}, "playedGames": 10, "won": 8,
+                 "draw": 1, "lost": 1, "goalsFor": 20, "goalsAgainst": 5, "goalDifference": 15, "points": 25, "form": "W,W,D"},
+                {"position": 2, "team": {"id": 2, "name": f"{code} Beta"}, "playedGames": 10, "won": 6,
+                 "draw": 2, "lost": 2, "goalsFor": 15, "goalsAgainst": 9, "goalDifference": 6, "points": 20, "form": "L,W,W"},
+            ],
+        }],
+    }
+
+
+class FakeUpstream:
+    """football-data.org 응답 흉내 (ETag 지원)"""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        etag = f'"{path}-v1"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        if path.endswith("/standings"):
+            code = path.split("/")[-2]
+            return httpx.Response(200, json=_standings_payload(code), headers={"ETag": etag})
+        if path.endswith("/matches"):
+            return httpx.Response(200, json={"matches": []}, headers={"ETag": etag})
+        if path.endswith("/scorers"):
+            return httpx.Response(200, json={"scorers": []}, headers={"ETag": etag})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    upstream = FakeUpstream()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(lss.httpx, "AsyncClient",
+                        lambda **kw: real_client(transport=httpx.MockTransport(upstream.handler), **kw))
+    monkeypatch.setenv("FOOTBALL_DATA_API_KEY", "test-key")
+    svc = lss.LeagueStandingsService()
+    svc._restored = True  # Firestore 복원/저장 생략
+    monkeypatch.setattr(svc, "_persist", lambda: asyncio.sleep(0))
+    svc._limiter = lss._SlidingWindowLimiter(max_calls=100, period=60)
+    svc.upstream = upstream
+    return svc
+
+
+def test_collect_all_builds_team_index(service):
+    result = asyncio.run(service.collect_all())
+    assert set(result) == set(lss.COMPETITION_MAP)
+    assert len(service.upstream.requests) == len(lss.COMPETITION_MAP)
+    assert service.get_team_rank("soccer_epl", "pl beta") == 2
+    assert service.get_team_form("soccer_epl", "PL Alpha") == "W,W,D"
+    assert service.get_team_rank("soccer_epl", "unknown") == 0
+
+
+def test_expired_entries_are_revalidated_with_etag(service):
+    async def run():
+        await service.collect_all()
+        for entry in service._responses.values():
+            entry["fetched_at"] = None  # 강제 만료
+        return await service.collect_all()
+
+    result = asyncio.run(run())
+    revalidations = service.upstream.requests[len(lss.COMPETITION_MAP):]
+    assert len(revalidations) == len(lss.COMPETITION_MAP)
+    assert all(r.headers.get("if-none-match") for r in revalidations)
+    assert service.stats["not_modified"] == len(lss.COMPETITION_MAP)
+    assert len(result["soccer_epl"]) == 2
+
+
+def test_league_table_is_served_from_cache(service):
+    async def run():
+        await service.collect_all()
+        before = len(service.upstream.requests)
+        await asyncio.gather(*[service.get_league_table("soccer_epl") for _ in range(20)])
+        return len(service.upstream.requests) - before
+
+    # 20건 동시 요청에도 최근 경기 + 득점 순위 각 1건만 호출
+    assert asyncio.run(run()) == 2
+
+
+def test_sliding_window_limiter_blocks_excess_calls():
+    limiter = lss._SlidingWindowLimiter(max_calls=3, period=0.2)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await limiter.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.19
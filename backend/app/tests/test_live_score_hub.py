@@ -0,0 +1,69 @@
+import sys
+import os
+import asyncio
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.live_score_hub import LiveScoreHub, diff_snapshots
+
+
+def _match(mid, hg=0, ag=0, status="1H", elapsed=10, league_id=39, league_name="Premier League"):
+    return {"match_id": mid, "home": f"H{mid}", "away": f"A{mid}", "home_goals": hg, "away_goals": ag,
+            "status": status, "elapsed": elapsed, "league_id": league_id, "league_name": league_name}
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.calls = 0
+        self.matches = []
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"matches": list(self.matches), "source": "fake"}
+
+
+def test_diff_snapshots_emits_per_match_events():
+    prev = {"1": _match(1), "2": _match(2), "3": _match(3)}
+    curr = {"1": _match(1, hg=1), "2": _match(2, status="HT", elapsed=45), "4": _match(4)}
+    events = {(e["type"], e["match_id"]) for e in diff_snapshots(prev, curr)}
+    assert events == {("goal", "1"), ("status", "2"), ("match_end", "3"), ("match_start", "4")}
+
+    minute = diff_snapshots({"1": _match(1)}, {"1": _match(1, elapsed=11)})
+    assert [e["type"] for e in minute] == ["minute"]
+
+
+def test_concurrent_readers_share_one_upstream_call():
+    upstream = FakeUpstream()
+    upstream.matches = [_match(1)]
+    hub = LiveScoreHub(fetcher=upstream.fetch, interval=30)
+
+    async def run():
+        await asyncio.gather(*[hub.refresh() for _ in range(50)])
+
+    asyncio.run(run())
+    assert upstream.calls == 1
+    assert hub.snapshot()["live_count"] == 1
+
+
+def test_subscribers_receive_only_their_league():
+    upstream = FakeUpstream()
+    upstream.matches = [_match(1), _match(2, league_id=140, league_name="La Liga")]
+    hub = LiveScoreHub(fetcher=upstream.fetch, interval=30)
+
+    async def run():
+        await hub.refresh()
+        epl = hub.subscribe("soccer_epl")
+        everyone = hub.subscribe()
+        upstream.matches = [_match(1, hg=1), _match(2, ag=1, league_id=140, league_name="La Liga")]
+        await hub.refresh(force=True)
+        for sub in (epl, everyone):
+            hub.unsubscribe(sub)
+        hub._task.cancel()
+        return epl.queue.qsize(), everyone.queue.qsize(), epl.queue.get_nowait()
+
+    epl_count, all_count, first = asyncio.run(run())
+    assert (epl_count, all_count) == (1, 2)
+    assert first["type"] == "goal" and first["side"] == "home"
+    assert upstream.calls == 2
@@ -0,0 +1,124 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+import pytest
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.llm_gateway import LLMGateway
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeClient:
+    """generate_content를 흉내내는 느린 동기 클라이언트"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return FakeResponse(f"  answer:{prompt}  ")
+
+
+def _gateway(client, **kwargs):
+    return LLMGateway(client_provider=lambda: client, model_name="test-model", **kwargs)
+
+
+def test_generate_caches_by_prompt():
+    client = FakeClient()
+    gw = _gateway(client)
+
+    async def run():
+        first = await gw.generate("hello")
+        second = await gw.generate("hello")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == "answer:hello"
+    assert client.calls == 1
+    assert gw.stats()["cache"]["hits"] == 1
+
+
+def test_concurrent_identical_prompts_are_coalesced():
+    client = FakeClient(delay=0.2)
+    gw = _gateway(client)
+
+    async def run():
+        return await asyncio.gather(*[gw.generate("same") for _ in range(10)])
+
+    results = asyncio.run(run())
+    assert results == ["answer:same"] * 10
+    assert client.calls == 1
+    assert gw.coalesced == 9
+
+
+def test_calls_do_not_block_event_loop():
+    client = FakeClient(delay=0.2)
+    gw = _gateway(client, max_workers=4)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(gw.generate("a"), gw.generate("b"), ticker())
+        return ticks
+
+    start = time.monotonic()
+    assert asyncio.run(run()) == 10
+    # 두 호출이 워커 풀에서 병렬 실행되어야 함
+    assert time.monotonic() - start < 0.4
+
+
+def test_timeout_propagates_and_is_not_cached():
+    client = FakeClient(delay=0.3)
+    gw = _gateway(client)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await gw.generate("slow", timeout=0.05)
+
+    asyncio.run(run())
+    assert gw.timeouts == 1
+    assert gw.stats()["cache"]["size"] == 0
+    assert gw.stats()["inflight"] == 0
+
+
+def test_cache_disabled_always_calls_client():
+    client = FakeClient(delay=0)
+    gw = _gateway(client)
+
+    async def run():
+        await gw.generate("promo", cache=False)
+        await gw.generate("promo", cache=False)
+
+    asyncio.run(run())
+    assert client.calls == 2
+
+
+def test_lru_cap_and_missing_client():
+    client = FakeClient(delay=0)
+    gw = _gateway(client, cache_size=2)
+    for prompt in ("a", "b", "c"):
+        gw.generate_blocking(prompt)
+    assert gw.stats()["cache"]["size"] == 2
+    gw.generate_blocking("a")  # 가장 오래된 항목은 축출됨
+    assert client.calls == 4
+
+    empty = LLMGateway(client_provider=lambda: None, model_name="test-model")
+    assert asyncio.run(empty.generate("x")) is None
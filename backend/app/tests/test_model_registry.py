@@ -0,0 +1,113 @@
+import sys
+import os
+import json
+import threading
+
+import joblib
+import lightgbm as lgb
+import numpy as np
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.model_store import ModelRegistry
+
+
+def _booster(seed, rounds=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(120, 4))
+    y = rng.integers(0, 3, size=120)
+    params = {"objective": "multiclass", "num_class": 3, "verbose": -1, "seed": seed}
+    return lgb.train(params, lgb.Dataset(X, label=y), num_boost_round=rounds)
+
+
+def _registry(tmp_path, **kwargs):
+    return ModelRegistry(root=str(tmp_path / "registry"), remote=False, **kwargs)
+
+
+def test_publish_writes_immutable_checksummed_versions(tmp_path):
+    registry = _registry(tmp_path)
+    registry.publish(_booster(1), "m", "20260101")
+    manifest = registry.manifest("m")
+    entry = manifest["versions"]["20260101"]
+    assert manifest["current"] == "20260101" and entry["format"] == "lightgbm_text"
+    assert os.path.exists(tmp_path / "registry" / "m" / "20260101" / "model.txt")
+
+    # 같은 버전 이름 + 다른 내용 → 기존 아티팩트는 그대로, 새 이름으로 저장
+    registry.publish(_booster(2), "m", "20260101")
+    manifest = registry.manifest("m")
+    assert manifest["current"] == "20260101_2" and manifest["previous"] == "20260101"
+    assert manifest["versions"]["20260101"]["sha256"] == entry["sha256"]
+
+    # 아티팩트 손상 → 체크섬 불일치로 로드 거부
+    with open(tmp_path / "registry" / "m" / "20260101" / "model.txt", "a") as f:
+        f.write("tampered\n")
+    try:
+        registry.load("m", "20260101")
+        raise AssertionError("corrupted artifact loaded")
+    except ValueError:
+        pass
+
+
+def test_hot_swap_keeps_in_flight_handle_and_skips_same_version(tmp_path):
+    registry = _registry(tmp_path, check_seconds=3600)
+    X = np.random.default_rng(0).normal(size=(3, 4))
+    registry.publish(_booster(1), "m", "v1")
+
+    first = registry.current("m")
+    assert first.version == "v1" and first.sha256 and first.load_ms >= 0
+    assert registry.current("m") is first  # 다른 서비스도 같은 인스턴스
+
+    # 같은 버전 → 다시 로드하지 않음
+    assert registry.refresh("m") is first and registry.swaps == 1
+
+    registry.publish(_booster(2, rounds=8), "m", "v2")
+    assert registry.current("m") is first  # 확인 주기 전에는 기존 버전 유지
+    second = registry.refresh("m")
+    assert second.version == "v2" and registry.current("m") is second
+    # 교체 전에 잡은 핸들은 계속 예측 가능
+    assert first.model.predict(X).shape == (3, 3)
+
+    # 롤백: 이전 버전으로 current 고정
+    registry.activate("m", "v1")
+    assert registry.refresh("m").version == "v1"
+    loads = registry.stats()["models"]["m"]["loads"]
+    assert [entry["version"] for entry in loads] == ["v1", "v2", "v1"]
+    assert all("load_ms" in entry and "rss_bytes" in entry for entry in loads)
+
+
+def test_background_check_picks_up_manifest_from_another_process(tmp_path):
+    reader = _registry(tmp_path, check_seconds=0)
+    writer = _registry(tmp_path)
+    writer.publish(_booster(1), "m", "v1")
+    assert reader.current("m").version == "v1"
+
+    writer.publish(_booster(2), "m", "v2")
+    reader.current("m")  # 확인 주기 경과 → 백그라운드 교체, 호출은 즉시 반환
+    for thread in threading.enumerate():
+        if thread.name == "model-refresh-m":
+            thread.join(timeout=10)
+    assert reader.current("m").version == "v2"
+
+
+def test_legacy_pickle_is_used_until_first_publish(tmp_path):
+    joblib.dump(_booster(3), tmp_path / "m_latest.pkl")
+    registry = _registry(tmp_path, check_seconds=3600)
+    handle = registry.current("m")
+    assert handle.version == "legacy" and handle.source == "legacy"
+
+    registry.publish(_booster(4), "m", "v1")
+    assert registry.refresh("m").version == "v1"
+    with open(tmp_path / "registry" / "m" / "manifest.json") as f:
+        assert json.load(f)["current"] == "v1"
+
+
+def test_info_does_not_copy_model():
+    from app.core.model_store import LoadedModel
+
+    class Uncopyable:
+        def __deepcopy__(self, memo):
+            raise AssertionError("model deep-copied")
+
+    info = LoadedModel("m", "v1", Uncopyable(), sha256="abc", load_ms=1.5).info()
+    assert "model" not in info and info["version"] == "v1" and info["sha256"] == "abc"
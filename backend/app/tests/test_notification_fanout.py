@@ -0,0 +1,108 @@
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from firebase_admin import messaging as real_messaging
+
+from app.services import notification_service as ns
+
+
+class FakeDB:
+    def __init__(self, tokens, prefs):
+        self.tokens, self.prefs = tokens, prefs
+        self.get_all_calls = 0
+        self.deactivated = []
+        self.single_reads = 0
+
+    def collection(self, name):
+        db = self
+
+        class Ref:
+            def __init__(self, doc_id=None):
+                self.id = doc_id
+
+            def where(self, *a):
+                return self
+
+            def select(self, *a):
+                return self
+
+            def stream(self):
+                return [SimpleNamespace(id=u, to_dict=lambda t=t: {"token": t}) for u, t in db.tokens.items()]
+
+            def document(self, doc_id):
+                return Ref(doc_id)
+
+            def get(self):
+                db.single_reads += 1
+                data = db.prefs.get(self.id)
+                return SimpleNamespace(id=self.id, exists=data is not None, to_dict=lambda: data)
+
+        return Ref()
+
+    def get_all(self, refs, field_paths=None):
+        self.get_all_calls += 1
+        return [SimpleNamespace(id=r.id, exists=r.id in self.prefs, to_dict=lambda r=r: self.prefs.get(r.id))
+                for r in refs]
+
+    def batch(self):
+        db = self
+        updates = []
+        return SimpleNamespace(update=lambda ref, data: updates.append(ref.id),
+                               commit=lambda: db.deactivated.extend(updates))
+
+
+class FakeMessaging:
+    def __init__(self):
+        self.batches = []
+
+    def __getattr__(self, name):
+        return getattr(real_messaging, name)
+
+    def send_each_for_multicast(self, message):
+        self.batches.append(len(message.tokens))
+        responses = []
+        for t in message.tokens:
+            if t.startswith("bad"):
+                responses.append(SimpleNamespace(success=False, exception=real_messaging.UnregisteredError("gone")))
+            elif t.startswith("quota"):
+                responses.append(SimpleNamespace(success=False, exception=real_messaging.QuotaExceededError("slow")))
+            else:
+                responses.append(SimpleNamespace(success=True, exception=None))
+        ok = sum(r.success for r in responses)
+        return SimpleNamespace(success_count=ok, failure_count=len(responses) - ok, responses=responses)
+
+
+def test_send_to_all_bulk_prefs_and_batched_deactivation(monkeypatch):
+    tokens = {f"u{i}": f"tok{i}" for i in range(1200)}
+    tokens["u5"], tokens["u6"], tokens["u7"] = "bad5", "bad6", "quota7"
+    prefs = {"u1": {"valueBetAlert": False}, "u2": {"valueBetAlert": True}, "u3": {"dailyPick": False}}
+    db, messaging = FakeDB(tokens, prefs), FakeMessaging()
+    monkeypatch.setattr(ns, "get_firestore_db", lambda: db)
+    service = ns.FCMNotificationService()
+    monkeypatch.setattr(service, "_get_messaging", lambda: messaging)
+
+    report = asyncio.run(service.send_to_all("value_bet", "hello"))
+
+    assert report["tokens"] == 1200 and report["skipped"] == 1
+    assert report["sent"] == 1196 and report["failed"] == 3
+    assert sorted(messaging.batches) == [199, 500, 500]
+    # 설정은 사용자별 단건 읽기 없이 get_all 묶음으로만 조회
+    assert db.single_reads == 0 and db.get_all_calls == 4
+    # 토큰 무효 오류만 비활성화 (쿼터 초과는 유지)
+    assert sorted(db.deactivated) == ["u5", "u6"] and report["deactivated"] == 2
+    assert report["elapsed_ms"] >= 0 and set(report["timings_ms"]) == {"tokens", "preferences", "send", "deactivate"}
+
+
+def test_send_to_user_skips_token_read_when_preference_off(monkeypatch):
+    db = FakeDB({}, {"u1": {"valueBetAlert": False}})
+    monkeypatch.setattr(ns, "get_firestore_db", lambda: db)
+    service = ns.FCMNotificationService()
+    monkeypatch.setattr(service, "_get_messaging", lambda: FakeMessaging())
+
+    assert asyncio.run(service.send_to_user("u1", "value_bet", "hello")) is False
+    assert db.single_reads == 1
@@ -0,0 +1,42 @@
+import sys
+import os
+import asyncio
+import datetime
+import json
+import time
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import pinnacle_api
+
+
+def test_memory_cache_expires_and_rereads_shared_snapshot(monkeypatch):
+    reads = []
+    snapshot = {"items": ["v1"]}
+
+    async def fake_get_market_cache(key):
+        reads.append(key)
+        if snapshot is None:
+            raise RuntimeError("firestore down")
+        return {"data": json.dumps(snapshot["items"]),
+                "updated_at": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+
+    monkeypatch.setattr(pinnacle_api, "get_market_cache", fake_get_market_cache)
+    service = pinnacle_api.PinnacleService()
+    service.set_api_key("key")
+    monkeypatch.setattr(service, "_parse_firestore_cache_odds", lambda data: list(data))
+
+    assert asyncio.run(service.fetch_odds()) == ["v1"]
+    # 만료 전 — 메모리 캐시
+    snapshot["items"] = ["v2"]
+    assert asyncio.run(service.fetch_odds()) == ["v1"] and len(reads) == 1
+
+    # 만료 후 — 리더가 갱신한 공유 스냅샷을 다시 읽음
+    service._last_fetch_time = time.time() - service._cache_duration - 1
+    assert asyncio.run(service.fetch_odds()) == ["v2"] and len(reads) == 2
+
+    # 스냅샷을 읽지 못하면 만료된 메모리 캐시라도 제공
+    snapshot = None
+    service._last_fetch_time = 0.0
+    assert asyncio.run(service.fetch_odds()) == ["v2"]
@@ -0,0 +1,162 @@
+import sys
+import os
+import asyncio
+import time
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import publish_pipeline as pp
+
+PRED = {"match_id": "m1", "team_home": "Arsenal", "team_away": "Chelsea", "league": "EPL",
+        "confidence": 72.04, "home_win_prob": 55.21, "draw_prob": 24.1, "away_win_prob": 20.7}
+
+
+def _pipeline(tmp_path, **limits):
+    return pp.PublishPipeline(store=pp.SQLitePublishStore(str(tmp_path / "publish.db")), limits=limits)
+
+
+def test_fingerprint_is_stable_and_template_sensitive():
+    a = pp.fingerprint("sns", pp.prediction_inputs([PRED]), "prompt v1")
+    # 키 순서 / 배당 미세 변동(소수 2자리)은 같은 지문
+    jittered = dict(reversed(list(PRED.items())), home_win_prob=55.24)
+    assert pp.fingerprint("sns", pp.prediction_inputs([jittered]), "prompt v1") == a
+    assert pp.fingerprint("sns", pp.prediction_inputs([dict(PRED, confidence=80)]), "prompt v1") != a
+    assert pp.fingerprint("sns", pp.prediction_inputs([PRED]), "prompt v2") != a
+
+
+def test_content_cache_and_idempotent_publish(tmp_path):
+    calls = {"llm": 0, "sent": []}
+
+    async def generate():
+        calls["llm"] += 1
+        return {"text": "hello"}
+
+    def target(channel, fail=False):
+        async def send():
+            calls["sent"].append(channel)
+            return {"success": not fail, "channel_id": channel, "post_id": f"p-{channel}"}
+        return pp.PublishTarget("buffer", channel, send)
+
+    async def run_once(pipeline, fail_b):
+        run = pipeline.start("test")
+        payload, fp = await run.content("sns", pp.prediction_inputs([PRED]), generate, "prompt")
+        results = await run.publish(fp, [target("a"), target("b", fail=fail_b)])
+        return payload, [r["status"] for r in results], run.finish()
+
+    pipeline = _pipeline(tmp_path)
+    payload, statuses, summary = asyncio.run(run_once(pipeline, fail_b=True))
+    assert payload == {"text": "hello"} and statuses == ["published", "failed"]
+    assert summary["content_cache"] == {"hits": 0, "misses": 1}
+    assert {"content", "publish", "total"} <= set(summary["timings_ms"])
+
+    # 재실행 (새 프로세스 가정: 같은 DB 파일) — LLM 0회, 발행된 채널은 건너뛰고 실패 채널만 재시도
+    pipeline = _pipeline(tmp_path)
+    payload, statuses, summary = asyncio.run(run_once(pipeline, fail_b=False))
+    assert calls["llm"] == 1 and summary["content_cache"] == {"hits": 1, "misses": 0}
+    assert statuses == ["skipped", "published"] and calls["sent"] == ["a", "b", "b"]
+
+    # 게시 도중 죽어 pending 으로 남은 채널은 결과 불명 → 다시 올리지 않음
+    fp = pp.fingerprint("sns", pp.prediction_inputs([PRED]), "prompt")
+    pipeline.store.claim(pp.ledger_key("buffer", "c", fp), "buffer", "c", fp, time.time())
+    results = asyncio.run(pipeline.publish(fp, [target("c")]))
+    assert results[0]["status"] == "in_doubt" and calls["sent"].count("c") == 0
+
+    # PENDING_TTL 이 지난 pending 은 중단된 실행으로 보고 재시도
+    pipeline.store.claim(pp.ledger_key("buffer", "d", fp), "buffer", "d", fp, time.time() - pipeline.pending_ttl - 1)
+    results = asyncio.run(pipeline.publish(fp, [target("d")]))
+    assert results[0]["status"] == "published" and calls["sent"].count("d") == 1
+
+
+def test_ledger_failure_does_not_publish(tmp_path):
+    sent = []
+
+    class BrokenLedger(pp.SQLitePublishStore):
+        def claim(self, *args, **kwargs):
+            raise RuntimeError("store down")
+
+    async def send():
+        sent.append(1)
+        return {"success": True}
+
+    pipeline = pp.PublishPipeline(store=BrokenLedger(str(tmp_path / "publish.db")))
+    results = asyncio.run(pipeline.publish("fp", [pp.PublishTarget("buffer", "a", send)]))
+    assert results[0]["status"] == "failed" and sent == []
+
+
+def test_platform_limits_bound_concurrency_and_spacing(tmp_path):
+    pipeline = _pipeline(tmp_path, buffer=(2, 0.05))
+    state = {"now": 0, "max": 0, "starts": []}
+
+    def target(i):
+        async def send():
+            state["starts"].append(time.perf_counter())
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+            await asyncio.sleep(0.02)
+            state["now"] -= 1
+            return {"success": True}
+        return pp.PublishTarget("buffer", f"ch{i}", send)
+
+    results = asyncio.run(pipeline.publish("fp", [target(i) for i in range(5)]))
+    assert [r["status"] for r in results] == ["published"] * 5
+    assert state["max"] <= 2
+    starts = sorted(state["starts"])
+    assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
+
+
+def test_content_generation_shares_gemini_limit(tmp_path):
+    pipeline = _pipeline(tmp_path, gemini=(2, 0))
+    state = {"now": 0, "max": 0}
+
+    async def one(i):
+        async def generate():
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+            await asyncio.sleep(0.01)
+            state["now"] -= 1
+            return {"text": str(i)}
+        return await pipeline.content("blog", {"match": i}, generate)
+
+    async def run():
+        return await asyncio.gather(*(one(i) for i in range(6)))
+
+    results = asyncio.run(run())
+    assert [payload for payload, _, _ in results] == [{"text": str(i)} for i in range(6)]
+    assert state["max"] <= 2
+
+
+def test_rotation_rerun_reuses_copy_and_skips_posted_channels(tmp_path, monkeypatch):
+    from app.api.endpoints import ai_predictions, marketing
+    from app.services import buffer_service as buffer_module, gemini_service
+
+    llm_calls, posts = [], []
+
+    async def fake_promo():
+        llm_calls.append("generic")
+        return f"promo {len(llm_calls)}"
+
+    async def fake_channels(force_refresh=False):
+        return [{"id": "fb", "service": "facebook"}, {"id": "x", "service": "twitter"}]
+
+    async def fake_create_post(channel_id, text, service="", scheduled_at=None, image_url=None):
+        posts.append((channel_id, text))
+        return {"success": True, "channel_id": channel_id, "post_id": f"{channel_id}-1", "status": "sent"}
+
+    monkeypatch.setenv("BUFFER_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(pp, "publish_pipeline", _pipeline(tmp_path))
+    monkeypatch.setattr(ai_predictions, "_predictions_cache", [PRED])
+    monkeypatch.setattr(gemini_service, "generate_generic_promo", fake_promo)
+    monkeypatch.setattr(buffer_module.buffer_service, "get_channels", fake_channels)
+    monkeypatch.setattr(buffer_module.buffer_service, "create_post", fake_create_post)
+
+    req = marketing.RotationPublishRequest(post_type="generic", with_image=False)
+    first = asyncio.run(marketing.publish_rotation_post(req))
+    second = asyncio.run(marketing.publish_rotation_post(req))
+
+    assert first["success"] and first["buffer_result"]["published"] == 2
+    assert sorted(posts) == [("fb", "promo 1"), ("x", "promo 1")]
+    # 같은 슬롯 재실행: LLM 호출 없음, 두 채널 모두 이미 같은 게시물 → 건너뜀
+    assert llm_calls == ["generic"] and second["text"] == "promo 1"
+    assert second["buffer_result"]["skipped"] == 2 and len(posts) == 2
+    assert second["content_cache"] == {"hits": 1, "misses": 0}
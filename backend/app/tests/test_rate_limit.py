@@ -0,0 +1,79 @@
+import sys
+import os
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.rate_limit import LocalGCRABackend, RateLimit, RateLimiter, RateLimitRule, default_rules, gcra
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_allows_burst_then_spaces_requests():
+    limit = RateLimit(60, 60.0, burst=5)
+    tat, allowed = None, []
+    for _ in range(7):
+        ok, new_tat, retry_after, remaining = gcra(tat, 0.0, limit)
+        allowed.append((ok, remaining))
+        if ok:
+            tat = new_tat
+    assert [a for a, _ in allowed] == [True] * 5 + [False] * 2
+    assert [r for _, r in allowed[:5]] == [4, 3, 2, 1, 0]
+    ok, _, retry_after, _ = gcra(tat, 0.0, limit)
+    assert not ok and abs(retry_after - 1.0) < 1e-9
+    # 1초 후 정확히 1건 회복
+    assert gcra(tat, 1.0, limit)[0] is True
+
+
+def test_limits_per_route_and_tier():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+
+    def count(key, tier, path, method="GET", n=1000):
+        return sum(limiter.check(key, tier, path, method).allowed for _ in range(n))
+
+    assert count("ip:1", "anonymous", "/api/odds/bets") == 60
+    assert count("user:a", "free", "/api/odds/bets") == 120
+    assert count("user:v", "vip", "/api/odds/bets") == 600
+    assert count("ip:2", "anonymous", "/api/auth/login/access-token", "POST") == 5
+    # 로그인 한도는 별도 버킷 — 일반 API 한도에 영향 없음
+    assert count("ip:2", "anonymous", "/api/league/x") == 60
+
+    stats = {r["name"]: r for r in limiter.stats()["rules"]}
+    assert stats["auth_login"]["allowed"] == 5 and stats["auth_login"]["rejected"] == 995
+
+    clock.now += 60
+    assert count("ip:1", "anonymous", "/api/odds/bets") == 60
+
+
+def test_state_is_bounded_and_eviction_only_forgets_idle_keys():
+    backend = LocalGCRABackend(max_keys=100)
+    limiter = RateLimiter(rules=[RateLimitRule("all", "/", {"default": RateLimit(2, 60.0)})],
+                          backend=backend, clock=FakeClock())
+    for i in range(10_000):
+        limiter.check(f"ip:{i}", "anonymous", "/x")
+    assert len(backend) == 100
+    assert backend.evictions == 9_900
+
+    # 최근 키는 LRU 에 남아 있으므로 한도 유지
+    assert limiter.check("ip:9999", "anonymous", "/x").allowed is True
+    assert limiter.check("ip:9999", "anonymous", "/x").allowed is False
+
+
+def test_backend_failure_fails_open():
+    class Broken:
+        def check(self, *args):
+            raise RuntimeError("down")
+
+        def stats(self):
+            return {}
+
+    limiter = RateLimiter(rules=default_rules(), backend=Broken())
+    assert limiter.check("ip:1", "anonymous", "/api/x").allowed is True
+    assert limiter.backend_errors == 1
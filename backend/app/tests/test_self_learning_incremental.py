@@ -0,0 +1,79 @@
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.feature_matrix import FeatureMatrixStore, LABELS
+from app.services import self_learning
+from app.services.self_learning import SelfLearningPipeline
+
+
+def test_feature_matrix_append_dedupes_and_loads_tail(tmp_path):
+    store = FeatureMatrixStore(str(tmp_path), mirror=False)
+    names = ["a", "b"]
+    X = np.arange(8, dtype=np.float32).reshape(4, 2)
+    added = store.append(names, X, ["HOME", "AWAY", "DRAW", "HOME"], ["m1", "m2", "m2", "m3"], ["1", "2", "2", "3"])
+    assert added == 3
+    assert store.append(names, X[:1], ["HOME"], ["m1"], ["1"]) == 0
+
+    store.append(names, np.array([[9, 9]], dtype=np.float32), ["DRAW"], ["m4"], ["4"])
+    X_all, y_all, ids = store.load(names)
+    assert ids == ["m1", "m2", "m3", "m4"]
+    assert [LABELS[i] for i in y_all] == ["HOME", "AWAY", "HOME", "DRAW"]
+
+    X_last, _, ids_last = store.load(names, last=2)
+    assert ids_last == ["m3", "m4"] and X_last.shape == (2, 2)
+
+    # 다른 인스턴스가 같은 디렉터리에서 복원
+    reopened = FeatureMatrixStore(str(tmp_path), mirror=False)
+    assert reopened.rows(names) == 4
+    # 특성 스키마가 바뀌면 새 행렬
+    assert reopened.rows(["a", "b", "c"]) == 0
+
+
+def test_nightly_retrain_featurizes_only_new_rows_and_warm_starts(tmp_path, monkeypatch):
+    names = [f"f{i}" for i in range(4)]
+    saved = {}
+    featurized = []
+
+    async def fake_extract(home_team, away_team, league, home_odds, draw_odds, away_odds):
+        featurized.append(home_team)
+        h = int(home_team[1:])
+        return {"f0": h % 3, "f1": home_odds, "f2": draw_odds, "f3": away_odds}
+
+    async def fake_query(sql):
+        return []
+
+    async def fake_log(*args, **kwargs):
+        return True
+
+    monkeypatch.setattr(self_learning, "get_feature_names", lambda: names)
+    monkeypatch.setattr(self_learning, "extract_features_with_odds", fake_extract)
+    monkeypatch.setattr(self_learning.bq, "query", fake_query)
+    monkeypatch.setattr(self_learning.bq, "log_feature_importance", fake_log)
+    monkeypatch.setattr(self_learning, "load_model", lambda name: saved.get(name))
+    monkeypatch.setattr(self_learning, "save_model",
+                        lambda model, name, version: saved.__setitem__(name, model) or f"/tmp/{name}")
+
+    def results(start, n):
+        return [{"match_id": f"m{i}", "home_team": f"h{i}", "away_team": "a", "league": "L",
+                 "pred_home": 0.5, "pred_draw": 0.3, "pred_away": 0.2, "predicted_at": f"{i:05d}",
+                 "actual_result": LABELS[i % 3]} for i in range(start, start + n)]
+
+    pipeline = SelfLearningPipeline(matrix=FeatureMatrixStore(str(tmp_path), mirror=False))
+    first = asyncio.run(pipeline._step3_retrain_model(results(0, 60), {}))
+    assert first["model_updated"] and first["training_mode"] == "full"
+    assert first["new_feature_rows"] == 60 and len(featurized) == 60
+    trees = saved["lightgbm_predictor"].num_trees()
+
+    # 둘째 날: 겹치는 경기는 다시 추출하지 않고 이전 부스터에서 이어서 학습
+    featurized.clear()
+    second = asyncio.run(pipeline._step3_retrain_model(results(40, 30), {}))
+    assert second["training_mode"] == "warm"
+    assert second["new_feature_rows"] == 10 and len(featurized) == 10
+    assert second["training_samples"] == 70
+    assert saved["lightgbm_predictor"].num_trees() > trees
@@ -0,0 +1,152 @@
+import sys
+import os
+import asyncio
+import threading
+
+import lightgbm as lgb
+import numpy as np
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core import ml_predictor as mp
+from app.core.model_store import ModelRegistry
+from app.core.shadow_eval import ShadowEvaluator, canary_bucket
+from app.services.feature_matrix import LABEL_INDEX
+
+NAMES = ["f0", "f1"]
+
+
+def _booster(seed):
+    # f0 가 클래스를 결정 (0 → AWAY, 1 → DRAW, 2 → HOME; feature_matrix.LABELS 인덱스)
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 3, size=300)
+    X = np.column_stack([y + rng.normal(scale=0.1, size=300), rng.normal(size=300)])
+    params = {"objective": "multiclass", "num_class": 3, "verbose": -1, "seed": seed, "min_data_in_leaf": 5}
+    return lgb.train(params, lgb.Dataset(X, label=y), num_boost_round=20)
+
+
+def test_class_probs_maps_booster_columns_to_home_draw_away():
+    booster = _booster(0)
+    X = np.array([[LABEL_INDEX["HOME"], 0.0], [LABEL_INDEX["AWAY"], 0.0]])
+    probs = mp.class_probs(booster, X)
+    assert probs.shape == (2, 3) and np.allclose(probs.sum(axis=1), 1)
+    assert probs[0].argmax() == 0 and probs[1].argmax() == 2   # [HOME, DRAW, AWAY]
+
+    class Sklearnish:
+        classes_ = np.array(["AWAY", "DRAW", "HOME"])
+
+        def predict_proba(self, X):
+            return np.tile([0.2, 0.3, 0.5], (len(X), 1))
+
+    assert np.allclose(mp.class_probs(Sklearnish(), X)[0], [0.5, 0.3, 0.2])
+
+
+def test_candidate_shadows_batch_and_serves_canary_share(tmp_path, monkeypatch):
+    registry = ModelRegistry(root=str(tmp_path / "registry"), remote=False, check_seconds=3600)
+    registry.publish(_booster(1), mp.MODEL_NAME, "v1")
+    registry.publish(_booster(2), mp.MODEL_NAME, "v2", stage="candidate", canary_pct=30)
+    logged = {"live": [], "shadow": []}
+
+    async def fake_extract(home_team, away_team, league, **kwargs):
+        return {"f0": float(int(home_team[1:]) % 3), "f1": kwargs["home_odds"]}
+
+    async def fake_log_predictions(rows):
+        logged["live"].extend(rows)
+        return True
+
+    async def fake_insert(table, rows):
+        logged["shadow"].extend(rows)
+        return True
+
+    monkeypatch.setattr(mp, "model_registry", registry)
+    monkeypatch.setattr(mp, "get_feature_names", lambda: NAMES)
+    monkeypatch.setattr(mp, "extract_features_with_odds", fake_extract)
+    monkeypatch.setattr(mp.bq, "log_predictions", fake_log_predictions)
+    monkeypatch.setattr(mp.bq, "insert_rows", fake_insert)
+
+    predictor = mp.MLPredictor()
+    predictor.shadow = ShadowEvaluator(max_pending=4)
+    matches = [{"team_home": f"h{i}", "team_away": "a", "league": "L", "home_odds": 2.0} for i in range(40)]
+    results = asyncio.run(predictor.predict_batch(matches))
+
+    canary_ids = {f"h{i}_a" for i in range(40) if canary_bucket(f"h{i}_a") < 30}
+    assert 0 < len(canary_ids) < 40
+    assert {r["match_id"] for r in results if r["canary"]} == canary_ids
+    assert all(r["model_version"] == ("v2" if r["canary"] else "v1") for r in results)
+    assert [r["model_version"] for r in logged["live"]] == [r["model_version"] for r in results]
+    # 정답 클래스 = h 번호 % 3 (LABELS 인덱스) 가 최고 확률
+    for i, r in enumerate(results):
+        assert r["recommendation"] == ("AWAY", "DRAW", "HOME")[i % 3]
+
+    predictor.shadow._executor.shutdown(wait=True)
+    stats = predictor.shadow.stats()
+    # 현재 모델은 40경기 전부, 후보는 카나리(요청 경로) + 나머지(섀도 워커)로 40경기 전부
+    assert stats["versions"]["v1"]["scored"] == 40 and stats["versions"]["v2"]["scored"] == 40
+    assert stats["versions"]["v2"]["batches"] == 2 and stats["dropped_batches"] == 0
+    assert len(predictor.shadow.take_log(min_rows=1)) == 40
+
+    settled = predictor.shadow.record_outcomes({f"h{i}_a": ("AWAY", "DRAW", "HOME")[i % 3] for i in range(40)})
+    assert settled == 40
+    for version in ("v1", "v2"):
+        summary = predictor.shadow.stats()["versions"][version]
+        assert summary["settled"] == 40 and summary["accuracy_pct"] == 100.0
+        assert 0 < summary["log_loss"] < 0.5 and 0 < summary["brier"] < 0.3
+        assert summary["latency_ms_avg"] is not None
+
+
+def test_shadow_backlog_is_bounded():
+    evaluator = ShadowEvaluator(max_pending=1)
+    gate = threading.Event()
+
+    def slow():
+        gate.wait(5)
+        return np.full((1, 3), 1 / 3)
+
+    first = evaluator.submit("v2", slow, ["m1"], "v1", np.full((1, 3), 1 / 3), 1.0)
+    second = evaluator.submit("v2", slow, ["m2"], "v1", np.full((1, 3), 1 / 3), 1.0)
+    assert first is not None and second is None and evaluator.stats()["dropped_batches"] == 1
+    gate.set()
+    first.result(timeout=5)
+    assert evaluator.stats()["shadow_batches"] == 1 and evaluator.stats()["inflight"] == 0
+
+
+def test_fallback_rows_when_no_model_or_feature_failure(tmp_path, monkeypatch):
+    registry = ModelRegistry(root=str(tmp_path / "registry"), remote=False, check_seconds=3600)
+    logged = []
+
+    async def fake_extract(home_team, away_team, league, **kwargs):
+        if home_team == "broken":
+            raise RuntimeError("feature store down")
+        return {"f0": 2.0, "f1": kwargs["home_odds"]}
+
+    async def fake_log_predictions(rows):
+        logged.extend(rows)
+        return True
+
+    monkeypatch.setattr(mp, "model_registry", registry)
+    monkeypatch.setattr(mp, "get_feature_names", lambda: NAMES)
+    monkeypatch.setattr(mp, "extract_features_with_odds", fake_extract)
+    monkeypatch.setattr(mp.bq, "log_predictions", fake_log_predictions)
+    monkeypatch.setattr(mp.MLPredictor, "_init_fallback", lambda self: None)
+
+    predictor = mp.MLPredictor()
+    predictor.shadow = ShadowEvaluator(max_pending=1)
+    rows = [
+        {"home_team": "h", "away_team": "a", "league": "L", "home_odds": 1.5, "draw_odds": 4.0, "away_odds": 6.0},
+        {"home_team": "broken", "away_team": "a", "league": "L", "home_odds": 3.0, "draw_odds": 3.0, "away_odds": 3.0},
+    ]
+
+    # 모델 없음 → 전부 배당 내재 확률 fallback
+    results = asyncio.run(predictor._predict_rows(rows))
+    assert [r["engine"] for r in results] == ["fallback_odds_implied"] * 2
+    assert results[0]["recommendation"] == "HOME"
+    assert results[0]["raw_probs"] == [results[0]["predictions"][k] for k in ("home_win", "draw", "away_win")]
+
+    # 모델 있음 + 특성 추출 실패 행 → 그 행만 fallback
+    registry.publish(_booster(1), mp.MODEL_NAME, "v1")
+    assert predictor.reload_model()
+    results = asyncio.run(predictor._predict_rows(rows))
+    assert results[0]["engine"] == "lightgbm" and results[0]["model_version"] == "v1"
+    assert results[1]["engine"] == "fallback_odds_implied"
+    assert [r["match_id"] for r in logged] == ["h_a"]
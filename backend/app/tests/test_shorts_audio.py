@@ -0,0 +1,70 @@
+import sys
+import os
+import wave
+
+import numpy as np
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import generate_shorts_pipeline as pipeline
+
+
+def _scalar_envelope(amps, duck_vol=0.03, normal_vol=0.12, threshold=0.015, attack=0.15, release=0.35, fps=10):
+    # 기존 apply_audio_ducking 의 스칼라 루프
+    envelope, current = [], normal_vol
+    for amp in amps:
+        target = duck_vol if amp > threshold else normal_vol
+        if target < current:
+            current = max(current - (current - target) * (1.0 / max(1, fps * attack)), duck_vol)
+        else:
+            current = min(current + (target - current) * (1.0 / max(1, fps * release)), normal_vol)
+        envelope.append(current)
+    return np.array(envelope)
+
+
+def test_vectorized_envelope_matches_scalar_loop():
+    rng = np.random.default_rng(5)
+    amps = np.where(rng.random(2000) < 0.6, rng.uniform(0.02, 0.5, 2000), rng.uniform(0, 0.01, 2000))
+    np.testing.assert_allclose(pipeline.ducking_envelope(amps), _scalar_envelope(amps), atol=1e-12)
+
+    env = pipeline.ducking_envelope(amps[:30])
+    bgm = np.ones((44100 * 3 + 17, 2), dtype=np.float32)
+    ducked = pipeline.duck_pcm(bgm, env, 44100)
+    assert ducked.shape == bgm.shape
+    assert np.allclose(ducked[4410 * 7, 0], env[7]) and np.allclose(ducked[-1, 1], env[-1])
+    # 구간 길이가 정수가 아닌 샘플레이트도 같은 결과
+    odd = pipeline.duck_pcm(np.ones(22050, dtype=np.float32), env, 22050, fps=7)
+    assert np.allclose(odd[22050 * 3 // 7 + 1], env[3])
+
+
+def test_decode_pcm_aligns_files_to_clip_durations(tmp_path):
+    paths = []
+    for i, (secs, level) in enumerate([(0.5, 0.5), (0.3, 0.0), (0.4, 0.5)]):
+        path = str(tmp_path / f"s{i}.wav")
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes((np.full(int(secs * 16000), level) * 32767).astype(np.int16).tobytes())
+        paths.append(path)
+    # 두 번째 파일을 더 긴 타임라인(0.6초)에 맞춰 무음 패딩
+    pcm = pipeline.decode_pcm(paths, 2000, durations=[0.5, 0.6, 0.4])
+    assert abs(len(pcm) - 3000) <= 2
+    amps = pipeline.speech_amplitudes(pcm, pcm_fps=2000)
+    assert len(amps) == 15
+    assert (amps[:5] > 0.4).all() and (amps[6:10] < 0.01).all() and (amps[12:] > 0.4).all()
+
+
+def test_ken_burns_zooms_from_source(tmp_path):
+    from moviepy.editor import ImageClip
+    rng = np.random.default_rng(1)
+    path = str(tmp_path / "src.png")
+    from PIL import Image
+    Image.fromarray(rng.integers(0, 255, (64, 36, 3), dtype=np.uint8)).save(path)
+    clip = ImageClip(path)
+    kb = pipeline.ken_burns(clip, 2.0, zoom_end=1.5, fps=10)
+    first, last = kb.get_frame(0), kb.get_frame(2.0)
+    assert first.shape == last.shape == (64, 36, 3)
+    assert np.abs(first.astype(int) - clip.get_frame(0)).mean() < 1.0
+    assert np.abs(last.astype(int) - clip.get_frame(0)).mean() > 10
@@ -0,0 +1,79 @@
+import sys
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import generate_shorts_pipeline as pipeline
+from app.services import browser_recorder, tts_service as tts_module
+from app.services.tts_service import TTSCache, TTSService
+
+
+def test_render_multilang_shares_assets_and_isolates_jobs(tmp_path, monkeypatch):
+    captures = []
+    tts_paths = []
+    jobs = []
+
+    colors = {"ko": (10, 20, 30), "en": (40, 50, 60), "ja": (70, 80, 90)}
+
+    async def fake_capture(lang, max_matches, viewport_width, viewport_height):
+        captures.append(lang)
+        shots = []
+        for i, scene in enumerate(["intro", "match"]):
+            path = str(tmp_path / f"shot_{lang}_{i}.png")
+            Image.new("RGB", (108, 192), colors[lang]).save(path)
+            shots.append({"screenshot_path": path, "scene": scene, "match_name": "A vs B"})
+        return shots
+
+    async def fake_engine(req, path):
+        tts_paths.append((req.lang, req.text))
+        with open(path, "wb") as f:
+            f.write(req.lang.encode())
+        return True
+
+    def fake_encode(job):
+        for scene in job["scenes"]:
+            with Image.open(scene["frame_path"]) as frame:
+                assert frame.size == (pipeline.WIDTH, pipeline.HEIGHT)
+                # 언어별 페이지에서 캡처한 화면이 그 언어 영상에 들어감
+                assert frame.getpixel((0, 0)) == colors[job["lang"]]
+        jobs.append(job)
+        with open(job["output_path"], "wb") as f:
+            f.write(b"mp4")
+        return job["output_path"]
+
+    monkeypatch.setattr(browser_recorder, "capture_match_screenshots", fake_capture)
+    service = TTSService(cache=TTSCache(str(tmp_path / "tts")), engines={"edge": fake_engine})
+    monkeypatch.setattr(tts_module, "tts_service", service)
+    monkeypatch.setattr(pipeline, "load_video_settings", lambda: {})
+    monkeypatch.setattr(pipeline, "_translate_scripts", lambda scripts, lang: scripts)
+    monkeypatch.setattr(pipeline, "get_bgm", lambda: str(tmp_path / "missing.mp3"))
+    monkeypatch.setattr(pipeline, "_encode_language_job", fake_encode)
+
+    langs = ["ko", "en", "ja"]
+    outputs = {lang: str(tmp_path / f"out_{lang}.mp4") for lang in langs}
+    with ThreadPoolExecutor(3) as executor:
+        result = asyncio.run(pipeline.render_multilang(langs, outputs, executor=executor))
+        first_jobs = list(jobs)
+        # 같은 대본 재렌더링 — TTS 는 전부 캐시 적중
+        asyncio.run(pipeline.render_multilang(langs, outputs, executor=executor))
+
+    assert result["outputs"] == outputs
+    assert captures == langs * 2
+    # 언어별 고유 문장(intro / match / CTA)만 합성, 두 번째 렌더는 합성 0회
+    assert len(tts_paths) == 9
+    assert service.hits == 9
+    # 언어마다 다른 작업 디렉터리 → 파일명 충돌 없음
+    assert len({job["work_dir"] for job in first_jobs}) == 3
+    assert len({s["audio_path"] for job in first_jobs for s in job["scenes"]}) == 9
+    frames = [[s["frame_path"] for s in job["scenes"]] for job in first_jobs]
+    # 장면 프레임은 언어별 캡처에서 만들어 각 작업 디렉터리에 둠
+    assert all(os.path.dirname(path) == job["work_dir"] for job in first_jobs for path in
+               (s["frame_path"] for s in job["scenes"]))
+    # 임시 작업 디렉터리와 캡처 파일 정리
+    assert not os.path.exists(os.path.dirname(frames[0][0]))
+    assert not any(os.path.exists(str(tmp_path / f"shot_{lang}_0.png")) for lang in langs)
@@ -0,0 +1,97 @@
+import sys
+import os
+import asyncio
+import types
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core import startup
+from app.core.startup import LazyRouterRegistry
+
+
+def _fake_router_module(name, imports):
+    router = APIRouter()
+
+    @router.get("/ping")
+    async def ping():
+        return {"module": name}
+
+    module = types.ModuleType(name)
+    module.router = router
+    sys.modules[name] = module
+    imports.append(name)
+    return module
+
+
+def test_lazy_router_loads_on_first_matching_request(monkeypatch):
+    imports = []
+    modules = {}
+    real_import = startup.importlib.import_module
+
+    def fake_import(name):
+        if name.startswith("fake_routers."):
+            if name not in modules:
+                modules[name] = _fake_router_module(name, imports)
+            return modules[name]
+        return real_import(name)
+
+    async def no_config():
+        return 0
+
+    monkeypatch.setattr(startup.importlib, "import_module", fake_import)
+    monkeypatch.setattr(startup, "wait_config", no_config)
+
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.add("fake_routers.vip_combo", "/api/vip/combo")
+    registry.add("fake_routers.vip_market", "/api/vip/market")
+
+    @app.middleware("http")
+    async def lazy(request, call_next):
+        await registry.ensure_for_path(request.url.path)
+        return await call_next(request)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+            first = await client.get("/api/vip/combo/ping")
+            again = await client.get("/api/vip/combo/ping")
+            other = await client.get("/api/vip/combox/ping")
+            return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert first.json() == {"module": "fake_routers.vip_combo"}
+    assert again.status_code == 200
+    assert other.status_code == 404
+    assert imports == ["fake_routers.vip_combo"]
+    assert registry.stats()["pending"] == ["/api/vip/market"]
+
+    asyncio.run(registry.warm())
+    assert imports == ["fake_routers.vip_combo", "fake_routers.vip_market"]
+    assert [r["trigger"] for r in startup.profile.routers[-2:]] == ["/api/vip/combo/ping", "warmup"]
+
+
+def test_import_timer_records_module_times(tmp_path, monkeypatch):
+    pkg = tmp_path / "slow_pkg_for_profile"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("import time\ntime.sleep(0.01)\nfrom . import child\n")
+    (pkg / "child.py").write_text("import time\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(startup, "PROFILE_IMPORTS", True)
+
+    timer = startup._ImportTimer()
+    sys.meta_path.insert(0, timer)
+    try:
+        import slow_pkg_for_profile  # noqa: F401
+    finally:
+        sys.meta_path.remove(timer)
+
+    parent = startup.profile.imports["slow_pkg_for_profile"]
+    child = startup.profile.imports["slow_pkg_for_profile.child"]
+    assert parent["inclusive_sec"] >= child["inclusive_sec"] + 0.009
+    assert parent["self_sec"] < parent["inclusive_sec"]
+    # 원래 loader 로 복원 — loader 타입에 의존하는 라이브러리 호환
+    assert type(sys.modules["slow_pkg_for_profile"].__loader__).__name__ == "SourceFileLoader"
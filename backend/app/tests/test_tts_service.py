@@ -0,0 +1,105 @@
+import sys
+import os
+import asyncio
+import struct
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.tts_service import TTSCache, TTSRequest, TTSService, audio_duration
+
+
+def _cbr_mp3(path, frames, with_id3=True):
+    # MPEG1 Layer III, 128kbps, 44.1kHz, 무패딩 → 프레임 417바이트 / 1152 샘플
+    header = bytes([0xFF, 0xFB, 0x90, 0x00])
+    with open(path, "wb") as f:
+        if with_id3:
+            f.write(b"ID3\x04\x00\x00" + bytes([0, 0, 0, 20]) + b"\x00" * 20)
+        for _ in range(frames):
+            f.write(header + b"\x00" * 413)
+
+
+def test_audio_duration_reads_headers_only(tmp_path):
+    path = str(tmp_path / "a.mp3")
+    _cbr_mp3(path, 100)
+    assert abs(audio_duration(path) - 100 * 1152 / 44100) < 0.01
+
+    # Xing 헤더가 있으면 프레임 수 사용 (MPEG1 스테레오: side info 32바이트)
+    xing = str(tmp_path / "x.mp3")
+    frame = bytearray(417)
+    frame[:4] = bytes([0xFF, 0xFB, 0x90, 0x00])
+    frame[36:48] = b"Xing" + struct.pack(">II", 1, 500)
+    with open(xing, "wb") as f:
+        f.write(bytes(frame) * 3)
+    assert abs(audio_duration(xing) - 500 * 1152 / 44100) < 0.01
+
+
+def test_service_caches_dedupes_and_evicts(tmp_path):
+    calls = []
+
+    async def engine(req, path):
+        calls.append(req.text)
+        await asyncio.sleep(0.01)
+        _cbr_mp3(path, 10 + len(req.text), with_id3=False)
+        return True
+
+    async def broken(req, path):
+        raise RuntimeError("quota")
+
+    cache = TTSCache(str(tmp_path), max_bytes=417 * 60)
+    service = TTSService(cache=cache, engines={"elevenlabs": broken, "edge": engine}, concurrency=2)
+    reqs = [TTSRequest("intro", "ko", "v"), TTSRequest("outro", "ko", "v"), TTSRequest("intro", "ko", "v")]
+    first = asyncio.run(service.synthesize_many(reqs))
+    assert sorted(calls) == ["intro", "outro"]           # 배치 안 중복은 1회만
+    assert first[0].path == first[2].path and first[0].engine == "edge" and not first[0].cached
+    assert abs(first[0].duration - 15 * 1152 / 44100) < 0.01
+
+    # 새 인스턴스(다른 프로세스)에서도 색인으로 적중
+    again = TTSService(cache=TTSCache(str(tmp_path), max_bytes=417 * 60),
+                       engines={"elevenlabs": broken, "edge": engine})
+    second = asyncio.run(again.synthesize_many(reqs[:2]))
+    assert all(r.cached for r in second) and len(calls) == 2
+    # 설정이 다르면 다른 키
+    asyncio.run(again.synthesize(TTSRequest("intro", "ko", "v", rate="+20%")))
+    assert len(calls) == 3
+
+    # 용량 초과 → 가장 오래 쓰지 않은 항목부터 축출
+    asyncio.run(again.synthesize(TTSRequest("a much longer sentence", "ko", "v")))
+    assert again.cache.evictions >= 1
+    assert again.cache.stats()["bytes"] <= 417 * 60
+
+
+def test_fallback_entries_expire_so_primary_engine_is_retried(tmp_path):
+    calls = []
+    state = {"primary_up": False}
+
+    async def primary(req, path):
+        calls.append("primary")
+        if not state["primary_up"]:
+            raise RuntimeError("quota")
+        _cbr_mp3(path, 10, with_id3=False)
+        return True
+
+    async def backup(req, path):
+        calls.append("backup")
+        _cbr_mp3(path, 10, with_id3=False)
+        return True
+
+    def service(ttl):
+        return TTSService(cache=TTSCache(str(tmp_path)), engines={"elevenlabs": primary, "edge": backup},
+                          fallback_ttl=ttl)
+
+    req = TTSRequest("intro", "ko", "v")
+    assert asyncio.run(service(3600).synthesize(req)).engine == "edge"
+    # TTL 안에서는 폴백 음성 재사용
+    assert asyncio.run(service(3600).synthesize(req)).cached and calls == ["primary", "backup"]
+
+    # 만료된 폴백 음성은 적중하지 않음 → 상위 엔진부터 다시 시도, 복구됐으면 상위 엔진 음성으로 교체
+    expired, outro = service(-1), TTSRequest("outro", "ko", "v")
+    asyncio.run(expired.synthesize(outro))
+    state["primary_up"] = True
+    result = asyncio.run(expired.synthesize(outro))
+    assert result.engine == "elevenlabs" and not result.cached
+    assert calls == ["primary", "backup", "primary", "backup", "primary"]
+    # 최상위 엔진 음성은 만료 없음
+    assert asyncio.run(expired.synthesize(outro)).cached
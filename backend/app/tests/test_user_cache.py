@@ -0,0 +1,84 @@
+import sys
+import os
+import asyncio
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import pytest
+from jose import JWTError
+
+from app.core import security
+from app.core.user_cache import UserCache
+
+
+class CountingLoader:
+    def __init__(self, users, delay=0.01):
+        self.users = users
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, user_id):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        user = self.users.get(user_id)
+        return dict(user) if user else None
+
+
+def test_concurrent_lookups_share_one_read():
+    loader = CountingLoader({"u1": {"id": "u1", "tier": "vip"}})
+    cache = UserCache(loader=loader)
+
+    async def run():
+        users = await asyncio.gather(*[cache.get_user("u1") for _ in range(20)])
+        again = await cache.get_user("u1")
+        missing = await asyncio.gather(cache.get_user("nope"), cache.get_user("nope"))
+        return users, again, missing
+
+    users, again, missing = asyncio.run(run())
+    assert all(u["tier"] == "vip" for u in users) and again["tier"] == "vip"
+    assert missing == [None, None]
+    # u1 1회 + 없는 유저 1회 (음성 캐시)
+    assert loader.calls == 2
+    assert cache.stats()["coalesced"] == 20
+
+
+def test_invalidate_drops_all_versions_and_blocks_stale_inflight_load():
+    users = {"u1": {"id": "u1", "gold_balance": 100}}
+    loader = CountingLoader(users, delay=0.05)
+    cache = UserCache(loader=loader)
+
+    async def run():
+        await cache.get_user("u1", token_version=0)
+        await cache.get_user("u1", token_version=2)
+        cache.invalidate("u1")
+        users["u1"]["gold_balance"] = 50
+        assert (await cache.get_user("u1", 2))["gold_balance"] == 50
+
+        # 무효화 이전에 시작된 조회는 결과를 캐시에 남기지 않음
+        users["u1"]["gold_balance"] = 40
+        cache.invalidate("u1")
+        pending = asyncio.ensure_future(cache.get_user("u1"))
+        await asyncio.sleep(0.01)
+        cache.invalidate("u1")
+        await pending
+        users["u1"]["gold_balance"] = 30
+        return (await cache.get_user("u1"))["gold_balance"]
+
+    assert asyncio.run(run()) == 30
+
+
+def test_decode_token_is_memoized_and_rejects_bad_tokens(monkeypatch):
+    cache = UserCache()
+    token = security.create_access_token("u1", token_version=3)
+    payload = cache.decode_token(token)
+    assert payload["sub"] == "u1" and payload["tv"] == 3
+
+    from jose import jwt
+    monkeypatch.setattr(jwt, "decode", lambda *a, **k: pytest.fail("decode should be memoized"))
+    assert cache.decode_token(token) is payload
+    monkeypatch.undo()
+
+    with pytest.raises(JWTError):
+        cache.decode_token(token + "x")
+    assert len(cache.tokens) == 1
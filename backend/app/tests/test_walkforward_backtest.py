@@ -0,0 +1,123 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.walkforward_backtest import (
+    MatchArrays, MarketPredictor, HeuristicPredictor, AIPredictorReplay,
+    build_features, evaluate, fold_ids, synthetic_frames, walk_forward,
+)
+
+
+def _data(n=1500):
+    return MatchArrays.from_frames(*synthetic_frames(n, n_leagues=2, teams_per_league=10, seed=3))
+
+
+def test_features_have_no_lookahead():
+    matches, odds = synthetic_frames(1500, n_leagues=2, teams_per_league=10, seed=3)
+    # 합성 배당은 모두 유효 (> 1) — _open_close_odds 에서 버려지는 행 없음
+    assert (odds[["home_odds", "draw_odds", "away_odds"]] > 1).all().all()
+    assert len(odds) == 2 * len(matches)
+    base = build_features(MatchArrays.from_frames(matches, odds))
+
+    cutoff = matches["match_date"].iloc[800]
+    later = matches["match_date"] >= cutoff
+    altered = matches.copy()
+    altered.loc[later, ["home_score", "away_score"]] = altered.loc[later, ["away_score", "home_score"]].to_numpy() + [5, 0]
+    changed = build_features(MatchArrays.from_frames(altered, odds))
+
+    data = MatchArrays.from_frames(matches, odds)
+    upto = np.flatnonzero(data.day <= data.day[800])
+    np.testing.assert_array_equal(base.X[upto], changed.X[upto])
+    assert not np.array_equal(base.X[upto[-1] + 1:], changed.X[upto[-1] + 1:])
+
+
+def test_features_match_running_counts():
+    data = _data(600)
+    fm = build_features(data)
+    i = 500
+    t = data.home[i]
+    prior = np.flatnonzero((data.day < data.day[i]) & ((data.home == t) | (data.away == t)))
+    last5 = prior[-5:]
+    wins = sum((data.result[j] == 0) if data.home[j] == t else (data.result[j] == 2) for j in last5)
+    assert abs(fm.col("home_win_rate_last5")[i] - wins / 5) < 1e-6
+    a = data.away[i]
+    prior_away = np.flatnonzero((data.day < data.day[i]) & ((data.home == a) | (data.away == a)))
+    assert fm.history[i] == min(len(prior), len(prior_away))
+
+
+def test_walk_forward_trains_only_on_past_and_reports_metrics():
+    data = _data()
+    seen = []
+
+    class Recorder(MarketPredictor):
+        name = "recorder"
+        trainable = True
+
+        def fit(self, data, fm, rows):
+            seen.append(rows)
+
+    report = walk_forward(data, [Recorder(), HeuristicPredictor()], n_folds=3)
+    fm = build_features(data)
+    folds = fold_ids(data, fm.history >= 3, 3)
+    for k, rows in enumerate(seen, start=1):
+        assert data.day[rows].max() < data.day[folds == k].min()
+
+    market = report["predictors"]["recorder"]["overall"]
+    assert market["n"] == report["eligible"] - (folds == 0).sum()
+    assert 0.4 < market["accuracy"] < 0.8
+    assert market["log_loss"] < report["predictors"]["ml_heuristic"]["overall"]["log_loss"] + 0.5
+    assert len(report["predictors"]["ml_heuristic"]["per_fold"]) == 3
+
+
+def test_ai_predictor_replay_returns_distributions():
+    data = _data(400)
+    fm = build_features(data)
+    rows = np.arange(300, 320)
+    probs = AIPredictorReplay().predict_proba(data, fm, rows)
+    assert probs.shape == (20, 3)
+    np.testing.assert_allclose(probs.sum(1), 1.0)
+
+
+def test_evaluate_roi_and_clv():
+    probs = np.array([[0.6, 0.2, 0.2], [0.2, 0.2, 0.6]])
+    y = np.array([0, 0])
+    open_odds = np.array([[2.0, 3.5, 4.0], [1.5, 4.0, 2.0]])
+    close_odds = np.array([[1.8, 3.5, 4.5], [1.4, 4.0, 2.5]])
+    m = evaluate(probs, y, open_odds, close_odds)
+    assert m["accuracy"] == 0.5
+    assert m["bets"] == 2
+    assert m["profit_units"] == 0.0
+    assert m["clv_mean"] == round(((2.0 / 1.8 - 1) + (2.0 / 2.5 - 1)) / 2, 4)
+
+
+def test_from_frames_keeps_scores_aligned_after_sort_and_drop():
+    matches, odds = synthetic_frames(300, n_leagues=1, teams_per_league=8, seed=5)
+    expected = MatchArrays.from_frames(matches, odds)
+
+    # 섞인 입력 + 결과 없는 행(제거 대상) 끼워 넣기
+    noisy = matches.sample(frac=1.0, random_state=1).reset_index(drop=True)
+    unsettled = noisy.iloc[:20].copy()
+    unsettled[["home_score", "away_score"]] = np.nan
+    if "result" in unsettled:
+        unsettled["result"] = None
+    unsettled["match_id"] = unsettled["match_id"].astype(str) + "_x"
+    noisy = noisy.iloc[::-1].reset_index(drop=True)
+    shuffled = MatchArrays.from_frames(pd.concat([unsettled, noisy], ignore_index=True), odds)
+
+    order = {mid: i for i, mid in enumerate(expected.match_id)}
+    idx = np.array([order[mid] for mid in shuffled.match_id])
+    assert len(shuffled) == len(expected)
+    np.testing.assert_array_equal(shuffled.home_goals, expected.home_goals[idx])
+    np.testing.assert_array_equal(shuffled.away_goals, expected.away_goals[idx])
+    np.testing.assert_array_equal(shuffled.result, expected.result[idx])
+    hg = dict(zip(matches["match_id"].astype(str), matches["home_score"]))
+    assert all(hg[mid] == g for mid, g in zip(shuffled.match_id, shuffled.home_goals))
+
+    no_scores = MatchArrays.from_frames(matches.drop(columns=["home_score", "away_score"]).assign(
+        result=np.where(matches["home_score"] > matches["away_score"], "HOME", "AWAY")), odds)
+    assert len(no_scores) == len(matches) and not no_scores.home_goals.any()
@@ -0,0 +1,107 @@
+"""
+Capture phase benchmark — 7경기 쇼츠의 스크린샷 캡처 단계 비교.
+
+기존 구현(인트로 1회 + 경기마다 Chromium 기동 → 페이지 로드 → 고정 sleep 2.0+0.2+1.5+0.3 초
+→ 뷰포트 캡처 → 종료, 경기 사이 0.5 초)과 현재 구현(풀에서 페이지 1개 임대, 1회 로드,
+더보기 일괄 클릭 후 준비 조건 대기 1회, 카드별 클립 캡처)을 비교.
+
+기본 대상은 테스트 fixture(app/tests/fixtures/bets.html). 실서비스는 --url 로 지정.
+
+사용법 (backend 디렉터리에서, playwright + chromium 필요):
+  python benchmarks/capture_phase.py --matches 7
+  python benchmarks/capture_phase.py --matches 7 --url https://scorenix.com/bets
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import browser_recorder  # noqa: E402
+from app.services.browser_pool import LAUNCH_ARGS, BrowserPool, context_options  # noqa: E402
+
+FIXTURE_URL = "file://" + os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "tests", "fixtures", "bets.html")
+
+
+async def legacy_shot(url, target_idx, output_path, width, height, intro=False):
+    """이전 capture_single_match_screenshot / 인트로 캡처 (비교용 원본 흐름)."""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        context = await browser.new_context(**context_options(width, height, "ko", color_scheme="dark"))
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=25000)
+        except Exception:
+            await page.goto(url, wait_until="domcontentloaded", timeout=12000)
+        await asyncio.sleep(2.5 if intro else 2.0)
+        await page.evaluate(browser_recorder.DISABLE_TOUR_JS)
+        if intro:
+            await page.screenshot(path=output_path)
+        else:
+            buttons = [b for b in await page.query_selector_all("button")
+                       if "더보기" in (await b.inner_text()) or "more" in (await b.inner_text()).lower()]
+            if target_idx < len(buttons):
+                btn = buttons[target_idx]
+                await btn.scroll_into_view_if_needed()
+                await asyncio.sleep(0.2)
+                await btn.click()
+                await asyncio.sleep(1.5)
+                await btn.scroll_into_view_if_needed()
+                await asyncio.sleep(0.3)
+                await page.screenshot(path=output_path)
+        await context.close()
+        await browser.close()
+
+
+async def legacy_capture(url, matches, width, height, out_dir):
+    await legacy_shot(url, 0, os.path.join(out_dir, "intro.png"), width, height, intro=True)
+    for idx in range(matches):
+        await legacy_shot(url, idx, os.path.join(out_dir, f"match_{idx}.png"), width, height)
+        await asyncio.sleep(0.5)
+
+
+async def pooled_capture(url, matches, width, height, pool):
+    return await browser_recorder.capture_match_screenshots(
+        max_matches=matches, viewport_width=width, viewport_height=height, bets_url=url, pool=pool)
+
+
+async def run(args):
+    out_dir = tempfile.mkdtemp(prefix="scorenix_capture_bench_")
+    started = time.perf_counter()
+    await legacy_capture(args.url, args.matches, args.width, args.height, out_dir)
+    legacy_s = time.perf_counter() - started
+    print(f"legacy (launch per match + sleeps) : {legacy_s:6.2f} s")
+
+    pool = BrowserPool(idle_seconds=0)
+    try:
+        started = time.perf_counter()
+        shots = await pooled_capture(args.url, args.matches, args.width, args.height, pool)
+        cold_s = time.perf_counter() - started
+        started = time.perf_counter()
+        await pooled_capture(args.url, args.matches, args.width, args.height, pool)
+        warm_s = time.perf_counter() - started
+    finally:
+        await pool.close()
+    print(f"pooled, cold browser               : {cold_s:6.2f} s  ({legacy_s / cold_s:4.1f}x)  {len(shots)} shots")
+    print(f"pooled, warm browser               : {warm_s:6.2f} s  ({legacy_s / warm_s:4.1f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Capture phase benchmark (7-match short)")
+    parser.add_argument("--matches", type=int, default=7)
+    parser.add_argument("--url", default=FIXTURE_URL)
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    args = parser.parse_args(argv)
+    print(f"target: {args.url}  matches: {args.matches}  viewport {args.width}x{args.height}")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Card render benchmark — 경기 분석 카드 100장 렌더링 비교.
+
+기존 구현(카드마다 폰트 4종 로드 + draw.line 1,160회 그라데이션 + 모든 패널 재그리기,
+PNG optimize=True, 1장씩 순차)과 현재 구현(배경 템플릿 복사 + 동적 텍스트/바만, 폰트 캐시,
+PNG compress_level / WebP, 렌더 풀)을 비교. 기존/현재 결과 픽셀 차이도 함께 출력.
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/card_render.py --cards 100
+  python benchmarks/card_render.py --cards 100 --workers 4 --font /usr/share/fonts/truetype/dejavu/DejaVuSans.ttf
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import card_generator as cg  # noqa: E402
+
+
+def legacy_card(match_data, font_regular, font_bold, width=1080, height=1080):
+    """이전 _create_match_card (비교용 원본, 폰트 다운로드 분기 제외)."""
+    home = match_data.get("team_home_ko", match_data.get("team_home", "홈팀"))
+    away = match_data.get("team_away_ko", match_data.get("team_away", "원정팀"))
+    league = match_data.get("league", "리그")
+    confidence = match_data.get("confidence", 0)
+    recommendation = match_data.get("recommendation", "")
+    home_prob = match_data.get("home_win_prob", 0)
+    draw_prob = match_data.get("draw_prob", 0)
+    away_prob = match_data.get("away_win_prob", 0)
+    factors = match_data.get("factors", [])[:4]
+    rec_text = "홈 승" if recommendation == "HOME" else "원정 승" if recommendation == "AWAY" else "무승부"
+
+    img = Image.new("RGB", (width, height), color=(15, 15, 25))
+    draw = ImageDraw.Draw(img)
+    font_lg = ImageFont.truetype(font_bold, 48)
+    font_md = ImageFont.truetype(font_regular, 36)
+    font_sm = ImageFont.truetype(font_regular, 28)
+    font_xs = ImageFont.truetype(font_regular, 22)
+
+    for y in range(height):
+        r = int(15 + (25 - 15) * y / height)
+        g = int(15 + (20 - 15) * y / height)
+        b = int(25 + (45 - 25) * y / height)
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    for y in range(0, 80):
+        ratio = y / 80
+        r = int(147 + (99 - 147) * ratio)
+        g = int(51 + (102 - 51) * ratio)
+        b = int(234 + (241 - 234) * ratio)
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+
+    draw.text((40, 20), "SCORENIX", fill=(255, 255, 255), font=font_lg)
+    draw.text((380, 30), "AI MATCH ANALYSIS", fill=(220, 220, 255), font=font_sm)
+    draw.text((40, 110), f"📍 {league}", fill=(180, 180, 220), font=font_md)
+    draw.rounded_rectangle([(40, 180), (520, 360)], radius=16, fill=(30, 30, 50))
+    draw.text((60, 200), "HOME", fill=(130, 130, 180), font=font_xs)
+    draw.text((60, 240), home, fill=(255, 255, 255), font=font_md)
+    draw.text((60, 300), f"{home_prob:.1f}%", fill=(100, 220, 160), font=font_lg)
+    draw.text((525, 240), "VS", fill=(147, 51, 234), font=font_lg)
+    draw.rounded_rectangle([(600, 180), (1040, 360)], radius=16, fill=(30, 30, 50))
+    draw.text((620, 200), "AWAY", fill=(130, 130, 180), font=font_xs)
+    draw.text((620, 240), away, fill=(255, 255, 255), font=font_md)
+    draw.text((620, 300), f"{away_prob:.1f}%", fill=(234, 100, 100), font=font_lg)
+    draw.rounded_rectangle([(350, 370), (730, 430)], radius=12, fill=(40, 40, 60))
+    draw.text((380, 380), f"DRAW  {draw_prob:.1f}%", fill=(200, 200, 230), font=font_sm)
+
+    if confidence >= 70:
+        conf_color = (0, 230, 118)
+    elif confidence >= 55:
+        conf_color = (255, 193, 7)
+    else:
+        conf_color = (234, 100, 100)
+    draw.rounded_rectangle([(40, 470), (1040, 620)], radius=16, fill=(25, 25, 45))
+    draw.text((60, 490), "🧠 AI RECOMMENDATION", fill=(147, 51, 234), font=font_sm)
+    draw.text((60, 540), rec_text, fill=conf_color, font=font_lg)
+    bar_w = int(500 * confidence / 100)
+    draw.rounded_rectangle([(500, 545), (1020, 585)], radius=10, fill=(50, 50, 70))
+    if bar_w > 0:
+        draw.rounded_rectangle([(500, 545), (500 + bar_w, 585)], radius=10, fill=conf_color)
+    draw.text((500 + bar_w + 10, 548), f"{confidence:.0f}%", fill=conf_color, font=font_sm)
+
+    draw.text((40, 660), "📊 KEY FACTORS", fill=(147, 51, 234), font=font_sm)
+    factor_y = 710
+    for i, factor in enumerate(factors):
+        name = factor.get("name", f"Factor {i+1}")
+        score = factor.get("score", 0)
+        color = cg.FACTOR_COLORS[i % len(cg.FACTOR_COLORS)]
+        draw.rounded_rectangle([(40, factor_y), (1040, factor_y + 60)], radius=10, fill=(30, 30, 50))
+        draw.text((60, factor_y + 12), name, fill=(200, 200, 230), font=font_sm)
+        bar_x = 550
+        bar_len = int(430 * abs(score) / 100) if score != 0 else 0
+        draw.rounded_rectangle([(bar_x, factor_y + 15), (bar_x + 430, factor_y + 45)], radius=8, fill=(50, 50, 70))
+        if bar_len > 0:
+            draw.rounded_rectangle([(bar_x, factor_y + 15), (bar_x + bar_len, factor_y + 45)], radius=8, fill=color)
+        draw.text((bar_x + bar_len + 8, factor_y + 15), f"{score:.0f}", fill=color, font=font_xs)
+        factor_y += 75
+
+    draw.rounded_rectangle([(0, height - 70), (width, height)], radius=0, fill=(20, 20, 35))
+    draw.text((40, height - 55), "scorenix.com", fill=(147, 51, 234), font=font_sm)
+    now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    draw.text((700, height - 50), now_str, fill=(120, 120, 160), font=font_xs)
+    return img
+
+
+def legacy_encode(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def sample_matches(n, seed=11):
+    rng = random.Random(seed)
+    teams = ["Arsenal", "Chelsea", "Liverpool", "Spurs", "Leeds", "Everton", "Napoli", "Inter", "울산", "전북"]
+    matches = []
+    for i in range(n):
+        h, d = rng.uniform(20, 60), rng.uniform(15, 30)
+        matches.append({
+            "match_id": f"m{i}",
+            "team_home": rng.choice(teams),
+            "team_away": rng.choice(teams),
+            "league": rng.choice(["EPL", "Serie A", "K League 1"]),
+            "confidence": rng.uniform(40, 90),
+            "recommendation": rng.choice(["HOME", "AWAY", "DRAW"]),
+            "home_win_prob": h, "draw_prob": d, "away_win_prob": 100 - h - d,
+            "factors": [{"name": f"Factor {j}", "score": rng.uniform(-100, 100)} for j in range(rng.randint(1, 4))],
+        })
+    return matches
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Card render benchmark (100 cards)")
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--font", help="regular 폰트 경로 (기본: NanumGothic → 없으면 DejaVuSans)")
+    parser.add_argument("--font-bold", help="bold 폰트 경로")
+    args = parser.parse_args(argv)
+
+    regular = args.font or (cg.FONT_REGULAR if os.path.exists(cg.FONT_REGULAR)
+                            else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    bold = args.font_bold or (cg.FONT_BOLD if os.path.exists(cg.FONT_BOLD)
+                              else regular.replace("DejaVuSans.ttf", "DejaVuSans-Bold.ttf"))
+    # 벤치마크에서는 네트워크 다운로드 없이 같은 폰트로 비교
+    cg.FONT_REGULAR, cg.FONT_BOLD = regular, bold
+    matches = sample_matches(args.cards)
+    n = len(matches)
+    print(f"cards: {n} × 1080x1080, font {os.path.basename(regular)}, cpu {os.cpu_count()}")
+
+    legacy_s, legacy_png = timed(lambda: [legacy_encode(legacy_card(m, regular, bold)) for m in matches])
+    legacy_draw_s, legacy_imgs = timed(lambda: [legacy_card(m, regular, bold) for m in matches[:10]])
+    print(f"legacy (draw + PNG optimize)   : {legacy_s:6.2f} s  {legacy_s / n * 1000:6.1f} ms/card  "
+          f"avg {sum(map(len, legacy_png)) / n / 1024:6.1f} KB  (draw only {legacy_draw_s / 10 * 1000:.1f} ms/card)")
+
+    cold_s, _ = timed(lambda: (cg._card_template(), cg._factor_row_tiles(), cg._fonts()))
+    draw_s, new_imgs = timed(lambda: [cg._render_card_image(m) for m in matches[:10]])
+    print(f"template build (1회)            : {cold_s * 1000:6.1f} ms  (draw only {draw_s / 10 * 1000:.1f} ms/card)")
+
+    for label, fmt, kwargs in [
+        ("template + PNG, sequential", "png", {"max_workers": 1}),
+        (f"template + PNG, {args.workers} threads", "png", {"max_workers": args.workers}),
+        (f"template + WebP, {args.workers} threads", "webp", {"max_workers": args.workers}),
+        (f"template + PNG, {args.workers} processes", "png", {"max_workers": args.workers, "use_processes": True}),
+    ]:
+        if kwargs.get("max_workers") == 1:
+            elapsed, out = timed(lambda: [cg._create_match_card(m, image_format=fmt) for m in matches])
+        else:
+            elapsed, out = timed(lambda: cg.render_cards(matches, fmt, **kwargs))
+        print(f"{label:31s}: {elapsed:6.2f} s  {elapsed / n * 1000:6.1f} ms/card  "
+              f"avg {sum(map(len, out)) / n / 1024:6.1f} KB  ({legacy_s / elapsed:4.1f}x)")
+
+    diff = max(int(np.abs(np.asarray(a, dtype=np.int16) - np.asarray(b, dtype=np.int16)).max())
+               for a, b in zip(legacy_imgs, new_imgs))
+    print(f"max pixel diff legacy vs template: {diff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Cold-start benchmark — uvicorn 프로세스 기동부터 첫 응답(TTFB)까지 측정.
+
+LAZY_STARTUP=0 (기존: 전체 라우터 즉시 import) 과 LAZY_STARTUP=1 (지연 로딩) 을 번갈아 N회 실행.
+각 실행은 새 프로세스 → OS 파일 캐시 외에는 매번 콜드 스타트.
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/cold_start.py --runs 5
+  python benchmarks/cold_start.py --runs 3 --path /api/league/standings --json cold_start.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str, timeout: float = 30.0):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            resp.read(1)
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def measure(lazy: bool, path: str, timeout: float) -> dict:
+    port = _free_port()
+    env = {**os.environ, "LAZY_STARTUP": "1" if lazy else "0", "LAZY_WARM_DELAY": "3600",
+           "PYTHONDONTWRITEBYTECODE": "0"}
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        ttfb = None
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            try:
+                _get(f"http://127.0.0.1:{port}/", timeout=1.0)
+                ttfb = time.perf_counter() - start
+                break
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.02)
+        if ttfb is None:
+            raise RuntimeError("server did not answer before timeout")
+
+        result = {"ttfb_sec": round(ttfb, 3)}
+        if path and path != "/":
+            t = time.perf_counter()
+            result["first_route_status"] = _get(f"http://127.0.0.1:{port}{path}")
+            result["first_route_sec"] = round(time.perf_counter() - t, 3)
+        return result
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def summarize(samples: list, key: str) -> dict:
+    values = [s[key] for s in samples if key in s]
+    if not values:
+        return {}
+    return {"median": round(statistics.median(values), 3), "min": min(values), "max": max(values)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start TTFB benchmark (eager vs lazy startup)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="", help="기동 직후 이어서 호출할 경로 (첫 지연 라우터 로드 비용 측정)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    samples = {"eager": [], "lazy": []}
+    for i in range(args.runs):
+        for mode in ("eager", "lazy"):
+            r = measure(mode == "lazy", args.path, args.timeout)
+            samples[mode].append(r)
+            print(f"run {i + 1} {mode:<5} {r}")
+
+    report = {mode: {"ttfb": summarize(s, "ttfb_sec"), "first_route": summarize(s, "first_route_sec"),
+                     "samples": s} for mode, s in samples.items()}
+    eager, lazy = report["eager"]["ttfb"]["median"], report["lazy"]["ttfb"]["median"]
+    report["ttfb_reduction_pct"] = round((1 - lazy / eager) * 100, 1) if eager else None
+    print(f"\nTTFB median: eager {eager}s → lazy {lazy}s ({report['ttfb_reduction_pct']}% faster)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
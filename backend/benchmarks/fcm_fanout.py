@@ -0,0 +1,169 @@
+"""
+FCM broadcast fan-out benchmark — N명 전체 발송을 모의 Firestore/FCM 지연으로 측정.
+
+기존 구현(사용자마다 notification_prefs 1회 읽기 → 500개씩 순차 멀티캐스트)과
+현재 send_to_all(get_all 일괄 조회 → 병렬 멀티캐스트 → 일괄 비활성화)을 비교.
+지연 값은 Cloud Run → Firestore/FCM 실측치 수준의 기본값 (옵션으로 조정).
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/fcm_fanout.py --users 100000
+  python benchmarks/fcm_fanout.py --users 100000 --legacy-sample 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_admin import messaging as real_messaging  # noqa: E402
+
+from app.services import notification_service as ns  # noqa: E402
+
+
+class _Snap:
+    def __init__(self, doc_id, data):
+        self.id, self._data = doc_id, data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeFirestore:
+    """fcm_tokens / notification_prefs 만 흉내내는 지연 모의 DB."""
+
+    def __init__(self, tokens, prefs, read_latency, rpc_latency):
+        self.tokens, self.prefs = tokens, prefs
+        self.read_latency, self.rpc_latency = read_latency, rpc_latency
+        self.reads = self.rpcs = self.writes = 0
+
+    def collection(self, name):
+        db = self
+
+        class Query:
+            def where(self, *a, **k):
+                return self
+
+            def select(self, *a, **k):
+                return self
+
+            def stream(self):
+                time.sleep(db.rpc_latency + len(db.tokens) * 2e-6)
+                db.rpcs += 1
+                return [_Snap(uid, {"token": t}) for uid, t in db.tokens.items()]
+
+            def document(self, doc_id):
+                return SimpleNamespace(id=doc_id, collection=name,
+                                       get=lambda: db._get(name, doc_id))
+
+        return Query()
+
+    def _get(self, name, doc_id):
+        time.sleep(self.read_latency)
+        self.reads += 1
+        return _Snap(doc_id, self.prefs.get(doc_id))
+
+    def get_all(self, refs, field_paths=None):
+        time.sleep(self.rpc_latency)
+        self.rpcs += 1
+        self.reads += len(refs)
+        return [_Snap(r.id, self.prefs.get(r.id)) for r in refs]
+
+    def batch(self):
+        db = self
+
+        class Batch:
+            n = 0
+
+            def update(self, ref, data):
+                self.n += 1
+
+            def commit(self):
+                time.sleep(db.rpc_latency)
+                db.writes += self.n
+
+        return Batch()
+
+
+class FakeMessaging:
+    """실제 메시지 클래스 + 지연 모의 send_each_for_multicast (토큰 'bad-' 접두어는 만료)."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def __getattr__(self, name):
+        return getattr(real_messaging, name)
+
+    def send_each_for_multicast(self, message):
+        time.sleep(self.latency)
+        responses = [
+            SimpleNamespace(success=False, exception=real_messaging.UnregisteredError("unregistered"))
+            if t.startswith("bad-") else SimpleNamespace(success=True, exception=None)
+            for t in message.tokens
+        ]
+        ok = sum(r.success for r in responses)
+        return SimpleNamespace(success_count=ok, failure_count=len(responses) - ok, responses=responses)
+
+
+async def legacy_send_to_all(service, messaging, notification_type, body):
+    """이전 send_to_all 의 I/O 패턴 (사용자별 설정 읽기, 순차 멀티캐스트)."""
+    entries = await service.get_all_active_tokens()
+    pref_key = service.NOTIFICATION_TYPES[notification_type]["pref_key"]
+    filtered = [e for e in entries if await service.check_user_preference(e["user_id"], pref_key)]
+    sent = failed = 0
+    for i in range(0, len(filtered), 500):
+        response = messaging.send_each_for_multicast(
+            messaging.MulticastMessage(tokens=[e["token"] for e in filtered[i:i + 500]],
+                                       notification=messaging.Notification(title="t", body=body)))
+        sent += response.success_count
+        failed += response.failure_count
+    return {"sent": sent, "failed": failed, "skipped": len(entries) - len(filtered)}
+
+
+def build(users, bad_ratio=0.02, off_ratio=0.1):
+    tokens = {f"u{i}": (f"bad-{i}" if i % int(1 / bad_ratio) == 0 else f"tok-{i}") for i in range(users)}
+    prefs = {f"u{i}": {"valueBetAlert": i % int(1 / off_ratio) != 2} for i in range(0, users, 2)}
+    return tokens, prefs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FCM send_to_all fan-out with simulated latency")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--read-ms", type=float, default=4.0, help="단건 문서 읽기 지연")
+    parser.add_argument("--rpc-ms", type=float, default=25.0, help="get_all / stream / batch commit 지연")
+    parser.add_argument("--fcm-ms", type=float, default=300.0, help="멀티캐스트 1회 지연")
+    parser.add_argument("--legacy-sample", type=int, default=2000,
+                        help="기존 구현은 이 인원으로 측정 후 선형 외삽 (0 = 생략)")
+    args = parser.parse_args(argv)
+
+    service = ns.FCMNotificationService()
+    messaging = FakeMessaging(args.fcm_ms / 1000)
+    service._get_messaging = lambda: messaging
+
+    tokens, prefs = build(args.users)
+    db = FakeFirestore(tokens, prefs, args.read_ms / 1000, args.rpc_ms / 1000)
+    ns.get_firestore_db = lambda: db
+    t0 = time.perf_counter()
+    report = asyncio.run(service.send_to_all("value_bet", "benchmark"))
+    elapsed = time.perf_counter() - t0
+    print(f"send_to_all ({args.users} users, concurrency={ns.FANOUT_CONCURRENCY}): {elapsed:.2f}s")
+    print(f"  report: {report}")
+    print(f"  firestore: {db.reads} doc reads in {db.rpcs} RPCs, {db.writes} writes")
+
+    if args.legacy_sample:
+        n = min(args.legacy_sample, args.users)
+        tokens, prefs = build(n)
+        ldb = FakeFirestore(tokens, prefs, args.read_ms / 1000, args.rpc_ms / 1000)
+        ns.get_firestore_db = lambda: ldb
+        t0 = time.perf_counter()
+        legacy = asyncio.run(legacy_send_to_all(service, messaging, "value_bet", "benchmark"))
+        legacy_elapsed = time.perf_counter() - t0
+        projected = legacy_elapsed * args.users / n
+        print(f"legacy ({n} users): {legacy_elapsed:.2f}s {legacy} → projected {args.users} users: {projected:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
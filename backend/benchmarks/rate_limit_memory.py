@@ -0,0 +1,83 @@
+"""
+Rate limiter memory benchmark — 서로 다른 키 1M 개(스푸핑 IP 스캔 상황)를 흘려보내며 메모리 추적.
+
+기존 RateLimitStore (IP별 타임스탬프 리스트, 축출 없음) 와 GCRA + LRU(RateLimiter) 를 비교.
+tracemalloc 으로 limiter 가 보유한 메모리만 측정.
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/rate_limit_memory.py --keys 1000000
+  python benchmarks/rate_limit_memory.py --keys 1000000 --skip-legacy
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.rate_limit import LocalGCRABackend, RateLimiter, default_rules  # noqa: E402
+
+
+class LegacyRateLimitStore:
+    """main.py 의 이전 구현 (비교용)."""
+
+    def __init__(self, max_requests: int = 60, window_seconds: int = 60):
+        self.max_requests = max_requests
+        self.window = window_seconds
+        self.requests: dict = defaultdict(list)
+
+    def is_allowed(self, client_ip: str) -> bool:
+        now = time.time()
+        self.requests[client_ip] = [t for t in self.requests[client_ip] if now - t < self.window]
+        if len(self.requests[client_ip]) >= self.max_requests:
+            return False
+        self.requests[client_ip].append(now)
+        return True
+
+
+def _ip(i: int) -> str:
+    return f"ip:{(i >> 24) & 255}.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def run(name: str, check, n_keys: int, checkpoints):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    rows = []
+    for i in range(n_keys):
+        check(_ip(i))
+        if i + 1 in checkpoints:
+            current, _ = tracemalloc.get_traced_memory()
+            rows.append((i + 1, (current - base) / 1e6, time.perf_counter() - t0))
+    tracemalloc.stop()
+    print(f"\n{name}")
+    print(f"{'keys':>10}{'memory MB':>12}{'elapsed s':>12}{'µs/req':>10}")
+    for keys, mb, sec in rows:
+        print(f"{keys:>10}{mb:>12.1f}{sec:>12.2f}{sec / keys * 1e6:>10.2f}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rate limiter memory with N distinct keys")
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--max-keys", type=int, default=50_000, help="GCRA LRU 최대 키 수")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args(argv)
+
+    checkpoints = {k for k in (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, args.keys) if k <= args.keys}
+
+    limiter = RateLimiter(rules=default_rules(), backend=LocalGCRABackend(max_keys=args.max_keys))
+    gcra_rows = run(f"GCRA + LRU (max_keys={args.max_keys})",
+                    lambda key: limiter.check(key, "anonymous", "/api/odds/bets"), args.keys, checkpoints)
+    print(f"evictions={limiter.backend.evictions}, keys held={len(limiter.backend)}")
+
+    if not args.skip_legacy:
+        legacy = LegacyRateLimitStore()
+        legacy_rows = run("Legacy RateLimitStore (defaultdict of lists)", legacy.is_allowed, args.keys, checkpoints)
+        print(f"\nfinal: GCRA {gcra_rows[-1][1]:.1f} MB vs legacy {legacy_rows[-1][1]:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Shorts encode benchmark — 같은 대본을 MoviePy 합성 경로와 ffmpeg 필터 그래프 렌더러로 인코딩해 비교.
+
+_encode_language_job 을 renderer=moviepy / ffmpeg 로 각각 새 프로세스에서 실행하고
+벽시계 시간, Python 프로세스 최대 RSS, 자식(ffmpeg) 프로세스 최대 RSS, 출력 길이/프레임 수를 출력.
+합성 장면 PNG(1080x1920) + 말소리 WAV + BGM WAV 를 사용하므로 캡처·TTS 시간은 포함하지 않음.
+MoviePy 경로의 BGM PCM 사전 디코드(render_multilang 에서 언어 공통 1회)는 측정에서 제외.
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/shorts_encode.py --scenes 6 --seconds 60
+  python benchmarks/shorts_encode.py --scenes 6 --seconds 60 --threads 2
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_shorts_pipeline as gsp  # noqa: E402
+from app.services import ffmpeg_renderer  # noqa: E402
+
+SR = 44100
+
+
+def write_wav(path, pcm):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes((np.clip(pcm, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def build_script(root, n_scenes, seconds, rng):
+    """장면 PNG / 장면별 말소리 WAV / BGM WAV 생성 → job 템플릿."""
+    weights = rng.uniform(0.6, 1.4, n_scenes)
+    durations = seconds * weights / weights.sum()
+    scenes = []
+    for i, dur in enumerate(durations):
+        frame = os.path.join(root, f"scene_{i}.png")
+        img = Image.fromarray(rng.integers(0, 255, (gsp.HEIGHT // 8, gsp.WIDTH // 8, 3), dtype=np.uint8))
+        img = img.resize((gsp.WIDTH, gsp.HEIGHT), Image.NEAREST)
+        ImageDraw.Draw(img).text((80, 160), f"scene {i}", fill=(255, 255, 255))
+        img.save(frame, compress_level=1)
+
+        t = np.arange(int(dur * SR)) / SR
+        gate = (np.sin(2 * np.pi * 0.4 * t + i) > -0.3).astype(np.float32)   # 발화 / 쉼 반복
+        audio = os.path.join(root, f"audio_{i}.wav")
+        write_wav(audio, 0.4 * gate * np.sin(2 * np.pi * (160 + 20 * i) * t))
+        scenes.append({"frame_path": frame, "audio_path": audio})
+    bgm = os.path.join(root, "bgm.wav")
+    t = np.arange(int(min(seconds, 30) * SR)) / SR
+    write_wav(bgm, 0.5 * np.sin(2 * np.pi * 110 * t))
+    return scenes, bgm
+
+
+def worker(mode, root, threads):
+    """새 프로세스에서 1회 인코딩 → JSON 결과."""
+    with open(os.path.join(root, "job.json"), encoding="utf-8") as f:
+        job = json.load(f)
+    work_dir = os.path.join(root, f"work_{mode}")
+    os.makedirs(work_dir, exist_ok=True)
+    job.update(renderer=mode, work_dir=work_dir, threads=threads,
+               output_path=os.path.join(root, f"out_{mode}.mp4"))
+    if mode == "moviepy":
+        job["bgm_pcm"] = gsp._decode_bgm(work_dir, gsp.MAX_SHORTS_SECONDS, job.pop("bgm_path"))
+    started = time.perf_counter()
+    # _encode_language_job 의 폴백 없이 해당 경로만 측정
+    if mode == "moviepy":
+        gsp._encode_language_job_moviepy(job)
+    else:
+        gsp._encode_language_job_ffmpeg(job)
+    wall = time.perf_counter() - started
+    print(json.dumps({
+        "wall_s": wall,
+        "self_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "output": job["output_path"],
+    }))
+
+
+def count_frames(path):
+    ffmpeg = ffmpeg_renderer.find_ffmpeg()
+    out = subprocess.run([ffmpeg, "-v", "error", "-i", path, "-map", "0:v", "-f", "framemd5", "-"],
+                         capture_output=True, text=True).stdout
+    return sum(1 for line in out.splitlines() if line and not line.startswith("#"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shorts encode benchmark (MoviePy vs ffmpeg filter graph)")
+    parser.add_argument("--scenes", type=int, default=6)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--worker", choices=["moviepy", "ffmpeg"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args.worker, args.dir, args.threads)
+        return
+
+    root = tempfile.mkdtemp(prefix="shorts_encode_bench_")
+    try:
+        scenes, bgm = build_script(root, args.scenes, args.seconds, np.random.default_rng(7))
+        with open(os.path.join(root, "job.json"), "w", encoding="utf-8") as f:
+            json.dump({"lang": "ko", "scenes": scenes, "bgm_path": bgm}, f)
+        durations = ffmpeg_renderer.probe_durations([s["audio_path"] for s in scenes])
+        expected = sum(ffmpeg_renderer.scene_frames(durations, gsp.SHORTS_FPS))
+        print(f"script: {args.scenes} scenes, {sum(durations):.2f}s @ {gsp.SHORTS_FPS}fps "
+              f"({expected} frames), {gsp.WIDTH}x{gsp.HEIGHT}, threads={args.threads}")
+
+        results = {}
+        for mode in ("moviepy", "ffmpeg"):
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", mode, "--dir", root,
+                 "--threads", str(args.threads)],
+                capture_output=True, text=True, check=True,
+            )
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            info = ffmpeg_renderer.probe([result["output"]])[0]
+            result.update(duration=info.duration, frames=count_frames(result["output"]))
+            results[mode] = result
+            print(f"{mode:8s}: {result['wall_s']:6.2f} s  python peak RSS {result['self_rss_mb']:6.0f} MB  "
+                  f"children peak RSS {result['child_rss_mb']:5.0f} MB  "
+                  f"→ {result['duration']:.2f}s / {result['frames']} frames")
+
+        base, fast = results["moviepy"], results["ffmpeg"]
+        print(f"speedup : {base['wall_s'] / fast['wall_s']:.1f}x  "
+              f"peak RSS {max(base['self_rss_mb'], base['child_rss_mb']):.0f} → "
+              f"{max(fast['self_rss_mb'], fast['child_rss_mb']):.0f} MB  "
+              f"frames {'match' if base['frames'] == fast['frames'] == expected else 'MISMATCH'}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
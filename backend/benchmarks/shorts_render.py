@@ -0,0 +1,175 @@
+"""
+Shorts render stage benchmark — 60초 영상 기준 오디오 덕킹 / Ken Burns 단계 비교.
+
+기존 구현(음성 get_frame 을 0.1초마다 호출 → 스칼라 attack/release 루프 →
+청크마다 리스트 컴프리헨션 게인 조회, Ken Burns 는 프레임마다 get_frame(0) + LANCZOS 리사이즈)과
+현재 구현(PCM 1회 디코드 → 벡터 엔벨로프 → np.take 게인, 원본 1회 디코드 + 사전 계산 크롭)을 비교.
+합성 음성/BGM/이미지를 사용하므로 네트워크·ffmpeg 인코딩 시간은 포함하지 않음.
+
+사용법 (backend 디렉터리에서):
+  python benchmarks/shorts_render.py --seconds 60
+  python benchmarks/shorts_render.py --seconds 60 --frame-sample 240
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moviepy.audio.AudioClip import AudioArrayClip  # noqa: E402
+from moviepy.editor import AudioFileClip, ImageClip  # noqa: E402
+
+import generate_shorts_pipeline as gsp  # noqa: E402
+
+SR = 44100
+
+
+def legacy_envelope(speech_clip, duck_vol=0.03, normal_vol=0.12, threshold=0.015, attack=0.15, release=0.35):
+    """이전 apply_audio_ducking 의 엔벨로프 계산부 (비교용 원본)."""
+    duration = speech_clip.duration
+    fps = 10
+    n_samples = int(duration * fps)
+    times = np.linspace(0, duration, n_samples)
+    amps = []
+    for t in times:
+        try:
+            frame = speech_clip.get_frame(t)
+            amps.append(np.max(np.abs(frame)))
+        except Exception:
+            amps.append(0.0)
+    envelope = []
+    current_vol = normal_vol
+    for amp in amps:
+        target_vol = duck_vol if amp > threshold else normal_vol
+        if target_vol < current_vol:
+            current_vol = current_vol - (current_vol - target_vol) * (1.0 / max(1, fps * attack))
+            current_vol = max(current_vol, duck_vol)
+        else:
+            current_vol = current_vol + (target_vol - current_vol) * (1.0 / max(1, fps * release))
+            current_vol = min(current_vol, normal_vol)
+        envelope.append(current_vol)
+    return envelope
+
+
+def legacy_ducking(bgm_clip, speech_clip):
+    """이전 apply_audio_ducking (비교용 원본)."""
+    fps = 10
+    envelope = legacy_envelope(speech_clip)
+
+    def get_vol(t):
+        if isinstance(t, np.ndarray):
+            indices = np.clip((t * fps).astype(int), 0, len(envelope) - 1)
+            return np.array([envelope[idx] for idx in indices])[:, np.newaxis]
+        idx = min(int(t * fps), len(envelope) - 1)
+        return envelope[idx]
+
+    return bgm_clip.fl(lambda gf, t: gf(t) * get_vol(t))
+
+
+def legacy_ken_burns(clip, duration, zoom_start=1.0, zoom_end=1.08):
+    """이전 ken_burns (비교용 원본)."""
+    from moviepy.video.VideoClip import VideoClip
+    w, h = clip.size
+
+    def make_frame(t):
+        progress = t / duration if duration > 0 else 0
+        zoom = zoom_start + (zoom_end - zoom_start) * progress
+        frame = clip.get_frame(0)
+        new_w, new_h = int(w / zoom), int(h / zoom)
+        x1, y1 = (w - new_w) // 2, (h - new_h) // 2
+        cropped = frame[y1:y1 + new_h, x1:x1 + new_w]
+        return np.array(Image.fromarray(cropped).resize((w, h), Image.LANCZOS))
+
+    return VideoClip(make_frame, duration=duration)
+
+
+def synthetic_audio(seconds, rng):
+    t = np.arange(int(seconds * SR)) / SR
+    # 말소리: 1.5~3초 발화 / 0.3~0.8초 쉼 반복
+    gate = np.zeros_like(t)
+    pos = 0.0
+    while pos < seconds:
+        talk = rng.uniform(1.5, 3.0)
+        gate[(t >= pos) & (t < pos + talk)] = 1.0
+        pos += talk + rng.uniform(0.3, 0.8)
+    speech = (0.4 * gate * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    bgm = (0.5 * np.sin(2 * np.pi * 110 * t)).astype(np.float32)
+    return np.stack([speech, speech], 1), np.stack([bgm, bgm], 1)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shorts render stage benchmark (ducking / Ken Burns)")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--frame-sample", type=int, default=120,
+                        help="Ken Burns 측정 프레임 수 (전체 프레임 수로 환산)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(7)
+    speech_pcm, bgm_pcm = synthetic_audio(args.seconds, rng)
+    # 실제 렌더처럼 음성은 파일(ffmpeg 리더)에서 읽음
+    import wave
+    speech_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_speech.wav")
+    with wave.open(speech_path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes((speech_pcm * 32767).astype(np.int16).tobytes())
+    speech = AudioFileClip(speech_path)
+    bgm = AudioArrayClip(bgm_pcm, fps=SR)
+    print(f"render: {args.seconds:.0f}s @ {gsp.SHORTS_FPS}fps, audio {SR}Hz stereo")
+
+    # ── 1) 오디오 덕킹: 엔벨로프 + BGM 전체 렌더 (write_audiofile 이 하는 청크 순회) ──
+    env_legacy_s, _ = timed(lambda: legacy_envelope(speech))
+    env_new_s, _ = timed(lambda: gsp.ducking_envelope(gsp.speech_amplitudes(speech)))
+    print(f"envelope legacy: {env_legacy_s * 1000:8.0f} ms  (get_frame × {int(args.seconds * 10)} + scalar loop)")
+    env_file_s, _ = timed(lambda: gsp.ducking_envelope(gsp.speech_amplitudes(gsp.decode_pcm(speech_path))))
+    print(f"envelope clip  : {env_new_s * 1000:8.0f} ms  ({env_legacy_s / env_new_s:5.1f}x)  (MoviePy 청크 디코드)")
+    print(f"envelope file  : {env_file_s * 1000:8.0f} ms  ({env_legacy_s / env_file_s:5.1f}x)  ← render path (ffmpeg PCM 1회)")
+    legacy_s, legacy_out = timed(lambda: gsp.clip_pcm(legacy_ducking(bgm, speech), SR))
+    clip_s, clip_out = timed(lambda: gsp.clip_pcm(gsp.apply_audio_ducking(bgm, speech), SR))
+    pcm_s, _ = timed(lambda: gsp.duck_pcm(
+        bgm_pcm, gsp.ducking_envelope(gsp.speech_amplitudes(gsp.decode_pcm(speech_path))), SR))
+    n = min(len(legacy_out), len(clip_out))
+    drift = float(np.mean(np.abs(legacy_out[:n] - clip_out[:n])))
+    print(f"ducking  legacy: {legacy_s * 1000:8.0f} ms")
+    print(f"ducking  clip  : {clip_s * 1000:8.0f} ms  ({legacy_s / clip_s:5.1f}x)  mean |Δ| vs legacy {drift:.4f}")
+    print(f"ducking  pcm   : {pcm_s * 1000:8.0f} ms  ({legacy_s / pcm_s:5.1f}x)  ← render path (duck_pcm)")
+    speech.close()
+    os.remove(speech_path)
+
+    # ── 2) Ken Burns: 표본 프레임 측정 → 전체 프레임 수로 환산 ──
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_kb_source.png")
+    Image.fromarray(rng.integers(0, 255, (gsp.HEIGHT, gsp.WIDTH, 3), dtype=np.uint8)).save(path)
+    try:
+        still = ImageClip(path).set_duration(args.seconds)
+        total_frames = int(args.seconds * gsp.SHORTS_FPS)
+        sample = min(args.frame_sample, total_frames)
+        times = np.arange(sample) * (total_frames / sample) / gsp.SHORTS_FPS
+
+        def run(factory):
+            kb = factory(still, args.seconds)
+            for t in times:
+                kb.get_frame(t)
+
+        kb_legacy_s, _ = timed(lambda: run(legacy_ken_burns))
+        kb_new_s, _ = timed(lambda: run(gsp.ken_burns))
+        scale = total_frames / sample
+        print(f"kenburns legacy: {kb_legacy_s / sample * 1000:6.1f} ms/frame → {kb_legacy_s * scale:6.1f} s / {total_frames} frames")
+        print(f"kenburns new   : {kb_new_s / sample * 1000:6.1f} ms/frame → {kb_new_s * scale:6.1f} s / {total_frames} frames"
+              f"  ({kb_legacy_s / kb_new_s:4.1f}x)")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.models.config_db import load_config_to_env
 from app.services.google_drive_service import google_drive_service
-from generate_shorts_pipeline import generate_video, build_script, fetch_top_matches
+from generate_shorts_pipeline import build_script, fetch_top_matches, render_multilang
 
 logging.basicConfig(
     level=logging.INFO,
@@ -74,29 +74,23 @@ async def run_distribution_pipeline(mode: str, use_avatar: bool = False, langs:
         langs = ["ko", "en", "ja"]
         
     results = {}
-    
-    for lang in langs:
-        logger.info(f"🌐 [{lang.upper()}] 다국어 숏츠 빌드 및 배포 시작...")
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        video_path = os.path.join(output_dir, f"scorenix_shorts_{mode}_{lang}_{ts}.mp4")
-        
-        # 1. 숏폼 비디오 생성 (Gemini 번역 및 성우 튜닝 탑재)
-        try:
-            loop = asyncio.get_running_loop()
-            rendered_path = await loop.run_in_executor(
-                None, 
-                generate_video, 
-                "background.mp4", 
-                video_path, 
-                False,      # auto_upload는 본 스케줄러에서 따로 관리하므로 False
-                use_avatar, 
-                mode,
-                lang
-            )
-        except Exception as render_err:
-            logger.error(f"❌ [{lang.upper()}] 비디오 렌더링 중 오류 발생: {render_err}", exc_info=True)
-            continue
 
+    # 1. 숏폼 비디오 일괄 생성 — 스크린샷·BGM 은 1회만 준비, 언어별 TTS/인코딩은 병렬
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    video_paths = {
+        lang: os.path.join(output_dir, f"scorenix_shorts_{mode}_{lang}_{ts}.mp4") for lang in langs
+    }
+    logger.info(f"🌐 다국어 숏츠 일괄 렌더링 시작: {', '.join(l.upper() for l in langs)}")
+    try:
+        render = await render_multilang(langs, video_paths)
+        rendered = render["outputs"]
+        logger.info(f"⏱️ 렌더링 단계별 소요(ms): {render['timings_ms']}")
+    except Exception as render_err:
+        logger.error(f"❌ 비디오 렌더링 중 오류 발생: {render_err}", exc_info=True)
+        rendered = {}
+
+    for lang in langs:
+        rendered_path = rendered.get(lang)
         if not rendered_path or not os.path.exists(rendered_path):
             logger.error(f"❌ [{lang.upper()}] 비디오 파일이 성공적으로 생성되지 않았습니다.")
             continue
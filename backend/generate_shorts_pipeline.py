@@ -30,6 +30,7 @@ except ImportError:
     load_betman_data = None
 
 WIDTH, HEIGHT = 1080, 1920  # 쇼츠 9:16
+SHORTS_FPS = 24
 
 
 def fetch_top_matches(limit=7):
@@ -503,96 +504,162 @@ except ImportError:
     PRESENTER_IMAGE = ""
 
 
+DUCK_ENV_FPS = 10          # 덕킹 엔벨로프 해상도 (0.1초)
+DUCK_PCM_FPS = 2000        # 음성 진폭 측정용 PCM 샘플레이트 (0.1초 구간 피크 검출에는 충분)
+
+
+def clip_pcm(clip, fps, quantize=False, nbytes=2):
+    """
+    오디오 클립 → PCM 배열 (1회 디코드).
+    MoviePy 1.0.3 의 to_soundarray 는 np.vstack(제너레이터) 를 써서 최신 NumPy 에서 TypeError.
+    """
+    chunks = list(clip.iter_chunks(fps=fps, quantize=quantize, nbytes=nbytes, chunksize=50000))
+    if not chunks:
+        return np.zeros((0, clip.nchannels), dtype=np.float32)
+    return np.vstack(chunks)
+
+
+def decode_pcm(paths, sample_rate=DUCK_PCM_FPS, durations=None):
+    """
+    ffmpeg 1회 호출로 파일(들) → 이어 붙인 모노 float32 PCM.
+    durations 지정 시 파일마다 그 길이로 자르거나 무음 패딩 (concatenate_videoclips 타임라인과 일치).
+    """
+    import subprocess
+    from moviepy.config import get_setting
+    if isinstance(paths, str):
+        paths = [paths]
+        durations = [durations] if durations is not None else None
+    cmd = [get_setting("FFMPEG_BINARY"), "-v", "error"]
+    for path in paths:
+        cmd += ["-i", path]
+    if durations is not None:
+        chains = [f"[{i}:a]aformat=channel_layouts=mono,aresample={sample_rate},"
+                  f"apad=whole_dur={d:.6f},atrim=0:{d:.6f}[a{i}]" for i, d in enumerate(durations)]
+        inputs = "".join(f"[a{i}]" for i in range(len(paths)))
+        cmd += ["-filter_complex", ";".join(chains) + f";{inputs}concat=n={len(paths)}:v=0:a=1[out]",
+                "-map", "[out]"]
+    elif len(paths) > 1:
+        inputs = "".join(f"[{i}:a]" for i in range(len(paths)))
+        cmd += ["-filter_complex", f"{inputs}concat=n={len(paths)}:v=0:a=1[out]", "-map", "[out]"]
+    cmd += ["-f", "f32le", "-ac", "1", "-ar", str(sample_rate), "-"]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(raw, dtype=np.float32)
+
+
+def speech_amplitudes(speech, fps=DUCK_ENV_FPS, pcm_fps=DUCK_PCM_FPS):
+    """
+    음성 PCM 을 1회 디코드해 1/fps 초 구간별 최대 진폭 배열로.
+    speech: 오디오 클립 또는 pcm_fps 샘플레이트의 PCM 배열.
+    """
+    if isinstance(speech, np.ndarray):
+        pcm = np.abs(speech.astype(np.float32, copy=False))
+        n = int(len(pcm) / pcm_fps * fps)
+    else:
+        n = int(speech.duration * fps)
+        if n <= 0:
+            return np.zeros(0, dtype=np.float32)
+        pcm = np.abs(np.asarray(clip_pcm(speech, pcm_fps), dtype=np.float32))
+    if n <= 0:
+        return np.zeros(0, dtype=np.float32)
+    mono = pcm.max(axis=1) if pcm.ndim == 2 else pcm
+    window = pcm_fps // fps
+    mono = np.pad(mono[:n * window], (0, max(0, n * window - len(mono))))
+    return mono.reshape(n, window).max(axis=1)
+
+
+def ducking_envelope(amps, duck_vol=0.03, normal_vol=0.12, threshold=0.015, attack=0.15, release=0.35,
+                     fps=DUCK_ENV_FPS):
+    """
+    진폭 → BGM 볼륨 엔벨로프 (attack/release 1차 평활).
+    목표 볼륨이 두 값뿐이라 같은 목표가 이어지는 구간은 등비수열 닫힌 식으로 한 번에 계산
+    (루프는 말소리 on/off 전환 횟수만큼만).
+    """
+    amps = np.asarray(amps, dtype=np.float64)
+    envelope = np.empty(len(amps), dtype=np.float64)
+    if not len(amps):
+        return envelope
+    keep_attack = 1.0 - 1.0 / max(1, fps * attack)
+    keep_release = 1.0 - 1.0 / max(1, fps * release)
+    ducked = amps > threshold
+    starts = np.flatnonzero(np.r_[True, ducked[1:] != ducked[:-1]])
+    ends = np.r_[starts[1:], len(amps)]
+    current = normal_vol
+    for start, end in zip(starts, ends):
+        steps = np.arange(1, end - start + 1)
+        if ducked[start]:
+            target, keep = duck_vol, keep_attack
+        else:
+            target, keep = normal_vol, keep_release
+        envelope[start:end] = target + (current - target) * keep ** steps
+        current = envelope[end - 1]
+    return np.clip(envelope, duck_vol, normal_vol)
+
+
+def duck_pcm(bgm_pcm, envelope, sample_rate, fps=DUCK_ENV_FPS):
+    """BGM PCM 배열에 엔벨로프 게인을 샘플 단위로 곱함 (np.take 조회)."""
+    if not len(envelope):
+        return bgm_pcm
+    if sample_rate % fps == 0:
+        # 구간당 샘플 수가 정수면 반복 확장 (인덱스 배열 없이)
+        gain = np.repeat(envelope.astype(np.float32), sample_rate // fps)[:len(bgm_pcm)]
+        if len(gain) < len(bgm_pcm):
+            gain = np.pad(gain, (0, len(bgm_pcm) - len(gain)), mode="edge")
+    else:
+        idx = np.minimum((np.arange(len(bgm_pcm)) * fps) // sample_rate, len(envelope) - 1)
+        gain = np.take(envelope, idx).astype(np.float32)
+    return bgm_pcm * (gain[:, np.newaxis] if bgm_pcm.ndim == 2 else gain)
+
+
 def apply_audio_ducking(bgm_clip, speech_clip, duck_vol=0.03, normal_vol=0.12, threshold=0.015, attack=0.15, release=0.35):
     """
     미리 말소리 진폭(Envelope)을 추출한 뒤 BGM 음량을 동적으로 조절하는 프로페셔널 오디오 덕킹 필터
     """
-    duration = speech_clip.duration
-    fps = 10  # 0.1초마다 샘플링
-    n_samples = int(duration * fps)
-    times = np.linspace(0, duration, n_samples)
-    
-    amps = []
-    for t in times:
-        try:
-            frame = speech_clip.get_frame(t)
-            amps.append(np.max(np.abs(frame)))
-        except Exception:
-            amps.append(0.0)
-            
-    envelope = []
-    current_vol = normal_vol
-    for amp in amps:
-        target_vol = duck_vol if amp > threshold else normal_vol
-        if target_vol < current_vol:
-            current_vol = current_vol - (current_vol - target_vol) * (1.0 / max(1, fps * attack))
-            current_vol = max(current_vol, duck_vol)
-        else:
-            current_vol = current_vol + (target_vol - current_vol) * (1.0 / max(1, fps * release))
-            current_vol = min(current_vol, normal_vol)
-        envelope.append(current_vol)
-        
+    fps = DUCK_ENV_FPS
+    envelope = ducking_envelope(speech_amplitudes(speech_clip, fps), duck_vol, normal_vol,
+                                threshold, attack, release, fps)
+    if not len(envelope):
+        envelope = np.array([normal_vol])
+    last = len(envelope) - 1
+
     def get_vol(t):
         if isinstance(t, np.ndarray):
-            indices = np.clip((t * fps).astype(int), 0, len(envelope) - 1)
-            return np.array([envelope[idx] for idx in indices])[:, np.newaxis]
-        else:
-            idx = min(int(t * fps), len(envelope) - 1)
-            return envelope[idx]
-            
+            return np.take(envelope, np.clip((t * fps).astype(int), 0, last))[:, np.newaxis]
+        return envelope[min(max(int(t * fps), 0), last)]
+
     return bgm_clip.fl(lambda gf, t: gf(t) * get_vol(t))
 
 
-async def _tts_async(text, path, lang="ko"):
-    import edge_tts
-    cfg = load_video_settings()
-    
-    # 언어별 최적의 성우 지정
-    voice_map = {
-        "ko": cfg.get("tts_voice_ko", "ko-KR-SunHiNeural"),
-        "en": cfg.get("tts_voice_en", "en-US-EmmaNeural"),
-        "ja": cfg.get("tts_voice_ja", "ja-JP-NanamiNeural")
-    }
-    voice = voice_map.get(lang, "ko-KR-SunHiNeural")
-    
-    # 속도를 언어별로 튜닝
-    rate_map = {
-        "ko": cfg.get("tts_speed_ko", "+15%"),
-        "en": cfg.get("tts_speed_en", "+12%"),
-        "ja": cfg.get("tts_speed_ja", "+10%")
-    }
-    rate = rate_map.get(lang, "+15%")
-    
-    # 피치 지정
-    pitch_map = {
-        "ko": cfg.get("tts_pitch_ko", "+5Hz"),
-        "en": cfg.get("tts_pitch_en", "+0Hz"),
-        "ja": cfg.get("tts_pitch_ja", "+0Hz")
-    }
-    pitch = pitch_map.get(lang, "+5Hz" if lang == "ko" else "+0Hz")
-    
-    communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch)
-    await communicate.save(path)
+_TTS_DEFAULTS = {
+    "ko": ("ko-KR-SunHiNeural", "+15%", "+5Hz"),
+    "en": ("en-US-EmmaNeural", "+12%", "+0Hz"),
+    "ja": ("ja-JP-NanamiNeural", "+10%", "+0Hz"),
+}
+
+
+def _tts_request(text, lang="ko", cfg=None):
+    """언어별 성우/속도/피치 설정 (Firestore video_config 우선)."""
+    from app.services.tts_service import TTSRequest
+    cfg = cfg if cfg is not None else load_video_settings()
+    voice, rate, pitch = _TTS_DEFAULTS.get(lang, ("ko-KR-SunHiNeural", "+15%", "+0Hz"))
+    return TTSRequest(
+        text=text,
+        lang=lang,
+        voice=cfg.get(f"tts_voice_{lang}", voice),
+        rate=cfg.get(f"tts_speed_{lang}", rate),
+        pitch=cfg.get(f"tts_pitch_{lang}", pitch),
+    )
 
 
 def generate_tts(text, path, lang="ko"):
-    """ElevenLabs (최고 품질) → Edge TTS (무료 폴백) → gTTS (최종 폴백)"""
-    # 1차: ElevenLabs (API 키 있으면)
-    if is_elevenlabs_available():
-        if elevenlabs_tts(text, path):
-            return
-        print("    [>] ElevenLabs failed, trying Edge TTS...")
-
-    # 2차: Edge TTS
-    try:
-        asyncio.run(_tts_async(text, path, lang))
-        return
-    except Exception as e:
-        print(f"    [!] Edge TTS failed ({e}), falling back to gTTS")
-
-    # 3차: gTTS
-    from gtts import gTTS
-    gTTS(text=text, lang=lang).save(path)
+    """
+    ElevenLabs (최고 품질) → Edge TTS (무료 폴백) → gTTS (최종 폴백).
+    tts_service 디스크 캐시 경유 — 같은 문장/성우 설정은 다시 합성하지 않음. 반환: 길이(초)
+    """
+    import shutil
+    from app.services.tts_service import tts_service
+    result = asyncio.run(tts_service.synthesize(_tts_request(text, lang)))
+    shutil.copyfile(result.path, path)
+    return result.duration
 
 
 
@@ -967,26 +1034,30 @@ def render_headline():
 
 
 # ─── Ken Burns Effect ───────────────────────────────────
-def ken_burns(clip, duration, zoom_start=1.0, zoom_end=1.08):
-    """정지 이미지에 느린 줌인 효과를 적용하여 영상 느낌 연출"""
+def ken_burns(clip, duration, zoom_start=1.0, zoom_end=1.08, fps=None):
+    """
+    정지 이미지에 느린 줌인 효과를 적용하여 영상 느낌 연출.
+    원본은 1회만 디코드하고, 프레임별 크롭 영역(서브픽셀)은 미리 계산해 resize(box=) 한 번으로 처리.
+    """
+    fps = fps or SHORTS_FPS
     w, h = clip.size
+    source = Image.fromarray(clip.get_frame(0))
+    n_frames = max(1, int(round(duration * fps)))
+    progress = np.arange(n_frames + 1) / n_frames
+    zoom = zoom_start + (zoom_end - zoom_start) * progress
+    crop_w, crop_h = w / zoom, h / zoom
+    boxes = np.stack([(w - crop_w) / 2, (h - crop_h) / 2, (w + crop_w) / 2, (h + crop_h) / 2], axis=1)
+    cache = {}
 
     def make_frame(t):
-        progress = t / duration if duration > 0 else 0
-        zoom = zoom_start + (zoom_end - zoom_start) * progress
-        frame = clip.get_frame(0)
-
-        # 줌 크롭 계산
-        new_w = int(w / zoom)
-        new_h = int(h / zoom)
-        x1 = (w - new_w) // 2
-        y1 = (h - new_h) // 2
-        cropped = frame[y1:y1 + new_h, x1:x1 + new_w]
-
-        # 원본 크기로 리사이즈
-        pil_img = Image.fromarray(cropped)
-        pil_img = pil_img.resize((w, h), Image.LANCZOS)
-        return np.array(pil_img)
+        idx = min(max(int(round(t * fps)), 0), n_frames)
+        frame = cache.get(idx)
+        if frame is None:
+            # 줌 ≤ 1.08 확대라 BILINEAR 로도 LANCZOS 와 시각적 차이가 없음
+            frame = np.asarray(source.resize((w, h), Image.BILINEAR, box=tuple(boxes[idx])))
+            cache.clear()
+            cache[idx] = frame
+        return frame
 
     from moviepy.video.VideoClip import VideoClip
     return VideoClip(make_frame, duration=duration)
@@ -1007,167 +1078,412 @@ def get_bgm():
     return bgm_path
 
 
-# ─── 메인 영상 생성 ─────────────────────────────────────
-def generate_video(bg_video_path, output_path, auto_upload=False, use_avatar=False, mode="membership", lang="ko"):
-    """
-    스코어닉스 Shorts 영상 생성 (v5.0 — Screenshot Style)
-    
-    새로운 방식:
-    1. /bets 페이지에서 각 경기 AI 분석 화면을 스크린샷으로 캡처
-    2. 각 스크린샷을 전체 화면 배경으로 사용 (Ken Burns 미세 움직임)
-    3. TTS 음성 나레이션만 추가 (자막/오버레이 없음)
-    4. BGM + 오디오 덕킹
-    """
-    import asyncio as _asyncio
+# ─── 다국어 렌더 플래너 ─────────────────────────────────
+# 언어와 무관한 자산(스크린샷 캡처 → 장면 프레임, 디코드된 BGM)은 1회만 준비하고
+# 언어별 TTS 는 tts_service 캐시 경유로 동시에 합성, 인코딩은 작업별 임시 디렉터리를 쓰는 프로세스 풀에서 병렬 실행.
+BGM_SAMPLE_RATE = 44100
+MAX_SHORTS_SECONDS = 180          # BGM 디코드 상한 (쇼츠 최대 길이)
+ENCODE_WORKERS = int(os.getenv("SHORTS_ENCODE_WORKERS", "3"))
+SHORTS_RENDERER = os.getenv("SHORTS_RENDERER", "ffmpeg")   # ffmpeg (필터 그래프 1회) / moviepy
 
-    print("=" * 50)
-    print(" [>>] Scorenix Screenshot Shorts v5.0 - Rendering")
-    if is_elevenlabs_available():
-        print(" [MIC] TTS: ElevenLabs (premium)")
-    else:
-        print(" [MIC] TTS: Edge TTS (free)")
-    print("=" * 50)
 
-    # ── 1) 스크린샷 캡처 ──────────────────────────────────────────────────
-    screenshots = []
-    try:
-        from app.services.browser_recorder import capture_match_screenshots
-        print(f"\n[>>] /bets 페이지 스크린샷 캡처 시작 (lang: {lang})...")
-        screenshots = _asyncio.run(
-            capture_match_screenshots(
-                lang=lang,
-                max_matches=5,
-                viewport_width=WIDTH,
-                viewport_height=HEIGHT,
-            )
-        )
-        print(f"  [OK] {len(screenshots)}개 스크린샷 캡처 완료")
-    except Exception as cap_err:
-        print(f"  [FAIL] 스크린샷 캡처 실패: {cap_err}")
-
-    if not screenshots:
-        print("  [!] 스크린샷 없음 — 정적 배경으로 폴백")
-        # 폴백: 기존 방식 (정적 배경 + 가짜 데이터)은 사용하지 않음
-        # 빈 영상 대신 에러 리턴
-        print("  [ABORT] 스크린샷 없이는 영상을 생성하지 않습니다.")
+def _prepare_scene_frames(screenshots, work_dir):
+    """스크린샷 → 1080x1920 장면 PNG (인코딩 중 프레임마다 리사이즈하지 않도록 미리 1회)."""
+    frames = []
+    for i, shot in enumerate(screenshots):
+        src = shot.get("screenshot_path", "")
+        if not src or not os.path.exists(src):
+            frames.append(None)
+            continue
+        dst = os.path.join(work_dir, f"scene_{i}.png")
+        with Image.open(src) as img:
+            img = img.convert("RGB")
+            if img.size != (WIDTH, HEIGHT):
+                img = img.resize((WIDTH, HEIGHT), Image.LANCZOS)
+            img.save(dst, compress_level=1)
+        frames.append(dst)
+    return frames
+
+
+def _decode_bgm(work_dir, seconds=MAX_SHORTS_SECONDS, bgm_path=None):
+    """BGM 을 1회 디코드해 int16 PCM(.npy)으로 저장 (짧으면 반복). 인코딩 작업은 mmap 으로 읽음."""
+    bgm_path = bgm_path or get_bgm()
+    if not os.path.exists(bgm_path):
         return None
+    bgm = AudioFileClip(bgm_path, fps=BGM_SAMPLE_RATE)
+    try:
+        clip = bgm.subclip(0, min(bgm.duration, seconds))
+        pcm = clip_pcm(clip, BGM_SAMPLE_RATE, quantize=True).astype(np.int16)
+    finally:
+        bgm.close()
+    if pcm.ndim == 1:
+        pcm = np.stack([pcm, pcm], axis=1)
+    needed = int(seconds * BGM_SAMPLE_RATE)
+    if 0 < len(pcm) < needed:
+        pcm = np.tile(pcm, (needed // len(pcm) + 1, 1))[:needed]
+    path = os.path.join(work_dir, "bgm_pcm.npy")
+    np.save(path, pcm)
+    return path
+
+
+def _translate_scripts(scripts, lang):
+    if lang == "ko":
+        return scripts
+    print(f"\n[i18n] Translating TTS to '{lang}'...")
+    scripts = [dict(script) for script in scripts]
+    try:
+        from app.services.gemini_service import translate_batch
+        translated = translate_batch([script["tts"] for script in scripts], lang)
+        for script, tts in zip(scripts, translated):
+            script["tts"] = tts
+        print(f"  [OK] {len(scripts)} scripts translated (batched)")
+    except Exception as trans_e:
+        print(f"  [!] Translation failed: {trans_e}")
+    return scripts
 
-    # ── 2) TTS 스크립트 생성 ──────────────────────────────────────────────
-    tts_scripts = _build_screenshot_tts(screenshots, lang=lang)
 
-    # 다국어 번역 (한국어 외)
-    if lang != "ko":
-        print(f"\n[i18n] Translating TTS to '{lang}'...")
-        try:
-            from app.services.gemini_service import translate_text
-            for i, script in enumerate(tts_scripts):
-                script["tts"] = translate_text(script["tts"], lang)
-                print(f"  [{i+1}/{len(tts_scripts)}] Translated")
-        except Exception as trans_e:
-            print(f"  [!] Translation failed: {trans_e}")
-
-    # ── 3) 씬별 영상 클립 생성 ────────────────────────────────────────────
-    clips = []
-
-    for i, script in enumerate(tts_scripts):
-        shot = script["screenshot"]
-        print(f"  [{i+1}/{len(tts_scripts)}] {shot['scene']}: {script['tts'][:40]}...")
-
-        # TTS 오디오 생성
-        audio_path = os.path.join(os.path.dirname(__file__), f"_tmp_audio_{i}.mp3")
-        generate_tts(script["tts"], audio_path, lang=lang)
-        audio = AudioFileClip(audio_path)
-        dur = audio.duration
+def _link_or_copy(src, dst):
+    """캐시 파일을 작업 디렉터리로 (하드링크 → 복사). 렌더 중 캐시 축출과 무관하게 유지."""
+    import shutil
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
 
-        # 스크린샷을 전체 화면 배경으로 사용
-        shot_path = shot["screenshot_path"]
-        if os.path.exists(shot_path):
-            bg_img = ImageClip(shot_path).set_duration(dur)
-            # 1080x1920에 맞게 리사이즈
-            bg_img = bg_img.resize(newsize=(WIDTH, HEIGHT))
-            bg_img = bg_img.set_position("center")
-
-            # CompositeVideoClip으로 처리
-            scene_clip = CompositeVideoClip(
-                [bg_img],
-                size=(WIDTH, HEIGHT)
-            ).set_duration(dur)
-        else:
-            # 스크린샷 파일 없으면 검정 배경
-            scene_clip = ColorClip(size=(WIDTH, HEIGHT), color=(12, 12, 25)).set_duration(dur)
 
-        # 오디오 합성
-        scene_clip = scene_clip.set_audio(audio)
+async def _synthesize_languages(scripts_by_lang, job_dirs):
+    """
+    모든 언어의 장면 TTS 를 tts_service 한 배치로 합성 (캐시 적중은 즉시, 나머지는 동시).
+    반환: {lang: [{"audio_path", "duration"}, ...] 또는 예외}
+    """
+    from app.services.tts_service import tts_service
+    cfg = await asyncio.to_thread(load_video_settings)
+    order, requests = [], []
+    for lang, scripts in scripts_by_lang.items():
+        for i, script in enumerate(scripts):
+            order.append((lang, i))
+            requests.append(_tts_request(script["tts"], lang, cfg))
+    results = await tts_service.synthesize_many(requests, return_exceptions=True)
+
+    out = {lang: [] for lang in scripts_by_lang}
+    for (lang, i), result in zip(order, results):
+        if isinstance(out[lang], BaseException):
+            continue
+        if isinstance(result, BaseException):
+            out[lang] = result
+            continue
+        dst = os.path.join(job_dirs[lang], f"audio_{i}.mp3")
+        _link_or_copy(result.path, dst)
+        out[lang].append({"audio_path": dst, "duration": result.duration, "cached": result.cached})
+    return out
 
-        # 단순 씬 추가 (크로스페이드 제거로 알파 합성 연산 병목 방지)
-        clips.append(scene_clip)
 
-    # ── 4) 영상 합성 ─────────────────────────────────────────────────────
-    print("\n  [CUT] Stitching scenes...")
-    final = concatenate_videoclips(clips, method="chain")
+def _encode_language_job(job):
+    """
+    프로세스 풀 워커: 한 언어 영상을 합성·인코딩. 모든 임시 파일은 job["work_dir"] 안에 생성.
+    기본은 ffmpeg 필터 그래프 1회 렌더, 실패하거나 SHORTS_RENDERER=moviepy 면 MoviePy 합성.
+    """
+    if job.get("renderer", SHORTS_RENDERER) == "ffmpeg":
+        try:
+            return _encode_language_job_ffmpeg(job)
+        except Exception as render_err:
+            print(f"  [!] ffmpeg renderer failed ({render_err}) — falling back to MoviePy")
+    return _encode_language_job_moviepy(job)
+
+
+def _encode_language_job_ffmpeg(job):
+    """장면 목록 → ffmpeg filter_complex 1회 (프레임이 Python 을 거치지 않음). 타이밍은 MoviePy 경로와 동일."""
+    from app.services import ffmpeg_renderer
+
+    audio_paths = [scene["audio_path"] for scene in job["scenes"]]
+    # AudioFileClip.duration 과 같은 컨테이너 헤더 길이 → 장면 경계가 MoviePy 경로와 일치
+    durations = ffmpeg_renderer.probe_durations(audio_paths)
+    scenes = [
+        ffmpeg_renderer.Scene(source=scene.get("frame_path"), duration=dur, audio=scene["audio_path"])
+        for scene, dur in zip(job["scenes"], durations)
+    ]
+    gain = None
+    bgm_path = job.get("bgm_path")
+    if bgm_path:
+        try:
+            speech = decode_pcm(audio_paths, durations=durations)
+            gain = ducking_envelope(speech_amplitudes(speech))
+        except Exception as duck_err:
+            print(f"  [!] Ducking failed ({duck_err})")
+    ffmpeg_renderer.render(
+        scenes,
+        job["output_path"],
+        WIDTH,
+        HEIGHT,
+        fps=SHORTS_FPS,
+        bgm=bgm_path,
+        bgm_volume=0.08,
+        bgm_gain=gain,
+        gain_fps=DUCK_ENV_FPS,
+        bitrate="8000k",
+        preset="ultrafast",
+        threads=job.get("threads", 1),
+        work_dir=job["work_dir"],
+    )
+    return job["output_path"]
+
+
+def _encode_language_job_moviepy(job):
+    """MoviePy 합성 경로 (ffmpeg 렌더러 폴백 / 비교 기준)."""
+    from moviepy.audio.AudioClip import AudioArrayClip, CompositeAudioClip
 
-    # ── 5) BGM 믹싱 ──────────────────────────────────────────────────────
-    bgm_path = get_bgm()
-    if os.path.exists(bgm_path):
-        print("  [~] Mixing BGM...")
-        from moviepy.audio.fx.volumex import volumex
-        from moviepy.audio.AudioClip import CompositeAudioClip
-
-        bgm = AudioFileClip(bgm_path)
-        if bgm.duration < final.duration:
-            from moviepy.audio.fx.audio_loop import audio_loop
-            bgm = audio_loop(bgm, duration=final.duration)
+    clips, durations = [], []
+    for scene in job["scenes"]:
+        audio = AudioFileClip(scene["audio_path"])
+        dur = audio.duration
+        durations.append(dur)
+        if scene.get("frame_path"):
+            scene_clip = ImageClip(scene["frame_path"]).set_duration(dur)
         else:
-            bgm = bgm.subclip(0, final.duration)
+            scene_clip = ColorClip(size=(WIDTH, HEIGHT), color=(12, 12, 25)).set_duration(dur)
+        clips.append(scene_clip.set_audio(audio))
+    final = concatenate_videoclips(clips, method="chain")
 
+    bgm_pcm_path = job.get("bgm_pcm")
+    if not bgm_pcm_path and job.get("bgm_path"):
+        # ffmpeg 경로용 작업(BGM 원본 경로만 전달)에서 폴백된 경우 여기서 디코드
+        bgm_pcm_path = _decode_bgm(job["work_dir"], min(MAX_SHORTS_SECONDS, final.duration + 1), job["bgm_path"])
+    if bgm_pcm_path:
+        pcm = np.load(bgm_pcm_path, mmap_mode="r")
+        n = min(len(pcm), int(final.duration * BGM_SAMPLE_RATE) + 1)
+        bgm_pcm = np.asarray(pcm[:n], dtype=np.float32) / 32768.0
         try:
-            print("  [~] Applying audio ducking...")
-            bgm = apply_audio_ducking(bgm, final.audio)
+            # 장면 음성 파일을 ffmpeg 로 1회씩 PCM 디코드 → 벡터 엔벨로프 → BGM 배열에 직접 게인 적용
+            speech = decode_pcm([scene["audio_path"] for scene in job["scenes"]], durations=durations)
+            envelope = ducking_envelope(speech_amplitudes(speech))
+            bgm_pcm = duck_pcm(bgm_pcm, envelope, BGM_SAMPLE_RATE)
         except Exception as duck_err:
             print(f"  [!] Ducking failed ({duck_err})")
-            bgm = bgm.fx(volumex, 0.08)
-
-        final = final.set_audio(
-            CompositeAudioClip([final.audio, bgm])
-        )
+            bgm_pcm = bgm_pcm * 0.08
+        bgm = AudioArrayClip(bgm_pcm, fps=BGM_SAMPLE_RATE)
+        bgm = bgm.set_duration(min(bgm.duration, final.duration))
+        final = final.set_audio(CompositeAudioClip([final.audio, bgm]))
 
-    # ── 6) 인코딩 ────────────────────────────────────────────────────────
-    print("  [REC] Encoding final video...")
     final.write_videofile(
-        output_path,
-        fps=24,
+        job["output_path"],
+        fps=SHORTS_FPS,
         codec="libx264",
         audio_codec="aac",
         bitrate="8000k",
-        threads=4,
+        threads=job.get("threads", 1),
         preset="ultrafast",
+        temp_audiofile=os.path.join(job["work_dir"], "mix_audio.m4a"),
+        logger=None,
     )
+    final.close()
+    return job["output_path"]
+
 
-    # ── 7) 임시 파일 정리 ────────────────────────────────────────────────
-    for i in range(len(tts_scripts)):
-        p = os.path.join(os.path.dirname(__file__), f"_tmp_audio_{i}.mp3")
-        if os.path.exists(p):
+async def render_multilang(langs, output_paths, max_matches=5, executor=None):
+    """
+    여러 언어 쇼츠를 한 번에 렌더링.
+    반환: {"outputs": {lang: 경로 또는 None}, "timings_ms": {...}}
+    스크린샷은 언어별 /{lang}/bets 페이지에서 동시에 캡처 (화면 문구가 언어마다 다름).
+    언어와 무관한 BGM 만 모든 언어가 공유.
+    """
+    import shutil
+    import tempfile
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    timings = {}
+    started = time.perf_counter()
+
+    def mark(stage, since):
+        timings[stage] = round((time.perf_counter() - since) * 1000, 1)
+
+    outputs = {lang: None for lang in langs}
+    work_root = tempfile.mkdtemp(prefix="scorenix_render_")
+    screenshots = {}
+    try:
+        # ── 1) 언어별 스크린샷 캡처 (동시, 브라우저 풀 공유) ──
+        t = time.perf_counter()
+        from app.services.browser_recorder import capture_match_screenshots
+
+        async def capture(lang):
             try:
-                os.remove(p)
-            except OSError:
-                pass
-
-    # 스크린샷 임시 파일 정리
-    for shot_info in screenshots:
-        sp = shot_info.get("screenshot_path", "")
-        if sp and os.path.exists(sp):
+                return await capture_match_screenshots(
+                    lang=lang,
+                    max_matches=max_matches,
+                    viewport_width=WIDTH,
+                    viewport_height=HEIGHT,
+                )
+            except Exception as cap_err:
+                print(f"  [FAIL] [{lang.upper()}] 스크린샷 캡처 실패: {cap_err}")
+                return []
+
+        print(f"\n[>>] /bets 페이지 스크린샷 캡처 시작 (langs: {', '.join(langs)})...")
+        try:
+            captured = await asyncio.gather(*[capture(lang) for lang in langs])
+        finally:
+            # 인코딩 단계 메모리 확보: 캡처가 끝나면 풀의 Chromium 즉시 종료
+            from app.services.browser_pool import browser_pool
+            await browser_pool.close()
+        screenshots = dict(zip(langs, captured))
+        mark("capture", t)
+        for lang in langs:
+            if screenshots[lang]:
+                print(f"  [OK] [{lang.upper()}] {len(screenshots[lang])}개 스크린샷 캡처 완료")
+            else:
+                print(f"  [ABORT] [{lang.upper()}] 스크린샷 없이는 영상을 생성하지 않습니다.")
+        langs = [lang for lang in langs if screenshots[lang]]
+        if not langs:
+            return {"outputs": outputs, "timings_ms": timings}
+
+        # ── 2) 공유 자산 (BGM) + 언어별 장면 프레임 / TTS 를 동시에 ──
+        t = time.perf_counter()
+        scripts_ko = {lang: _build_screenshot_tts(screenshots[lang], lang="ko") for lang in langs}
+        job_dirs = {lang: os.path.join(work_root, lang) for lang in langs}
+        for job_dir in job_dirs.values():
+            os.makedirs(job_dir, exist_ok=True)
+
+        async def tts():
+            since = time.perf_counter()
+            translated = await asyncio.gather(
+                *[asyncio.to_thread(_translate_scripts, scripts_ko[lang], lang) for lang in langs]
+            )
+            audio = await _synthesize_languages(dict(zip(langs, translated)), job_dirs)
+            mark("tts", since)
+            return audio
+
+        async def frames():
+            prepared = await asyncio.gather(
+                *[asyncio.to_thread(_prepare_scene_frames, screenshots[lang], job_dirs[lang]) for lang in langs],
+                return_exceptions=True,
+            )
+            out = {}
+            for lang, result in zip(langs, prepared):
+                if isinstance(result, BaseException):
+                    print(f"  [!] [{lang.upper()}] Scene frame preparation failed ({result})")
+                    result = [None] * len(screenshots[lang])
+                out[lang] = result
+            return out
+
+        async def bgm():
+            if SHORTS_RENDERER == "ffmpeg":
+                # ffmpeg 렌더러는 BGM 원본을 직접 읽음 (PCM 사전 디코드 불필요)
+                path = await asyncio.to_thread(get_bgm)
+                return {"bgm_path": path} if os.path.exists(path) else {}
             try:
-                os.remove(sp)
-            except OSError:
-                pass
+                path = await asyncio.to_thread(_decode_bgm, work_root)
+                return {"bgm_pcm": path} if path else {}
+            except Exception as bgm_err:
+                print(f"  [!] BGM decode failed ({bgm_err})")
+                return {}
+
+        scene_frames, bgm_asset, audio = await asyncio.gather(
+            frames(),
+            bgm(),
+            tts(),
+            return_exceptions=True,
+        )
+        mark("assets_and_tts", t)
+        if isinstance(scene_frames, BaseException):
+            print(f"  [!] Scene frame preparation failed ({scene_frames})")
+            scene_frames = {lang: [None] * len(screenshots[lang]) for lang in langs}
+        if isinstance(bgm_asset, BaseException):
+            bgm_asset = {}
+        if isinstance(audio, BaseException):
+            audio = {lang: audio for lang in langs}
+
+        # ── 3) 언어별 인코딩 (프로세스 풀, 작업별 임시 디렉터리) ──
+        jobs = []
+        for lang in langs:
+            tracks = audio[lang]
+            if isinstance(tracks, BaseException):
+                print(f"  [!] [{lang.upper()}] TTS failed: {tracks}")
+                continue
+            shot_index = {id(shot): i for i, shot in enumerate(screenshots[lang])}
+            scenes = [
+                dict(track, frame_path=scene_frames[lang][shot_index[id(script["screenshot"])]])
+                for script, track in zip(scripts_ko[lang], tracks)
+            ]
+            jobs.append(dict(bgm_asset, lang=lang, scenes=scenes, renderer=SHORTS_RENDERER,
+                             output_path=output_paths[lang], work_dir=job_dirs[lang]))
+        if not jobs:
+            return {"outputs": outputs, "timings_ms": timings}
+        threads = max(1, (os.cpu_count() or 1) // len(jobs))
+        for job in jobs:
+            job["threads"] = threads
+
+        t = time.perf_counter()
+        print(f"  [REC] Encoding {len(jobs)} video(s)...")
+        loop = asyncio.get_running_loop()
+        own_pool = None
+        if executor is None and len(jobs) > 1:
+            # 서버 프로세스(스레드 다수)에서 fork 는 위험하므로 spawn
+            own_pool = executor = ProcessPoolExecutor(
+                max_workers=min(ENCODE_WORKERS, len(jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        try:
+            results = await asyncio.gather(
+                *[loop.run_in_executor(executor, _encode_language_job, job) for job in jobs],
+                return_exceptions=True,
+            )
+        finally:
+            if own_pool is not None:
+                own_pool.shutdown(wait=True)
+        mark("encode", t)
+        for job, result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                print(f"  [!] [{job['lang'].upper()}] Encoding failed: {result}")
+            else:
+                outputs[job["lang"]] = result
+                print(f"  [OK] [{job['lang'].upper()}] Done! → {result}")
+        return {"outputs": outputs, "timings_ms": timings}
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+        # 스크린샷 임시 파일 정리
+        for shot_info in (shot for shots in screenshots.values() for shot in shots):
+            sp = shot_info.get("screenshot_path", "")
+            if sp and os.path.exists(sp):
+                try:
+                    os.remove(sp)
+                except OSError:
+                    pass
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"  [TIME] render_multilang {timings}")
+
 
-    print(f"\n  [OK] Done! → {output_path}")
+# ─── 메인 영상 생성 ─────────────────────────────────────
+def generate_video(bg_video_path, output_path, auto_upload=False, use_avatar=False, mode="membership", lang="ko"):
+    """
+    스코어닉스 Shorts 영상 생성 (v5.0 — Screenshot Style)
+    
+    새로운 방식:
+    1. /bets 페이지에서 각 경기 AI 분석 화면을 스크린샷으로 캡처
+    2. 각 스크린샷을 전체 화면 배경으로 사용 (Ken Burns 미세 움직임)
+    3. TTS 음성 나레이션만 추가 (자막/오버레이 없음)
+    4. BGM + 오디오 덕킹
+
+    단일 언어 render_multilang 호출. 여러 언어는 render_multilang 을 직접 사용하면
+    언어별 캡처·TTS 를 동시에 진행하고 BGM 을 공유하며 병렬로 인코딩함.
+    """
+    print("=" * 50)
+    print(" [>>] Scorenix Screenshot Shorts v5.0 - Rendering")
+    if is_elevenlabs_available():
+        print(" [MIC] TTS: ElevenLabs (premium)")
+    else:
+        print(" [MIC] TTS: Edge TTS (free)")
+    print("=" * 50)
+
+    result = asyncio.run(render_multilang([lang], {lang: output_path}))
+    path = result["outputs"].get(lang)
+    if not path:
+        return None
 
-    # 8) 업로드
+    # 업로드
     if auto_upload:
-        _upload(output_path)
+        _upload(path)
 
-    return output_path
+    return path
 
 
 def _build_screenshot_tts(screenshots, lang="ko"):
@@ -4,7 +4,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
-import asyncio
 import logging
 
 router = APIRouter()
@@ -78,11 +77,10 @@ async def betman_crawl():
     베트맨 크롤링 수동 실행.
     성공 시 데이터가 자동 저장됩니다.
     """
-    from app.services.crawler_betman import BetmanCrawler
+    from app.services.crawler_betman import betman_crawler
 
-    crawler = BetmanCrawler()
-    loop = asyncio.get_event_loop()
-    items = await loop.run_in_executor(None, crawler.fetch_odds)
+    crawler = betman_crawler
+    items = await crawler.fetch_odds_async()
 
     if items:
         return {
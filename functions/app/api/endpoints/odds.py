@@ -14,11 +14,10 @@ from fastapi import APIRouter
 from typing import List
 from app.schemas.odds import MatchBetSummary
 from app.services.pinnacle_api import pinnacle_service
-from app.services.crawler_betman import BetmanCrawler
+from app.services.crawler_betman import betman_crawler
 from app.models.betman_db import get_betman_matches
 from app.schemas.odds import OddsItem
 from app.services.team_mapper import TeamMapper
-import asyncio
 import logging
 
 router = APIRouter()
@@ -112,9 +111,7 @@ async def get_all_bets():
         # 3. Betman 크롤링 시도 (없으면)
         if not betman_items:
             try:
-                crawler = BetmanCrawler()
-                loop = asyncio.get_event_loop()
-                betman_items = await loop.run_in_executor(None, crawler.fetch_odds)
+                betman_items = await betman_crawler.fetch_odds_async()
             except Exception as e:
                 logger.warning(f"Betman crawl failed: {e}")
 
@@ -66,13 +66,12 @@ async def trigger_betman_collection(background_tasks: BackgroundTasks):
     if _betman_crawling:
         return {"status": "Already crawling", "last_crawl": _betman_last_crawl}
 
-    def crawl():
+    async def crawl():
         global _betman_crawling, _betman_last_crawl, _betman_last_count
         _betman_crawling = True
         try:
-            from app.services.crawler_betman import BetmanCrawler
-            crawler = BetmanCrawler()
-            items = crawler.fetch_odds()
+            from app.services.crawler_betman import betman_crawler
+            items = await betman_crawler.fetch_odds_async()
             _betman_last_count = len(items)
             _betman_last_crawl = datetime.now(timezone.utc).isoformat()
             logger.info(f"✅ Betman crawl complete: {len(items)} matches")
@@ -105,16 +104,15 @@ async def trigger_all_collection(background_tasks: BackgroundTasks):
         except Exception as e:
             logger.error(f"Pinnacle collection failed: {e}")
 
-    # Betman (sync in executor)
-    def collect_betman():
+    # Betman (async crawler)
+    async def collect_betman():
         global _betman_crawling, _betman_last_crawl, _betman_last_count
         if _betman_crawling:
             return
         _betman_crawling = True
         try:
-            from app.services.crawler_betman import BetmanCrawler
-            crawler = BetmanCrawler()
-            items = crawler.fetch_odds()
+            from app.services.crawler_betman import betman_crawler
+            items = await betman_crawler.fetch_odds_async()
             _betman_last_count = len(items)
             _betman_last_crawl = datetime.now(timezone.utc).isoformat()
             logger.info(f"Betman: {len(items)} matches collected")
@@ -104,6 +104,57 @@ def save_betman_round(round_id: str, matches: List[Dict]) -> int:
     return len(matches)
 
 
+def apply_betman_round_diff(round_id: str, diff, is_primary: bool = True) -> int:
+    """
+    Apply a RoundDiff (app.services.betman_diff) to a stored round.
+    Only added/changed/removed matches are touched; nothing is written when the diff is empty.
+    Only the primary round becomes last_round_id (the round get_betman_matches() serves);
+    secondary rounds crawled alongside it are stored without moving the pointer.
+    Returns the number of matches written.
+    """
+    db = _get_db()
+    now = datetime.now(timezone.utc).isoformat()
+
+    if diff.is_empty:
+        db["last_crawl"] = now
+        if is_primary and db.get("last_round_id") != round_id and round_id in db.get("rounds", {}):
+            db["last_round_id"] = round_id
+            _save_db(db)
+        return 0
+
+    rdata = db["rounds"].setdefault(round_id, {"matches": [], "crawled_at": now, "match_count": 0})
+    matches = rdata["matches"]
+
+    if diff.removed:
+        removed = set(diff.removed)
+        matches[:] = [m for m in matches if m.get("match_id") not in removed]
+
+    if diff.changed:
+        by_id = {m.get("match_id"): m for m in matches}
+        for match_id, changes in diff.changed:
+            target = by_id.get(match_id)
+            if target is not None:
+                target.update(changes)
+                target["updated_at"] = now
+
+    for m in diff.added:
+        m.setdefault("match_id", str(uuid.uuid4())[:8])
+        m["source"] = m.get("source", "crawl")
+        m["modified"] = False
+        matches.append(m)
+
+    rdata["crawled_at"] = now
+    rdata["match_count"] = len(matches)
+    db["last_crawl"] = now
+    if is_primary:
+        db["last_round_id"] = round_id
+
+    _save_db(db)
+    written = len(diff.added) + len(diff.changed) + len(diff.removed)
+    logger.info(f"Applied Betman diff for round {round_id}: {diff.summary()}")
+    return written
+
+
 # ─────────────────────────────────────────────
 # READ
 # ─────────────────────────────────────────────
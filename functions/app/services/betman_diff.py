@@ -0,0 +1,83 @@
+"""
+Betman Round Diff — 크롤링 결과 ↔ 마지막 저장 회차 비교
+- 경기 키: (team_home, team_away, match_time)
+- 배당/리그/종목이 바뀐 경기만 changed 로 분류
+- 수동 수정(modified=True)된 경기는 크롤링 값으로 덮어쓰지 않음
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+TRACKED_FIELDS = ("home_odds", "draw_odds", "away_odds", "league", "sport")
+
+
+def match_key(match: Dict) -> Tuple[str, str, str]:
+    return (
+        match.get("team_home", ""),
+        match.get("team_away", ""),
+        match.get("match_time", "") or "",
+    )
+
+
+def _changed_fields(stored: Dict, fetched: Dict) -> Dict:
+    changes = {}
+    for f in TRACKED_FIELDS:
+        old, new = stored.get(f), fetched.get(f)
+        if isinstance(old, (int, float)) and isinstance(new, (int, float)):
+            if abs(float(old) - float(new)) < 1e-9:
+                continue
+        elif old == new:
+            continue
+        changes[f] = new
+    return changes
+
+
+@dataclass
+class RoundDiff:
+    added: List[Dict] = field(default_factory=list)
+    changed: List[Tuple[str, Dict]] = field(default_factory=list)  # (match_id, {field: new_value})
+    removed: List[str] = field(default_factory=list)  # match_id
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def summary(self) -> Dict:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_round(stored: List[Dict], fetched: List[Dict]) -> RoundDiff:
+    """Compare a freshly crawled round against the stored copy of the same round."""
+    diff = RoundDiff()
+    stored_by_key = {match_key(m): m for m in stored}
+    seen = set()
+
+    for m in fetched:
+        key = match_key(m)
+        if key in seen:
+            continue
+        seen.add(key)
+        old = stored_by_key.get(key)
+        if old is None:
+            diff.added.append(m)
+            continue
+        if old.get("modified"):
+            diff.unchanged += 1
+            continue
+        changes = _changed_fields(old, m)
+        if changes:
+            diff.changed.append((old.get("match_id"), changes))
+        else:
+            diff.unchanged += 1
+
+    for key, old in stored_by_key.items():
+        # 수동 추가 경기는 크롤링 결과에 없어도 유지
+        if key not in seen and old.get("source", "crawl") != "manual":
+            diff.removed.append(old.get("match_id"))
+
+    return diff
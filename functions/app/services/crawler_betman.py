@@ -1,101 +1,185 @@
 """
 Betman Crawler — 베트맨 프로토 승부식 경기/배당 크롤러
-- requests 세션 기반 WAF 우회 (쿠키 자동 관리)
-- httpx 폴백
-- 크롤링 성공 시 betman_db에 자동 저장
+- httpx.AsyncClient 기반 비동기 크롤링 (event loop 차단 없음)
+- 쿠키 저장소 유지 → 크롤링 간 세션 재사용 (WAF 우회)
+- 배당 페이지 동시 조회 (세마포어로 동시성 제한) + 비동기 지수 백오프
+- 마지막 저장 회차와 비교(diff)하여 변경된 경기만 betman_db에 저장
 - 실패 시 마지막 저장 데이터로 폴백
-- 재시도 로직 + 활성 회차 우선 필터링
 """
-from typing import List, Optional, Tuple
-import requests as req_lib
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
 import httpx
 from datetime import datetime, timezone
+import asyncio
 import json
 import traceback
 import logging
-import time
-import warnings
 
 from app.services.base_provider import BaseOddsProvider
+from app.services.betman_diff import diff_round, RoundDiff
 from app.schemas.odds import OddsItem
 
 # Lazy import to avoid Firestore initialization on module load
 # (allows local usage without Firebase credentials)
 def _get_betman_db():
     try:
-        from app.models.betman_db import save_betman_round, get_betman_matches, get_betman_status
-        return save_betman_round, get_betman_matches, get_betman_status
+        from app.models.betman_db import get_betman_matches, apply_betman_round_diff
+        return get_betman_matches, apply_betman_round_diff
     except Exception:
-        return None, None, None
-
-# Suppress SSL warnings for Betman
-warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+        return None, None
 
 logger = logging.getLogger(__name__)
 
 # Retry config
 MAX_RETRIES = 2
 RETRY_DELAY_BASE = 2.0  # seconds (exponential backoff)
+MAX_CONCURRENCY = 3  # 동시에 조회할 배당 페이지 수
+REQUEST_TIMEOUT = 15.0
 
 # URLs
 BASE_URL = "https://www.betman.co.kr" # Global URLs — Use CACHE API for 24/7 availability (non-purchase hours)
-DISCOVERY_URL = "https://www.betman.co.kr/buyPsblGame/inqCacheBuyAbleGameInfoList.do"
-DISCOVERY_URL_FALLBACK = "https://www.betman.co.kr/buyPsblGame/inqBuyAbleGameInfoList.do"
-ODDS_URL = f"{BASE_URL}/buyPsblGame/gameInfoInq.do"
+DISCOVERY_PATH = "/buyPsblGame/inqCacheBuyAbleGameInfoList.do"
+DISCOVERY_PATH_FALLBACK = "/buyPsblGame/inqBuyAbleGameInfoList.do"
+ODDS_PATH = "/buyPsblGame/gameInfoInq.do"
+DISCOVERY_URL = f"{BASE_URL}{DISCOVERY_PATH}"
+DISCOVERY_URL_FALLBACK = f"{BASE_URL}{DISCOVERY_PATH_FALLBACK}"
+ODDS_URL = f"{BASE_URL}{ODDS_PATH}"
 MAIN_PAGE_URL = f"{BASE_URL}/"
 
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# Double-nested _sbmInfo — 베트맨 requestClient.js 프레임워크의 요구사항
+SBM_INFO = {"_sbmInfo": {"_sbmInfo": {"debugMode": "false"}}}
+
 
 class BetmanCrawler(BaseOddsProvider):
-    def __init__(self):
+    def __init__(self, base_url: str = BASE_URL, use_browser: bool = True, max_concurrency: int = MAX_CONCURRENCY):
         super().__init__("Betman")
-        self.base_url = BASE_URL
+        self.base_url = base_url.rstrip("/")
+        self.use_browser = use_browser
+        self.max_concurrency = max_concurrency
         self.last_round_id = None
-        self._session = None
-
-    def _get_session(self) -> req_lib.Session:
-        """Get or create a requests session with Betman cookies."""
-        if self._session is None:
-            self._session = req_lib.Session()
-            self._session.verify = False
-            self._session.headers.update({"User-Agent": UA})
-            
+        self.last_diff: Optional[RoundDiff] = None
+        # 쿠키 저장소는 클라이언트가 재생성되어도 유지 (크롤링 간 세션 재사용)
+        self._cookies = httpx.Cookies()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+        # 클라이언트별 진행 중 요청 수 — 세션 리셋 시 교체된 클라이언트는 마지막 요청이 끝난 뒤 닫음
+        self._inflight: Dict[httpx.AsyncClient, int] = {}
+
+    @property
+    def _headers(self) -> dict:
+        return {
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Referer": f"{self.base_url}/main/mainPage/gamebuy/buyableGameList.do",
+            "Origin": self.base_url,
+            "X-Requested-With": "XMLHttpRequest",
+            "Content-Type": "application/json; charset=UTF-8",
+        }
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or create an AsyncClient bound to the running loop, sharing the cookie jar."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                verify=False,
+                timeout=REQUEST_TIMEOUT,
+                headers={"User-Agent": UA},
+                cookies=self._cookies,
+            )
+            self._client_loop = loop
+
+        if not self._cookies:
             # Acquire cookies by visiting the main page
             try:
                 logger.info("Acquiring Betman session cookies...")
-                resp = self._session.get(MAIN_PAGE_URL, timeout=15)
-                cookies = list(self._session.cookies.keys())
-                logger.info(f"Session established: status={resp.status_code}, cookies={cookies}")
-                time.sleep(0.3)  # Small delay after cookie acquisition
+                resp = await self._client.get(f"{self.base_url}/")
+                self._cookies.update(resp.cookies)
+                logger.info(f"Session established: status={resp.status_code}, cookies={list(self._cookies.keys())}")
+                await asyncio.sleep(0.3)  # Small delay after cookie acquisition
             except Exception as e:
                 logger.warning(f"Failed to acquire cookies: {e}")
-        
-        return self._session
+
+        return self._client
+
+    @asynccontextmanager
+    async def _lease(self):
+        """요청 1건 동안 클라이언트 사용 표시 (동시 요청 중 리셋돼도 닫히지 않도록)."""
+        client = await self._get_client()
+        self._inflight[client] = self._inflight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._inflight[client] -= 1
+            if not self._inflight[client]:
+                del self._inflight[client]
+                if client is not self._client:
+                    await self._close_client(client)
+
+    async def _reset_session(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Drop cookies and connection pool (WAF 차단/연결 오류 시).
+        실패한 클라이언트가 아직 현재 클라이언트일 때만 교체 (형제 요청이 이미 리셋했으면 새 세션 유지).
+        교체된 클라이언트는 진행 중 요청이 모두 끝난 뒤 닫힘.
+        """
+        if client is not None and client is not self._client:
+            return
+        self._cookies.clear()
+        retired, self._client, self._client_loop = self._client, None, None
+        if retired is not None and retired not in self._inflight:
+            await self._close_client(retired)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient):
+        if not client.is_closed:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def aclose(self):
+        for client in [self._client, *self._inflight]:
+            if client is not None:
+                await self._close_client(client)
+        self._inflight.clear()
+        self._client = None
+        self._client_loop = None
 
     def fetch_odds(self) -> List[OddsItem]:
+        """Sync entry point (BaseOddsProvider). Async callers should await fetch_odds_async()."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._fetch_and_close())
+        raise RuntimeError("fetch_odds() called inside a running event loop — use await fetch_odds_async()")
+
+    async def _fetch_and_close(self) -> List[OddsItem]:
+        try:
+            return await self.fetch_odds_async()
+        finally:
+            await self.aclose()
+
+    async def fetch_odds_async(self) -> List[OddsItem]:
         """
         Main entry point. 3-tier strategy:
-        1. Browser crawl (Playwright) — WAF 완전 우회
-        2. HTTP crawl (requests/httpx) — 빠르지만 WAF 차단 가능
+        1. Browser crawl (Playwright) — WAF 완전 우회 (별도 스레드)
+        2. HTTP crawl (httpx async) — 빠르지만 WAF 차단 가능
         3. Saved DB fallback — 마지막 저장 데이터
         """
+        self.last_round_id = None
+        self.last_diff = None
+
         # --- Strategy 1: Browser crawl (Playwright) ---
-        browser_data = self._try_browser_crawl()
-        if browser_data:
-            return browser_data
+        if self.use_browser:
+            browser_data = await self._try_browser_crawl()
+            if browser_data:
+                return browser_data
 
-        # --- Strategy 2: HTTP crawl (requests + httpx) ---
+        # --- Strategy 2: HTTP crawl (httpx async) ---
         try:
-            real_data, round_id = self._fetch_real_data()
+            real_data, round_id = await self._fetch_real_data()
             if real_data and len(real_data) > 0:
-                matches_dicts = [self._odds_to_dict(item) for item in real_data]
-                save_fn, _, _ = _get_betman_db()
-                if save_fn:
-                    try:
-                        save_fn(str(round_id), matches_dicts)
-                    except Exception as e:
-                        logger.warning(f"DB save failed (non-critical): {e}")
                 logger.info(f"✅ Betman HTTP: {len(real_data)} items (round: {round_id})")
                 return real_data
         except Exception as e:
@@ -105,14 +189,15 @@ class BetmanCrawler(BaseOddsProvider):
         logger.warning("All crawl strategies failed. Loading from saved DB.")
         return self._load_from_db()
 
-    def _try_browser_crawl(self) -> Optional[List[OddsItem]]:
+    async def _try_browser_crawl(self) -> Optional[List[OddsItem]]:
         """Attempt Playwright browser crawl. Returns None if browser unavailable."""
         try:
             from app.services.crawler_betman_browser import crawl_betman_via_browser
             logger.info("🌐 Attempting browser-based crawl (Playwright)...")
-            
-            result = crawl_betman_via_browser(headless=True)
-            
+
+            # sync Playwright → 워커 스레드에서 실행
+            result = await asyncio.to_thread(crawl_betman_via_browser, True)
+
             if result["success"] and result["matches"]:
                 # Convert match dicts to OddsItems
                 items = []
@@ -128,22 +213,17 @@ class BetmanCrawler(BaseOddsProvider):
                         away_odds=float(m.get("away_odds", 0)),
                         match_time=m.get("match_time", ""),
                     ))
-                
-                # Save to DB
+
+                # Save to DB (변경분만)
                 self.last_round_id = result["round_id"]
-                save_fn, _, _ = _get_betman_db()
-                if save_fn:
-                    try:
-                        save_fn(str(result["round_id"]), result["matches"])
-                    except Exception as e:
-                        logger.warning(f"DB save failed (non-critical): {e}")
+                self._save_round(str(result["round_id"]), [self._odds_to_dict(i) for i in items])
                 logger.info(f"✅ Browser crawl: {len(items)} items (round: {result['round_id']})")
                 return items
             else:
                 error = result.get("error", "No matches found")
                 logger.warning(f"Browser crawl returned no data: {error}")
                 return None
-                
+
         except ImportError:
             logger.info("Playwright not available, skipping browser crawl")
             return None
@@ -151,56 +231,59 @@ class BetmanCrawler(BaseOddsProvider):
             logger.warning(f"Browser crawl failed: {e}")
             return None
 
-    def _fetch_real_data(self) -> Tuple[List[OddsItem], Optional[str]]:
-        """Attempt to crawl Betman. Returns (items, round_id)."""
-        # 1. Discover Active Round (gmTs)
-        gm_ts, gm_id = self._discover_round_id()
-        if not gm_ts:
+    async def _fetch_real_data(self) -> Tuple[List[OddsItem], Optional[str]]:
+        """Attempt to crawl Betman. Returns (items of the primary round, round_id)."""
+        # 1. Discover rounds (첫 번째가 우선 회차)
+        rounds = await self._discover_rounds()
+        if not rounds:
             logger.warning("No active round found from Betman API")
             return [], None
 
+        gm_ts, gm_id = rounds[0]
         self.last_round_id = gm_ts
-        logger.info(f"📌 Using round: gmId={gm_id}, gmTs={gm_ts}")
-
-        # 2. Fetch Odds Data
-        data = self._fetch_odds_page(gm_id, gm_ts)
-        if not data:
-            return [], str(gm_ts)
-
-        # 3. Parse Data
-        items = self._parse_response(data)
-        logger.info(f"🔍 Parsed {len(items)} matches from round {gm_ts}")
-        return items, str(gm_ts)
-
-    def _discover_round_id(self) -> Tuple[Optional[int], Optional[str]]:
-        """
-        Find the active round ID (gmTs) for Proto Match (G101).
-        Uses requests session for cookie management (WAF bypass).
-        Priority: mainState == '1' (발매중) > mainState == '2' (발매마감, 최신)
-        """
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": f"{self.base_url}/main/mainPage/gamebuy/buyableGameList.do",
-            "Origin": self.base_url,
-            "X-Requested-With": "XMLHttpRequest",
-            "Content-Type": "application/json; charset=UTF-8",
-        }
-
-        # Double-nested _sbmInfo — 베트맨 requestClient.js 프레임워크의 요구사항
-        payload = {"_sbmInfo": {"_sbmInfo": {"debugMode": "false"}}}
-
+        logger.info(f"📌 Using round: gmId={gm_id}, gmTs={gm_ts} (+{len(rounds) - 1} concurrent)")
+
+        # 2. Fetch odds pages concurrently (bounded)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(round_ref):
+            async with semaphore:
+                return await self._fetch_odds_page(round_ref[1], round_ref[0])
+
+        pages = await asyncio.gather(*[fetch(r) for r in rounds], return_exceptions=True)
+
+        # 3. Parse + diff-save each round
+        primary_items: List[OddsItem] = []
+        for (ts, _), data in zip(rounds, pages):
+            if isinstance(data, BaseException):
+                logger.error(f"Odds page failed for round {ts}: {data}")
+                continue
+            if not data:
+                continue
+            items = self._parse_response(data)
+            logger.info(f"🔍 Parsed {len(items)} matches from round {ts}")
+            if items:
+                self._save_round(str(ts), [self._odds_to_dict(i) for i in items], is_primary=ts == gm_ts)
+            if ts == gm_ts:
+                primary_items = items
+
+        return primary_items, str(gm_ts)
+
+    async def _post_json(self, path: str, payload: dict, label: str) -> Optional[dict]:
+        """POST with retries + async exponential backoff. Returns parsed JSON or None."""
+        url = f"{self.base_url}{path}"
         for attempt in range(MAX_RETRIES + 1):
+            client = None
             try:
-                session = self._get_session()
-                resp = session.post(DISCOVERY_URL, headers=headers, json=payload, timeout=15)
+                async with self._lease() as client:
+                    resp = await client.post(url, headers=self._headers, json=payload)
 
                 content_type = resp.headers.get("content-type", "")
-                logger.info(f"Discovery response: status={resp.status_code}, ct={content_type}, len={len(resp.content)} (attempt {attempt + 1})")
+                logger.info(f"{label} response: status={resp.status_code}, ct={content_type}, len={len(resp.content)} (attempt {attempt + 1})")
 
                 if resp.status_code != 200:
-                    logger.error(f"Discovery API Error: HTTP {resp.status_code}")
-                    self._retry_delay(attempt)
+                    logger.error(f"{label} HTTP {resp.status_code}")
+                    await self._retry_delay(attempt)
                     continue
 
                 # Check for HTML error page (WAF block or error)
@@ -208,59 +291,58 @@ class BetmanCrawler(BaseOddsProvider):
                     if "페이지 오류" in resp.text[:500]:
                         logger.error(f"Betman returned error page (attempt {attempt + 1})")
                     else:
-                        logger.error(f"Unexpected HTML response (attempt {attempt + 1})")
-                    
+                        logger.error(f"{label} returned HTML (WAF/error) (attempt {attempt + 1})")
                     # Reset session for next attempt
-                    self._session = None
-                    self._retry_delay(attempt)
+                    await self._reset_session(client)
+                    await self._retry_delay(attempt)
                     continue
 
-                data = resp.json()
-                status_msg = data.get("rsMsg", {}).get("message", "N/A")
-                logger.info(f"Discovery OK: {status_msg}")
-
-                return self._select_best_round(data)
-
-            except req_lib.exceptions.Timeout:
-                logger.error(f"Discovery timeout (attempt {attempt + 1})")
-                self._retry_delay(attempt)
-            except req_lib.exceptions.ConnectionError as e:
-                logger.error(f"Discovery connection error: {e} (attempt {attempt + 1})")
-                self._session = None  # Reset session
-                self._retry_delay(attempt)
+                try:
+                    return resp.json()
+                except json.JSONDecodeError:
+                    logger.error(f"Failed to decode JSON from {label}")
+                    return None
+
+            except httpx.TimeoutException:
+                logger.error(f"{label} timeout (attempt {attempt + 1})")
+                await self._retry_delay(attempt)
+            except httpx.TransportError as e:
+                logger.error(f"{label} connection error: {e} (attempt {attempt + 1})")
+                await self._reset_session(client)
+                await self._retry_delay(attempt)
             except Exception as e:
-                logger.error(f"Discovery Error: {e}")
-                self._retry_delay(attempt)
-
-        # All retries failed — try httpx as last resort
-        return self._discover_round_id_httpx()
+                logger.error(f"{label} error: {e}")
+                await self._retry_delay(attempt)
+        return None
 
-    def _discover_round_id_httpx(self) -> Tuple[Optional[int], Optional[str]]:
-        """Fallback: try httpx for discovery."""
-        logger.info("Trying httpx fallback for discovery...")
-        headers = {
-            "User-Agent": UA,
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": f"{self.base_url}/main/mainPage/gamebuy/buyableGameList.do",
-            "Origin": self.base_url,
-            "X-Requested-With": "XMLHttpRequest",
-            "Content-Type": "application/json; charset=UTF-8",
-        }
-        payload = {"_sbmInfo": {"_sbmInfo": {"debugMode": "false"}}}
-        try:
-            with httpx.Client(verify=False, timeout=15.0) as client:
-                resp = client.post(DISCOVERY_URL, headers=headers, json=payload)
-                ct = resp.headers.get("content-type", "")
-                if resp.status_code == 200 and "application/json" in ct:
-                    data = resp.json()
-                    logger.info("httpx fallback succeeded!")
-                    return self._select_best_round(data)
-                else:
-                    logger.error(f"httpx fallback failed: {resp.status_code}, ct={ct}")
-        except Exception as e:
-            logger.error(f"httpx fallback error: {e}")
-        return None, None
+    async def _discover_rounds(self) -> List[Tuple[int, str]]:
+        """
+        Find rounds to crawl. Uses the cache discovery API, then the live one as fallback.
+        Priority: mainState == '1' (발매중) > mainState == '2' (발매마감, 최신)
+        """
+        for path in (DISCOVERY_PATH, DISCOVERY_PATH_FALLBACK):
+            data = await self._post_json(path, SBM_INFO, "Discovery")
+            if data:
+                status_msg = data.get("rsMsg", {}).get("message", "N/A")
+                logger.info(f"Discovery OK: {status_msg}")
+                rounds = self._select_rounds(data)
+                if rounds:
+                    return rounds
+        return []
+
+    def _select_rounds(self, data: dict) -> List[Tuple[int, str]]:
+        """Best round first, followed by other on-sale G101 rounds (동시 조회 대상, 최대 max_concurrency)."""
+        gm_ts, gm_id = self._select_best_round(data)
+        if not gm_ts:
+            return []
+        rounds = [(gm_ts, gm_id)]
+        for game in data.get("protoGames", []):
+            if len(rounds) >= self.max_concurrency:
+                break
+            ts = game.get("gmTs")
+            if game.get("gmId") == "G101" and str(game.get("mainState")) == "1" and ts != gm_ts:
+                rounds.append((ts, "G101"))
+        return rounds
 
     def _select_best_round(self, data: dict) -> Tuple[Optional[int], Optional[str]]:
         """Select the best available round from API response data."""
@@ -302,63 +384,24 @@ class BetmanCrawler(BaseOddsProvider):
         logger.warning("No proto games in response")
         return None, None
 
-    def _fetch_odds_page(self, gm_id: str, gm_ts) -> Optional[dict]:
+    async def _fetch_odds_page(self, gm_id: str, gm_ts) -> Optional[dict]:
         """Fetch game data JSON from gameInfoInq.do."""
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": f"{self.base_url}/main/mainPage/gamebuy/buyableGameList.do",
-            "Origin": self.base_url,
-            "X-Requested-With": "XMLHttpRequest",
-            "Content-Type": "application/json; charset=UTF-8",
-        }
-
         payload = {
             "gmId": gm_id,
             "gmTs": gm_ts,
             "gameYear": "",
-            "_sbmInfo": {"_sbmInfo": {"debugMode": "false"}},
+            **SBM_INFO,
         }
-
-        for attempt in range(MAX_RETRIES + 1):
-            try:
-                session = self._get_session()
-                resp = session.post(ODDS_URL, headers=headers, json=payload, timeout=15)
-
-                content_type = resp.headers.get("content-type", "")
-                logger.info(f"Odds API response: status={resp.status_code}, ct={content_type}, len={len(resp.content)} (attempt {attempt + 1})")
-
-                if resp.status_code == 200:
-                    if "text/html" in content_type:
-                        logger.error("Odds API returned HTML (WAF/error)")
-                        self._session = None
-                        self._retry_delay(attempt)
-                        continue
-
-                    try:
-                        data = resp.json()
-                        if "compSchedules" in data:
-                            keys_count = len(data["compSchedules"].get("keys", []))
-                            data_count = len(data["compSchedules"].get("datas", []))
-                            logger.info(f"✅ Odds data: {keys_count} columns, {data_count} rows")
-                        else:
-                            logger.warning(f"No compSchedules in response. Keys: {list(data.keys())}")
-                        return data
-                    except json.JSONDecodeError:
-                        logger.error("Failed to decode JSON from odds API")
-                        return None
-                else:
-                    logger.error(f"Odds API HTTP {resp.status_code}")
-                    self._retry_delay(attempt)
-
-            except req_lib.exceptions.Timeout:
-                logger.error(f"Odds API timeout (attempt {attempt + 1})")
-                self._retry_delay(attempt)
-            except Exception as e:
-                logger.error(f"Fetch Odds Error: {e}")
-                self._retry_delay(attempt)
-
-        return None
+        data = await self._post_json(ODDS_PATH, payload, "Odds API")
+        if data is None:
+            return None
+        if "compSchedules" in data:
+            keys_count = len(data["compSchedules"].get("keys", []))
+            data_count = len(data["compSchedules"].get("datas", []))
+            logger.info(f"✅ Odds data: {keys_count} columns, {data_count} rows")
+        else:
+            logger.warning(f"No compSchedules in response. Keys: {list(data.keys())}")
+        return data
 
     def _parse_response(self, data: dict) -> List[OddsItem]:
         """Parse the JSON data from gameInfoInq.do into OddsItems."""
@@ -455,7 +498,7 @@ class BetmanCrawler(BaseOddsProvider):
     def _load_from_db(self) -> List[OddsItem]:
         """Load last saved Betman data from local JSON DB."""
         try:
-            _, get_matches_fn, _ = _get_betman_db()
+            get_matches_fn, _ = _get_betman_db()
             if not get_matches_fn:
                 logger.info("Firestore not available, no DB fallback.")
                 return []
@@ -487,12 +530,29 @@ class BetmanCrawler(BaseOddsProvider):
             logger.error(f"Error loading from DB: {e}")
             return []
 
-    def _retry_delay(self, attempt: int):
-        """Exponential backoff delay for retries."""
+    def _save_round(self, round_id: str, matches: List[dict], is_primary: bool = True) -> Optional[RoundDiff]:
+        """Diff against the stored round and persist only the changed matches."""
+        get_matches_fn, apply_diff_fn = _get_betman_db()
+        if not apply_diff_fn:
+            return None
+        try:
+            diff = diff_round(get_matches_fn(round_id), matches)
+            if is_primary:
+                self.last_diff = diff
+            if diff.is_empty:
+                logger.info(f"Round {round_id} unchanged ({diff.unchanged} matches) — skip save")
+            apply_diff_fn(round_id, diff, is_primary=is_primary)
+            return diff
+        except Exception as e:
+            logger.warning(f"DB save failed (non-critical): {e}")
+            return None
+
+    async def _retry_delay(self, attempt: int):
+        """Exponential backoff delay for retries (non-blocking)."""
         if attempt < MAX_RETRIES:
             delay = RETRY_DELAY_BASE * (2 ** attempt)
             logger.info(f"Retrying in {delay:.1f}s... (attempt {attempt + 1}/{MAX_RETRIES})")
-            time.sleep(delay)
+            await asyncio.sleep(delay)
 
     @staticmethod
     def _odds_to_dict(item: OddsItem) -> dict:
@@ -508,3 +568,7 @@ class BetmanCrawler(BaseOddsProvider):
             "away_odds": item.away_odds,
             "match_time": item.match_time or "",
         }
+
+
+# Shared instance — 쿠키 세션을 크롤링 간 재사용
+betman_crawler = BetmanCrawler()
@@ -0,0 +1,234 @@
+import sys
+import os
+import asyncio
+import copy
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Ensure functions directory is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services import crawler_betman
+from app.services.crawler_betman import BetmanCrawler
+from app.models import betman_db
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubBetman:
+    """녹화된 베트맨 응답을 재생하는 로컬 스텁 서버"""
+
+    def __init__(self):
+        self.discovery = _load_fixture("betman_discovery.json")
+        self.odds = {260018: _load_fixture("betman_odds_260018.json")}
+        self.waf_blocks = 0
+        self.block_rounds = set()   # 해당 gmTs 첫 요청만 WAF 오류 페이지
+        self.odds_delay = 0.0
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type, extra_headers=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (extra_headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stub.requests.append(("GET", self.path, self.headers.get("Cookie")))
+                self._send(200, "<html>betman</html>", "text/html", {"Set-Cookie": "WMONID=stub-session; Path=/"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests.append(("POST", self.path, self.headers.get("Cookie")))
+
+                if stub.waf_blocks > 0:
+                    stub.waf_blocks -= 1
+                    self._send(200, "<html>페이지 오류</html>", "text/html;charset=UTF-8")
+                    return
+
+                if payload.get("gmTs") in stub.block_rounds:
+                    stub.block_rounds.discard(payload.get("gmTs"))
+                    self._send(200, "<html>페이지 오류</html>", "text/html;charset=UTF-8")
+                    return
+
+                if self.path == crawler_betman.DISCOVERY_PATH:
+                    self._send(200, json.dumps(stub.discovery, ensure_ascii=False), "application/json;charset=UTF-8")
+                elif self.path == crawler_betman.ODDS_PATH:
+                    time.sleep(stub.odds_delay)
+                    body = stub.odds.get(payload.get("gmTs"), {"rsMsg": {"message": "no data"}})
+                    self._send(200, json.dumps(body, ensure_ascii=False), "application/json;charset=UTF-8")
+                else:
+                    self._send(404, "not found", "text/plain")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(betman_db, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(betman_db, "BETMAN_FILE", str(tmp_path / "betman_odds.json"))
+    monkeypatch.setattr(betman_db, "_MEMORY_CACHE", {"rounds": {}, "last_crawl": None, "last_round_id": None})
+    monkeypatch.setattr(crawler_betman, "RETRY_DELAY_BASE", 0.0)
+
+
+@pytest.fixture
+def stub():
+    with StubBetman() as s:
+        yield s
+
+
+def _crawler(stub):
+    return BetmanCrawler(base_url=stub.url, use_browser=False)
+
+
+def test_crawl_parses_recorded_round_and_saves(stub):
+    crawler = _crawler(stub)
+    items = crawler.fetch_odds()
+
+    # 핸디캡 변형(handi=1)과 미확정(protoStatus=1) 행은 제외
+    assert len(items) == 4
+    assert crawler.last_round_id == 260018
+    assert {i.sport for i in items} == {"Soccer", "Basketball"}
+
+    saved = betman_db.get_betman_matches("260018")
+    assert len(saved) == 4
+    assert crawler.last_diff.summary()["added"] == 4
+
+
+def test_session_cookie_is_reused_across_requests(stub):
+    crawler = _crawler(stub)
+
+    async def run():
+        await crawler.fetch_odds_async()
+        await crawler.fetch_odds_async()
+        await crawler.aclose()
+
+    asyncio.run(run())
+    main_page_visits = [r for r in stub.requests if r[0] == "GET"]
+    posts = [r for r in stub.requests if r[0] == "POST"]
+    assert len(main_page_visits) == 1
+    assert posts and all("WMONID=stub-session" in (cookie or "") for _, _, cookie in posts)
+
+
+def test_waf_block_resets_session_and_retries(stub):
+    stub.waf_blocks = 1
+    items = _crawler(stub).fetch_odds()
+    assert len(items) == 4
+    # 차단 후 쿠키를 다시 받기 위해 메인 페이지 재방문
+    assert len([r for r in stub.requests if r[0] == "GET"]) == 2
+
+
+def test_session_reset_does_not_close_client_under_concurrent_requests(stub):
+    stub.odds_delay = 0.3
+    stub.block_rounds.add(999)
+    crawler = _crawler(stub)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *[crawler._fetch_odds_page("G101", 260018) for _ in range(3)],
+                crawler._fetch_odds_page("G101", 999),
+            )
+        finally:
+            await crawler.aclose()
+
+    pages = asyncio.run(run())
+    # 차단된 요청만 세션을 새로 받아 재시도, 진행 중이던 형제 요청은 기존 클라이언트로 그대로 완료
+    assert all(page and "compSchedules" in page for page in pages[:3])
+    odds_posts = [r for r in stub.requests if r[0] == "POST" and r[1] == crawler_betman.ODDS_PATH]
+    assert len(odds_posts) == 5
+    assert not crawler._inflight
+
+
+def test_recrawl_writes_only_changed_matches(stub):
+    crawler = _crawler(stub)
+    crawler.fetch_odds()
+    first_ids = {m["team_home"]: m["match_id"] for m in betman_db.get_betman_matches("260018")}
+
+    # 동일 회차 재수집 — 변경 없음 → 저장 생략
+    crawler.fetch_odds()
+    assert crawler.last_diff.is_empty
+    assert crawler.last_diff.unchanged == 4
+
+    # 한 경기 배당 변경 + 한 경기 제외
+    odds = copy.deepcopy(stub.odds[260018])
+    odds["compSchedules"]["datas"][0][6] = 1.95
+    del odds["compSchedules"]["datas"][1]
+    stub.odds[260018] = odds
+    crawler.fetch_odds()
+
+    assert crawler.last_diff.summary() == {"added": 0, "changed": 1, "removed": 1, "unchanged": 2}
+    saved = {m["team_home"]: m for m in betman_db.get_betman_matches("260018")}
+    assert "리버풀" not in saved
+    assert saved["아스널"]["home_odds"] == 1.95
+    # 기존 경기의 match_id 유지
+    assert saved["아스널"]["match_id"] == first_ids["아스널"]
+
+
+def test_latest_matches_stay_on_primary_round_with_concurrent_rounds(stub):
+    # 260017 도 발매중 → 우선 회차(260018) 뒤에 함께 수집되는 보조 회차
+    stub.discovery["protoGames"][1]["mainState"] = "1"
+    secondary = copy.deepcopy(stub.odds[260018])
+    secondary["compSchedules"]["datas"] = secondary["compSchedules"]["datas"][:1]
+    stub.odds[260017] = secondary
+    crawler = _crawler(stub)
+
+    assert len(crawler.fetch_odds()) == 4
+    assert len(betman_db.get_betman_matches("260017")) == 1
+    assert len(betman_db.get_betman_matches()) == 4
+
+    # 우선 회차는 변경 없음(빈 diff), 보조 회차만 변경 — 최신 회차는 여전히 우선 회차
+    secondary["compSchedules"]["datas"][0][6] = 1.95
+    crawler.fetch_odds()
+    assert crawler.last_diff.is_empty
+    assert len(betman_db.get_betman_matches()) == 4
+    assert betman_db.get_betman_status()["last_round_id"] == "260018"
+
+
+def test_manual_edits_survive_recrawl(stub):
+    crawler = _crawler(stub)
+    crawler.fetch_odds()
+    target = next(m for m in betman_db.get_betman_matches("260018") if m["team_home"] == "아스널")
+    betman_db.update_betman_match(target["match_id"], {"home_odds": 2.5})
+
+    crawler.fetch_odds()
+    saved = next(m for m in betman_db.get_betman_matches("260018") if m["team_home"] == "아스널")
+    assert saved["home_odds"] == 2.5
+
+
+def test_falls_back_to_saved_db_when_upstream_blocked(stub):
+    crawler = _crawler(stub)
+    crawler.fetch_odds()
+
+    stub.waf_blocks = 100
+    items = crawler.fetch_odds()
+    assert len(items) == 4
+    assert crawler.last_round_id is None
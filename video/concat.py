@@ -1,7 +1,9 @@
 """
 Scorenix Video Concatenation Engine
 ===================================
-MoviePy를 사용하여 여러 비디오 클립을 초고퀄리티로 병합합니다.
+여러 비디오 클립을 초고퀄리티로 병합합니다.
+트랜지션이 없으면 ffmpeg 필터 그래프 1회 호출(규격이 같으면 스트림 복사),
+교차 페이드가 필요하거나 렌더러를 쓸 수 없으면 MoviePy로 병합합니다.
 """
 import sys
 if hasattr(sys.stdout, 'reconfigure'):
@@ -10,7 +12,7 @@ if hasattr(sys.stdout, 'reconfigure'):
 import os
 import argparse
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -51,6 +53,12 @@ def concatenate_videos(
         return False
 
     print(f"🎬 비디오 병합 시작 (총 {len(video_paths)}개 파일) -> {output_path}")
+
+    if transition_duration <= 0.0:
+        result = _concatenate_ffmpeg(video_paths, output_path, bgm_path, bgm_volume, quality)
+        if result is not None:
+            return result
+
     clips = []
     
     # 1. 파일 존재 여부 확인 및 로드
@@ -157,6 +165,55 @@ def concatenate_videos(
             c.close()
 
 
+def _concatenate_ffmpeg(
+    video_paths: List[str],
+    output_path: str,
+    bgm_path: str = None,
+    bgm_volume: float = 0.08,
+    quality: str = "high",
+) -> Optional[bool]:
+    """
+    ffmpeg_renderer 로 병합 (가장 큰 해상도로 스케일, 원본 fps 유지).
+    모든 입력의 코덱/해상도/fps 가 같으면 영상은 재인코딩 없이 스트림 복사.
+    렌더러를 쓸 수 없거나 실패하면 None → MoviePy 경로로 폴백.
+    """
+    from video.overlay import load_renderer
+
+    renderer = load_renderer()
+    ffmpeg = renderer.find_ffmpeg() if renderer else None
+    if not ffmpeg:
+        return None
+    for path in video_paths:
+        if not os.path.exists(path):
+            print(f"❌ 비디오 파일을 찾을 수 없습니다: {path}")
+            return False
+    try:
+        infos = renderer.probe(video_paths, ffmpeg)
+        max_w = max(info.width for info in infos)
+        max_h = max(info.height for info in infos)
+        print(f"  [Size] 대상 해상도로 자동 조정: {max_w}x{max_h}")
+        bitrate, preset = ("12000k", "slow") if quality == "high" else ("8000k", "medium")
+        plan = renderer.render(
+            [renderer.Scene(source=path) for path in video_paths],
+            output_path,
+            max_w,
+            max_h,
+            fps=None,
+            bgm=bgm_path if bgm_path and os.path.exists(bgm_path) else None,
+            bgm_volume=bgm_volume,
+            bitrate=bitrate,
+            preset=preset,
+            threads=4,
+            ffmpeg=ffmpeg,
+        )
+        mode = "스트림 복사" if plan.video_copy else f"인코딩 ({bitrate}, {preset})"
+        print(f"✅ 비디오 병합 완료: {output_path} [ffmpeg {mode}, {plan.duration:.1f}초]")
+        return True
+    except Exception as e:
+        print(f"  [!] ffmpeg 병합 실패 — MoviePy로 재시도: {e}")
+        return None
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scorenix Video Concat CLI")
     parser.add_argument("--files", required=True, help="병합할 비디오 파일 목록 (쉼표로 구분)")
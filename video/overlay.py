@@ -1,10 +1,12 @@
 """
 Overlay Module — ffmpeg를 사용하여 자막 텍스트를 영상에 합성합니다.
 """
+import importlib
 import logging
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 from typing import List, Optional
 
@@ -31,6 +33,45 @@ def _find_ffmpeg() -> Optional[str]:
     return None
 
 
+def load_backend_service(name: str):
+    """
+    backend/app/services/<name> (쇼츠 파이프라인과 공용 서비스) 로드.
+    backend 디렉터리가 없거나 import 실패 시 None → 기존 경로 사용.
+    """
+    backend_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+    if not os.path.isdir(backend_dir):
+        return None
+    if backend_dir not in sys.path:
+        sys.path.append(backend_dir)
+    try:
+        return importlib.import_module(f"app.services.{name}")
+    except Exception as e:
+        logger.debug(f"{name} unavailable: {e}")
+        return None
+
+
+def load_renderer():
+    """ffmpeg_renderer (필터 그래프 렌더러) 로드. 실패 시 None."""
+    return load_backend_service("ffmpeg_renderer")
+
+
+def to_render_overlays(renderer, overlay_texts: List[OverlayText]) -> list:
+    """OverlayText → ffmpeg_renderer.Overlay (기존 drawtext 스타일 유지)."""
+    return [
+        renderer.Overlay(
+            text=ot.text,
+            start=ot.start_sec,
+            end=ot.end_sec,
+            position=ot.position,
+            font_size=ot.font_size,
+            color=ot.color,
+            box_color=ot.box_color,
+            font="Malgun Gothic",
+        )
+        for ot in overlay_texts
+    ]
+
+
 def _escape_text(text: str) -> str:
     """ffmpeg drawtext용 특수문자 이스케이핑"""
     # 콜론, 작은따옴표, 역슬래시 이스케이프
@@ -100,10 +141,36 @@ def apply_overlay(
         성공 여부 (bool)
     """
     ffmpeg = _find_ffmpeg()
+    renderer = load_renderer()
+    if renderer is not None:
+        ffmpeg = ffmpeg or renderer.find_ffmpeg()
     if not ffmpeg:
         logger.error("❌ ffmpeg를 찾을 수 없습니다. PATH에 ffmpeg를 추가하거나 설치하세요.")
         return False
 
+    if renderer is not None:
+        # 공용 렌더러: textfile 기반 drawtext, 오디오는 가능하면 스트림 복사
+        try:
+            logger.info(f"🔤 자막 합성 중: {os.path.basename(input_path)} → {os.path.basename(output_path)}")
+            info = renderer.probe([input_path], ffmpeg)[0]
+            renderer.render(
+                [renderer.Scene(source=input_path, overlays=to_render_overlays(renderer, overlay_texts))],
+                output_path,
+                info.width or video_width,
+                info.height or video_height,
+                fps=None,
+                preset="fast",
+                crf=20,
+                threads=os.cpu_count() or 1,
+                timeout=300,
+                ffmpeg=ffmpeg,
+            )
+            size_mb = os.path.getsize(output_path) / (1024 * 1024)
+            logger.info(f"✅ 자막 합성 완료: {output_path} ({size_mb:.1f} MB)")
+            return True
+        except Exception as e:
+            logger.warning(f"공용 렌더러 자막 합성 실패 — 기존 경로로 재시도: {e}")
+
     vf_filter = _build_vf_filter(overlay_texts, video_height)
 
     # 출력 디렉토리 생성
@@ -146,10 +146,29 @@ async def _execute_action(page, action: Action) -> None:
         logger.warning(f"알 수 없는 액션 유형: {t}")
 
 
+def load_browser_pool():
+    """backend browser_pool 의 공용 풀. 없으면 None."""
+    from .overlay import load_backend_service
+
+    module = load_backend_service("browser_pool")
+    return module.browser_pool if module is not None else None
+
+
+async def _run_steps(page, scenario: BaseScenario) -> None:
+    """액션 순차 실행 (액션별 sleep 은 자막 타임라인에 맞춘 연출 시간이라 그대로 유지)"""
+    for i, action in enumerate(scenario.steps):
+        logger.info(f"  [{i+1}/{len(scenario.steps)}] 액션: {action.type} {action.value or action.selector or ''}")
+        try:
+            await _execute_action(page, action)
+        except Exception as e:
+            logger.warning(f"  ⚠️ 액션 {action.type} 오류 (계속): {e}")
+
+
 async def produce(
     scenario: BaseScenario,
     output_path: str,
     headless: bool = True,
+    pool=None,
 ) -> bool:
     """
     시나리오를 실행하여 webm 영상을 녹화합니다.
@@ -159,44 +178,43 @@ async def produce(
         scenario: 실행할 시나리오 인스턴스
         output_path: 최종 저장 경로 (.webm)
         headless: True면 백그라운드 실행
+        pool: backend BrowserPool (None 이면 headless 일 때 공용 풀, 로드 실패 시 단독 브라우저)
 
     Returns:
         성공 여부 (bool)
     """
-    from playwright.async_api import async_playwright
-
     logger.info(f"🎥 영상 제작 시작: [{scenario.name}] → {output_path}")
     temp_dir = tempfile.mkdtemp()
+    if pool is None and headless:
+        pool = load_browser_pool()
+
+    options = {
+        "viewport": {"width": scenario.viewport_width, "height": scenario.viewport_height},
+        "user_agent": (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+        ),
+        "record_video_dir": temp_dir,
+        "record_video_size": {"width": scenario.viewport_width, "height": scenario.viewport_height},
+    }
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=headless,
-                args=["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
-            )
-
-            context = await browser.new_context(
-                viewport={"width": scenario.viewport_width, "height": scenario.viewport_height},
-                user_agent=(
-                    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
-                    "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
-                ),
-                record_video_dir=temp_dir,
-                record_video_size={"width": scenario.viewport_width, "height": scenario.viewport_height},
-            )
-
-            page = await context.new_page()
-
-            # 액션 순차 실행
-            for i, action in enumerate(scenario.steps):
-                logger.info(f"  [{i+1}/{len(scenario.steps)}] 액션: {action.type} {action.value or action.selector or ''}")
-                try:
-                    await _execute_action(page, action)
-                except Exception as e:
-                    logger.warning(f"  ⚠️ 액션 {action.type} 오류 (계속): {e}")
-
-            await context.close()
-            await browser.close()
+        if pool is not None:
+            # 녹화 컨텍스트는 닫혀야 webm 이 확정되므로 일회용, 브라우저는 풀에서 재사용
+            async with pool.context(**options) as context:
+                await _run_steps(await context.new_page(), scenario)
+        else:
+            from playwright.async_api import async_playwright
+
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(
+                    headless=headless,
+                    args=["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
+                )
+                context = await browser.new_context(**options)
+                await _run_steps(await context.new_page(), scenario)
+                await context.close()
+                await browser.close()
 
         # 녹화 파일 찾기 및 복사
         files = [f for f in os.listdir(temp_dir) if f.endswith(".webm") or f.endswith(".mp4")]
@@ -28,7 +28,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from video.scenarios import SCENARIO_MAP
-from video.producer import produce
+from video.producer import load_browser_pool, produce
 from video.overlay import apply_overlay
 from video.concat import concatenate_videos
 
@@ -46,6 +46,7 @@ async def make_video(
     scenario_name: str,
     apply_subtitles: bool = True,
     headless: bool = True,
+    pool=None,
 ) -> str:
     """
     지정한 유형의 영상을 제작합니다.
@@ -64,7 +65,7 @@ async def make_video(
 
     # 1단계: Playwright로 webm 녹화
     raw_webm = str(OUTPUT_DIR / f"{scenario_name}_{timestamp}_raw.webm")
-    ok = await produce(scenario, raw_webm, headless=headless)
+    ok = await produce(scenario, raw_webm, headless=headless, pool=pool)
 
     if not ok:
         raise RuntimeError(f"영상 녹화 실패: {scenario_name}")
@@ -91,6 +92,28 @@ async def make_video(
         return raw_webm
 
 
+async def make_videos(types_to_make, apply_subtitles: bool = True, headless: bool = True) -> list:
+    """여러 유형을 한 이벤트 루프에서 순차 제작 (브라우저 풀 공유, 끝나면 종료)."""
+    pool = load_browser_pool() if headless else None
+    generated_files = []
+    try:
+        for t in types_to_make:
+            print(f"\n{'='*50}")
+            print(f"[제작 중]: {t}")
+            print(f"{'='*50}")
+            try:
+                output = await make_video(t, apply_subtitles, headless, pool=pool)
+                print(f"완료: {output}\n")
+                generated_files.append(output)
+            except Exception as e:
+                print(f"실패: {e}\n")
+                logger.exception(e)
+    finally:
+        if pool is not None:
+            await pool.close()
+    return generated_files
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scorenix 자동 영상 제작 및 병합 CLI",
@@ -151,18 +174,7 @@ def main():
         parser.print_help()
         return
 
-    generated_files = []
-    for t in types_to_make:
-        print(f"\n{'='*50}")
-        print(f"[제작 중]: {t}")
-        print(f"{'='*50}")
-        try:
-            output = asyncio.run(make_video(t, apply_subtitles, headless))
-            print(f"완료: {output}\n")
-            generated_files.append(output)
-        except Exception as e:
-            print(f"실패: {e}\n")
-            logger.exception(e)
+    generated_files = asyncio.run(make_videos(types_to_make, apply_subtitles, headless))
 
     # 지정한 시나리오들의 제작이 모두 성공적으로 완료되었을 때 병합 수행
     if args.concat and len(generated_files) > 1: